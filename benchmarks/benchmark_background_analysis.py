@@ -0,0 +1,90 @@
+"""
+Background Analysis Benchmark
+=============================
+
+Measures how long a Streamlit script run is blocked by the AI analysis. The
+analysis used to run inside the run that handled the button click, so the
+click blocked the page (and any widget interaction restarted the work) for
+the whole analysis. It now runs as a background job: the click only submits
+it, and each progress poll copies the job's progress into the session. The
+table reports the analysis time recorded by the job, the script time of the
+click run, and the mean script time of the polls while the job ran. Rule-based
+recommendations are used (no OPENROUTER_API_KEY), so analysis times exclude
+LLM latency.
+
+Usage:
+    python -m benchmarks.benchmark_background_analysis --customers 100 1000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+
+def analysis_page(customers: int):
+    """Results page essentials: run button, progress polling, finished results"""
+    import pandas as pd
+    import streamlit as st
+    from src.components.results import render_analysis_progress, run_ai_analysis
+
+    if "customer_data" not in st.session_state:
+        df = pd.read_csv("sample-customer-data-20250715.csv")
+        df = pd.concat([df] * (customers // len(df) + 1), ignore_index=True).head(customers)
+        st.session_state["customer_data"] = {"processed_data": df}
+        st.session_state["purchase_data"] = {"processed_data": df}
+        st.session_state["customers_to_analyze"] = customers
+    if st.button("Run", key="run"):
+        run_ai_analysis()
+    if "ai_analysis_job_id" in st.session_state:
+        render_analysis_progress()
+    results = st.session_state.get("ai_analysis_results")
+    if results:
+        st.write(f"processing_time={results['processing_time']}")
+
+
+def measure(customers: int, poll_interval: float):
+    """Analysis time, click run time and mean poll run time (s)"""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(project_root)
+    app = AppTest.from_function(analysis_page, args=(customers,), default_timeout=600)
+    app.run()
+
+    start = time.perf_counter()
+    app.button(key="run").click().run()
+    click = time.perf_counter() - start
+
+    polls = []
+    while True:
+        time.sleep(poll_interval)
+        start = time.perf_counter()
+        app.run()
+        polls.append(time.perf_counter() - start)
+        finished = [m.value for m in app.markdown if m.value.startswith("processing_time=")]
+        if finished:
+            return float(finished[0].split("=")[1]), click, sum(polls) / len(polls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    os.environ.pop("OPENROUTER_API_KEY", None)
+
+    print(f"{'customers':>9} | {'analysis (s)':>12} | {'click run (s)':>13} | {'mean poll run (s)':>17}")
+    for customers in args.customers:
+        analysis, click, poll = measure(customers, args.poll_interval)
+        print(f"{customers:>9} | {analysis:>12.2f} | {click:>13.3f} | {poll:>17.3f}")
+
+
+if __name__ == "__main__":
+    main()
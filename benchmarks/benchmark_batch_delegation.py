@@ -0,0 +1,61 @@
+"""
+Batch Delegation Benchmark
+==========================
+
+Compares one delegation round-trip per at-risk customer with the batched
+delegation protocol between the Lead Intelligence and Revenue Optimization agents.
+
+Usage:
+    python -m benchmarks.benchmark_batch_delegation --rows 10000 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.lead_intelligence_agent import LeadIntelligenceAgent
+from src.agents.revenue_optimization_agent import RevenueOptimizationAgent
+from benchmarks.benchmark_lead_intelligence import make_customer_records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    lead_agent = LeadIntelligenceAgent()
+    revenue_agent = RevenueOptimizationAgent()
+    print(f"{'rows':>9} | {'at-risk':>8} | {'per-customer (s)':>16} | {'round-trips':>11} | {'batched (s)':>11} | {'groups':>6}")
+    for rows in args.rows:
+        df = make_customer_records(rows)
+        features = lead_agent._build_feature_frame(df)
+        delegation_items = lead_agent._identify_delegation_needs(df, features)
+        batch = lead_agent._prepare_batch_delegation(features, delegation_items)
+        at_risk = [
+            {"customer_id": customer_id, "monthly_spend": spend, "churn_probability": churn, "segment": group["segment"]}
+            for group in batch["groups"] if group["request_type"] == "retention_strategy"
+            for customer_id, spend, churn in zip(group["customer_ids"], group["monthly_spend"], group["churn_probability"])
+        ]
+
+        start = time.perf_counter()
+        for customer in at_risk:
+            revenue_agent.create_retention_offers([customer])
+        for item in delegation_items:
+            revenue_agent.respond_to_delegation(item)
+        per_customer = time.perf_counter() - start
+
+        start = time.perf_counter()
+        revenue_agent.respond_to_delegation(batch)
+        batched = time.perf_counter() - start
+
+        print(f"{rows:>9,} | {len(at_risk):>8,} | {per_customer:>16.3f} | {len(at_risk) + len(delegation_items):>11,} | "
+              f"{batched:>11.3f} | {len(batch['groups']):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Bulk Offer Matching Benchmark
+=============================
+
+Compares per-customer match_offers_for_customer (eligibility index, one customer
+at a time) with the broadcasted customers x products ThreeHKBusinessRulesEngine
+bulk API. Reports the scoring and top-N selection throughput of rank_offers_bulk
+in customer-product pairs per second, and the end-to-end match_offers_bulk time
+including OfferMatch construction for the selected pairs.
+
+Usage:
+    python -m benchmarks.benchmark_bulk_offer_matching --catalog-sizes 8 200 2000 --customers 20000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from benchmarks.benchmark_offer_matching import grow_catalog
+from src.agents.three_hk_business_rules import ThreeHKBusinessRulesEngine
+from tests.test_bulk_offer_matching import to_bulk_inputs
+from tests.fixtures_data import make_customers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog-sizes", type=int, nargs="+", default=[8, 200, 2000])
+    parser.add_argument("--customers", type=int, default=20_000)
+    parser.add_argument("--per-customer-sample", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    customers = make_customers(args.customers)
+    inputs = to_bulk_inputs(customers)
+    sample = customers[:args.per_customer_sample]
+    print(f"{args.customers:,} customers")
+    print(f"{'products':>8} | {'per-customer (s)':>16} | {'rank (s)':>8} | {'Mpairs/s':>8} | {'bulk (s)':>8} | {'speedup':>7}")
+    for size in args.catalog_sizes:
+        engine = ThreeHKBusinessRulesEngine()
+        grow_catalog(engine, size)
+        engine.get_eligibility_index()
+
+        start = time.perf_counter()
+        for features, lead_score, segment, current_products in sample:
+            engine.match_offers_for_customer(features, lead_score, segment, current_products)
+        per_customer = (time.perf_counter() - start) * len(customers) / len(sample)
+
+        start = time.perf_counter()
+        engine.rank_offers_bulk(*inputs)
+        rank = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine.match_offers_bulk(*inputs)
+        bulk = time.perf_counter() - start
+
+        pairs = len(customers) * len(engine.product_catalog)
+        print(f"{len(engine.product_catalog):>8,} | {per_customer:>16.3f} | {rank:>8.3f} | {pairs / rank / 1e6:>8.1f} | "
+              f"{bulk:>8.3f} | {per_customer / bulk:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
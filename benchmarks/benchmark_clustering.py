@@ -0,0 +1,85 @@
+"""
+Customer Clustering Benchmark
+=============================
+
+Compares the previous cluster_customers model search (a full KMeans(n_init=10)
+per candidate k whose results were discarded, a final refit and an exact
+silhouette over all customers) with CustomerDataAnalyzer.cluster_feature_matrix
+in exact KMeans mode and in the scalable MiniBatchKMeans mode. Feature rows are
+resampled with noise from extracted synthetic customers.
+
+Usage:
+    python -m benchmarks.benchmark_clustering --customers 5000 20000 100000 --previous-limit 20000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerDataAnalyzer
+from tests.fixtures_data import make_customer_datasets
+
+
+def previous_clustering(feature_matrix: np.ndarray) -> int:
+    """Previous implementation: discarded elbow fits, hard-coded k, refit, full silhouette"""
+    scaled = StandardScaler().fit_transform(feature_matrix)
+    for k in range(2, min(8, len(scaled) // 2) + 1):
+        KMeans(n_clusters=k, random_state=42, n_init=10).fit(scaled)
+    labels = KMeans(n_clusters=5, random_state=42, n_init=10).fit_predict(scaled)
+    silhouette_score(scaled, labels)
+    return 5
+
+
+def make_feature_matrix(analyzer: CustomerDataAnalyzer, count: int, seed: int = 8) -> np.ndarray:
+    """Numerical features of synthetic customers, resampled with noise to count rows"""
+    datasets = make_customer_datasets(2000)
+    customers, purchases = analyzer._datasets_to_frames(datasets)
+    base = analyzer.extract_feature_matrix(customers, purchases, customer_key="_dataset_index").numerical_matrix()
+    rng = np.random.default_rng(seed)
+    rows = base[rng.integers(len(base), size=count)]
+    return rows + rng.normal(0.0, 0.05, rows.shape) * (base.std(axis=0) + 1e-9)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, nargs="+", default=[5_000, 20_000, 100_000])
+    parser.add_argument("--previous-limit", type=int, default=20_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    analyzer = CustomerDataAnalyzer(enable_ml_clustering=True)
+    print(f"{'customers':>9} | {'previous (s)':>12} | {'kmeans (s)':>10} | {'k':>2} | {'minibatch (s)':>13} | {'k':>2}")
+    for count in args.customers:
+        feature_matrix = make_feature_matrix(analyzer, count)
+        customer_ids = [f"CUST{i:07d}" for i in range(count)]
+
+        previous = "-"
+        kmeans, kmeans_k = "-", "-"
+        if count <= args.previous_limit:
+            start = time.perf_counter()
+            previous_clustering(feature_matrix)
+            previous = f"{time.perf_counter() - start:.2f}"
+
+            start = time.perf_counter()
+            kmeans_k = analyzer.cluster_feature_matrix(feature_matrix, customer_ids, scalable=False)["n_clusters"]
+            kmeans = f"{time.perf_counter() - start:.2f}"
+
+        start = time.perf_counter()
+        minibatch_k = analyzer.cluster_feature_matrix(feature_matrix, customer_ids, scalable=True)["n_clusters"]
+        minibatch = time.perf_counter() - start
+        print(f"{count:>9,} | {previous:>12} | {kmeans:>10} | {kmeans_k:>2} | {minibatch:>13.2f} | {minibatch_k:>2}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Email Batch Rendering Benchmark
+===============================
+
+Compares rendering a campaign's HTML and plain text emails one call at a time
+with the original layouts ("per-call": every email rebuilds the styles,
+header, footer and compliance blocks, and branding post-processes the whole
+document) against precompiled templates, first per call and then with
+generate_batch (campaign-wide slots rendered once, branding applied to the
+customer slots only) on one or more worker processes. The table reports
+emails per second; each customer gets one HTML and one text email.
+
+Usage:
+    python -m benchmarks.benchmark_email_batch --customers 20000 --workers 1 4 --branded
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.email_templates import EmailTemplateGenerator
+from tests.test_email_templates import make_campaign
+
+
+def render_per_call(generator: EmailTemplateGenerator, campaign, branded: bool) -> int:
+    """Render every email with the single-email methods"""
+    customers, recommendations, offers, deliverables = campaign
+    brand = generator.format_three_hk_branding if branded else (lambda content: content)
+    emails = 0
+    for customer, recommendation, customer_offers in zip(customers, recommendations, offers):
+        args = (customer, recommendation, customer_offers, deliverables)
+        brand(generator.generate_html_email_template(*args))
+        brand(generator.generate_plain_text_email_template(*args))
+        emails += 2
+    return emails
+
+
+def render_batch(generator: EmailTemplateGenerator, campaign, branded: bool, workers: int) -> int:
+    """Render every email with generate_batch"""
+    results = generator.generate_batch(*campaign, branded=branded, workers=workers)
+    return sum(len(result["templates"]) for result in results)
+
+
+def rate(render, *args) -> float:
+    """Emails rendered per second"""
+    start = time.perf_counter()
+    emails = render(*args)
+    return emails / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, nargs="+", default=[20000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--branded", action="store_true", help="Apply Three HK branding to every email")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"CPU cores: {os.cpu_count()}, branded: {args.branded}")
+    print(f"{'customers':>9} | {'mode':>22} | {'emails/s':>10}")
+    for customers in args.customers:
+        campaign = make_campaign(customers)
+        rows = [
+            ("per-call", rate(render_per_call, EmailTemplateGenerator(precompiled=False), campaign, args.branded)),
+            ("precompiled per-call", rate(render_per_call, EmailTemplateGenerator(), campaign, args.branded)),
+        ]
+        for workers in sorted(set(args.workers)):
+            rows.append((
+                f"generate_batch x{workers}",
+                rate(render_batch, EmailTemplateGenerator(), campaign, args.branded, workers),
+            ))
+        for mode, emails_per_second in rows:
+            print(f"{customers:>9} | {mode:>22} | {emails_per_second:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Engine Startup Benchmark
+========================
+
+Measures the cost of constructing a ThreeHKBusinessRulesEngine and matching a
+first customer, as happens for every LeadScoringEngine created by
+score_single_lead or batch_score_and_prioritize. "rebuild" clears the process-wide rule set
+registry before each engine, reproducing the previous per-instance construction
+of catalog, rules and eligibility index; "shared" reuses the registry.
+
+Usage:
+    python -m benchmarks.benchmark_engine_startup --engines 200
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.three_hk_business_rules import ThreeHKBusinessRulesEngine, rule_set_registry
+from tests.fixtures_data import make_customers
+
+
+def time_startup(engines: int, rebuild: bool, customer) -> float:
+    """Milliseconds per engine for construction plus one offer match"""
+    features, lead_score, segment, current_products = customer
+    start = time.perf_counter()
+    for _ in range(engines):
+        if rebuild:
+            rule_set_registry.clear()
+        engine = ThreeHKBusinessRulesEngine()
+        engine.match_offers_for_customer(features, lead_score, segment, current_products)
+    return (time.perf_counter() - start) / engines * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--engines", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    customer = make_customers(1)[0]
+    rebuild = time_startup(args.engines, True, customer)
+    time_startup(1, False, customer)
+    shared = time_startup(args.engines, False, customer)
+    print(f"{'':<28} | {'rebuild (ms)':>12} | {'shared (ms)':>11} | {'speedup':>7}")
+    print(f"{'engine + first offer match':<28} | {rebuild:>12.3f} | {shared:>11.3f} | {rebuild / shared:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Customer Feature Extraction Benchmark
+=====================================
+
+Compares per-customer CustomerDataAnalyzer.extract_customer_features with the
+columnar extract_feature_matrix on synthetic customer and purchase frames.
+Both timings start from the same frames, so the scalar path includes building
+its per-customer dicts and purchase lists.
+
+Usage:
+    python -m benchmarks.benchmark_feature_extraction --customers 10000 100000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerDataAnalyzer
+
+ENGAGEMENT_COLUMNS = ["app_usage_hours", "service_interactions", "complaint_count", "satisfaction_score",
+                      "promotion_responses", "promotion_offers"]
+
+
+def make_frames(customers: int, seed: int = 3):
+    """Synthetic customer frame (profile + engagement) and long purchase frame"""
+    rng = np.random.default_rng(seed)
+    customer_frame = pd.DataFrame({
+        "customer_id": [f"CUST{i:07d}" for i in range(customers)],
+        "age": rng.integers(18, 70, customers),
+        "location": rng.choice(["Central, Hong Kong Island", "Mong Kok, Kowloon", "Sha Tin, New Territories"], customers),
+        "account_type": rng.choice(["Premium", "Business", "Family", "Standard"], customers),
+        "tenure_months": rng.integers(0, 48, customers),
+        "monthly_spend": rng.uniform(100, 2000, customers).round(2),
+        "data_usage_gb": rng.uniform(0, 80, customers),
+        "voice_minutes": rng.uniform(0, 900, customers),
+        "sms_count": rng.integers(0, 300, customers),
+        "roaming_usage": rng.choice([0.0, 2.5], customers),
+        "app_usage_hours": rng.uniform(0, 30, customers),
+        "service_interactions": rng.integers(0, 15, customers),
+        "complaint_count": rng.integers(0, 5, customers),
+        "satisfaction_score": rng.uniform(1, 10, customers).round(1),
+        "promotion_responses": rng.integers(0, 4, customers),
+        "promotion_offers": rng.integers(1, 6, customers),
+    })
+    purchases_per_customer = rng.integers(0, 12, customers)
+    purchase_frame = pd.DataFrame({
+        "customer_id": np.repeat(customer_frame["customer_id"].to_numpy(), purchases_per_customer),
+        "amount": rng.uniform(-10, 500, purchases_per_customer.sum()).round(2),
+    })
+    return customer_frame, purchase_frame
+
+
+def scalar_inputs(customer_frame: pd.DataFrame, purchase_frame: pd.DataFrame):
+    """Per-customer (customer_data, purchase_history, engagement_data) arguments"""
+    purchases = purchase_frame.groupby("customer_id", sort=False)["amount"].apply(
+        lambda amounts: [{"amount": amount} for amount in amounts]
+    ).to_dict()
+    inputs = []
+    for customer in customer_frame.to_dict("records"):
+        engagement = {column: customer.pop(column) for column in ENGAGEMENT_COLUMNS}
+        inputs.append((customer, purchases.get(customer["customer_id"], []), engagement))
+    return inputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    analyzer = CustomerDataAnalyzer(enable_ml_clustering=False)
+    print(f"{'customers':>10} | {'scalar (s)':>10} | {'columnar (s)':>12} | {'speed-up':>8}")
+    for customers in args.customers:
+        customer_frame, purchase_frame = make_frames(customers)
+
+        start = time.perf_counter()
+        inputs = scalar_inputs(customer_frame, purchase_frame)
+        for customer_data, purchase_history, engagement_data in inputs:
+            analyzer.extract_customer_features(customer_data, purchase_history, engagement_data)
+        scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        analyzer.extract_feature_matrix(customer_frame, purchase_frame)
+        columnar = time.perf_counter() - start
+
+        print(f"{customers:>10,} | {scalar:>10.3f} | {columnar:>12.3f} | {scalar / columnar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
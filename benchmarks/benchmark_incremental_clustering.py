@@ -0,0 +1,66 @@
+"""
+Incremental Clustering Benchmark
+================================
+
+Compares processing a daily delta of new customers by re-clustering the whole
+customer base (cluster_feature_matrix on base + delta) with assigning only the
+delta to the persisted artefact (assign_clusters, including feature extraction,
+drift check, reservoir update and saving the artefact).
+
+Usage:
+    python -m benchmarks.benchmark_incremental_clustering --customers 20000 100000 300000 --delta 2000
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from benchmarks.benchmark_clustering import make_feature_matrix
+from src.agents.customer_analysis import CustomerDataAnalyzer
+from tests.fixtures_data import make_customer_datasets
+from tests.test_incremental_clustering import to_frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, nargs="+", default=[20_000, 100_000, 300_000])
+    parser.add_argument("--delta", type=int, default=2_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    analyzer = CustomerDataAnalyzer(enable_ml_clustering=True)
+    customers, purchases = to_frames(analyzer, make_customer_datasets(args.delta, seed=99), "DELTA")
+    delta_matrix = analyzer.extract_feature_matrix(customers, purchases).numerical_matrix()
+    model_path = Path(tempfile.mkdtemp()) / "clustering.joblib"
+
+    print(f"{args.delta:,} new customers per day")
+    print(f"{'customers':>9} | {'full refit (s)':>14} | {'assign delta (s)':>16} | {'speedup':>7} | {'drift':>5}")
+    for count in args.customers:
+        base = make_feature_matrix(analyzer, count)
+        analyzer.cluster_feature_matrix(base, [f"CUST{i:07d}" for i in range(count)], model_path=model_path)
+
+        training = np.vstack([base, delta_matrix])
+        start = time.perf_counter()
+        CustomerDataAnalyzer(enable_ml_clustering=True).cluster_feature_matrix(
+            training, [f"CUST{i:07d}" for i in range(len(training))]
+        )
+        full = time.perf_counter() - start
+
+        daily = CustomerDataAnalyzer(enable_ml_clustering=True)
+        start = time.perf_counter()
+        result = daily.assign_clusters(customers, purchases, model_path=model_path, refit_on_drift=False)
+        assign = time.perf_counter() - start
+        print(f"{count:>9,} | {full:>14.2f} | {assign:>16.3f} | {full / assign:>6.0f}x | {str(result['drift']['drifted']):>5}")
+
+
+if __name__ == "__main__":
+    main()
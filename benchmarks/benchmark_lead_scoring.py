@@ -0,0 +1,78 @@
+"""
+Lead Scoring Benchmark
+======================
+
+Compares LeadScoringEngine.batch_score_leads with the previous per-lead flow,
+in which score_lead extracted features and then analyze_customer_patterns
+extracted them a second time.
+
+Usage:
+    python -m benchmarks.benchmark_lead_scoring --customers 2000 20000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerAnalysisContext
+from src.agents.lead_scoring import LeadScoringEngine
+from tests.fixtures_data import make_customer_datasets
+
+
+def double_extraction_scoring(engine: LeadScoringEngine, customer_datasets):
+    """Score every lead the way score_lead did before analysis contexts"""
+    analyzer = engine.customer_analyzer
+    scored_leads = []
+    for i, data in enumerate(customer_datasets):
+        customer_data = data.get("customer_data", {})
+        purchase_history = data.get("purchase_history", [])
+        engagement_data = data.get("engagement_data", {})
+
+        features = analyzer.extract_customer_features(customer_data, purchase_history, engagement_data)
+        patterns = analyzer.analyze_customer_patterns(customer_data, purchase_history, engagement_data)
+        segment, confidence = analyzer._apply_segmentation_rules(features)
+        context = CustomerAnalysisContext(customer_data.get("customer_id", f"unknown_{i}"), features, patterns,
+                                          segment, confidence)
+        scored_leads.append((context.customer_id, engine.score_lead(customer_data, purchase_history,
+                                                                    engagement_data, context=context)))
+    return scored_leads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, nargs="+", default=[2_000, 20_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    engine = LeadScoringEngine()
+    analyzer = engine.customer_analyzer
+    print(f"{'customers':>9} | {'double (s)':>10} | {'extractions':>11} | {'context (s)':>11} | {'extractions':>11} | {'speedup':>7}")
+    for customers in args.customers:
+        datasets = make_customer_datasets(customers)
+
+        double = single = float("inf")
+        for _ in range(args.repeat):
+            analyzer.feature_extractions = 0
+            start = time.perf_counter()
+            double_extraction_scoring(engine, datasets)
+            double = min(double, time.perf_counter() - start)
+            double_extractions = analyzer.feature_extractions
+
+            analyzer.feature_extractions = 0
+            start = time.perf_counter()
+            engine.batch_score_leads(datasets)
+            single = min(single, time.perf_counter() - start)
+
+        print(f"{customers:>9,} | {double:>10.3f} | {double_extractions:>11,} | {single:>11.3f} | "
+              f"{analyzer.feature_extractions:>11,} | {double / single:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
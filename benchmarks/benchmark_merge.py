@@ -0,0 +1,98 @@
+"""
+Shared Join Merge Benchmark
+===========================
+
+Compares DataMerger.merge_datasets, which factorizes the Account IDs once and
+takes both the original and the display frame from one join indexer, with the
+previous procedure: a set-based quality report plus two full prefixed
+pd.merge runs (original and display). Reports best-of-N wall time and the
+tracemalloc peak of a separate run.
+
+Usage:
+    python -m benchmarks.benchmark_merge --rows 100000 1000000 --strategy left
+"""
+
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.data_merging import DataMerger, MergeStrategy
+from tests.fixtures_data import make_merge_frames
+from tests.test_shared_join_indexer import reference_merge
+
+
+def double_merge(customer_df, purchase_df, customer_display, purchase_display, strategy):
+    """Previous merge_datasets core: ID sets for the report, then one pd.merge per frame pair"""
+    customer_ids = set(customer_df["Account ID"].dropna().astype(str))
+    purchase_ids = set(purchase_df["Account ID"].dropna().astype(str))
+    matched = customer_ids & purchase_ids
+    duplicates = (
+        customer_df[customer_df["Account ID"].duplicated()]["Account ID"].tolist(),
+        purchase_df[purchase_df["Account ID"].duplicated()]["Account ID"].tolist(),
+    )
+    merged = reference_merge(customer_df, purchase_df, strategy)
+    display = reference_merge(customer_display, purchase_display, strategy)
+    return merged, display, len(matched), duplicates
+
+
+def shared_merge(customer_df, purchase_df, customer_display, purchase_display, strategy):
+    """merge_datasets with the shared join indexer"""
+    result = DataMerger().merge_datasets(
+        {"original_data": customer_df, "display_data": customer_display},
+        {"original_data": purchase_df, "display_data": purchase_display},
+        strategy=strategy,
+    )
+    assert result.success, result.message
+    return result.merged_data, result.display_data, result.quality_report["matched_records"], None
+
+
+def measure(function, args, repeats):
+    """Best wall time over repeats, then the tracemalloc peak of one more run (MiB)"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = function(*args)
+        best = min(best, time.perf_counter() - start)
+        del output
+    tracemalloc.start()
+    output = function(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return best, peak, output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--strategy", choices=[strategy.value for strategy in MergeStrategy], default="left")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    strategy = MergeStrategy(args.strategy)
+
+    print(f"{'rows':>8} | {'merged':>8} | {'path':>6} | {'time (s)':>8} | {'peak (MiB)':>10}")
+    for rows in args.rows:
+        customer_df, purchase_df = make_merge_frames(rows)
+        # Display copies as the privacy pipeline returns them: same rows, masked values
+        customer_display = customer_df.assign(Email="***@example.com")
+        purchase_display = purchase_df.copy()
+        frames = (customer_df, purchase_df, customer_display, purchase_display, strategy)
+
+        old_time, old_peak, old = measure(double_merge, frames, args.repeats)
+        new_time, new_peak, new = measure(shared_merge, frames, args.repeats)
+        assert old[0].equals(new[0]) and old[2] == new[2]
+
+        print(f"{rows:>8} | {len(new[0]):>8} | {'double':>6} | {old_time:>8.2f} | {old_peak:>10.1f}")
+        print(f"{rows:>8} | {len(new[0]):>8} | {'shared':>6} | {new_time:>8.2f} | {new_peak:>10.1f}")
+        print(f"{'':>8} | {'':>8} | {'ratio':>6} | {old_time / new_time:>7.1f}x | {old_peak / new_peak:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
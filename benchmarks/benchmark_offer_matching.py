@@ -0,0 +1,117 @@
+"""
+Offer Matching Benchmark
+========================
+
+Compares the previous full-catalog scan of match_offers_for_customer (eligibility,
+scoring, pricing and sales strategy for every product) with the eligibility-index
+path, on the built-in catalog and on synthetic catalogs of growing size.
+
+Usage:
+    python -m benchmarks.benchmark_offer_matching --catalog-sizes 8 200 2000 --customers 2000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from dataclasses import replace
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerSegment
+from src.agents.three_hk_business_rules import EligibilityStatus, OfferMatch, ThreeHKBusinessRulesEngine
+from tests.fixtures_data import make_customers
+
+
+def full_scan_match(engine, features, lead_score, segment, current_products):
+    """Previous implementation: build a complete OfferMatch for every product above the threshold"""
+    matched = []
+    for product in engine.product_catalog:
+        eligibility = engine._evaluate_product_eligibility(product, features, segment, current_products)
+        if eligibility["status"] == EligibilityStatus.NOT_ELIGIBLE:
+            continue
+        match_score = engine._calculate_match_score(product, features, lead_score, segment)
+        if match_score < 30.0:
+            continue
+        pricing = engine._calculate_personalized_pricing(product, features, lead_score, {})
+        strategy = engine._generate_sales_strategy(product, features, lead_score, segment)
+        matched.append(OfferMatch(
+            product=product,
+            offer_type=engine._determine_offer_type(product, features, current_products, lead_score),
+            eligibility_status=eligibility["status"],
+            match_score=match_score,
+            confidence_level=eligibility["confidence"],
+            recommended_price=pricing["final_price"],
+            discount_amount=pricing["discount_amount"],
+            estimated_monthly_value=pricing["value_estimate"],
+            offer_valid_until=engine._calculate_offer_expiry(),
+            conditions=eligibility["conditions"],
+            presentation_priority=engine._calculate_presentation_priority(match_score, lead_score),
+            sales_approach=strategy["approach"],
+            key_selling_points=strategy["selling_points"],
+            potential_objections=strategy["objections"],
+            cross_sell_opportunities=engine._identify_cross_sell_opportunities(product, features),
+            upsell_potential=engine._assess_upsell_potential(product, features),
+            retention_value=engine._calculate_retention_value(product, features),
+        ))
+    matched.sort(key=lambda x: (x.match_score, -x.presentation_priority), reverse=True)
+    return matched[:engine.business_params["maximum_concurrent_offers"]]
+
+
+def grow_catalog(engine: ThreeHKBusinessRulesEngine, size: int, seed: int = 4) -> None:
+    """Extend the built-in catalog with variants that differ in spend and segment rules"""
+    rng = np.random.default_rng(seed)
+    base = list(engine.product_catalog)
+    segments = [segment.value for segment in CustomerSegment]
+    for i in range(size - len(base)):
+        template = base[i % len(base)]
+        required = list(rng.choice(segments, 2, replace=False)) if rng.random() < 0.6 else []
+        engine.product_catalog.append(replace(
+            template,
+            product_id=f"{template.product_id}_V{i}",
+            min_monthly_spend=Decimal(int(rng.choice([100, 200, 300, 400, 500, 600, 800, 1000, 1200, 1500]))),
+            required_segments=required,
+            priority_segments=list(rng.choice(segments, 1)),
+        ))
+    engine.invalidate_eligibility_index()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog-sizes", type=int, nargs="+", default=[8, 200, 2000])
+    parser.add_argument("--customers", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    customers = make_customers(args.customers)
+    print(f"{'products':>8} | {'full scan (ms/cust)':>19} | {'index build (s)':>15} | {'indexed (ms/cust)':>17} | {'speedup':>7}")
+    for size in args.catalog_sizes:
+        engine = ThreeHKBusinessRulesEngine()
+        grow_catalog(engine, size)
+
+        start = time.perf_counter()
+        for features, lead_score, segment, current_products in customers:
+            full_scan_match(engine, features, lead_score, segment, current_products)
+        full_scan = (time.perf_counter() - start) / len(customers) * 1000
+
+        start = time.perf_counter()
+        engine.get_eligibility_index()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for features, lead_score, segment, current_products in customers:
+            engine.match_offers_for_customer(features, lead_score, segment, current_products)
+        indexed = (time.perf_counter() - start) / len(customers) * 1000
+
+        print(f"{len(engine.product_catalog):>8,} | {full_scan:>19.3f} | {build:>15.3f} | {indexed:>17.3f} | "
+              f"{full_scan / indexed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Parallel Batch Scoring Benchmark
+================================
+
+Measures LeadScoringEngine.batch_score_leads and batch_analyze_customers as the
+number of worker processes grows from 1 (the serial in-process loop) to N.
+Timings include spawning the pool and initialising the engine in each worker.
+
+Usage:
+    python -m benchmarks.benchmark_parallel_scoring --customers 20000 --workers 1 2 4 8
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import batch_analyze_customers
+from src.agents.lead_scoring import LeadScoringEngine
+from tests.fixtures_data import make_customer_datasets
+
+
+def default_worker_counts():
+    """1, 2, 4, ... up to the number of cores"""
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_worker_counts())
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    datasets = make_customer_datasets(args.customers)
+    engine = LeadScoringEngine()
+    print(f"{args.customers:,} customers on {os.cpu_count()} cores")
+    print(f"{'workers':>7} | {'scoring (s)':>11} | {'speedup':>7} | {'analysis (s)':>12} | {'speedup':>7}")
+
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        engine.batch_score_leads(datasets, workers=workers, chunk_size=args.chunk_size)
+        scoring = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_analyze_customers(datasets, enable_clustering=False, workers=workers, chunk_size=args.chunk_size)
+        analysis = time.perf_counter() - start
+
+        baseline = baseline or (scoring, analysis)
+        print(f"{workers:>7} | {scoring:>11.3f} | {baseline[0] / scoring:>6.1f}x | "
+              f"{analysis:>12.3f} | {baseline[1] / analysis:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Partitioned Merge Benchmark
+===========================
+
+Compares peak RSS and wall time of reading a customer and a purchase CSV into
+memory and running DataMerger.merge_datasets ("in-memory") with streaming both
+files in chunks through PartitionedMerge ("partitioned"), whose merged chunks
+are consumed and dropped as downstream analysis would. Each run happens in a
+fresh interpreter, so peak RSS is not inherited from earlier runs; the RSS
+after imports is reported as the baseline.
+
+Usage:
+    python -m benchmarks.benchmark_partitioned_merge --rows 100000 300000 --partitions 16
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from benchmarks.benchmark_streaming_ingestion import peak_rss_mib
+
+
+def measure(mode: str, customer_csv: str, purchase_csv: str, storage_path: str, partitions: str) -> None:
+    """Run one merge and print baseline RSS, seconds, peak RSS and merged rows"""
+    import pandas as pd
+    from src.utils.data_merging import DataMerger, MergeStrategy
+    from src.utils.encrypted_storage import EncryptedStorage
+    from src.utils.partitioned_merge import PartitionedMerge
+
+    logging.disable(logging.INFO)
+    storage = EncryptedStorage(storage_path=storage_path, master_password="benchmark")
+    baseline = peak_rss_mib()
+
+    start = time.perf_counter()
+    if mode == "partitioned":
+        merge = PartitionedMerge(
+            storage,
+            pd.read_csv(customer_csv, chunksize=50_000),
+            pd.read_csv(purchase_csv, chunksize=50_000),
+            MergeStrategy.LEFT,
+            num_partitions=int(partitions),
+        )
+        merged_rows = sum(len(chunk) for chunk in merge)
+    else:
+        customer_df, purchase_df = pd.read_csv(customer_csv), pd.read_csv(purchase_csv)
+        result = DataMerger().merge_datasets(
+            {"original_data": customer_df, "display_data": customer_df},
+            {"original_data": purchase_df, "display_data": purchase_df},
+            strategy=MergeStrategy.LEFT,
+        )
+        assert result.success, result.message
+        merged_rows = len(result.merged_data)
+    elapsed = time.perf_counter() - start
+    print(f"{baseline} {elapsed} {peak_rss_mib()} {merged_rows}")
+
+
+def run(mode: str, customer_csv: str, purchase_csv: str, partitions: int):
+    """Measure one mode in a fresh interpreter"""
+    storage_path = tempfile.mkdtemp()
+    try:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.benchmark_partitioned_merge", "--measure",
+             mode, customer_csv, purchase_csv, storage_path, str(partitions)],
+            cwd=project_root, capture_output=True, text=True, check=True,
+        ).stdout.split()
+    finally:
+        shutil.rmtree(storage_path, ignore_errors=True)
+    return tuple(float(value) for value in output[-4:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 300000])
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--measure", nargs=5, metavar=("MODE", "CUSTOMER", "PURCHASE", "STORAGE", "PARTITIONS"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    from tests.fixtures_data import make_merge_frames
+
+    print(f"{'rows':>8} | {'CSV (MiB)':>9} | {'mode':>11} | {'merged':>8} | {'time (s)':>8} | "
+          f"{'baseline RSS (MiB)':>18} | {'peak RSS (MiB)':>14}")
+    for rows in args.rows:
+        customer_df, purchase_df = make_merge_frames(rows)
+        paths = []
+        for df in (customer_df, purchase_df):
+            handle, path = tempfile.mkstemp(suffix=".csv")
+            os.close(handle)
+            df.to_csv(path, index=False)
+            paths.append(path)
+        size = sum(os.path.getsize(path) for path in paths) / 2**20
+        try:
+            for mode in ("in-memory", "partitioned"):
+                baseline, elapsed, peak, merged = run(mode, *paths, args.partitions)
+                print(f"{rows:>8} | {size:>9.1f} | {mode:>11} | {int(merged):>8} | {elapsed:>8.2f} | "
+                      f"{baseline:>18.1f} | {peak:>14.1f}")
+        finally:
+            for path in paths:
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Purchase History Parsing Benchmark
+==================================
+
+Compares parse_purchase_data (vectorized melt and str.extract) with a per-row
+regex parse of the wide "Purchase History N" and "Engagement Data" columns,
+the way agents previously handled them record by record.
+
+Usage:
+    python -m benchmarks.benchmark_purchase_parsing --rows 10000 100000
+"""
+
+import argparse
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.purchase_history_parsing import parse_purchase_data
+from tests.test_purchase_history_parsing import make_purchase_frame
+
+ENTRY = re.compile(r"^\s*(.*?\S)\s*\((\d{4}-\d{2}-\d{2})\)\s*$")
+ITEM = re.compile(r"([^:;]+?)\s*:\s*(-?\d+(?:\.\d+)?)")
+
+
+def per_row_parse(df):
+    """Per-record parse into purchase dicts and engagement dicts"""
+    purchases, engagement = [], []
+    history_columns = [f"Purchase History {slot}" for slot in range(1, 6)]
+    for record in df.to_dict("records"):
+        for slot, column in enumerate(history_columns, 1):
+            value = record[column]
+            match = ENTRY.match(value) if isinstance(value, str) else None
+            if match:
+                purchases.append({"account_id": record["Account ID"], "slot": slot,
+                                  "product": match.group(1), "date": match.group(2)})
+        text = record["Engagement Data"]
+        engagement.append({k.strip(): float(v) for k, v in ITEM.findall(text)} if isinstance(text, str) else {})
+    return purchases, engagement
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'rows':>8} | {'per-row (s)':>11} | {'vectorized (s)':>14} | {'speedup':>7} | {'events':>7}")
+    for rows in args.rows:
+        df = make_purchase_frame(rows)
+        start = time.perf_counter()
+        purchases, _ = per_row_parse(df)
+        per_row = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parsed = parse_purchase_data(df, "Account ID")
+        vectorized = time.perf_counter() - start
+
+        assert len(parsed.purchase_events) == len(purchases)
+        print(f"{rows:>8} | {per_row:>11.3f} | {vectorized:>14.3f} | {per_row / vectorized:>6.1f}x | {len(purchases):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Recommendation Generation Benchmark
+===================================
+
+Compares the previous per-lead RecommendationGenerator pipeline (iterrows, a
+recommendation object built for every lead, Python sort of all of them) with
+generate_recommendations, which converts the frame once, ranks every lead with
+a vectorized key and builds recommendations only for the selected leads.
+With the default stub analyzer, scorer and rules engine of the tests the
+timings measure the generator itself. With --engines the generator runs over
+the real analysis, scoring and offer engines: lead inputs come from one
+feature extraction pass and bulk offer matching, compared with the
+per-customer engine calls, and the end-to-end time is reported.
+
+Usage:
+    python -m benchmarks.benchmark_recommendations --leads 10000 100000 --max-recommendations 50
+    python -m benchmarks.benchmark_recommendations --engines --leads 1000 10000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from tests.fixtures_data import make_customer_records
+from tests.test_recommendation_batch import (
+    comparable,
+    make_engine_generator,
+    make_generator,
+    make_leads,
+    per_lead_engine_inputs,
+    per_lead_recommendations,
+)
+
+
+def benchmark_engines(leads_counts, max_recommendations) -> None:
+    """Time lead inputs and recommendations over the real engines"""
+    generator = make_engine_generator()
+    print(f"{'leads':>8} | {'per-customer (s)':>16} | {'batch inputs (s)':>16} | {'speedup':>7} | {'end-to-end (s)':>14} | identical")
+    for n in leads_counts:
+        leads = make_customer_records(n)
+
+        start = time.perf_counter()
+        expected = per_lead_engine_inputs(generator, leads)
+        per_customer = time.perf_counter() - start
+
+        start = time.perf_counter()
+        inputs = generator._get_all_lead_inputs(leads, leads.to_dict("records"))
+        batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        generator.generate_recommendations(leads, max_recommendations)
+        end_to_end = time.perf_counter() - start
+
+        identical = [
+            (analysis["customer_segment"], scores["overall_score"], [offer["name"] for offer in offers])
+            for analysis, scores, offers in inputs
+        ] == expected
+        print(
+            f"{n:>8,} | {per_customer:>16.3f} | {batch:>16.3f} | {per_customer / batch:>6.1f}x | "
+            f"{end_to_end:>14.3f} | {identical}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leads", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--max-recommendations", type=int, default=50)
+    parser.add_argument("--engines", action="store_true", help="Use the real analysis, scoring and offer engines")
+    args = parser.parse_args()
+    logging.disable(logging.ERROR)
+
+    if args.engines:
+        benchmark_engines(args.leads, args.max_recommendations)
+        return
+
+    generator = make_generator()
+    print(f"{'leads':>8} | {'per-lead (s)':>12} | {'batch (s)':>9} | {'speedup':>7} | identical")
+    for n in args.leads:
+        leads = make_leads(n)
+
+        start = time.perf_counter()
+        expected = per_lead_recommendations(generator, leads, args.max_recommendations)
+        per_lead = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = generator.generate_recommendations(leads, args.max_recommendations)
+        batch = time.perf_counter() - start
+
+        identical = comparable(actual) == comparable(expected)
+        print(f"{n:>8,} | {per_lead:>12.3f} | {batch:>9.3f} | {per_lead / batch:>6.1f}x | {identical}")
+
+
+if __name__ == "__main__":
+    main()
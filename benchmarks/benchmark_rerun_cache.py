@@ -0,0 +1,97 @@
+"""
+Streamlit Rerun Cache Benchmark
+===============================
+
+Measures the work the upload and results pages repeat on every Streamlit rerun
+of a loaded session: validating the uploaded customer CSV, running it through
+the privacy pipeline, loading the product catalog and summarizing the data.
+"uncached" calls the underlying functions as every rerun did before; "cached"
+goes through the session memo and fingerprint-keyed caches after a first run.
+
+Usage:
+    python -m benchmarks.benchmark_rerun_cache --rows 5000 --reruns 5
+"""
+
+import argparse
+import io
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import pandas as pd
+
+from src.components import results
+from src.components.upload import process_data_through_privacy_pipeline, validate_csv_file
+from src.utils import streamlit_cache
+from src.utils.product_catalog_db import catalog_db
+from tests.fixtures_data import FakeUpload
+
+
+def make_upload(rows: int) -> FakeUpload:
+    """Customer CSV of the given size, built by repeating the sample file"""
+    sample = pd.read_csv(project_root / "sample-customer-data-20250715.csv")
+    customers = pd.concat([sample] * (rows // len(sample) + 1), ignore_index=True).head(rows)
+    customers["Account ID"] = [f"ACC{i:07d}" for i in range(rows)]
+    return FakeUpload(customers.to_csv(index=False).encode("utf-8"), "customers.csv")
+
+
+def uncached_rerun(upload: FakeUpload) -> None:
+    """One rerun as before: validate, pipeline, catalog, summaries"""
+    _, _, df = validate_csv_file(upload, auto_correct_encoding=True)
+    process_data_through_privacy_pipeline(df, "customer_data", upload.name)
+    catalog_db.load_catalog()
+    results.analyze_customer_data.__wrapped__(df)
+    results.generate_lead_scores.__wrapped__(df)
+
+
+def cached_rerun(upload: FakeUpload) -> None:
+    """One rerun through the session memo and caches"""
+    key = streamlit_cache.upload_fingerprint(upload, True)
+    (_, _, df), _ = streamlit_cache.session_memo(
+        "customer_upload_validation", key, lambda: validate_csv_file(upload, auto_correct_encoding=True)
+    )
+    streamlit_cache.session_memo(
+        "customer_upload_pipeline", key, lambda: process_data_through_privacy_pipeline(df, "customer_data", upload.name)
+    )
+    streamlit_cache.get_product_catalog()
+    results.analyze_customer_data(df)
+    results.generate_lead_scores(df)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'rows':>6} | {'uncached (ms)':>13} | {'first run (ms)':>14} | {'cached (ms)':>11} | {'speedup':>7}")
+    for rows in args.rows:
+        upload = make_upload(rows)
+        streamlit_cache.clear_session_memo()
+        results.analyze_customer_data.clear()
+        results.generate_lead_scores.clear()
+
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            uncached_rerun(upload)
+        uncached = (time.perf_counter() - start) / args.reruns * 1000
+
+        start = time.perf_counter()
+        cached_rerun(upload)
+        first = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            cached_rerun(upload)
+        cached = (time.perf_counter() - start) / args.reruns * 1000
+        print(f"{rows:>6,} | {uncached:>13.1f} | {first:>14.1f} | {cached:>11.2f} | {uncached / cached:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Results Pagination Benchmark
+============================
+
+Compares the script time and the number of Streamlit elements sent for one
+rerun of the recommendations view, with every recommendation rendered as a
+card ("all cards", the previous view) and with the paginated view, which
+filters and sorts a cached table and renders one page of cards. Each view is
+run through streamlit.testing.v1.AppTest; the first run builds the table, so
+the best of the following reruns is reported.
+
+Usage:
+    python -m benchmarks.benchmark_results_pagination --recommendations 100 1000 10000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+
+def all_cards_view(count: int):
+    """Previous view: filter and sort the list, then render every recommendation"""
+    import streamlit as st
+    from src.components.results import render_recommendation_card
+    from tests.test_result_pagination import list_selection, make_recommendations
+
+    # Results live in the session, as after run_ai_analysis
+    if "benchmark_recommendations" not in st.session_state:
+        st.session_state["benchmark_recommendations"] = make_recommendations(count)
+    recommendations = st.session_state["benchmark_recommendations"]
+    filtered = list_selection(recommendations, "All", "All", "Business Impact")
+    st.write(f"Showing {len(filtered)} of {len(recommendations)} recommendations")
+    for i, rec in enumerate(filtered):
+        render_recommendation_card(rec, i + 1)
+
+
+def paginated_view(count: int):
+    """Current view: render_recommendations_section"""
+    import streamlit as st
+    from src.components.results import render_recommendations_section
+    from tests.test_result_pagination import make_recommendations
+
+    if "benchmark_recommendations" not in st.session_state:
+        st.session_state["benchmark_recommendations"] = make_recommendations(count)
+    recommendations = st.session_state["benchmark_recommendations"]
+    render_recommendations_section({
+        "recommendations": {"recommendations": recommendations},
+        "metadata": {"timestamp": "benchmark"},
+    })
+
+
+def count_elements(node) -> int:
+    """Number of elements below an AppTest node"""
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return sum(count_elements(child) for child in children.values())
+
+
+def measure(view, count: int, repeats: int):
+    """Best rerun time (s) and element count of a view"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(view, args=(count,), default_timeout=600)
+    app.run()
+    assert not app.exception, app.exception
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        app.run()
+        best = min(best, time.perf_counter() - start)
+    return best, count_elements(app._tree)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recommendations", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'recommendations':>15} | {'view':>10} | {'rerun (s)':>9} | {'elements':>8}")
+    for count in args.recommendations:
+        for name, view in (("all cards", all_cards_view), ("paginated", paginated_view)):
+            elapsed, elements = measure(view, count, args.repeats)
+            print(f"{count:>15} | {name:>10} | {elapsed:>9.3f} | {elements:>8}")
+
+
+if __name__ == "__main__":
+    main()
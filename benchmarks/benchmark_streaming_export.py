@@ -0,0 +1,137 @@
+"""
+Streaming Export Benchmark
+==========================
+
+Compares building the complete business package and the email templates
+package the previous way ("in-memory": every CSV built with a DataFrame and
+to_csv, the JSON report with json.dumps, all members written with writestr
+into a BytesIO ZIP whose bytes are returned) with the streaming export engine
+("streaming": rows and template files generated lazily and compressed into a
+spooled temporary file, then read back in 1 MiB blocks as a download would).
+Each run happens in a fresh interpreter; the table reports the RSS after the
+analysis results are built and the peak RSS of the export on top of that.
+
+Usage:
+    python -m benchmarks.benchmark_streaming_export --customers 10000 100000
+"""
+
+import argparse
+import io
+import json
+import logging
+import subprocess
+import sys
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+PACKAGES = ("business", "templates")
+
+
+def in_memory_business_package(results) -> bytes:
+    """Previous export_complete_business_package: whole-document strings into a BytesIO ZIP"""
+    import pandas as pd
+    from src.components import results as export
+
+    deliverables = results["collaboration_results"]["deliverables"]
+    legacy = results["recommendations"]["recommendations"]
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        offers = list(export.crewai_offer_rows(deliverables["personalized_offers"]))
+        zip_file.writestr("1_Customer_Offers.csv", pd.DataFrame(offers).to_csv(index=False))
+        actions = list(export.crewai_recommendation_rows(deliverables["customer_recommendations"]))
+        zip_file.writestr("2_Action_Recommendations.csv", pd.DataFrame(actions).to_csv(index=False))
+        zip_file.writestr("3_Campaign_Summary.csv", export.export_campaign_summary_csv(results))
+        rows = list(export.recommendation_export_rows(legacy))
+        zip_file.writestr("4_Legacy_Recommendations.csv", pd.DataFrame(rows).to_csv(index=False))
+        zip_file.writestr("5_Detailed_Analysis_Report.json", json.dumps(results, indent=2, default=str))
+        entries = export.business_package_entries(results)
+        for name, chunks in entries:
+            if name.startswith("Email_Templates/") or name == "EXECUTIVE_SUMMARY.txt":
+                zip_file.writestr(name, "".join(chunks))
+    return zip_buffer.getvalue()
+
+
+def in_memory_templates_package(results) -> bytes:
+    """Previous export_email_templates_package: README string grown per template, BytesIO ZIP"""
+    from src.components import results as export
+
+    templates = results["collaboration_results"]["deliverables"]["email_templates"]
+    generated = datetime.now()
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        readme_content = f"Three HK Email Marketing Templates\nTemplates: {len(templates)}\n\nFiles included:\n"
+        for i, template in enumerate(templates):
+            for file_name, content in export.email_template_files(template, i, generated):
+                zip_file.writestr(file_name, content)
+                readme_content += f"- {file_name}\n"
+        zip_file.writestr("README.txt", readme_content)
+    return zip_buffer.getvalue()
+
+
+def measure(package: str, mode: str, customers: int) -> None:
+    """Run one export and print results RSS, seconds, peak RSS and archive MiB"""
+    from benchmarks.benchmark_streaming_ingestion import peak_rss_mib
+    from src.components import results as export
+    from tests.test_streaming_export import make_deliverables
+
+    logging.disable(logging.INFO)
+    results = make_deliverables(customers)
+    baseline = peak_rss_mib()
+
+    start = time.perf_counter()
+    if mode == "streaming":
+        opener = export.open_complete_business_package if package == "business" else export.open_email_templates_package
+        with opener(results) as handle:
+            size = 0
+            while block := handle.read(2**20):
+                size += len(block)
+    else:
+        builder = in_memory_business_package if package == "business" else in_memory_templates_package
+        size = len(builder(results))
+    elapsed = time.perf_counter() - start
+    print(f"{baseline} {elapsed} {peak_rss_mib()} {size / 2**20}")
+
+
+def run(package: str, mode: str, customers: int):
+    """Measure one export in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.benchmark_streaming_export", "--measure", package, mode, str(customers)],
+        cwd=project_root, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return tuple(float(value) for value in output[-4:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--packages", nargs="+", choices=PACKAGES, default=list(PACKAGES))
+    parser.add_argument("--measure", nargs=3, metavar=("PACKAGE", "MODE", "CUSTOMERS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        package, mode, customers = args.measure
+        measure(package, mode, int(customers))
+        return
+
+    print(
+        f"{'customers':>9} | {'package':>9} | {'mode':>9} | {'time (s)':>8} | {'ZIP (MiB)':>9} | "
+        f"{'results RSS (MiB)':>17} | {'export peak (MiB)':>17}"
+    )
+    for customers in args.customers:
+        for package in args.packages:
+            for mode in ("in-memory", "streaming"):
+                baseline, elapsed, peak, size = run(package, mode, customers)
+                print(
+                    f"{customers:>9} | {package:>9} | {mode:>9} | {elapsed:>8.2f} | {size:>9.1f} | "
+                    f"{baseline:>17.1f} | {peak - baseline:>17.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Streaming Ingestion Benchmark
+=============================
+
+Compares peak RSS and wall time of loading a customer CSV into one DataFrame
+and running PrivacyPipeline.process_upload ("in-memory") with streaming the
+same file through process_upload_stream ("streaming"). Each run happens in a
+fresh interpreter, so peak RSS is not inherited from earlier runs; the RSS
+after imports is reported as the baseline.
+
+Usage:
+    python -m benchmarks.benchmark_streaming_ingestion --rows 10000 50000 200000 --in-memory-max 50000
+"""
+
+import argparse
+import logging
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process in MiB"""
+    # ru_maxrss survives exec and would include the parent's peak; VmHWM starts afresh
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(mode: str, csv_path: str, storage_path: str) -> None:
+    """Run one ingestion and print baseline RSS, seconds and peak RSS"""
+    import pandas as pd
+    from src.utils.privacy_pipeline import PrivacyPipeline
+
+    logging.disable(logging.INFO)
+    pipeline = PrivacyPipeline(storage_path=storage_path, master_password="benchmark")
+    baseline = peak_rss_mib()
+
+    start = time.perf_counter()
+    if mode == "streaming":
+        result = pipeline.process_upload_stream(csv_path, "benchmark")
+    else:
+        result = pipeline.process_upload(pd.read_csv(csv_path), "benchmark")
+    elapsed = time.perf_counter() - start
+    assert result.success, result.message
+    print(f"{baseline} {elapsed} {peak_rss_mib()}")
+
+
+def run(mode: str, csv_path: str):
+    """Measure one mode in a fresh interpreter"""
+    storage_path = tempfile.mkdtemp()
+    try:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.benchmark_streaming_ingestion", "--measure", mode, csv_path, storage_path],
+            cwd=project_root, capture_output=True, text=True, check=True,
+        ).stdout.split()
+    finally:
+        shutil.rmtree(storage_path, ignore_errors=True)
+    return tuple(float(value) for value in output[-3:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--in-memory-max", type=int, default=50000)
+    parser.add_argument("--measure", nargs=3, metavar=("MODE", "CSV", "STORAGE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    from tests.test_streaming_ingestion import make_customer_csv
+
+    print(f"{'rows':>8} | {'CSV (MiB)':>9} | {'mode':>9} | {'time (s)':>8} | {'baseline RSS (MiB)':>18} | {'peak RSS (MiB)':>14}")
+    for rows in args.rows:
+        handle, csv_path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w") as f:
+            f.write(make_customer_csv(rows))
+        size = os.path.getsize(csv_path) / 2**20
+        try:
+            modes = ["in-memory", "streaming"] if rows <= args.in_memory_max else ["streaming"]
+            for mode in modes:
+                baseline, elapsed, peak = run(mode, csv_path)
+                print(f"{rows:>8} | {size:>9.1f} | {mode:>9} | {elapsed:>8.2f} | {baseline:>18.1f} | {peak:>14.1f}")
+        finally:
+            os.remove(csv_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Upload Encoding Benchmark
+=========================
+
+Measures validate_csv_file on large synthetic customer CSVs in UTF-8 and GBK.
+"full chardet" reproduces the previous path: chardet over the whole file, a
+decode/encode/decode round trip and parsing from the decoded text. "sniffed" is
+the current path: BOM check, strict UTF-8 validation, sampled chardet and parsing
+from the uploaded bytes. Reports best-of-N wall time and tracemalloc peak memory.
+
+Usage:
+    python -m benchmarks.benchmark_upload_encoding --sizes-mb 1 5 10
+"""
+
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+
+import chardet
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.components.upload import validate_csv_file
+from tests.fixtures_data import FakeUpload
+from tests.test_upload_encoding import make_csv
+
+
+def full_chardet_validate(uploaded_file) -> pd.DataFrame:
+    """The previous upload path: full-file chardet, round-trip conversion, parse from text"""
+    file_content = uploaded_file.read()
+    detected_encoding = chardet.detect(file_content)["encoding"]
+    utf8_content = file_content.decode(detected_encoding).encode("utf-8").decode("utf-8")
+    return pd.read_csv(StringIO(utf8_content))
+
+
+def sniffed_validate(uploaded_file) -> pd.DataFrame:
+    """The current upload path"""
+    is_valid, message, df = validate_csv_file(uploaded_file)
+    assert is_valid, message
+    return df
+
+
+def measure(validate, content: bytes, repeats: int):
+    """Best-of-repeats seconds and peak MiB of one validation, plus the parsed frame"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = validate(FakeUpload(content, "customers.csv"))
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced on a separate run, so tracing overhead does not skew timings
+    tracemalloc.start()
+    validate(FakeUpload(content, "customers.csv"))
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return min(timings), peak, df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(
+        f"{'file':>14} | {'full chardet (s)':>16} | {'sniffed (s)':>11} | {'speedup':>7} | "
+        f"{'full peak (MiB)':>15} | {'sniffed peak (MiB)':>18}"
+    )
+    for size_mb in args.sizes_mb:
+        rows = int(size_mb * 2**20 / 36)
+        text = make_csv(rows)
+        for encoding in ("utf-8", "gbk"):
+            content = text.encode(encoding)
+            full_time, full_peak, expected = measure(full_chardet_validate, content, args.repeats)
+            sniff_time, sniff_peak, df = measure(sniffed_validate, content, args.repeats)
+            pd.testing.assert_frame_equal(df, expected)
+            label = f"{len(content) / 2**20:.1f} MiB {encoding}"
+            print(
+                f"{label:>14} | {full_time:>16.2f} | {sniff_time:>11.2f} | {full_time / sniff_time:>6.1f}x | "
+                f"{full_peak:>15.1f} | {sniff_peak:>18.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
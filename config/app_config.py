@@ -23,6 +23,7 @@ class Config:
     FALLBACK_MODEL: str = os.getenv("FALLBACK_MODEL", "mistralai/mistral-small-3.2-24b-instruct:free")  # Mistral FREE model for fallback
     MAX_TOKENS: int = int(os.getenv("MAX_TOKENS", "4000"))
     TEMPERATURE: float = float(os.getenv("TEMPERATURE", "0.7"))
+    PROMPT_TOKEN_CEILING: int = int(os.getenv("PROMPT_TOKEN_CEILING", "3000"))  # Max tokens of customer data per agent prompt
     
     # Application Settings
     APP_NAME: str = os.getenv("APP_NAME", "Agentic AI Revenue Assistant")
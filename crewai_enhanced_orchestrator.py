@@ -38,6 +38,8 @@ from src.utils.privacy_pipeline import PrivacyPipeline
 from src.utils.logger import setup_logging
 from src.utils.smart_litellm_client import get_smart_litellm_client
 from src.utils.free_models_manager import get_free_models_manager
+from src.utils.customer_data_digest import CustomerDataDigester, CustomerDataDigest, truncate_to_tokens
+from src.utils.collaboration_cache import current_model_config, run_stage
 
 # Configure logging
 setup_logging()
@@ -75,6 +77,14 @@ class CrewAIEnhancedOrchestrator:
         self.privacy_pipeline = PrivacyPipeline()
         self.state = CrewAIEnhancedState()
         
+        # Token-budgeted customer data digests keep every task prompt under the ceiling
+        self.data_digester = CustomerDataDigester()
+        self._prompt_digests: Dict[str, CustomerDataDigest] = {}
+        self._prompt_digests_source = None
+        
+        # Optional CollaborationResultCache; crew phases with unchanged inputs are served from it
+        self.result_cache = None
+        
         # Initialize enhanced LLMs for different agent roles
         self._setup_enhanced_llms()
         
@@ -181,6 +191,8 @@ class CrewAIEnhancedOrchestrator:
         logger.info("Executing simplified 2-agent analysis due to context length constraints")
         
         try:
+            digest = self._get_prompt_digests(customer_data)["simplified_analysis"]
+            
             # Simple task for lead intelligence agent only
             simple_task = Task(
                 description=f"""
@@ -189,7 +201,8 @@ class CrewAIEnhancedOrchestrator:
                 2. Revenue optimization opportunities
                 3. Actionable recommendations
                 
-                Customer Data Summary: {str(customer_data)[:500]}...
+                Customer Data Summary ({digest.total_customers} customers):
+                {digest.text}
                 
                 Keep analysis concise and focused on immediate business value.
                 """,
@@ -267,6 +280,15 @@ class CrewAIEnhancedOrchestrator:
                 "fallback_result": "Context length management engaged - analysis simplified"
             }
     
+    def _get_prompt_digests(self, customer_data: Any) -> Dict[str, CustomerDataDigest]:
+        """Build (or reuse) the per-agent customer data digests for the current run"""
+        if self._prompt_digests_source is not customer_data or not self._prompt_digests:
+            self._prompt_digests = self.data_digester.build_agent_digests(customer_data)
+            self._prompt_digests_source = customer_data
+            token_summary = ", ".join(f"{role}={d.token_count}" for role, d in self._prompt_digests.items())
+            logger.info(f"Built customer data digests (tokens: {token_summary})")
+        return self._prompt_digests
+    
     def _verify_free_model_configuration(self):
         """Verify that all configuration points to free models"""
         api_base = os.environ.get("OPENAI_API_BASE")
@@ -375,15 +397,20 @@ class CrewAIEnhancedOrchestrator:
     def create_hierarchical_analysis_crew(self, customer_data: Dict[str, Any]) -> Crew:
         """Create a hierarchical crew for comprehensive customer analysis"""
         
+        digests = self._get_prompt_digests(customer_data)
+        data_info = customer_data if isinstance(customer_data, dict) else {}
+        
         # Task 1: Deep Customer Intelligence Analysis
         intelligence_task = Task(
             description=f"""
             Conduct comprehensive customer intelligence analysis on Hong Kong telecom data.
             
             **Data Summary:**
-            - Total customers: {customer_data.get('total_customers', 'unknown')}
-            - Data fields: {customer_data.get('fields', [])}
-            - Analysis timestamp: {customer_data.get('timestamp', 'unknown')}
+            - Total customers: {digests['customer_intelligence'].total_customers or data_info.get('total_customers', 'unknown')}
+            - Analysis timestamp: {data_info.get('timestamp', 'unknown')}
+            
+            **Customer Data Digest:**
+            {digests['customer_intelligence'].text}
             
             **Your Analysis Must Include:**
             1. **Behavioral Segmentation**: Identify 6-8 distinct customer segments based on usage patterns, value, and churn risk
@@ -415,9 +442,12 @@ class CrewAIEnhancedOrchestrator:
         
         # Task 2: Market Intelligence & Competitive Context
         market_task = Task(
-            description="""
+            description=f"""
             Provide market intelligence and competitive context to inform revenue strategies.
             
+            **Customer Base Overview:**
+            {digests['market_intelligence'].text}
+            
             **Research Focus:**
             1. **Competitive Landscape**: Current pricing strategies, promotional offers, market positioning of China Mobile, SmarTone, CSL
             2. **Market Trends**: 5G adoption rates, data consumption patterns, emerging services in Hong Kong
@@ -448,9 +478,12 @@ class CrewAIEnhancedOrchestrator:
         
         # Task 3: Revenue Optimization Strategy Development
         revenue_task = Task(
-            description="""
+            description=f"""
             Develop sophisticated revenue optimization strategies based on customer intelligence and market context.
             
+            **Customer Value Digest:**
+            {digests['revenue_optimization'].text}
+            
             **Strategy Development Framework:**
             1. **Segment-Specific Optimization**: Create targeted strategies for each identified customer segment
             2. **Pricing Strategy**: Develop dynamic pricing recommendations considering competitive landscape
@@ -483,9 +516,12 @@ class CrewAIEnhancedOrchestrator:
         
         # Task 4: Retention Strategy & Lifecycle Optimization
         retention_task = Task(
-            description="""
+            description=f"""
             Design proactive retention strategies and customer lifecycle optimization programs.
             
+            **Churn Risk Digest:**
+            {digests['retention_strategy'].text}
+            
             **Retention Strategy Components:**
             1. **Predictive Interventions**: Design early warning systems and proactive outreach programs
             2. **Loyalty Optimization**: Enhance existing loyalty programs with personalized benefits
@@ -518,9 +554,12 @@ class CrewAIEnhancedOrchestrator:
         
         # Task 5: Campaign Execution & Performance Optimization
         execution_task = Task(
-            description="""
+            description=f"""
             Design comprehensive campaign execution plans that deliver the revenue optimization and retention strategies.
             
+            **Audience Digest:**
+            {digests['campaign_execution'].text}
+            
             **Campaign Framework:**
             1. **Multi-Channel Orchestration**: Coordinate email, SMS, app notifications, customer service, and retail channels
             2. **Timing Optimization**: Determine optimal campaign timing based on customer behavior patterns and market dynamics
@@ -580,6 +619,9 @@ class CrewAIEnhancedOrchestrator:
     def create_consensus_validation_crew(self, analysis_results: Dict[str, Any]) -> Crew:
         """Create a consensus crew for validating and refining recommendations"""
         
+        consensus_budget = self.data_digester.budget_for("consensus_validation")
+        customer_overview = self._prompt_digests.get("consensus_validation")
+        
         # Consensus validation task
         validation_task = Task(
             description=f"""
@@ -592,8 +634,11 @@ class CrewAIEnhancedOrchestrator:
             4. **Market Viability**: Confirm strategies are viable in Hong Kong market context
             5. **Resource Requirements**: Validate implementation feasibility with available resources
             
+            **Customer Base Overview:**
+            {customer_overview.text if customer_overview else 'Not available'}
+            
             **Analysis Results to Validate:**
-            {str(analysis_results)[:1000]}...
+            {truncate_to_tokens(str(analysis_results), consensus_budget)}
             
             **Consensus Requirements:**
             - Agreement on revenue uplift projections (minimum 80% confidence)
@@ -642,13 +687,19 @@ class CrewAIEnhancedOrchestrator:
         self._current_customer_data = customer_data
         
         try:
+            model_config = current_model_config()
+            
             # Phase 1: Hierarchical Analysis
             logger.info("Phase 1: Executing hierarchical analysis crew...")
-            analysis_crew = self.create_hierarchical_analysis_crew(customer_data)
             
             # Execute the hierarchical analysis with context length protection
             try:
-                analysis_results = analysis_crew.kickoff()
+                analysis_results = run_stage(
+                    self.result_cache,
+                    "crewai_analysis",
+                    {"customer_data": customer_data, "model_config": model_config},
+                    lambda: str(self.create_hierarchical_analysis_crew(customer_data).kickoff())
+                )
             except Exception as e:
                 if "context length" in str(e).lower() or "96000 tokens" in str(e) or "maximum context" in str(e).lower():
                     logger.warning("Context length exceeded during hierarchical analysis, falling back to simplified mode")
@@ -659,11 +710,17 @@ class CrewAIEnhancedOrchestrator:
             
             # Phase 2: Consensus Validation  
             logger.info("Phase 2: Executing consensus validation crew...")
-            consensus_crew = self.create_consensus_validation_crew(analysis_results)
+            # The consensus prompt includes the customer overview digest, also when phase 1 came from cache
+            self._get_prompt_digests(customer_data)
             
             # Execute consensus validation with context length protection
             try:
-                consensus_results = consensus_crew.kickoff()
+                consensus_results = run_stage(
+                    self.result_cache,
+                    "crewai_consensus",
+                    {"crewai_analysis": analysis_results, "customer_data": customer_data, "model_config": model_config},
+                    lambda: str(self.create_consensus_validation_crew(analysis_results).kickoff())
+                )
             except Exception as e:
                 if "context length" in str(e).lower() or "96000 tokens" in str(e) or "maximum context" in str(e).lower():
                     logger.warning("Context length exceeded during consensus validation, using analysis results directly")
@@ -27,6 +27,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 # Import both systems
 from crewai_enhanced_orchestrator import create_crewai_enhanced_orchestrator
 from src.agents.agent_integration_orchestrator import create_integration_service
+from src.utils.collaboration_cache import get_collaboration_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -43,11 +44,17 @@ class CrewAIIntegrationBridge:
     - Hybrid approach combining both systems
     """
     
-    def __init__(self):
-        """Initialize the integration bridge"""
+    def __init__(self, cache_scope: Optional[str] = None):
+        """
+        Initialize the integration bridge
+        
+        Args:
+            cache_scope: Owner of the memoized agent stages (e.g. the Streamlit session)
+        """
         self.standard_service = None
         self.crewai_orchestrator = None
         self.initialized = False
+        self.result_cache = get_collaboration_cache(cache_scope)
         
         logger.info("CrewAI Integration Bridge initialized")
     
@@ -56,7 +63,7 @@ class CrewAIIntegrationBridge:
         try:
             # Initialize standard integration service  
             try:
-                self.standard_service = create_integration_service()
+                self.standard_service = create_integration_service(self.result_cache)
                 logger.info("✅ Standard integration service initialized")
             except Exception as e:
                 logger.warning(f"⚠️ Standard service initialization warning: {e}")
@@ -65,6 +72,7 @@ class CrewAIIntegrationBridge:
             # Initialize CrewAI orchestrator (should work with OpenRouter)
             try:
                 self.crewai_orchestrator = create_crewai_enhanced_orchestrator()
+                self.crewai_orchestrator.result_cache = self.result_cache
                 logger.info("✅ CrewAI enhanced orchestrator initialized")
             except Exception as e:
                 logger.warning(f"⚠️ CrewAI orchestrator initialization warning: {e}")
@@ -423,7 +431,8 @@ class CrewAIIntegrationBridge:
 # Integration function for the dashboard
 def process_agent_collaboration_with_crewai(lead_results: Dict[str, Any], 
                                           mode: str = "crewai_enhanced",
-                                          customer_data: Dict[str, Any] = None) -> Dict[str, Any]:
+                                          customer_data: Dict[str, Any] = None,
+                                          cache_scope: Optional[str] = None) -> Dict[str, Any]:
     """
     Main integration function for the Lead Intelligence Dashboard.
     
@@ -434,13 +443,14 @@ def process_agent_collaboration_with_crewai(lead_results: Dict[str, Any],
         lead_results: Results from Lead Intelligence analysis
         mode: "standard", "crewai_enhanced", or "hybrid"
         customer_data: Raw customer data for CrewAI processing
+        cache_scope: Owner of the memoized agent stages (e.g. the Streamlit session)
     
     Returns:
         Enhanced collaboration results
     """
     
     async def run_collaboration():
-        bridge = CrewAIIntegrationBridge()
+        bridge = CrewAIIntegrationBridge(cache_scope)
         return await bridge.process_enhanced_collaboration(lead_results, mode, customer_data)
     
     # Run the async collaboration
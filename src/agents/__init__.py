@@ -47,7 +47,10 @@ from .customer_analysis import (
     CustomerDataAnalyzer,
     # Data structures
     FeatureSet,
+    FeatureMatrix,
     PatternAnalysis,
+    CustomerAnalysisContext,
+    ClusteringModel,
     # Enums
     CustomerSegment,
     # Convenience functions
@@ -105,7 +108,10 @@ __all__ = [
     # Customer analysis components
     "CustomerDataAnalyzer",
     "FeatureSet",
+    "FeatureMatrix",
     "PatternAnalysis",
+    "CustomerAnalysisContext",
+    "ClusteringModel",
     "CustomerSegment",
     "analyze_single_customer",
     "batch_analyze_customers",
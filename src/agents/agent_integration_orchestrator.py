@@ -40,10 +40,17 @@ class AgentIntegrationService:
     Service that orchestrates automatic agent collaboration and handoffs.
     """
     
-    def __init__(self):
-        """Initialize the integration service."""
+    def __init__(self, result_cache=None):
+        """
+        Initialize the integration service.
+        
+        Args:
+            result_cache: Optional CollaborationResultCache; agent stages whose
+                inputs are unchanged are then served from it
+        """
         self.service_name = "Agent Integration Service"
         self.sales_agent = create_sales_optimization_agent()
+        self.result_cache = result_cache
         
     def process_lead_intelligence_completion(self, lead_results: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -83,7 +90,11 @@ class AgentIntegrationService:
             
             # Step 2: Process through Sales Optimization Agent
             logger.info("🎯 Triggering Sales Optimization Agent...")
-            sales_results = self.sales_agent.process_lead_intelligence_results(lead_results)
+            sales_results = self._run_stage(
+                "sales_optimization",
+                {"lead_results": lead_results},
+                lambda: self.sales_agent.process_lead_intelligence_results(lead_results)
+            )
             
             integration_results["workflow_steps"].append({
                 "step": 2,
@@ -96,7 +107,13 @@ class AgentIntegrationService:
             integration_results["collaboration_results"]["sales_optimization"] = sales_results
             
             # Step 3: Create Agent Protocol tasks for further processing
-            protocol_tasks = self._create_agent_protocol_tasks(lead_results, sales_results)
+            protocol_tasks = self._run_stage(
+                "agent_protocol_tasks",
+                {"lead_results": lead_results, "sales_optimization": sales_results},
+                lambda: self._create_agent_protocol_tasks(lead_results, sales_results),
+                # Retry handoffs on the next run if the Agent Protocol server was unreachable
+                cacheable=bool
+            )
             integration_results["workflow_steps"].append({
                 "step": 3,
                 "action": "Create Agent Protocol Tasks",
@@ -138,6 +155,13 @@ class AgentIntegrationService:
                 "timestamp": datetime.now().isoformat()
             }
     
+    def _run_stage(self, stage: str, inputs: Dict[str, Any], compute, cacheable=lambda result: True) -> Any:
+        """Run an agent stage, reusing its memoized output when a result cache is attached."""
+        if self.result_cache is None:
+            return compute()
+        result, _ = self.result_cache.get_or_compute(stage, inputs, compute, cacheable)
+        return result
+    
     def _validate_lead_results(self, lead_results: Dict[str, Any]) -> Dict[str, Any]:
         """Validate Lead Intelligence Agent results."""
         validation = {
@@ -347,9 +371,9 @@ class AgentIntegrationService:
             }
 
 
-def create_integration_service() -> AgentIntegrationService:
+def create_integration_service(result_cache=None) -> AgentIntegrationService:
     """Factory function to create Agent Integration Service."""
-    return AgentIntegrationService()
+    return AgentIntegrationService(result_cache)
 
 
 # Example usage and testing
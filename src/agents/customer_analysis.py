@@ -19,11 +19,12 @@ Key Features:
 import os
 import json
 import time
+import hashlib
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional, Tuple, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass, asdict, field, fields
 from datetime import datetime, timedelta
 from enum import Enum
 import math
@@ -32,16 +33,24 @@ import warnings
 
 # Statistical and ML imports
 try:
+    import joblib
     from sklearn.preprocessing import StandardScaler, MinMaxScaler
-    from sklearn.cluster import KMeans
+    from sklearn.cluster import KMeans, MiniBatchKMeans
     from sklearn.decomposition import PCA
-    from sklearn.metrics import silhouette_score
+    from sklearn.metrics import pairwise_distances, silhouette_score
+    from scipy.optimize import linear_sum_assignment
 
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
     warnings.warn("scikit-learn not available. Some advanced analysis features will be limited.")
 
+# Process pool helpers for parallel batch analysis
+try:
+    from ..utils.parallel_batch import iter_chunked_results, resolve_workers
+except ImportError:
+    from utils.parallel_batch import iter_chunked_results, resolve_workers
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -128,6 +137,93 @@ class FeatureSet:
         return numerical
 
 
+# Numerical FeatureSet fields in declaration order (same order as get_numerical_features)
+NUMERICAL_FEATURE_FIELDS = tuple(f.name for f in fields(FeatureSet) if f.type in (int, float))
+
+# Clustering: candidate cluster counts, and the scalable mode used for large customer bases
+MAX_CLUSTERS = 8
+SCALABLE_CLUSTERING_MIN_CUSTOMERS = 50_000
+CLUSTERING_CHUNK_SIZE = 10_000
+CLUSTERING_EPOCHS = 3
+SILHOUETTE_SAMPLE_SIZE = 3_000  # Pairwise distances of the sample are computed once and shared by every candidate
+
+# Incremental assignment: training rows kept for refits, and the drift that triggers one
+CLUSTERING_RESERVOIR_SIZE = 20_000
+DRIFT_MEAN_SHIFT_THRESHOLD = 0.25  # Largest per-feature mean shift, in training standard deviations
+DRIFT_PSI_THRESHOLD = 0.2  # Population stability index of the cluster proportions
+
+# Engagement fields read from a customer frame by extract_feature_matrix
+ENGAGEMENT_FIELDS = (
+    "app_usage_hours",
+    "service_interactions",
+    "complaint_count",
+    "satisfaction_score",
+    "promotion_responses",
+    "promotion_offers",
+)
+
+
+@dataclass
+class FeatureMatrix:
+    """Columnar container of extracted features: one typed array per FeatureSet field."""
+
+    customer_ids: np.ndarray
+    columns: Dict[str, np.ndarray]
+
+    @classmethod
+    def from_feature_sets(cls, customer_ids: List[str], feature_sets: List[FeatureSet]) -> "FeatureMatrix":
+        """Stack per-customer FeatureSets into columns."""
+        columns = {
+            f.name: np.array(
+                [getattr(features, f.name) for features in feature_sets], dtype=object if f.type is str else f.type
+            )
+            for f in fields(FeatureSet)
+        }
+        return cls(customer_ids=np.array(customer_ids, dtype=object), columns=columns)
+
+    def __len__(self) -> int:
+        return len(self.customer_ids)
+
+    def __getitem__(self, field_name: str) -> np.ndarray:
+        return self.columns[field_name]
+
+    def slice(self, rows: slice) -> "FeatureMatrix":
+        """Feature matrix view of a contiguous range of customers."""
+        return FeatureMatrix(
+            customer_ids=self.customer_ids[rows], columns={name: column[rows] for name, column in self.columns.items()}
+        )
+
+    def feature_set(self, index: int) -> FeatureSet:
+        """Materialize the FeatureSet view of one customer."""
+        return FeatureSet(**{f.name: f.type(self.columns[f.name][index]) for f in fields(FeatureSet)})
+
+    def iter_feature_sets(self) -> Iterator[FeatureSet]:
+        """Yield FeatureSet views for every customer."""
+        for index in range(len(self)):
+            yield self.feature_set(index)
+
+    def numerical_matrix(self) -> np.ndarray:
+        """Numerical features as a (customers x features) float matrix for ML algorithms."""
+        if len(self) == 0:
+            return np.empty((0, len(NUMERICAL_FEATURE_FIELDS)))
+        return np.column_stack([self.columns[name].astype(float) for name in NUMERICAL_FEATURE_FIELDS])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convert to a DataFrame indexed by customer id."""
+        return pd.DataFrame(self.columns, index=pd.Index(self.customer_ids, name="customer_id"))
+
+
+def _compensated_sum(*terms: np.ndarray) -> np.ndarray:
+    """Element-wise Neumaier sum, matching Python's built-in sum() of floats."""
+    total = np.zeros_like(terms[0], dtype=float)
+    compensation = np.zeros_like(total)
+    for term in terms:
+        partial = total + term
+        compensation += np.where(np.abs(total) >= np.abs(term), (total - partial) + term, (term - partial) + total)
+        total = partial
+    return total + compensation
+
+
 @dataclass
 class PatternAnalysis:
     """Container for identified behavioral patterns."""
@@ -151,6 +247,118 @@ class PatternAnalysis:
         return asdict(self)
 
 
+@dataclass
+class CustomerAnalysisContext:
+    """Per-customer analysis results shared by scoring, offer matching and recommendations."""
+
+    customer_id: str
+    features: FeatureSet
+    patterns: List[PatternAnalysis]
+    segment: CustomerSegment
+    segment_confidence: float
+
+
+@dataclass
+class ClusteringModel:
+    """
+    Persisted clustering artefact: fitted scaler and model, stable cluster ids and descriptions,
+    and the training reference used to assign new customers without refitting.
+    """
+
+    scaler: Any
+    model: Any
+    feature_names: Tuple[str, ...]
+    model_selection: Dict[int, Dict[str, float]]
+    fitted_at: str
+    cluster_ids: Optional[np.ndarray] = None  # Stable cluster id of each model label
+    cluster_descriptions: Dict[int, Dict[str, str]] = field(default_factory=dict)
+    cluster_proportions: Optional[np.ndarray] = None  # Training share of each model label
+    training_fingerprint: str = ""
+    training_size: int = 0
+    reservoir: Optional[np.ndarray] = None  # Uniform sample of every row seen, in raw feature units
+    rows_seen: int = 0
+
+    @property
+    def n_clusters(self) -> int:
+        return int(self.model.n_clusters)
+
+    @property
+    def centroids(self) -> Dict[int, List[float]]:
+        """Cluster centres in raw feature units, by stable cluster id."""
+        centres = self.scaler.inverse_transform(self.model.cluster_centers_)
+        return {int(cluster_id): centre.tolist() for cluster_id, centre in zip(self.stable_ids(), centres)}
+
+    def stable_ids(self) -> np.ndarray:
+        return self.cluster_ids if self.cluster_ids is not None else np.arange(self.n_clusters)
+
+    def predict_labels(self, feature_matrix: np.ndarray, chunk_size: int = CLUSTERING_CHUNK_SIZE) -> np.ndarray:
+        """Model labels for a (customers x numerical features) matrix, scaled and assigned chunk by chunk."""
+        labels = np.empty(len(feature_matrix), dtype=np.intp)
+        for start in range(0, len(feature_matrix), chunk_size):
+            chunk = feature_matrix[start : start + chunk_size]
+            labels[start : start + len(chunk)] = self.model.predict(self.scaler.transform(chunk))
+        return labels
+
+    def predict(self, feature_matrix: np.ndarray, chunk_size: int = CLUSTERING_CHUNK_SIZE) -> np.ndarray:
+        """Stable cluster ids for a (customers x numerical features) matrix."""
+        return self.stable_ids()[self.predict_labels(feature_matrix, chunk_size)]
+
+    def measure_drift(self, feature_matrix: np.ndarray, labels: np.ndarray) -> Dict[str, Any]:
+        """
+        Compare new customers with the training data.
+
+        Returns:
+            Largest per-feature mean shift in training standard deviations, population stability
+            index of the cluster proportions, and whether either exceeds its threshold
+        """
+        mean_shift = float(np.abs(self.scaler.transform(feature_matrix).mean(axis=0)).max())
+        psi = 0.0
+        if self.cluster_proportions is not None:
+            observed = np.clip(np.bincount(labels, minlength=self.n_clusters) / len(labels), 1e-4, None)
+            expected = np.clip(self.cluster_proportions, 1e-4, None)
+            psi = float(np.sum((observed - expected) * np.log(observed / expected)))
+        return {
+            "mean_shift": mean_shift,
+            "cluster_psi": psi,
+            "drifted": mean_shift > DRIFT_MEAN_SHIFT_THRESHOLD or psi > DRIFT_PSI_THRESHOLD,
+        }
+
+    def update_reservoir(self, feature_matrix: np.ndarray) -> None:
+        """Add rows to the uniform training sample (reservoir sampling), in O(rows)."""
+        rng = np.random.default_rng(self.rows_seen)
+        reservoir = self.reservoir if self.reservoir is not None else np.empty((0, feature_matrix.shape[1]))
+        free = max(0, CLUSTERING_RESERVOIR_SIZE - len(reservoir))
+        if free:
+            reservoir = np.vstack([reservoir, feature_matrix[:free]])
+        rest = feature_matrix[free:]
+        if len(rest):
+            seen = self.rows_seen + free + np.arange(1, len(rest) + 1)
+            slots = rng.integers(0, seen)
+            keep = slots < CLUSTERING_RESERVOIR_SIZE
+            reservoir[slots[keep]] = rest[keep]
+        self.reservoir = reservoir
+        self.rows_seen += len(feature_matrix)
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Persist the artefact."""
+        joblib.dump(vars(self), path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "ClusteringModel":
+        """Load a persisted artefact, rejecting ones fitted on a different feature layout."""
+        clustering = cls(**joblib.load(path))
+        if tuple(clustering.feature_names) != NUMERICAL_FEATURE_FIELDS:
+            raise ValueError(f"Clustering model at {path} was fitted on a different feature layout")
+        return clustering
+
+
+def _fingerprint_features(feature_matrix: np.ndarray) -> str:
+    """Content hash of a numerical feature matrix and its layout."""
+    digest = hashlib.sha256(",".join(NUMERICAL_FEATURE_FIELDS).encode())
+    digest.update(np.ascontiguousarray(feature_matrix, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
 class CustomerDataAnalyzer:
     """
     Core customer data analysis engine implementing sophisticated algorithms
@@ -185,6 +393,10 @@ class CustomerDataAnalyzer:
             self.scaler = StandardScaler()
             self.clustering_model = None
             self.pca_model = None
+            self.fitted_clustering: Optional[ClusteringModel] = None
+
+        # Instrumentation: number of per-customer feature extractions performed
+        self.feature_extractions = 0
 
         logger.info(f"CustomerDataAnalyzer initialized (ML: {self.enable_ml}, Stats: {self.enable_advanced_stats})")
 
@@ -205,6 +417,8 @@ class CustomerDataAnalyzer:
         Returns:
             Extracted feature set
         """
+        self.feature_extractions += 1
+
         try:
             features = FeatureSet()
 
@@ -236,11 +450,227 @@ class CustomerDataAnalyzer:
             logger.error(f"Feature extraction failed: {e}")
             return FeatureSet()  # Return default features on error
 
+    def extract_feature_matrix(
+        self,
+        df: pd.DataFrame,
+        purchase_history: Optional[pd.DataFrame] = None,
+        customer_key: str = "customer_id",
+        engagement: Optional[pd.DataFrame] = None,
+    ) -> FeatureMatrix:
+        """
+        Extract the feature set of every customer as vectorized columns.
+
+        Batch counterpart of extract_customer_features. Profile and engagement
+        fields are read from the columns of ``df`` (one row per customer); a row
+        counts as having engagement data when any engagement column is set.
+        Purchases come from ``purchase_history`` (one row per purchase joined on
+        ``customer_key``) or, for a merged customer+purchase frame, from the
+        ``amount`` column of ``df`` itself. Engagement fields missing from
+        ``df`` can come from ``engagement``, one row per account joined on
+        ``customer_key``. Missing values keep the FeatureSet defaults.
+
+        Args:
+            df: Customer frame, or merged customer+purchase frame
+            purchase_history: Optional purchase records with ``customer_key`` and ``amount`` columns
+            customer_key: Column identifying the customer
+            engagement: Optional per-account engagement fields with an ``account_id`` column
+                (see MergeResult.engagement_features)
+
+        Returns:
+            Columnar feature matrix
+        """
+        if purchase_history is None and "amount" in df.columns and customer_key in df.columns:
+            purchase_history = df.loc[df["amount"].notna(), [customer_key, "amount"]]
+            df = df.drop_duplicates(customer_key).drop(columns="amount")
+        if engagement is not None:
+            df = self._join_engagement(df, engagement, customer_key)
+        df = df.reset_index(drop=True)
+
+        n = len(df)
+        num = lambda column, default: self._numeric_column(df, column, default)
+        params = self.hk_market_params
+
+        # Categorical features are computed as integer codes into these label arrays
+        age_labels = np.array(["young_adult", "early_career", "mid_career", "senior_professional", "mature"], dtype=object)
+        tenure_labels = np.array(["new", "recent", "established", "loyal"], dtype=object)
+        spend_labels = np.array(["premium", "standard", "budget", "minimal"], dtype=object)
+        frequency_labels = np.array(["high", "medium", "low"], dtype=object)
+        segment_labels = np.array(
+            ["premium_business", "corporate", "urban_professional", "family_subscriber", "general_consumer"], dtype=object
+        )
+
+        # Demographic features
+        age = num("age", 0)
+        age_code = np.digitize(age, [25, 35, 45, 55])
+        age_group = age_labels[age_code]
+        young = age_code <= 1
+        missing_age = np.isnan(age)
+        if missing_age.any():
+            raw_age = df["age"][missing_age]
+            text_age = np.where(raw_age.notna(), raw_age.astype(str).str.lower(), "unknown")
+            age_group[missing_age] = text_age
+            young[missing_age] = np.isin(text_age, ["young_adult", "early_career"])
+
+        location_code = self._categorize_text(
+            df, "location", [("hong kong island", "central"), ("kowloon",), ("new territories",)]
+        )
+        account_code = self._categorize_text(df, "account_type", [("premium", "vip"), ("business",), ("family",)])
+        location_category = np.array(["premium_business", "urban_residential", "suburban_family", "general"], dtype=object)[location_code]
+        account_type = np.array(["premium", "business", "family", "standard"], dtype=object)[account_code]
+
+        tenure = num("tenure_months", 0)
+        tenure_code = np.where(np.isnan(tenure), 0, np.digitize(tenure, [6, 12, 24]))
+
+        # Financial features
+        spend = num("monthly_spend", 0)
+        spend_thresholds = [params["budget_threshold"], params["average_monthly_spend"], params["premium_threshold"]]
+        spend_code = np.where(np.isnan(spend), 2, 3 - np.digitize(spend, spend_thresholds))
+        monthly_spend = np.nan_to_num(spend)
+
+        purchase_count, positive_count, spend_variance = self._aggregate_purchases(df, purchase_history, customer_key)
+        payment_reliability = np.minimum(1.0, positive_count / 12.0)
+        frequency_code = 2 - np.digitize(purchase_count, [5, 10])
+
+        # Usage features
+        data_usage_gb = np.nan_to_num(num("data_usage_gb", 0))
+        voice_minutes = np.nan_to_num(num("voice_minutes", 0))
+        sms_count = np.trunc(np.nan_to_num(num("sms_count", 0))).astype(np.int64)
+        roaming_usage = np.nan_to_num(num("roaming_usage", 0))
+
+        # Behavioral and engagement features (only for customers with engagement data)
+        present = [column for column in ENGAGEMENT_FIELDS if column in df.columns]
+        has_engagement = df[present].notna().any(axis=1).to_numpy() if present else np.zeros(n, dtype=bool)
+        engagement = lambda column, default: np.where(
+            has_engagement, np.nan_to_num(num(column, default), nan=default), default
+        )
+
+        app_usage_hours = engagement("app_usage_hours", 0.0)
+        service_interactions = np.trunc(engagement("service_interactions", 0)).astype(np.int64)
+        complaint_count = np.trunc(engagement("complaint_count", 0)).astype(np.int64)
+        satisfaction_score = engagement("satisfaction_score", 5.0)
+
+        engagement_score = (
+            0.0
+            + np.where(app_usage_hours > 0, np.minimum(0.4, app_usage_hours / 20.0), 0.0)
+            + np.where(service_interactions > 0, np.minimum(0.3, service_interactions / 10.0), 0.0)
+            + np.where(satisfaction_score > 5.0, np.minimum(0.3, (satisfaction_score - 5.0) / 5.0), 0.0)
+        )
+        digital_engagement = np.where(has_engagement, np.minimum(1.0, engagement_score), 0.0)
+
+        promotion_responses = engagement("promotion_responses", 0)
+        promotion_offers = engagement("promotion_offers", 1)
+        response_rate = np.divide(
+            promotion_responses, promotion_offers, out=np.zeros(n), where=promotion_offers != 0
+        )
+        promotion_response_rate = np.where(has_engagement, np.minimum(1.0, response_rate), 0.0)
+
+        # Hong Kong market-specific features
+        segment_code = np.select(
+            [
+                (location_code == 0) & (spend_code <= 1),
+                account_code == 1,
+                (location_code == 1) & young,
+                account_code == 2,
+            ],
+            [0, 1, 2, 3],
+            default=4,
+        )
+        risk_factors = (
+            0.0
+            + np.where(satisfaction_score < 6.0, 0.3, 0.0)
+            + np.where(complaint_count > 2, 0.2, 0.0)
+            + np.where(spend_code == 3, 0.2, 0.0)
+            + np.where(tenure_code == 0, 0.15, 0.0)
+        )
+        competitor_switch_risk = np.minimum(1.0, risk_factors)
+
+        # Derived features (component sums follow _compute_derived_features)
+        tenure_score = np.array([0.2, 0.5, 0.8, 1.0])[tenure_code]
+        customer_value_score = _compensated_sum(
+            np.minimum(1.0, monthly_spend / params["premium_threshold"]) * 0.4,
+            tenure_score * 0.2,
+            digital_engagement * 0.25,
+            np.minimum(1.0, satisfaction_score / 10.0) * 0.15,
+        )
+        churn_risk_score = np.minimum(
+            1.0,
+            _compensated_sum(
+                np.array([0.4, 0.2, 0.0])[np.digitize(satisfaction_score, [5.0, 7.0])],
+                np.array([0.3, 0.15, 0.0])[np.digitize(digital_engagement, [0.3, 0.6])],
+                np.array([0.0, 0.1, 0.2])[np.digitize(complaint_count, [2, 4])],
+                competitor_switch_risk * 0.1,
+            ),
+        )
+        low_spend = spend_code >= 2
+        upsell_propensity = np.minimum(
+            1.0,
+            _compensated_sum(
+                np.select(
+                    [
+                        low_spend & (monthly_spend / params["average_monthly_spend"] < 0.8),
+                        low_spend,
+                        spend_code == 1,
+                    ],
+                    [0.4, 0.2, 0.3],
+                    default=0.1,
+                ),
+                digital_engagement * 0.35,
+                np.array([0.05, 0.15, 0.25])[np.digitize(satisfaction_score, [6.0, 8.0])],
+            ),
+        )
+
+        columns = {
+            "age_group": age_group,
+            "location_category": location_category,
+            "account_type": account_type,
+            "tenure_category": tenure_labels[tenure_code],
+            "monthly_spend": monthly_spend,
+            "spend_category": spend_labels[spend_code],
+            "spend_variance": spend_variance,
+            "payment_reliability": payment_reliability,
+            "data_usage_gb": data_usage_gb,
+            "voice_minutes": voice_minutes,
+            "sms_count": sms_count,
+            "roaming_usage": roaming_usage,
+            "purchase_frequency": frequency_labels[frequency_code],
+            "service_interactions": service_interactions,
+            "complaint_count": complaint_count,
+            "satisfaction_score": satisfaction_score,
+            "app_usage_hours": app_usage_hours,
+            "digital_engagement": digital_engagement,
+            "promotion_response_rate": promotion_response_rate,
+            "hk_market_segment": segment_labels[segment_code],
+            "competitor_switch_risk": competitor_switch_risk,
+            "regulatory_compliance_score": np.ones(n),
+            "customer_value_score": customer_value_score,
+            "churn_risk_score": churn_risk_score,
+            "upsell_propensity": upsell_propensity,
+        }
+
+        if customer_key in df.columns:
+            customer_ids = df[customer_key].to_numpy()
+        else:
+            customer_ids = np.array([f"unknown_{i}" for i in range(n)], dtype=object)
+
+        logger.debug(f"Columnar feature extraction completed for {n} customers")
+        return FeatureMatrix(customer_ids=customer_ids, columns=columns)
+
+    def _join_engagement(self, df: pd.DataFrame, engagement: pd.DataFrame, customer_key: str) -> pd.DataFrame:
+        """Add the engagement fields df lacks from a per-account engagement frame"""
+        fields = [column for column in ENGAGEMENT_FIELDS if column in engagement.columns and column not in df.columns]
+        if not fields:
+            return df
+        rows = pd.Index(engagement["account_id"]).get_indexer(df[customer_key].astype(str))
+        return df.assign(**{
+            column: np.where(rows >= 0, engagement[column].to_numpy(dtype=float)[rows], np.nan) for column in fields
+        })
+
     def analyze_customer_patterns(
         self,
         customer_data: Dict[str, Any],
         purchase_history: List[Dict[str, Any]],
         engagement_data: Optional[Dict[str, Any]] = None,
+        features: Optional[FeatureSet] = None,
     ) -> List[PatternAnalysis]:
         """
         Identify behavioral patterns in customer data.
@@ -249,6 +679,7 @@ class CustomerDataAnalyzer:
             customer_data: Customer profile information
             purchase_history: Historical purchase records
             engagement_data: Optional engagement metrics
+            features: Previously extracted features (extracted here if None)
 
         Returns:
             List of identified patterns
@@ -256,8 +687,9 @@ class CustomerDataAnalyzer:
         try:
             patterns = []
 
-            # Extract features first
-            features = self.extract_customer_features(customer_data, purchase_history, engagement_data)
+            # Extract features first unless the caller already has them
+            if features is None:
+                features = self.extract_customer_features(customer_data, purchase_history, engagement_data)
 
             # Analyze spending patterns
             spending_patterns = self._analyze_spending_patterns(purchase_history, features)
@@ -295,6 +727,7 @@ class CustomerDataAnalyzer:
         customer_data: Dict[str, Any],
         purchase_history: List[Dict[str, Any]],
         engagement_data: Optional[Dict[str, Any]] = None,
+        features: Optional[FeatureSet] = None,
     ) -> Tuple[CustomerSegment, float]:
         """
         Segment customer into Hong Kong telecom market categories.
@@ -303,12 +736,14 @@ class CustomerDataAnalyzer:
             customer_data: Customer profile information
             purchase_history: Historical purchase records
             engagement_data: Optional engagement metrics
+            features: Previously extracted features (extracted here if None)
 
         Returns:
             Tuple of (segment, confidence_score)
         """
         try:
-            features = self.extract_customer_features(customer_data, purchase_history, engagement_data)
+            if features is None:
+                features = self.extract_customer_features(customer_data, purchase_history, engagement_data)
 
             # Apply segmentation rules
             segment, confidence = self._apply_segmentation_rules(features)
@@ -320,12 +755,56 @@ class CustomerDataAnalyzer:
             logger.error(f"Customer segmentation failed: {e}")
             return CustomerSegment.BUDGET_CONSCIOUS, 0.5
 
-    def cluster_customers(self, customer_datasets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def build_analysis_context(
+        self,
+        customer_data: Dict[str, Any],
+        purchase_history: List[Dict[str, Any]],
+        engagement_data: Optional[Dict[str, Any]] = None,
+    ) -> CustomerAnalysisContext:
+        """
+        Extract features once and derive patterns and segment from them.
+
+        The returned context is meant to be passed on to lead scoring, offer
+        matching and recommendation generation so none of them re-extract the
+        customer's features.
+
+        Args:
+            customer_data: Customer profile information
+            purchase_history: Historical purchase records
+            engagement_data: Optional engagement metrics
+
+        Returns:
+            Analysis context for the customer
+        """
+        features = self.extract_customer_features(customer_data, purchase_history, engagement_data)
+        patterns = self.analyze_customer_patterns(customer_data, purchase_history, engagement_data, features=features)
+        segment, segment_confidence = self.segment_customer(
+            customer_data, purchase_history, engagement_data, features=features
+        )
+
+        return CustomerAnalysisContext(
+            customer_id=customer_data.get("customer_id", "unknown"),
+            features=features,
+            patterns=patterns,
+            segment=segment,
+            segment_confidence=segment_confidence,
+        )
+
+    def cluster_customers(
+        self,
+        customer_datasets: List[Dict[str, Any]],
+        scalable: Optional[bool] = None,
+        model_path: Optional[Union[str, os.PathLike]] = None,
+    ) -> Dict[str, Any]:
         """
         Perform ML-based customer clustering analysis.
 
         Args:
             customer_datasets: List of customer data for clustering
+            scalable: Fit MiniBatchKMeans over feature-matrix chunks instead of full KMeans;
+                by default used from SCALABLE_CLUSTERING_MIN_CUSTOMERS customers
+            model_path: Where to persist the fitted clustering artefact; an existing artefact
+                there provides the cluster ids to keep stable
 
         Returns:
             Clustering results and insights
@@ -335,46 +814,255 @@ class CustomerDataAnalyzer:
             return {"error": "ML clustering not available"}
 
         try:
-            # Extract features for all customers
-            all_features = []
-            customer_ids = []
+            # Extract features for all customers in one columnar pass
+            customers, purchases = self._datasets_to_frames(customer_datasets)
+            feature_matrix = self.extract_feature_matrix(customers, purchases, customer_key="_dataset_index").numerical_matrix()
+            customer_ids = [
+                data.get("customer_data", {}).get("customer_id", f"unknown_{i}")
+                for i, data in enumerate(customer_datasets)
+            ]
+            return self.cluster_feature_matrix(feature_matrix, customer_ids, scalable, model_path)
 
-            for data in customer_datasets:
-                customer_data = data.get("customer_data", {})
-                purchase_history = data.get("purchase_history", [])
-                engagement_data = data.get("engagement_data", {})
+        except Exception as e:
+            logger.error(f"Customer clustering failed: {e}")
+            return {"error": str(e)}
 
-                features = self.extract_customer_features(customer_data, purchase_history, engagement_data)
-                numerical_features = features.get_numerical_features()
+    def cluster_feature_matrix(
+        self,
+        feature_matrix: np.ndarray,
+        customer_ids: List[str],
+        scalable: Optional[bool] = None,
+        model_path: Optional[Union[str, os.PathLike]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Cluster customers from their (customers x numerical features) matrix.
 
-                if numerical_features:
-                    all_features.append(list(numerical_features.values()))
-                    customer_ids.append(customer_data.get("customer_id", f"unknown_{len(customer_ids)}"))
+        Args:
+            feature_matrix: Numerical features, one row per customer
+            customer_ids: Customer id of each row
+            scalable: See cluster_customers
+            model_path: See cluster_customers
 
-            if len(all_features) < 3:
-                return {"error": "Insufficient data for clustering (minimum 3 customers required)"}
+        Returns:
+            Clustering results and insights
+        """
+        if not self.enable_ml:
+            logger.warning("ML clustering not available - scikit-learn not installed")
+            return {"error": "ML clustering not available"}
 
-            # Convert to numpy array and scale
-            feature_matrix = np.array(all_features)
-            scaled_features = self.scaler.fit_transform(feature_matrix)
+        try:
+            if len(feature_matrix) < 3:
+                return {"error": "Insufficient data for clustering (minimum 3 customers required)"}
+            if scalable is None:
+                scalable = len(feature_matrix) >= SCALABLE_CLUSTERING_MIN_CUSTOMERS
 
-            # Determine optimal number of clusters
-            optimal_clusters = self._find_optimal_clusters(scaled_features)
+            # A previously persisted artefact keeps cluster ids stable across runs
+            if model_path is not None and self.fitted_clustering is None and os.path.exists(model_path):
+                try:
+                    self.load_clustering_model(model_path)
+                except Exception as e:
+                    logger.warning(f"Ignoring previous clustering model at {model_path}: {e}")
 
-            # Perform clustering
-            self.clustering_model = KMeans(n_clusters=optimal_clusters, random_state=42, n_init=10)
-            cluster_labels = self.clustering_model.fit_predict(scaled_features)
+            scaled_features, cluster_labels, model_selection = self._fit_clustering(feature_matrix, scalable)
 
             # Analyze clusters
-            cluster_analysis = self._analyze_clusters(scaled_features, cluster_labels, customer_ids, all_features)
+            cluster_analysis = self._analyze_clusters(
+                scaled_features, cluster_labels, customer_ids, feature_matrix,
+                silhouette_sample_size=SILHOUETTE_SAMPLE_SIZE if scalable else None,
+                cluster_descriptions=self.fitted_clustering.cluster_descriptions,
+            )
+            if "error" not in cluster_analysis:
+                cluster_analysis["clustering_mode"] = "minibatch_kmeans" if scalable else "kmeans"
+                cluster_analysis["model_selection"] = model_selection
 
-            logger.info(f"Clustering completed: {optimal_clusters} clusters identified")
+            if model_path is not None:
+                self.save_clustering_model(model_path)
+                cluster_analysis["model_path"] = str(model_path)
+
+            logger.info(f"Clustering completed: {self.fitted_clustering.n_clusters} clusters identified")
             return cluster_analysis
 
         except Exception as e:
             logger.error(f"Customer clustering failed: {e}")
             return {"error": str(e)}
 
+    def _fit_clustering(
+        self,
+        feature_matrix: np.ndarray,
+        scalable: bool,
+        reservoir: Optional[Tuple[np.ndarray, int]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[int, Dict[str, float]]]:
+        """
+        Fit scaler and clustering model and store them as the fitted artefact.
+
+        Cluster ids are matched to the closest centroids of the previous artefact, so
+        refits keep the ids of clusters that still exist. The artefact's reservoir is
+        sampled from feature_matrix, unless an existing (reservoir, rows_seen) sample
+        is passed in.
+
+        Returns:
+            (scaled features, stable cluster id per row, model selection scores)
+        """
+        # Scale features
+        self.scaler = StandardScaler()
+        scaled_features = self.scaler.fit_transform(feature_matrix)
+
+        # Fit candidate cluster counts and keep the selected model
+        _, self.clustering_model, model_selection = self._find_optimal_clusters(scaled_features, scalable)
+        if scalable:
+            model_labels = self._predict_scaled(self.clustering_model, scaled_features)
+        else:
+            model_labels = self.clustering_model.labels_
+
+        cluster_ids = self._align_cluster_ids(self.clustering_model, self.fitted_clustering)
+        cluster_labels = cluster_ids[model_labels]
+        clustering = ClusteringModel(
+            scaler=self.scaler,
+            model=self.clustering_model,
+            feature_names=NUMERICAL_FEATURE_FIELDS,
+            model_selection=model_selection,
+            fitted_at=datetime.now().isoformat(),
+            cluster_ids=cluster_ids,
+            cluster_descriptions={
+                int(cluster_id): self._describe_cluster_characteristics(scaled_features[cluster_labels == cluster_id])
+                for cluster_id in np.unique(cluster_labels)
+            },
+            cluster_proportions=np.bincount(model_labels, minlength=len(cluster_ids)) / len(model_labels),
+            training_fingerprint=_fingerprint_features(feature_matrix),
+            training_size=len(feature_matrix),
+        )
+        if reservoir is None:
+            clustering.update_reservoir(feature_matrix)
+        else:
+            clustering.reservoir, clustering.rows_seen = reservoir
+        self.fitted_clustering = clustering
+        return scaled_features, cluster_labels, model_selection
+
+    def _align_cluster_ids(self, model: Any, previous: Optional[ClusteringModel]) -> np.ndarray:
+        """Stable ids for the labels of a new model, reusing the ids of the nearest previous centroids."""
+        if previous is None or tuple(previous.feature_names) != NUMERICAL_FEATURE_FIELDS:
+            return np.arange(model.n_clusters)
+
+        previous_centres = self.scaler.transform(previous.scaler.inverse_transform(previous.model.cluster_centers_))
+        new_rows, previous_rows = linear_sum_assignment(pairwise_distances(model.cluster_centers_, previous_centres))
+        previous_ids = previous.stable_ids()
+        cluster_ids = np.full(model.n_clusters, -1, dtype=np.intp)
+        cluster_ids[new_rows] = previous_ids[previous_rows]
+        unmatched = cluster_ids < 0
+        cluster_ids[unmatched] = previous_ids.max() + 1 + np.arange(unmatched.sum())
+        return cluster_ids
+
+    def assign_clusters(
+        self,
+        df: pd.DataFrame,
+        purchase_history: Optional[pd.DataFrame] = None,
+        customer_key: str = "customer_id",
+        model_path: Optional[Union[str, os.PathLike]] = None,
+        refit_on_drift: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Assign new customers to the persisted clusters in O(new customers).
+
+        The customers are scaled and assigned with the fitted artefact. Only when their
+        feature distribution or cluster mix drifts beyond DRIFT_MEAN_SHIFT_THRESHOLD or
+        DRIFT_PSI_THRESHOLD is the model refitted, on the artefact's bounded reservoir of
+        training rows plus the new customers. Artefacts saved before the reservoir existed
+        hold no training rows, so they are refitted on the new customers alone.
+
+        Args:
+            df: Customer frame of the new customers (see extract_feature_matrix)
+            purchase_history: Optional purchase records of the new customers
+            customer_key: Column identifying the customer
+            model_path: Artefact to load when none is fitted, and to save the updated artefact to
+            refit_on_drift: Refit when drift is detected
+
+        Returns:
+            Cluster id per customer id, drift measurements and whether the model was refitted
+        """
+        if not self.enable_ml:
+            raise ValueError("ML clustering not available")
+        if self.fitted_clustering is None:
+            if model_path is None or not os.path.exists(model_path):
+                raise ValueError("No fitted clustering model; run cluster_customers or pass model_path")
+            self.load_clustering_model(model_path)
+
+        features = self.extract_feature_matrix(df, purchase_history, customer_key)
+        feature_matrix = features.numerical_matrix()
+        clustering = self.fitted_clustering
+        drift = {"mean_shift": 0.0, "cluster_psi": 0.0, "drifted": False}
+        refitted = False
+
+        if len(feature_matrix):
+            labels = clustering.predict_labels(feature_matrix)
+            drift = clustering.measure_drift(feature_matrix, labels)
+            if drift["drifted"] and refit_on_drift:
+                if clustering.reservoir is None:
+                    training = feature_matrix
+                else:
+                    training = np.vstack([clustering.reservoir, feature_matrix])
+                # Sample the delta into the reservoir while rows_seen still counts every
+                # row seen, then carry the sample over to the refitted artefact
+                clustering.update_reservoir(feature_matrix)
+                self._fit_clustering(
+                    training,
+                    scalable=len(training) >= SCALABLE_CLUSTERING_MIN_CUSTOMERS,
+                    reservoir=(clustering.reservoir, clustering.rows_seen),
+                )
+                clustering, refitted = self.fitted_clustering, True
+                logger.info(f"Cluster drift detected ({drift}); refitted on {len(training)} customers")
+            else:
+                clustering.update_reservoir(feature_matrix)
+            cluster_ids = clustering.predict(feature_matrix)
+        else:
+            cluster_ids = np.empty(0, dtype=np.intp)
+
+        if model_path is not None:
+            clustering.save(model_path)
+
+        return {
+            "assignments": dict(zip(features.customer_ids.tolist(), cluster_ids.tolist())),
+            "drift": drift,
+            "refitted": refitted,
+            "n_clusters": clustering.n_clusters,
+            "cluster_descriptions": clustering.cluster_descriptions,
+            "training_fingerprint": clustering.training_fingerprint,
+        }
+
+    def save_clustering_model(self, path: Union[str, os.PathLike]) -> None:
+        """Persist the scaler and model fitted by the last cluster_customers call."""
+        if not self.enable_ml or self.fitted_clustering is None:
+            raise ValueError("No fitted clustering model to save")
+        self.fitted_clustering.save(path)
+
+    def load_clustering_model(self, path: Union[str, os.PathLike]) -> ClusteringModel:
+        """Load a persisted scaler and model for predict_clusters."""
+        if not self.enable_ml:
+            raise ValueError("ML clustering not available")
+        self.fitted_clustering = ClusteringModel.load(path)
+        self.scaler, self.clustering_model = self.fitted_clustering.scaler, self.fitted_clustering.model
+        return self.fitted_clustering
+
+    def predict_clusters(self, customer_datasets: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Assign customers to the clusters of the fitted or loaded model without refitting.
+
+        Args:
+            customer_datasets: List of customer data to assign
+
+        Returns:
+            Cluster id per customer id
+        """
+        if not self.enable_ml or self.fitted_clustering is None:
+            raise ValueError("No fitted clustering model; run cluster_customers or load_clustering_model first")
+
+        customers, purchases = self._datasets_to_frames(customer_datasets)
+        feature_matrix = self.extract_feature_matrix(customers, purchases, customer_key="_dataset_index").numerical_matrix()
+        labels = self.fitted_clustering.predict(feature_matrix)
+        customer_ids = [
+            data.get("customer_data", {}).get("customer_id", f"unknown_{i}") for i, data in enumerate(customer_datasets)
+        ]
+        return dict(zip(customer_ids, labels.tolist()))
+
     def generate_customer_insights(
         self,
         customer_data: Dict[str, Any],
@@ -403,14 +1091,10 @@ class CustomerDataAnalyzer:
             if engagement_data is None:
                 engagement_data = {}
 
-            # Extract features
-            features = self.extract_customer_features(customer_data, purchase_history, engagement_data)
-
-            # Identify patterns
-            patterns = self.analyze_customer_patterns(customer_data, purchase_history, engagement_data)
-
-            # Segment customer
-            segment, segment_confidence = self.segment_customer(customer_data, purchase_history, engagement_data)
+            # Extract features, patterns and segment in a single feature pass
+            context = self.build_analysis_context(customer_data, purchase_history, engagement_data)
+            features, patterns = context.features, context.patterns
+            segment, segment_confidence = context.segment, context.segment_confidence
 
             # Generate risk assessments
             churn_risk = self._assess_churn_risk(features, patterns)
@@ -473,6 +1157,77 @@ class CustomerDataAnalyzer:
 
     # Private helper methods for feature extraction
 
+    def _numeric_column(self, df: pd.DataFrame, column: str, default: float) -> np.ndarray:
+        """Column as a float array (NaN for missing values), or the `.get()` default when absent."""
+        if column not in df.columns:
+            return np.full(len(df), default, dtype=float)
+        return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+
+    def _categorize_text(self, df: pd.DataFrame, column: str, keyword_rules: List[Tuple[str, ...]]) -> np.ndarray:
+        """
+        Keyword-categorize a text column with `str(value).lower()` matching, evaluating each
+        distinct value only once. Returns the index of the first matching rule (len(rules) if none).
+        """
+        if column not in df.columns:
+            codes, values = np.zeros(len(df), dtype=np.int64), [""]
+        else:
+            codes, values = pd.factorize(df[column], use_na_sentinel=False)
+        category_codes = np.array([
+            next(
+                (code for code, keywords in enumerate(keyword_rules) if any(k in str(value).lower() for k in keywords)),
+                len(keyword_rules),
+            )
+            for value in values
+        ], dtype=np.int64)
+        return category_codes[codes]
+
+    def _aggregate_purchases(
+        self, df: pd.DataFrame, purchase_history: Optional[pd.DataFrame], customer_key: str
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-customer purchase count, positive-amount count and spend variance."""
+        n = len(df)
+        purchase_count = np.zeros(n, dtype=np.int64)
+        positive_count = np.zeros(n, dtype=np.int64)
+        spend_variance = np.zeros(n)
+        if purchase_history is None or purchase_history.empty or customer_key not in df.columns:
+            return purchase_count, positive_count, spend_variance
+
+        try:
+            positions = pd.Index(df[customer_key]).get_indexer(purchase_history[customer_key])
+        except pd.errors.InvalidIndexError:
+            raise ValueError(f"Customer key '{customer_key}' must be unique to join purchase history")
+        amounts = self._numeric_column(purchase_history, "amount", 0)
+        known = positions >= 0
+        positions, amounts = positions[known], amounts[known]
+        purchase_count = np.bincount(positions, minlength=n)
+
+        positive = amounts > 0
+        positions, amounts = positions[positive], amounts[positive]
+        positive_count = np.bincount(positions, minlength=n)
+        means = np.bincount(positions, weights=amounts, minlength=n) / np.maximum(positive_count, 1)
+        squared = np.bincount(positions, weights=(amounts - means[positions]) ** 2, minlength=n)
+        spend_variance = np.where(positive_count > 1, squared / np.maximum(positive_count, 1), 0.0)
+        return purchase_count, positive_count, spend_variance
+
+    def _datasets_to_frames(self, customer_datasets: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Flatten per-customer dataset dicts into a customer frame and a purchase frame."""
+        customer_rows = []
+        purchase_rows = []
+        for index, data in enumerate(customer_datasets):
+            engagement_data = data.get("engagement_data") or {}
+            customer_data = data.get("customer_data", {})
+            customer_rows.append({
+                **{k: v for k, v in customer_data.items() if k not in ENGAGEMENT_FIELDS},
+                **{k: engagement_data.get(k) for k in ENGAGEMENT_FIELDS if k in engagement_data},
+                "_dataset_index": index,
+            })
+            purchase_rows.extend(
+                {"_dataset_index": index, "amount": purchase.get("amount", 0)}
+                for purchase in data.get("purchase_history", [])
+            )
+        purchases = pd.DataFrame(purchase_rows, columns=["_dataset_index", "amount"])
+        return pd.DataFrame(customer_rows), purchases
+
     def _extract_demographic_features(self, features: FeatureSet, customer_data: Dict[str, Any]) -> FeatureSet:
         """Extract demographic features."""
         try:
@@ -1182,45 +1937,102 @@ class CustomerDataAnalyzer:
 
     # Additional helper methods for clustering and insights
 
-    def _find_optimal_clusters(self, feature_matrix: np.ndarray) -> int:
-        """Find optimal number of clusters using elbow method."""
-        if len(feature_matrix) < 3:
-            return 2
+    def _find_optimal_clusters(
+        self, feature_matrix: np.ndarray, scalable: bool = False
+    ) -> Tuple[int, Any, Dict[int, Dict[str, float]]]:
+        """
+        Choose the number of clusters by silhouette score on a sample, falling back to the elbow of the inertia curve.
 
-        max_clusters = min(8, len(feature_matrix) // 2)
-        inertias = []
+        Returns:
+            (cluster count, its fitted model, inertia and silhouette per candidate count)
+        """
+        max_clusters = max(2, min(MAX_CLUSTERS, len(feature_matrix) // 2))
+        rng = np.random.default_rng(42)
+        if len(feature_matrix) > SILHOUETTE_SAMPLE_SIZE:
+            sample = feature_matrix[np.sort(rng.choice(len(feature_matrix), SILHOUETTE_SAMPLE_SIZE, replace=False))]
+        else:
+            sample = feature_matrix
+        sample_distances = pairwise_distances(sample)
 
+        models, selection = {}, {}
         for k in range(2, max_clusters + 1):
-            kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-            kmeans.fit(feature_matrix)
-            inertias.append(kmeans.inertia_)
+            if scalable:
+                model = self._fit_minibatch_kmeans(feature_matrix, k)
+                inertia = -sum(
+                    model.score(feature_matrix[start : start + CLUSTERING_CHUNK_SIZE])
+                    for start in range(0, len(feature_matrix), CLUSTERING_CHUNK_SIZE)
+                )
+            else:
+                model = KMeans(n_clusters=k, random_state=42, n_init=10).fit(feature_matrix)
+                inertia = model.inertia_
 
-        # Simple elbow detection (could be more sophisticated)
-        if len(inertias) >= 3:
-            return min(5, len(inertias) + 1)  # Conservative approach
+            sample_labels = model.predict(sample)
+            distinct_labels = len(np.unique(sample_labels))
+            if 1 < distinct_labels < len(sample):
+                silhouette = silhouette_score(sample_distances, sample_labels, metric="precomputed")
+            else:
+                silhouette = float("nan")
+            models[k] = model
+            selection[k] = {"inertia": float(inertia), "silhouette": float(silhouette)}
+
+        scored = [k for k in selection if not math.isnan(selection[k]["silhouette"])]
+        if scored:
+            optimal = max(scored, key=lambda k: selection[k]["silhouette"])
+        elif len(selection) >= 3:
+            # Elbow: largest second difference of the inertia curve
+            inertias = [selection[k]["inertia"] for k in sorted(selection)]
+            optimal = 3 + int(np.argmax(np.diff(inertias, n=2)))
         else:
-            return 3
+            optimal = min(selection)
+
+        return optimal, models[optimal], selection
+
+    def _fit_minibatch_kmeans(self, feature_matrix: np.ndarray, n_clusters: int) -> Any:
+        """MiniBatchKMeans trained with partial_fit over shuffled feature-matrix chunks."""
+        model = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, n_init=3)
+        rng = np.random.default_rng(42)
+        for _ in range(CLUSTERING_EPOCHS):
+            order = rng.permutation(len(feature_matrix))
+            for start in range(0, len(order), CLUSTERING_CHUNK_SIZE):
+                chunk = order[start : start + CLUSTERING_CHUNK_SIZE]
+                if len(chunk) >= n_clusters:
+                    model.partial_fit(feature_matrix[chunk])
+        return model
+
+    def _predict_scaled(self, model: Any, feature_matrix: np.ndarray) -> np.ndarray:
+        """Cluster labels of already scaled features, chunk by chunk."""
+        return np.concatenate([
+            model.predict(feature_matrix[start : start + CLUSTERING_CHUNK_SIZE])
+            for start in range(0, len(feature_matrix), CLUSTERING_CHUNK_SIZE)
+        ])
 
     def _analyze_clusters(
         self,
         feature_matrix: np.ndarray,
         cluster_labels: np.ndarray,
         customer_ids: List[str],
-        original_features: List[List[float]],
+        original_features: np.ndarray,
+        silhouette_sample_size: Optional[int] = None,
+        cluster_descriptions: Optional[Dict[int, Dict[str, str]]] = None,
     ) -> Dict[str, Any]:
         """Analyze clustering results and generate insights."""
         try:
+            if silhouette_sample_size is not None and len(feature_matrix) <= silhouette_sample_size:
+                silhouette_sample_size = None
             cluster_analysis = {
-                "n_clusters": len(set(cluster_labels)),
-                "silhouette_score": silhouette_score(feature_matrix, cluster_labels),
+                "n_clusters": len(np.unique(cluster_labels)),
+                "silhouette_score": silhouette_score(
+                    feature_matrix, cluster_labels, sample_size=silhouette_sample_size, random_state=42
+                ),
                 "clusters": {},
                 "insights": [],
             }
 
             # Analyze each cluster
-            for cluster_id in set(cluster_labels):
+            customer_ids = np.asarray(customer_ids, dtype=object)
+            for cluster_id in np.unique(cluster_labels):
                 cluster_mask = cluster_labels == cluster_id
-                cluster_customers = [customer_ids[i] for i in range(len(customer_ids)) if cluster_mask[i]]
+                cluster_customers = customer_ids[cluster_mask].tolist()
                 cluster_features = feature_matrix[cluster_mask]
 
                 cluster_info = {
@@ -1228,7 +2040,8 @@ class CustomerDataAnalyzer:
                     "size": len(cluster_customers),
                     "customers": cluster_customers,
                     "centroid": cluster_features.mean(axis=0).tolist(),
-                    "characteristics": self._describe_cluster_characteristics(cluster_features),
+                    "characteristics": (cluster_descriptions or {}).get(int(cluster_id))
+                    or self._describe_cluster_characteristics(cluster_features),
                 }
 
                 cluster_analysis["clusters"][f"cluster_{cluster_id}"] = cluster_info
@@ -1720,13 +2533,20 @@ def analyze_single_customer(
     return analyzer.generate_customer_insights(customer_data, purchase_history, engagement_data)
 
 
-def batch_analyze_customers(customer_datasets: List[Dict[str, Any]], enable_clustering: bool = True) -> Dict[str, Any]:
+def batch_analyze_customers(
+    customer_datasets: List[Dict[str, Any]],
+    enable_clustering: bool = True,
+    workers: Optional[int] = 1,
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Analyze multiple customers and perform clustering.
 
     Args:
         customer_datasets: List of customer data dictionaries
         enable_clustering: Enable customer clustering analysis
+        workers: Worker processes for the individual analyses (all cores if None)
+        chunk_size: Customers per worker chunk (derived from workers if None)
 
     Returns:
         Batch analysis results including clustering insights
@@ -1735,14 +2555,20 @@ def batch_analyze_customers(customer_datasets: List[Dict[str, Any]], enable_clus
 
     results = {"individual_analyses": [], "clustering_results": None, "batch_insights": {}}
 
-    # Analyze each customer individually
-    for data in customer_datasets:
-        customer_data = data.get("customer_data", {})
-        purchase_history = data.get("purchase_history", [])
-        engagement_data = data.get("engagement_data", {})
-
-        analysis = analyzer.generate_customer_insights(customer_data, purchase_history, engagement_data)
-        results["individual_analyses"].append(analysis)
+    # Analyze each customer individually, sharded across worker processes if requested
+    if resolve_workers(workers) > 1 and len(customer_datasets) > 1:
+        chunks = iter_chunked_results(
+            _analyze_chunk,
+            customer_datasets,
+            workers=workers,
+            chunk_size=chunk_size,
+            initializer=_init_analysis_worker,
+            initargs=(analyzer,),
+        )
+        for _, analyses in chunks:
+            results["individual_analyses"].extend(analyses)
+    else:
+        results["individual_analyses"] = _analyze_datasets(analyzer, customer_datasets)
 
     # Perform clustering if enabled
     if enable_clustering and len(customer_datasets) >= 3:
@@ -1755,6 +2581,34 @@ def batch_analyze_customers(customer_datasets: List[Dict[str, Any]], enable_clus
     return results
 
 
+def _analyze_datasets(analyzer: CustomerDataAnalyzer, customer_datasets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Generate insights for each customer dataset."""
+    analyses = []
+    for data in customer_datasets:
+        customer_data = data.get("customer_data", {})
+        purchase_history = data.get("purchase_history", [])
+        engagement_data = data.get("engagement_data", {})
+
+        analyses.append(analyzer.generate_customer_insights(customer_data, purchase_history, engagement_data))
+    return analyses
+
+
+# Process pool workers for parallel batch analysis
+
+_worker_analyzer: Optional[CustomerDataAnalyzer] = None
+
+
+def _init_analysis_worker(analyzer: CustomerDataAnalyzer) -> None:
+    """Install the analyzer once per worker process."""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _analyze_chunk(start: int, chunk: List[Dict[str, Any]], shared: Any = None) -> List[Dict[str, Any]]:
+    """Analyze a contiguous chunk of a batch in a worker process."""
+    return _analyze_datasets(_worker_analyzer, chunk)
+
+
 def _generate_batch_insights(individual_analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Generate insights across multiple customer analyses."""
     if not individual_analyses:
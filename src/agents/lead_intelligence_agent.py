@@ -84,6 +84,23 @@ class LeadIntelligenceAgent:
             "high": 0.8
         }
         
+        # Churn indicator weights, in the order the scalar model sums them
+        self.churn_indicator_weights = {
+            "low_engagement": 0.25,
+            "support_issues": 0.2,
+            "payment_delays": 0.3,
+            "competitor_usage": 0.15,
+            "tenure_risk": 0.1
+        }
+        
+        # Churn probability of every indicator combination (bit i set = i-th indicator
+        # present), summed like the scalar model so vectorized thresholds agree exactly
+        weights = list(self.churn_indicator_weights.values())
+        self.churn_probability_lookup = np.array([
+            min(sum(weight for bit, weight in enumerate(weights) if mask >> bit & 1), 1.0)
+            for mask in range(2 ** len(weights))
+        ])
+        
         self.lead_score_factors = {
             "revenue_potential": 0.3,
             "engagement_level": 0.25,
@@ -92,6 +109,9 @@ class LeadIntelligenceAgent:
             "competitive_risk": 0.1
         }
         
+        # Instrumentation: number of passes over the raw customer data in the last analysis
+        self.data_passes = 0
+        
         logger.info(f"Lead Intelligence Agent initialized with DeepSeek specialization")
     
     def _define_customer_segments(self) -> Dict[str, CustomerSegment]:
@@ -195,44 +215,166 @@ class LeadIntelligenceAgent:
             else:
                 df = pd.DataFrame([customer_data])
             
+            # Single pass over the data; every sub-analysis reads the shared feature frame
+            self.data_passes = 0
+            features = self._build_feature_frame(df)
+            
             # Perform comprehensive analysis
             patterns = {
-                "customer_segments": self._segment_customers(df),
-                "lead_scores": self._calculate_lead_scores(df),
-                "churn_analysis": self._analyze_churn_risk(df),
-                "revenue_opportunities": self._identify_revenue_opportunities(df),
-                "market_trends": self._analyze_market_trends(df),
-                "delegation_items": self._identify_delegation_needs(df)
+                "customer_segments": self._segment_customers(df, features),
+                "lead_scores": self._calculate_lead_scores(df, features=features),
+                "churn_analysis": self._analyze_churn_risk(df, features),
+                "revenue_opportunities": self._identify_revenue_opportunities(df, features),
+                "market_trends": self._analyze_market_trends(df, features),
+                "delegation_items": self._identify_delegation_needs(df, features)
             }
             
             # Generate agent insights
             patterns["agent_insights"] = self._generate_agent_insights(patterns)
             patterns["collaboration_requests"] = self._prepare_collaboration_requests(patterns)
+            patterns["batch_delegation"] = self._prepare_batch_delegation(features, patterns["delegation_items"])
             
-            logger.info(f"Pattern analysis complete: {len(df)} customers analyzed")
+            logger.info(f"Pattern analysis complete: {len(df)} customers analyzed in {self.data_passes} data pass(es)")
             return patterns
             
         except Exception as e:
             logger.error(f"Pattern analysis failed: {str(e)}")
             raise
     
-    def _segment_customers(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Segment customers based on behavior patterns"""
-        segments = {}
+    def _numeric_column(self, df: pd.DataFrame, column: str, default: float) -> np.ndarray:
+        """Column as a float array, using the per-record `.get()` default when the column is absent"""
+        if column not in df.columns:
+            return np.full(len(df), default, dtype=float)
+        return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)
+    
+    def _flag_column(self, df: pd.DataFrame, column: str, default: bool = False) -> np.ndarray:
+        """Column truthiness as a bool array, matching `bool(customer.get(column, default))`"""
+        if column not in df.columns:
+            return np.full(len(df), bool(default))
+        return df[column].astype(bool).to_numpy()
+    
+    def _build_feature_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute the shared per-customer feature frame in a single vectorized pass.
         
-        for customer in df.to_dict('records'):
-            segment = self._classify_customer_segment(customer)
-            if segment not in segments:
-                segments[segment] = []
-            segments[segment].append(customer.get('customer_id', 'unknown'))
+        Holds segment, lead score, churn probability and lifetime value (mirroring
+        _classify_customer_segment, _score_individual_lead, _calculate_churn_probability
+        and _estimate_lifetime_value, including their per-field defaults) plus the
+        opportunity flags the market and delegation analyses filter on.
+        """
+        self.data_passes += 1
+        col = lambda name, default: self._numeric_column(df, name, default)
+        
+        # Segment classification (same rule order as _classify_customer_segment)
+        spend = col('monthly_spend', 0)
+        account_type = df['account_type'] if 'account_type' in df.columns else pd.Series(None, index=df.index)
+        segment = np.select(
+            [
+                (spend > 150) & (col('data_usage_gb', 0) > 50) & (col('tenure_months', 0) > 24),
+                (col('active_services', 1) > 2) & (spend >= 80) & (spend <= 150),
+                (spend > 200) & (account_type == 'business').to_numpy(),
+                spend < 50,
+                col('roaming_usage', 0) > 0,
+            ],
+            ["premium_individual", "family_plan", "business_sme", "budget_conscious", "tourist_roaming"],
+            default="premium_individual"
+        )
+        
+        # Weighted lead score (same operation order as _score_individual_lead)
+        factors = self.lead_score_factors
+        lead_score = (
+            np.minimum(spend / 200.0, 1.0) * 10 * factors["revenue_potential"] +
+            np.minimum(col('data_usage_gb', 0) / 100.0, 1.0) * 10 * factors["engagement_level"] +
+            np.minimum(col('tenure_months', 0) / 36.0, 1.0) * 10 * factors["loyalty_indicators"] +
+            col('service_growth_rate', 0.5) * 10 * factors["growth_potential"] +
+            (1 - col('competitor_usage', 0.3)) * 10 * factors["competitive_risk"]
+        )
+        
+        # Churn probability (same indicators as _calculate_churn_probability, in
+        # churn_indicator_weights order). Scores are looked up per indicator combination
+        # so they are summed exactly like the scalar sum() instead of accumulating
+        # float error column by column.
+        indicators = [
+            col('data_usage_gb', 50) < 10,
+            col('support_tickets', 0) > 3,
+            col('payment_delays', 0) > 1,
+            col('competitor_usage', 0) > 0.5,
+            col('tenure_months', 12) < 6,
+        ]
+        combination = sum(indicator.astype(np.int64) << bit for bit, indicator in enumerate(indicators))
+        churn_probability = self.churn_probability_lookup[combination]
+        thresholds = self.churn_risk_thresholds
+        risk_level = np.select(
+            [
+                churn_probability < thresholds["low"],
+                churn_probability < thresholds["medium"],
+                churn_probability < thresholds["high"],
+            ],
+            ["low", "medium", "high"],
+            default="critical"
+        )
+        
+        # Lifetime value (same formula as _estimate_lifetime_value)
+        base_value = spend * (col('tenure_months', 12) + 12)
+        lifetime_value = base_value + base_value * col('service_growth_rate', 0.0) * 0.5
+        
+        customer_id = df['customer_id'].to_numpy() if 'customer_id' in df.columns else np.full(len(df), 'unknown', dtype=object)
+        monthly_spend = df['monthly_spend'].to_numpy() if 'monthly_spend' in df.columns else np.zeros(len(df), dtype=int)
+        data_usage = col('data_usage_gb', 0)
+        plan_type = df['plan_type'] if 'plan_type' in df.columns else pd.Series(None, index=df.index)
+        
+        return pd.DataFrame({
+            "customer_id": customer_id,
+            "segment": segment,
+            "lead_score": self._round_scores(lead_score),
+            "churn_probability": churn_probability,
+            "risk_level": risk_level,
+            "lifetime_value": lifetime_value,
+            "monthly_spend": monthly_spend,
+            "spend": spend,
+            "data_usage_gb": data_usage,
+            "upsell_candidate": data_usage > col('plan_data_limit', 100) * 0.8,
+            "family_conversion": (col('family_lines', 0) > 1) & ~self._flag_column(df, 'family_plan'),
+            "family_lines_multi": col('family_lines', 0) > 1,
+            "plan_5g": (plan_type == '5G').to_numpy(),
+            "business_features": self._flag_column(df, 'business_features'),
+        })
+    
+    @staticmethod
+    def _round_scores(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+        """Round like Python's round(); np.round can differ on values sitting at a half step"""
+        rounded = np.round(values, decimals)
+        scaled = values * 10 ** decimals
+        at_half_step = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        for position in np.flatnonzero(at_half_step):
+            rounded[position] = round(float(values[position]), decimals)
+        return rounded
+    
+    @staticmethod
+    def _top_k_positions(scores: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the k highest scores, ties kept in original order like a stable sort"""
+        ranked = np.where(np.isnan(scores), -np.inf, scores)
+        if len(ranked) > k:
+            kth_value = np.partition(ranked, len(ranked) - k)[len(ranked) - k]
+            candidates = np.flatnonzero(ranked >= kth_value)
+        else:
+            candidates = np.arange(len(ranked))
+        order = np.lexsort((candidates, -ranked[candidates]))
+        return candidates[order][:k]
+    
+    def _segment_customers(self, df: pd.DataFrame, features: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Segment customers based on behavior patterns"""
+        features = self._build_feature_frame(df) if features is None else features
+        segment_counts = features.groupby("segment", sort=False).size()
+        segments = {segment: int(count) for segment, count in segment_counts.items()}
         
         # Update segment sizes
-        for segment_id, customer_ids in segments.items():
+        for segment_id, size in segments.items():
             if segment_id in self.customer_segments:
-                self.customer_segments[segment_id].size = len(customer_ids)
+                self.customer_segments[segment_id].size = size
         
         return {
-            "segment_distribution": {k: len(v) for k, v in segments.items()},
+            "segment_distribution": segments,
             "segment_details": {k: self.customer_segments.get(k, {}) for k in segments.keys()},
             "total_customers": len(df)
         }
@@ -258,22 +400,21 @@ class LeadIntelligenceAgent:
         else:
             return "premium_individual"  # Default
     
-    def _calculate_lead_scores(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_lead_scores(self, df: pd.DataFrame, top_k: int = 10,
+                               features: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Calculate lead scores for all customers"""
-        lead_analyses = []
+        features = self._build_feature_frame(df) if features is None else features
+        scores = features["lead_score"].to_numpy()
         
-        for customer in df.to_dict('records'):
-            analysis = self._score_individual_lead(customer)
-            lead_analyses.append(analysis)
-        
-        # Sort by lead score
-        lead_analyses.sort(key=lambda x: x.lead_score, reverse=True)
+        # Rich LeadAnalysis objects are only materialised for the top-K leads
+        top_positions = self._top_k_positions(scores, top_k)
+        top_leads = [self._score_individual_lead(customer) for customer in df.iloc[top_positions].to_dict('records')]
         
         return {
-            "top_leads": lead_analyses[:10],  # Top 10 leads
-            "score_distribution": self._analyze_score_distribution(lead_analyses),
-            "high_value_count": len([l for l in lead_analyses if l.lead_score >= 8.0]),
-            "average_score": sum(l.lead_score for l in lead_analyses) / len(lead_analyses)
+            "top_leads": top_leads,
+            "score_distribution": self._analyze_score_distribution(scores),
+            "high_value_count": int((scores >= 8.0).sum()),
+            "average_score": float(scores.mean())
         }
     
     def _score_individual_lead(self, customer: Dict[str, Any]) -> LeadAnalysis:
@@ -337,13 +478,7 @@ class LeadIntelligenceAgent:
         }
         
         # Weight the indicators
-        weights = {
-            "low_engagement": 0.25,
-            "support_issues": 0.2,
-            "payment_delays": 0.3,
-            "competitor_usage": 0.15,
-            "tenure_risk": 0.1
-        }
+        weights = self.churn_indicator_weights
         
         churn_score = sum(weights[k] for k, v in indicators.items() if v)
         return min(churn_score, 1.0)
@@ -420,34 +555,18 @@ class LeadIntelligenceAgent:
         
         return delegation
     
-    def _analyze_churn_risk(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_churn_risk(self, df: pd.DataFrame, features: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Analyze churn risk across customer base"""
-        churn_analysis = []
-        
-        for customer in df.to_dict('records'):
-            churn_prob = self._calculate_churn_probability(customer)
-            risk_level = self._categorize_churn_risk(churn_prob)
-            
-            churn_analysis.append({
-                "customer_id": customer.get('customer_id', 'unknown'),
-                "churn_probability": churn_prob,
-                "risk_level": risk_level,
-                "segment": self._classify_customer_segment(customer)
-            })
-        
-        # Analyze by risk level
-        risk_distribution = {}
-        for analysis in churn_analysis:
-            risk = analysis['risk_level']
-            if risk not in risk_distribution:
-                risk_distribution[risk] = []
-            risk_distribution[risk].append(analysis)
+        features = self._build_feature_frame(df) if features is None else features
+        churn_prob = features["churn_probability"]
+        risk_counts = features.groupby("risk_level", sort=False).size()
+        high_risk = features.loc[features["risk_level"] == "high", ["customer_id", "churn_probability", "risk_level", "segment"]]
         
         return {
-            "total_at_risk": len([a for a in churn_analysis if a['churn_probability'] > 0.6]),
-            "high_risk_customers": [a for a in churn_analysis if a['risk_level'] == 'high'],
-            "risk_distribution": {k: len(v) for k, v in risk_distribution.items()},
-            "urgent_interventions": len([a for a in churn_analysis if a['churn_probability'] > 0.8])
+            "total_at_risk": int((churn_prob > 0.6).sum()),
+            "high_risk_customers": high_risk.to_dict('records'),
+            "risk_distribution": {risk: int(count) for risk, count in risk_counts.items()},
+            "urgent_interventions": int((churn_prob > 0.8).sum())
         }
     
     def _categorize_churn_risk(self, churn_probability: float) -> str:
@@ -461,60 +580,57 @@ class LeadIntelligenceAgent:
         else:
             return "critical"
     
-    def _identify_revenue_opportunities(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_revenue_opportunities(self, df: pd.DataFrame, features: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Identify revenue opportunities in customer base"""
-        opportunities = {
-            "upsell_candidates": [],
-            "cross_sell_opportunities": [],
-            "retention_priority": [],
+        features = self._build_feature_frame(df) if features is None else features
+        
+        # Upsell opportunities
+        upsell = features[features["upsell_candidate"]]
+        upsell_candidates = pd.DataFrame({
+            "customer_id": upsell["customer_id"],
+            "opportunity": "Data plan upgrade",
+            "revenue_potential": upsell["monthly_spend"] * 0.3
+        })
+        
+        # Cross-sell opportunities
+        cross_sell = features[features["family_conversion"]]
+        cross_sell_opportunities = pd.DataFrame({
+            "customer_id": cross_sell["customer_id"],
+            "opportunity": "Family plan conversion",
+            "revenue_potential": cross_sell["monthly_spend"] * 1.5
+        })
+        
+        # Retention priority
+        retention = features[(features["churn_probability"] > 0.6) & (features["spend"] > 100)]
+        retention_priority = pd.DataFrame({
+            "customer_id": retention["customer_id"],
+            "churn_risk": retention["churn_probability"],
+            "revenue_at_risk": retention["monthly_spend"] * 12
+        })
+        
+        return {
+            "upsell_candidates": upsell_candidates.to_dict('records'),
+            "cross_sell_opportunities": cross_sell_opportunities.to_dict('records'),
+            "retention_priority": retention_priority.to_dict('records'),
             "new_service_potential": []
         }
-        
-        for customer in df.to_dict('records'):
-            customer_id = customer.get('customer_id', 'unknown')
-            
-            # Upsell opportunities
-            if customer.get('data_usage_gb', 0) > customer.get('plan_data_limit', 100) * 0.8:
-                opportunities["upsell_candidates"].append({
-                    "customer_id": customer_id,
-                    "opportunity": "Data plan upgrade",
-                    "revenue_potential": customer.get('monthly_spend', 0) * 0.3
-                })
-            
-            # Cross-sell opportunities
-            if customer.get('family_lines', 0) > 1 and not customer.get('family_plan', False):
-                opportunities["cross_sell_opportunities"].append({
-                    "customer_id": customer_id,
-                    "opportunity": "Family plan conversion",
-                    "revenue_potential": customer.get('monthly_spend', 0) * 1.5
-                })
-            
-            # Retention priority
-            churn_prob = self._calculate_churn_probability(customer)
-            if churn_prob > 0.6 and customer.get('monthly_spend', 0) > 100:
-                opportunities["retention_priority"].append({
-                    "customer_id": customer_id,
-                    "churn_risk": churn_prob,
-                    "revenue_at_risk": customer.get('monthly_spend', 0) * 12
-                })
-        
-        return opportunities
-    
-    def _analyze_market_trends(self, df: pd.DataFrame) -> Dict[str, Any]:
+    
+    def _analyze_market_trends(self, df: pd.DataFrame, features: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Analyze market trends from customer data"""
+        features = self._build_feature_frame(df) if features is None else features
         trends = {
-            "data_usage_growth": self._calculate_data_usage_trend(df),
-            "service_adoption": self._analyze_service_adoption(df),
+            "data_usage_growth": self._calculate_data_usage_trend(features),
+            "service_adoption": self._analyze_service_adoption(features),
             "geographic_patterns": self._analyze_geographic_patterns(df),
             "seasonal_patterns": self._identify_seasonal_patterns(df)
         }
         
         return trends
     
-    def _calculate_data_usage_trend(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_data_usage_trend(self, features: pd.DataFrame) -> Dict[str, Any]:
         """Calculate data usage trends"""
-        avg_usage = df['data_usage_gb'].mean() if 'data_usage_gb' in df.columns else 0
-        high_usage_pct = len(df[df.get('data_usage_gb', 0) > 50]) / len(df) * 100 if len(df) > 0 else 0
+        avg_usage = features['data_usage_gb'].mean() if len(features) > 0 else 0
+        high_usage_pct = (features['data_usage_gb'] > 50).mean() * 100 if len(features) > 0 else 0
         
         return {
             "average_usage_gb": round(avg_usage, 2),
@@ -522,12 +638,12 @@ class LeadIntelligenceAgent:
             "trend": "increasing" if avg_usage > 30 else "stable"
         }
     
-    def _analyze_service_adoption(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_service_adoption(self, features: pd.DataFrame) -> Dict[str, Any]:
         """Analyze service adoption patterns"""
         return {
-            "5g_adoption": len(df[df.get('plan_type', '') == '5G']) / len(df) * 100 if len(df) > 0 else 0,
-            "family_plans": len(df[df.get('family_lines', 0) > 1]) / len(df) * 100 if len(df) > 0 else 0,
-            "business_services": len(df[df.get('business_features', False)]) / len(df) * 100 if len(df) > 0 else 0
+            "5g_adoption": features['plan_5g'].mean() * 100 if len(features) > 0 else 0,
+            "family_plans": features['family_lines_multi'].mean() * 100 if len(features) > 0 else 0,
+            "business_services": features['business_features'].mean() * 100 if len(features) > 0 else 0
         }
     
     def _analyze_geographic_patterns(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -547,13 +663,13 @@ class LeadIntelligenceAgent:
             "business_quarter_patterns": True
         }
     
-    def _identify_delegation_needs(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _identify_delegation_needs(self, df: pd.DataFrame, features: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         """Identify items that need delegation to Revenue Agent"""
+        features = self._build_feature_frame(df) if features is None else features
         delegation_items = []
         
         # High-value customers needing pricing strategy
-        high_value_customers = len([c for c in df.to_dict('records') 
-                                  if c.get('monthly_spend', 0) > 150])
+        high_value_customers = int((features["spend"] > 150).sum())
         
         if high_value_customers > 0:
             delegation_items.append({
@@ -564,8 +680,7 @@ class LeadIntelligenceAgent:
             })
         
         # Churn risk customers needing retention offers
-        high_churn_customers = len([c for c in df.to_dict('records') 
-                                  if self._calculate_churn_probability(c) > 0.7])
+        high_churn_customers = int((features["churn_probability"] > 0.7).sum())
         
         if high_churn_customers > 0:
             delegation_items.append({
@@ -576,8 +691,7 @@ class LeadIntelligenceAgent:
             })
         
         # Family plan opportunities
-        family_opportunities = len([c for c in df.to_dict('records') 
-                                  if c.get('family_lines', 0) > 1 and not c.get('family_plan', False)])
+        family_opportunities = int(features["family_conversion"].sum())
         
         if family_opportunities > 0:
             delegation_items.append({
@@ -589,10 +703,8 @@ class LeadIntelligenceAgent:
         
         return delegation_items
     
-    def _analyze_score_distribution(self, analyses: List[LeadAnalysis]) -> Dict[str, Any]:
+    def _analyze_score_distribution(self, scores: np.ndarray) -> Dict[str, Any]:
         """Analyze lead score distribution"""
-        scores = [a.lead_score for a in analyses]
-        
         return {
             "mean": round(np.mean(scores), 2),
             "median": round(np.median(scores), 2),
@@ -664,6 +776,65 @@ class LeadIntelligenceAgent:
         
         return requests
     
+    def _prepare_batch_delegation(self, features: pd.DataFrame,
+                                  delegation_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Bundle delegation items into one batched request for the Revenue Agent.
+        
+        Customers behind each delegation item are grouped by (request type,
+        segment, risk tier) so the Revenue Agent can compute each strategy once
+        and fan the result back out to the group's customers. Groups carry
+        customer ids, a count and group aggregates rather than per-customer
+        records; only retention groups, whose offers are priced per customer,
+        also carry their spend and churn columns.
+        """
+        selections = {
+            "pricing_strategy": features["spend"] > 150,
+            "retention_strategy": features["churn_probability"] > 0.7,
+            "family_plan_optimization": features["family_conversion"],
+        }
+        aggregate_columns = {
+            "monthly_spend": "sum",
+            "churn_probability": "mean",
+            "lead_score": "mean",
+            "lifetime_value": "mean",
+        }
+        
+        groups = []
+        for item in delegation_items:
+            request_type = item["type"]
+            if request_type not in selections:
+                continue
+            selected = features[selections[request_type]]
+            grouped = selected.groupby(["segment", "risk_level"], sort=False)
+            aggregates = grouped.agg(aggregate_columns)
+            for (segment, risk_level), index in grouped.indices.items():
+                group = {
+                    "request_type": request_type,
+                    "segment": segment,
+                    "risk_tier": f"{risk_level}_risk",
+                    "priority": item.get("priority", "medium"),
+                    "customer_count": len(index),
+                    "customer_ids": selected["customer_id"].iloc[index].tolist(),
+                    "aggregates": {
+                        f"total_{column}" if how == "sum" else f"avg_{column}":
+                            float(aggregates.at[(segment, risk_level), column])
+                        for column, how in aggregate_columns.items()
+                    }
+                }
+                if request_type == "retention_strategy":
+                    group["monthly_spend"] = selected["monthly_spend"].iloc[index].tolist()
+                    group["churn_probability"] = selected["churn_probability"].iloc[index].tolist()
+                groups.append(group)
+        
+        return {
+            "type": "batch_delegation",
+            "priority": "urgent" if any(item.get("priority") == "urgent" for item in delegation_items) else "high",
+            "description": f"Batched delegation of {len(delegation_items)} requests in {len(groups)} customer groups",
+            "requests": delegation_items,
+            "groups": groups
+        }
+    
     def get_agent_status(self) -> Dict[str, Any]:
         """Get current agent status and capabilities"""
         return {
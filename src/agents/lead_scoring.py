@@ -22,19 +22,32 @@ import time
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional, Tuple, Union
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from enum import Enum
+import heapq
 import math
 from collections import defaultdict, Counter
 import warnings
 
 # Import customer analysis components
 try:
-    from .customer_analysis import CustomerDataAnalyzer, FeatureSet, PatternAnalysis, CustomerSegment
+    from .customer_analysis import (
+        CustomerAnalysisContext,
+        CustomerDataAnalyzer,
+        FeatureSet,
+        PatternAnalysis,
+        CustomerSegment,
+    )
 except ImportError:
-    from customer_analysis import CustomerDataAnalyzer, FeatureSet, PatternAnalysis, CustomerSegment
+    from customer_analysis import (
+        CustomerAnalysisContext,
+        CustomerDataAnalyzer,
+        FeatureSet,
+        PatternAnalysis,
+        CustomerSegment,
+    )
 
 # Import Three HK business rules (optional integration)
 try:
@@ -51,9 +64,18 @@ except ImportError:
         # Suppress warning during package initialization to avoid circular import noise
         # The integration works fine when modules are imported individually
 
+# Import process pool helpers for parallel batch scoring
+try:
+    from ..utils.parallel_batch import iter_chunked_results, resolve_workers
+except ImportError:
+    from utils.parallel_batch import iter_chunked_results, resolve_workers
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Feature values that count as "not provided" when assessing data completeness
+DEFAULT_FEATURE_VALUES = frozenset([0, 0.0, "", "unknown", "general", "new"])
+
 
 class LeadPriority(Enum):
     """Lead priority levels for sales team routing."""
@@ -183,6 +205,9 @@ class LeadScoringEngine:
         """
         self.customer_analyzer = customer_analyzer or CustomerDataAnalyzer()
 
+        # Analysis contexts of the most recent batch, keyed by customer id
+        self.analysis_contexts: Dict[str, CustomerAnalysisContext] = {}
+
         # Initialize Three HK business rules integration if available
         if THREE_HK_INTEGRATION_AVAILABLE:
             self.three_hk_engine = ThreeHKBusinessRulesEngine()
@@ -264,6 +289,7 @@ class LeadScoringEngine:
         purchase_history: List[Dict[str, Any]],
         engagement_data: Optional[Dict[str, Any]] = None,
         market_context: Optional[Dict[str, Any]] = None,
+        context: Optional[CustomerAnalysisContext] = None,
     ) -> LeadScore:
         """
         Generate comprehensive lead score for a customer.
@@ -273,6 +299,7 @@ class LeadScoringEngine:
             purchase_history: Historical purchase records
             engagement_data: Customer engagement metrics
             market_context: Market and competitive context
+            context: Precomputed analysis context (built here if None)
 
         Returns:
             Comprehensive lead scoring results
@@ -280,15 +307,12 @@ class LeadScoringEngine:
         start_time = time.time()
 
         try:
-            # Extract customer features using the analyzer
-            features = self.customer_analyzer.extract_customer_features(
-                customer_data, purchase_history, engagement_data
-            )
-
-            # Analyze behavioral patterns
-            patterns = self.customer_analyzer.analyze_customer_patterns(
-                customer_data, purchase_history, engagement_data
-            )
+            # Extract features and behavioral patterns once per customer
+            if context is None:
+                context = self.customer_analyzer.build_analysis_context(
+                    customer_data, purchase_history, engagement_data
+                )
+            features, patterns = context.features, context.patterns
 
             # Score each category
             revenue_score = self._score_revenue_potential(features, patterns, market_context)
@@ -367,7 +391,10 @@ class LeadScoringEngine:
             )
 
     def prioritize_leads(
-        self, lead_scores: List[Tuple[str, LeadScore]], constraints: Optional[Dict[str, Any]] = None
+        self,
+        lead_scores: List[Tuple[str, LeadScore]],
+        constraints: Optional[Dict[str, Any]] = None,
+        contexts: Optional[Dict[str, CustomerAnalysisContext]] = None,
     ) -> List[PrioritizedLead]:
         """
         Prioritize and rank leads for sales team assignment.
@@ -375,33 +402,62 @@ class LeadScoringEngine:
         Args:
             lead_scores: List of (customer_id, LeadScore) tuples
             constraints: Optional constraints for prioritization
+            contexts: Optional analysis contexts by customer id, used for offer matching
+
+        Returns:
+            Ranked list of prioritized leads
+        """
+        return self.prioritize_lead_stream(lead_scores, constraints, contexts)
+
+    def prioritize_lead_stream(
+        self,
+        lead_scores: Iterable[Tuple[Any, ...]],
+        constraints: Optional[Dict[str, Any]] = None,
+        contexts: Optional[Dict[str, CustomerAnalysisContext]] = None,
+    ) -> List[PrioritizedLead]:
+        """
+        Prioritize leads from a stream of scores, keeping only the top candidates.
+
+        A bounded min-heap holds the best ``max_leads`` qualified leads seen so
+        far, so memory is O(K) and time O(N log K) for N scored leads. Leads are
+        ranked by (priority_score, urgency_factor, revenue_potential) descending,
+        ties keeping input order, exactly as a full stable sort would. Offer
+        matching only runs for the final K leads.
+
+        Args:
+            lead_scores: Iterable of (customer_id, LeadScore) or
+                (customer_id, LeadScore, CustomerAnalysisContext) tuples
+            constraints: Optional constraints for prioritization
+            contexts: Optional analysis contexts by customer id, used for offer matching
 
         Returns:
             Ranked list of prioritized leads
         """
         try:
             constraints = constraints or {}
+            contexts = contexts or {}
             max_leads = constraints.get("max_leads", 100)
             min_score_threshold = constraints.get("min_score_threshold", 20.0)
 
-            # Filter leads by minimum score
-            qualified_leads = [
-                (customer_id, score) for customer_id, score in lead_scores if score.overall_score >= min_score_threshold
-            ]
-
-            # Sort by priority score (descending)
-            sorted_leads = sorted(
-                qualified_leads,
-                key=lambda x: (x[1].priority_score, x[1].urgency_factor, x[1].revenue_potential),
-                reverse=True,
-            )
-
-            # Limit to max leads
-            top_leads = sorted_leads[:max_leads]
-
-            # Create prioritized lead objects
+            # Bounded heap of (rank key, -input index, customer_id, LeadScore, context);
+            # the root is the weakest lead kept so far
+            heap = []
+            candidates = 0
+            for index, (customer_id, lead_score, *context) in enumerate(lead_scores):
+                candidates += 1
+                if max_leads <= 0 or lead_score.overall_score < min_score_threshold:
+                    continue
+
+                rank_key = (lead_score.priority_score, lead_score.urgency_factor, lead_score.revenue_potential)
+                entry = (rank_key, -index, customer_id, lead_score, context[0] if context else None)
+                if len(heap) < max_leads:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+
+            # Create prioritized lead objects for the survivors only
             prioritized_leads = []
-            for position, (customer_id, lead_score) in enumerate(top_leads, 1):
+            for position, (_, _, customer_id, lead_score, context) in enumerate(sorted(heap, reverse=True), 1):
                 prioritized_lead = PrioritizedLead(
                     customer_id=customer_id,
                     lead_score=lead_score,
@@ -410,11 +466,17 @@ class LeadScoringEngine:
                 )
 
                 # Add relevant offers based on score (enhanced matching if customer data available)
-                prioritized_lead.relevant_offers = self._match_relevant_offers(lead_score)
+                context = context or contexts.get(customer_id)
+                if context is not None:
+                    prioritized_lead.customer_features = context.features
+                    prioritized_lead.customer_segment = context.segment
+                prioritized_lead.relevant_offers = self._match_relevant_offers(
+                    lead_score, prioritized_lead.customer_features, prioritized_lead.customer_segment
+                )
 
                 prioritized_leads.append(prioritized_lead)
 
-            logger.info(f"Prioritized {len(prioritized_leads)} leads from {len(lead_scores)} candidates")
+            logger.info(f"Prioritized {len(prioritized_leads)} leads from {candidates} candidates")
 
             return prioritized_leads
 
@@ -423,35 +485,29 @@ class LeadScoringEngine:
             return []
 
     def batch_score_leads(
-        self, customer_datasets: List[Dict[str, Any]], market_context: Optional[Dict[str, Any]] = None
+        self,
+        customer_datasets: List[Dict[str, Any]],
+        market_context: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = 1,
+        chunk_size: Optional[int] = None,
     ) -> List[Tuple[str, LeadScore]]:
         """
         Score multiple leads in batch for efficiency.
 
+        The analysis context of every scored customer is kept in
+        ``self.analysis_contexts`` so prioritization can reuse it.
+
         Args:
             customer_datasets: List of customer data for scoring
             market_context: Market context for all leads
+            workers: Worker processes to shard the batch across (all cores if None)
+            chunk_size: Customers per worker chunk (derived from workers if None)
 
         Returns:
             List of (customer_id, LeadScore) tuples
         """
         try:
-            scored_leads = []
-
-            for i, data in enumerate(customer_datasets):
-                customer_data = data.get("customer_data", {})
-                purchase_history = data.get("purchase_history", [])
-                engagement_data = data.get("engagement_data", {})
-
-                customer_id = customer_data.get("customer_id", f"unknown_{i}")
-
-                lead_score = self.score_lead(customer_data, purchase_history, engagement_data, market_context)
-
-                scored_leads.append((customer_id, lead_score))
-
-                # Log progress for large batches
-                if (i + 1) % 50 == 0:
-                    logger.info(f"Scored {i + 1}/{len(customer_datasets)} leads")
+            scored_leads = list(self.iter_score_leads(customer_datasets, market_context, workers, chunk_size))
 
             logger.info(f"Batch scoring completed: {len(scored_leads)} leads processed")
 
@@ -461,6 +517,78 @@ class LeadScoringEngine:
             logger.error(f"Batch lead scoring failed: {e}")
             return []
 
+    def iter_score_leads(
+        self,
+        customer_datasets: List[Dict[str, Any]],
+        market_context: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = 1,
+        chunk_size: Optional[int] = None,
+        include_contexts: bool = False,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream lead scores in input order.
+
+        With more than one worker the datasets are sharded into contiguous
+        chunks across a process pool; each worker process receives a copy of
+        this engine once, and chunk results are yielded as soon as every
+        earlier chunk has been yielded.
+
+        Args:
+            customer_datasets: List of customer data for scoring
+            market_context: Market context for all leads
+            workers: Worker processes to shard the batch across (all cores if None)
+            chunk_size: Customers per worker chunk (derived from workers if None)
+            include_contexts: Yield each analysis context with its score instead
+                of keeping every context in ``self.analysis_contexts``
+
+        Yields:
+            (customer_id, LeadScore) tuples, or (customer_id, LeadScore, context)
+            tuples when include_contexts is set
+        """
+        self.analysis_contexts = {}
+
+        if resolve_workers(workers) > 1 and len(customer_datasets) > 1:
+            chunks = iter_chunked_results(
+                _score_chunk,
+                customer_datasets,
+                market_context,
+                workers=workers,
+                chunk_size=chunk_size,
+                initializer=_init_scoring_worker,
+                initargs=(self,),
+            )
+            results = (result for _, chunk_results in chunks for result in chunk_results)
+        else:
+            results = (
+                self._score_dataset(i, data, market_context) for i, data in enumerate(customer_datasets)
+            )
+
+        for scored, (customer_id, lead_score, context) in enumerate(results, 1):
+            if include_contexts:
+                yield customer_id, lead_score, context
+            else:
+                self.analysis_contexts[customer_id] = context
+                yield customer_id, lead_score
+
+            # Log progress for large batches
+            if scored % 50 == 0:
+                logger.info(f"Scored {scored}/{len(customer_datasets)} leads")
+
+    def _score_dataset(
+        self, index: int, data: Dict[str, Any], market_context: Optional[Dict[str, Any]]
+    ) -> Tuple[str, LeadScore, CustomerAnalysisContext]:
+        """Score one entry of a batch, returning its id, score and analysis context."""
+        customer_data = data.get("customer_data", {})
+        purchase_history = data.get("purchase_history", [])
+        engagement_data = data.get("engagement_data", {})
+
+        customer_id = customer_data.get("customer_id", f"unknown_{index}")
+
+        context = self.customer_analyzer.build_analysis_context(customer_data, purchase_history, engagement_data)
+        lead_score = self.score_lead(customer_data, purchase_history, engagement_data, market_context, context=context)
+
+        return customer_id, lead_score, context
+
     def _score_revenue_potential(
         self, features: FeatureSet, patterns: List[PatternAnalysis], market_context: Optional[Dict[str, Any]]
     ) -> float:
@@ -680,10 +808,8 @@ class LeadScoringEngine:
             confidence_factors = []
 
             # Data completeness
-            feature_dict = features.to_dict()
-            non_default_features = sum(
-                1 for v in feature_dict.values() if v not in [0, 0.0, "", "unknown", "general", "new"]
-            )
+            feature_dict = vars(features)
+            non_default_features = sum(1 for v in feature_dict.values() if v not in DEFAULT_FEATURE_VALUES)
             total_features = len(feature_dict)
             completeness = non_default_features / total_features
             confidence_factors.append(completeness * 0.4)
@@ -913,6 +1039,24 @@ class LeadScoringEngine:
         return list(set(offers))  # Remove duplicates
 
 
+# Process pool workers for parallel batch scoring
+
+_worker_engine: Optional[LeadScoringEngine] = None
+
+
+def _init_scoring_worker(engine: LeadScoringEngine) -> None:
+    """Install the scoring engine once per worker process."""
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _score_chunk(
+    start: int, chunk: List[Dict[str, Any]], market_context: Optional[Dict[str, Any]]
+) -> List[Tuple[str, LeadScore, CustomerAnalysisContext]]:
+    """Score a contiguous chunk of a batch in a worker process."""
+    return [_worker_engine._score_dataset(start + offset, data, market_context) for offset, data in enumerate(chunk)]
+
+
 # Convenience functions for easy integration
 
 
@@ -939,7 +1083,11 @@ def score_single_lead(
 
 
 def batch_score_and_prioritize(
-    customer_datasets: List[Dict[str, Any]], market_context: Optional[Dict[str, Any]] = None, max_leads: int = 100
+    customer_datasets: List[Dict[str, Any]],
+    market_context: Optional[Dict[str, Any]] = None,
+    max_leads: int = 100,
+    workers: Optional[int] = 1,
+    chunk_size: Optional[int] = None,
 ) -> List[PrioritizedLead]:
     """
     Convenience function to score and prioritize multiple leads.
@@ -948,18 +1096,20 @@ def batch_score_and_prioritize(
         customer_datasets: List of customer data for scoring
         market_context: Market context
         max_leads: Maximum number of leads to return
+        workers: Worker processes for scoring (all cores if None)
+        chunk_size: Customers per worker chunk
 
     Returns:
         Prioritized list of leads
     """
     engine = LeadScoringEngine()
 
-    # Score all leads
-    scored_leads = engine.batch_score_leads(customer_datasets, market_context)
+    # Score leads as a stream so only the top candidates are kept in memory
+    scored_leads = engine.iter_score_leads(customer_datasets, market_context, workers, chunk_size, include_contexts=True)
 
     # Prioritize leads
     constraints = {"max_leads": max_leads, "min_score_threshold": 20.0}
-    prioritized_leads = engine.prioritize_leads(scored_leads, constraints)
+    prioritized_leads = engine.prioritize_lead_stream(scored_leads, constraints)
 
     return prioritized_leads
 
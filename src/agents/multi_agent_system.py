@@ -566,10 +566,17 @@ class MultiAgentRevenueSystem:
             revenue_agent = create_revenue_optimization_agent()
             logger.info("Revenue Optimization Agent processing delegations...")
             
-            revenue_responses = []
-            for item in delegation_items:
-                response = revenue_agent.respond_to_delegation(item)
-                revenue_responses.append(response)
+            # All delegation items travel in one batched round-trip when available
+            batch_request = lead_analysis.get("batch_delegation")
+            batch_response = None
+            if batch_request and batch_request.get("groups"):
+                batch_response = revenue_agent.respond_to_delegation(batch_request)
+                revenue_responses = batch_response.get("responses", [])
+            else:
+                revenue_responses = []
+                for item in delegation_items:
+                    response = revenue_agent.respond_to_delegation(item)
+                    revenue_responses.append(response)
             
             # Step 4: Revenue Agent provides additional analysis
             revenue_analysis = revenue_agent.optimize_revenue_opportunities(lead_analysis)
@@ -591,6 +598,7 @@ class MultiAgentRevenueSystem:
                 "agent_collaboration": {
                     "delegation_items": delegation_items,
                     "revenue_responses": revenue_responses,
+                    "batch_delegation_response": batch_response,
                     "collaboration_requests": collaboration_requests
                 },
                 "combined_recommendations": self._synthesize_recommendations(
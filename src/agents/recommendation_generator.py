@@ -17,8 +17,9 @@ from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 from enum import Enum
+from numbers import Real
 
-from .customer_analysis import CustomerDataAnalyzer
+from .customer_analysis import CustomerAnalysisContext, CustomerDataAnalyzer
 from .lead_scoring import LeadScoringEngine
 from .three_hk_business_rules import ThreeHKBusinessRulesEngine
 
@@ -32,6 +33,16 @@ class RecommendationPriority(Enum):
     WATCH = "watch"  # Monitor for changes
 
 
+# Weight of each priority in business impact and ranking
+PRIORITY_WEIGHTS = {
+    RecommendationPriority.CRITICAL: 1.0,
+    RecommendationPriority.HIGH: 0.8,
+    RecommendationPriority.MEDIUM: 0.6,
+    RecommendationPriority.LOW: 0.4,
+    RecommendationPriority.WATCH: 0.2,
+}
+
+
 class ActionType(Enum):
     """Types of recommended actions"""
     IMMEDIATE_CALL = "immediate_call"
@@ -168,6 +179,9 @@ class RecommendationGenerator:
     ) -> List[ActionableRecommendation]:
         """
         Generate ranked actionable recommendations for a set of leads
+
+        The frame is converted to records once. Leads are ranked by a vectorized
+        key and recommendations are built only for the best max_recommendations.
         
         Args:
             leads_data: DataFrame with lead information
@@ -178,31 +192,36 @@ class RecommendationGenerator:
         """
         self.logger.info(f"Generating recommendations for {len(leads_data)} leads")
 
-        recommendations = []
-
-        for _, lead_row in leads_data.iterrows():
-            try:
-                # Get comprehensive analysis for this lead
-                customer_analysis = self._get_customer_analysis(lead_row)
-                lead_scores = self._get_lead_scores(lead_row)
-                offer_matches = self._get_offer_matches(lead_row, customer_analysis)
-
-                # Generate recommendation based on analysis
-                recommendation = self._create_recommendation(
-                    lead_row, customer_analysis, lead_scores, offer_matches
-                )
+        if max_recommendations <= 0:
+            return []
 
-                if recommendation:
-                    recommendations.append(recommendation)
+        # Convert the frame once; every stage works on the same row records
+        records = leads_data.to_dict("records")
+        inputs = self._get_all_lead_inputs(leads_data, records)
 
-            except Exception as e:
-                self.logger.error(
-                    f"Error generating recommendation for lead {lead_row.get('customer_id', 'unknown')}: {e}"
+        try:
+            ranking_scores, buildable = self._ranking_scores_bulk(inputs)
+        except (TypeError, ValueError, AttributeError) as e:
+            # Inputs the vectorized key cannot represent: build and rank every recommendation
+            self.logger.debug(f"Falling back to per-lead ranking: {e}")
+            recommendations = [
+                rec for rec in (self._create_recommendation(record, *lead_inputs) for record, lead_inputs in zip(records, inputs))
+                if rec
+            ]
+            ranked_recommendations = self._rank_recommendations(recommendations)[:max_recommendations]
+        else:
+            # Build recommendations only for the top candidates, taking more if some fail to build
+            ranked_recommendations = []
+            remaining = buildable
+            while len(ranked_recommendations) < max_recommendations and remaining.any():
+                candidates = self._select_top_candidates(
+                    ranking_scores, remaining, max_recommendations - len(ranked_recommendations)
                 )
-                continue
-
-        # Rank recommendations by business impact
-        ranked_recommendations = self._rank_recommendations(recommendations)
+                remaining[candidates] = False
+                for row in candidates.tolist():
+                    recommendation = self._create_recommendation(records[row], *inputs[row])
+                    if recommendation:
+                        ranked_recommendations.append(recommendation)
 
         # Apply business constraints and limits
         final_recommendations = self._apply_business_constraints(
@@ -214,32 +233,112 @@ class RecommendationGenerator:
         )
         return final_recommendations
 
-    def _get_customer_analysis(self, lead_row: pd.Series) -> Dict[str, Any]:
+    def _get_all_lead_inputs(
+        self, leads_data: pd.DataFrame, records: List[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], Dict[str, float], List[Dict[str, Any]]]]:
+        """
+        Customer analysis, lead scores and offer matches of every lead
+
+        Collaborators with the per-lead dict methods are called once per lead. The
+        analysis engines are used through their batch APIs instead, falling back to
+        the per-lead calls if the batch analysis fails.
+        """
+        if not hasattr(self.customer_analyzer, "analyze_single_customer"):
+            try:
+                return self._get_engine_lead_inputs(leads_data, records)
+            except Exception as e:
+                self.logger.warning(f"Batch lead analysis failed, analyzing leads one by one: {e}")
+        return [self._get_lead_inputs(record) for record in records]
+
+    def _get_engine_lead_inputs(
+        self, leads_data: pd.DataFrame, records: List[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], Dict[str, float], List[Dict[str, Any]]]]:
+        """
+        Lead inputs from the analysis engines, adapted to the generator's dicts
+
+        Features are extracted in one columnar pass and offers are matched in bulk.
+        Each lead is scored from its extracted features, so nothing is re-extracted.
+        Engine scores (0-100) are scaled to the 0-1 scores the generator works with.
+        """
+        feature_matrix = self.customer_analyzer.extract_feature_matrix(leads_data)
+        if len(feature_matrix) != len(records):
+            raise ValueError("Leads frame is not one row per customer")
+
+        analyses, scores, lead_scores, segments = [], [], [], []
+        for record, features in zip(records, feature_matrix.iter_feature_sets()):
+            segment, confidence = self.customer_analyzer.segment_customer(record, [], features=features)
+            context = CustomerAnalysisContext(
+                customer_id=record.get("customer_id", "unknown"),
+                features=features,
+                patterns=self.customer_analyzer.analyze_customer_patterns(record, [], features=features),
+                segment=segment,
+                segment_confidence=confidence,
+            )
+            lead_score = self.lead_scorer.score_lead(record, [], context=context)
+            segments.append(segment)
+            lead_scores.append(lead_score)
+            analyses.append({
+                "customer_segment": segment.value,
+                "churn_risk": features.churn_risk_score,
+                "expansion_potential": features.upsell_propensity,
+                "competitor_interest": features.competitor_switch_risk > 0.5,
+            })
+            scores.append({
+                key: getattr(lead_score, key) / 100
+                for key in ("overall_score", "conversion_probability", "urgency_factor", "revenue_potential", "strategic_value")
+            })
+
+        offers = self.business_rules.match_offers_bulk(feature_matrix, lead_scores, segments, top_n=3)
+        offer_dicts = [
+            [
+                {
+                    "name": offer.product.product_name,
+                    "category": offer.product.category.value,
+                    "monthly_value": float(offer.estimated_monthly_value or offer.recommended_price),
+                    "key_benefit": (offer.key_selling_points or ["Enhanced service"])[0],
+                    "compliance_score": offer.match_score / 100,
+                }
+                for offer in customer_offers
+            ]
+            for customer_offers in offers
+        ]
+        return list(zip(analyses, scores, offer_dicts))
+
+    def _get_lead_inputs(
+        self, lead_record: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, float], List[Dict[str, Any]]]:
+        """Customer analysis, lead scores and offer matches of one lead"""
+        customer_analysis = self._get_customer_analysis(lead_record)
+        lead_scores = self._get_lead_scores(lead_record)
+        offer_matches = self._get_offer_matches(lead_record, customer_analysis)
+        return customer_analysis, lead_scores, offer_matches
+
+    def _get_customer_analysis(self, lead_record: Dict[str, Any]) -> Dict[str, Any]:
         """Get customer analysis from CustomerDataAnalyzer"""
         try:
             # Use single customer analysis method
-            analysis = self.customer_analyzer.analyze_single_customer(lead_row.to_dict())
+            analysis = self.customer_analyzer.analyze_single_customer(lead_record)
             return analysis if analysis else {}
         except Exception as e:
             self.logger.warning(f"Customer analysis failed: {e}")
             return {}
 
-    def _get_lead_scores(self, lead_row: pd.Series) -> Dict[str, float]:
+    def _get_lead_scores(self, lead_record: Dict[str, Any]) -> Dict[str, float]:
         """Get lead scores from LeadScoringEngine"""
         try:
-            scores = self.lead_scorer.score_single_lead(lead_row.to_dict())
+            scores = self.lead_scorer.score_single_lead(lead_record)
             return scores if scores else {}
         except Exception as e:
             self.logger.warning(f"Lead scoring failed: {e}")
             return {}
 
     def _get_offer_matches(
-        self, lead_row: pd.Series, customer_analysis: Dict[str, Any]
+        self, lead_record: Dict[str, Any], customer_analysis: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         """Get offer matches from ThreeHKBusinessRulesEngine"""
         try:
             offers = self.business_rules.match_offers_for_customer(
-                lead_row.to_dict(), customer_analysis
+                lead_record, customer_analysis
             )
             return offers[:3]  # Top 3 offers
         except Exception as e:
@@ -248,7 +347,7 @@ class RecommendationGenerator:
 
     def _create_recommendation(
         self,
-        lead_row: pd.Series,
+        lead_row: Dict[str, Any],
         customer_analysis: Dict[str, Any],
         lead_scores: Dict[str, float],
         offer_matches: List[Dict[str, Any]],
@@ -264,9 +363,10 @@ class RecommendationGenerator:
             priority = self._calculate_priority(lead_scores, customer_analysis)
 
             # Get template for this action type
-            template = self.recommendation_templates.get(
-                action_type, self.recommendation_templates[ActionType.FOLLOW_UP]
-            )
+            if action_type in self.recommendation_templates:
+                template = self.recommendation_templates[action_type]
+            else:
+                template = self.recommendation_templates[ActionType.FOLLOW_UP]
 
             # Generate explanation
             explanation = self._generate_explanation(
@@ -480,15 +580,7 @@ class RecommendationGenerator:
         revenue_score = min(1.0, expected_revenue / 100000)  # Normalize to 100K HKD
         conversion_score = conversion_probability
         
-        priority_multiplier = {
-            RecommendationPriority.CRITICAL: 1.0,
-            RecommendationPriority.HIGH: 0.8,
-            RecommendationPriority.MEDIUM: 0.6,
-            RecommendationPriority.LOW: 0.4,
-            RecommendationPriority.WATCH: 0.2,
-        }
-        
-        return (revenue_score * 0.5 + conversion_score * 0.5) * priority_multiplier[priority]
+        return (revenue_score * 0.5 + conversion_score * 0.5) * PRIORITY_WEIGHTS[priority]
 
     def _generate_talking_points(
         self, customer_analysis: Dict[str, Any], offer_matches: List[Dict[str, Any]]
@@ -601,23 +693,132 @@ class RecommendationGenerator:
         
         def ranking_score(rec: ActionableRecommendation) -> float:
             # Multi-factor ranking
-            priority_weight = {
-                RecommendationPriority.CRITICAL: 1.0,
-                RecommendationPriority.HIGH: 0.8,
-                RecommendationPriority.MEDIUM: 0.6,
-                RecommendationPriority.LOW: 0.4,
-                RecommendationPriority.WATCH: 0.2,
-            }
-            
             return (
                 rec.business_impact_score * 0.4 +
-                priority_weight[rec.priority] * 0.3 +
+                PRIORITY_WEIGHTS[rec.priority] * 0.3 +
                 rec.conversion_probability * 0.2 +
                 rec.urgency_score * 0.1
             )
         
         return sorted(recommendations, key=ranking_score, reverse=True)
 
+    def _ranking_scores_bulk(
+        self, inputs: List[Tuple[Dict[str, Any], Dict[str, float], List[Dict[str, Any]]]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ranking score of every lead, computed column-wise without building recommendations.
+
+        Mirrors _determine_action_type, _calculate_priority, _calculate_urgency_score,
+        _calculate_business_impact_score and _rank_recommendations with the same
+        floating point operations, so the scores equal those of the built objects.
+
+        Args:
+            inputs: (customer_analysis, lead_scores, offer_matches) of each lead
+
+        Returns:
+            (ranking_scores, buildable): float scores and a mask of the leads whose
+            action type has a recommendation template
+
+        Raises:
+            TypeError, ValueError: If a score is not a real number
+        """
+        analyses = [customer_analysis for customer_analysis, _, _ in inputs]
+        scores = [lead_scores for _, lead_scores, _ in inputs]
+        offers = [offer_matches for _, _, offer_matches in inputs]
+
+        def column(dicts: List[Dict[str, Any]], key: str, default: float) -> np.ndarray:
+            values = [d.get(key, default) for d in dicts]
+            if not all(isinstance(value, Real) for value in values):
+                raise TypeError(f"Non-numeric {key}")
+            return np.array(values, dtype=float)
+
+        overall = column(scores, "overall_score", 0)
+        urgency_factor = column(scores, "urgency_factor", 0)
+        churn_risk = column(analyses, "churn_risk", 0)
+        has_offers = np.array([bool(offer_matches) for offer_matches in offers], dtype=bool)
+        existing_customer = np.array(
+            [a.get("customer_segment") in ["existing_premium", "existing_basic"] for a in analyses], dtype=bool
+        )
+
+        # Action type; only the types with a template can be built
+        action_types = np.select(
+            [
+                (urgency_factor > 0.8) & (overall > 0.7),
+                (column(scores, "conversion_probability", 0) > 0.6) & (overall > 0.6),
+                has_offers & (overall > 0.5),
+                existing_customer & (overall > 0.4),
+                churn_risk > 0.3,
+            ],
+            [
+                ActionType.IMMEDIATE_CALL.value,
+                ActionType.SCHEDULE_MEETING.value,
+                ActionType.SEND_PROPOSAL.value,
+                ActionType.OFFER_UPGRADE.value,
+                ActionType.RETENTION_OUTREACH.value,
+            ],
+            ActionType.FOLLOW_UP.value,
+        )
+        buildable = np.isin(action_types, [action_type.value for action_type in self.recommendation_templates])
+
+        # Priority weight
+        priority_weight = np.select(
+            [
+                (urgency_factor > 0.8) & (overall > 0.7) & (column(scores, "revenue_potential", 0) > 0.7),
+                (overall > 0.6) & (urgency_factor > 0.5),
+                overall > 0.4,
+                overall > 0.2,
+            ],
+            [
+                PRIORITY_WEIGHTS[RecommendationPriority.CRITICAL],
+                PRIORITY_WEIGHTS[RecommendationPriority.HIGH],
+                PRIORITY_WEIGHTS[RecommendationPriority.MEDIUM],
+                PRIORITY_WEIGHTS[RecommendationPriority.LOW],
+            ],
+            PRIORITY_WEIGHTS[RecommendationPriority.WATCH],
+        )
+
+        # Business metrics of the recommendation
+        expected_revenue = np.array(
+            [
+                self._calculate_expected_revenue(offer_matches, lead_scores.get("overall_score", 0))
+                for offer_matches, lead_scores in zip(offers, scores)
+            ],
+            dtype=float,
+        )
+        conversion_probability = column(scores, "conversion_probability", 0.5)
+        business_impact = (
+            np.minimum(1.0, expected_revenue / 100000) * 0.5 + conversion_probability * 0.5
+        ) * priority_weight
+        competitor_interest = np.array([bool(a.get("competitor_interest", False)) for a in analyses], dtype=bool)
+        urgency_score = np.minimum(
+            1.0,
+            column(scores, "urgency_factor", 0.3)
+            + np.where(churn_risk > 0.5, 0.3, 0.0)
+            + np.where(competitor_interest, 0.2, 0.0),
+        )
+
+        ranking_scores = (
+            business_impact * 0.4 + priority_weight * 0.3 + conversion_probability * 0.2 + urgency_score * 0.1
+        )
+        if np.isnan(ranking_scores[buildable]).any():
+            raise ValueError("Undefined ranking score")
+        return ranking_scores, buildable
+
+    def _select_top_candidates(self, ranking_scores: np.ndarray, mask: np.ndarray, count: int) -> np.ndarray:
+        """
+        Positions of the ``count`` best masked leads in ranking order.
+
+        Ties keep input order, as the stable sort of _rank_recommendations does; only the
+        leads at or above the count-th best score are sorted.
+        """
+        candidates = np.flatnonzero(mask)
+        scores = ranking_scores[candidates]
+        if count < len(candidates):
+            threshold = np.partition(scores, len(scores) - count)[len(scores) - count]
+            kept = scores >= threshold
+            candidates, scores = candidates[kept], scores[kept]
+        return candidates[np.lexsort((candidates, -scores))[:count]]
+
     def _apply_business_constraints(
         self, recommendations: List[ActionableRecommendation], max_recommendations: int
     ) -> List[ActionableRecommendation]:
@@ -18,7 +18,7 @@ import os
 import json
 import logging
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import pandas as pd
 
@@ -410,6 +410,9 @@ class RevenueOptimizationAgent:
         
         retention_offers = []
         
+        # Offer design only depends on (segment, risk level); compute it once per pair
+        offer_strategies = {}
+        
         try:
             for customer in at_risk_customers:
                 customer_id = customer.get("customer_id", "unknown")
@@ -420,23 +423,21 @@ class RevenueOptimizationAgent:
                 # Determine risk level
                 risk_level = self._categorize_retention_risk(churn_prob)
                 
-                # Get retention template
+                # Get retention template and the shared offer design for this group
                 template = self.retention_templates.get(risk_level, self.retention_templates["medium_risk"])
-                
-                # Customize offer based on customer profile
-                customized_offer = self._customize_retention_offer(
-                    customer, template, risk_level
-                )
+                if (segment, risk_level) not in offer_strategies:
+                    offer_strategies[(segment, risk_level)] = self._retention_offer_strategy(segment, template)
+                offer_strategy = offer_strategies[(segment, risk_level)]
                 
                 # Calculate revenue protection value
                 revenue_protection = monthly_spend * 12 * (1 - churn_prob)
                 
                 retention_offer = RetentionOffer(
                     customer_id=customer_id,
-                    offer_type=customized_offer["offer_type"],
-                    discount_amount=customized_offer["discount_amount"],
-                    additional_benefits=customized_offer["benefits"],
-                    offer_duration=customized_offer["duration"],
+                    offer_type=offer_strategy["offer_type"],
+                    discount_amount=monthly_spend * offer_strategy["discount_percentage"] / 100,
+                    additional_benefits=list(offer_strategy["benefits"]),
+                    offer_duration=offer_strategy["duration"],
                     expected_success_rate=template["success_rate"],
                     revenue_protection=revenue_protection,
                     urgency_level=risk_level
@@ -537,8 +538,13 @@ class RevenueOptimizationAgent:
             request_type = delegation_request.get("type", "general_strategy")
             priority = delegation_request.get("priority", "medium")
             context = delegation_request.get("context", {})
+            if not isinstance(context, dict):
+                # Lead Intelligence delegation items carry a free-text context
+                delegation_request = {**delegation_request, "context": {"summary": context}}
             
-            if request_type == "pricing_strategy":
+            if request_type == "batch_delegation":
+                return self.respond_to_batch_delegation(delegation_request)
+            elif request_type == "pricing_strategy":
                 return self._handle_pricing_strategy_request(delegation_request)
             elif request_type == "retention_strategy":
                 return self._handle_retention_strategy_request(delegation_request)
@@ -558,6 +564,91 @@ class RevenueOptimizationAgent:
                 "response_type": "error"
             }
     
+    def respond_to_batch_delegation(self, batch_request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Respond to a batched delegation from the Lead Intelligence Agent in one round-trip.
+        
+        Groups are keyed by (request type, segment, risk tier); each group's
+        strategy is computed once and fanned back out to the group's customers.
+        
+        Args:
+            batch_request: Batch built by LeadIntelligenceAgent._prepare_batch_delegation
+            
+        Returns:
+            Per-request summaries, per-group strategies and per-customer retention offers
+        """
+        start_time = datetime.now()
+        groups = batch_request.get("groups", [])
+        logger.info(f"Processing batch delegation with {len(groups)} customer groups")
+        
+        # One summary response per delegated request type
+        responses = [self.respond_to_delegation(item) for item in batch_request.get("requests", [])]
+        
+        strategies = {}
+        group_results = []
+        retention_customers = []
+        for group in groups:
+            request_type = group.get("request_type", "general_strategy")
+            segment = group.get("segment", "budget_conscious")
+            risk_tier = group.get("risk_tier", "medium_risk")
+            customer_ids = group.get("customer_ids", [])
+            
+            key = (request_type, segment, risk_tier)
+            if key not in strategies:
+                strategies[key] = self._group_strategy(request_type, segment, risk_tier, group)
+            
+            if request_type == "retention_strategy":
+                retention_customers.extend(
+                    {"customer_id": customer_id, "monthly_spend": spend,
+                     "churn_probability": churn, "segment": segment}
+                    for customer_id, spend, churn in zip(
+                        customer_ids, group.get("monthly_spend", []), group.get("churn_probability", [])
+                    )
+                )
+            
+            group_results.append({
+                "request_type": request_type,
+                "segment": segment,
+                "risk_tier": risk_tier,
+                "customer_ids": customer_ids,
+                "strategy": strategies[key]
+            })
+        
+        retention_offers = self.create_retention_offers(retention_customers) if retention_customers else []
+        
+        return {
+            "status": "completed",
+            "response_type": "batch_delegation",
+            "responses": responses,
+            "groups": group_results,
+            "retention_offers": [asdict(offer) for offer in retention_offers],
+            "strategies_computed": len(strategies),
+            "customers_covered": sum(len(group["customer_ids"]) for group in group_results),
+            "processing_time": (datetime.now() - start_time).total_seconds()
+        }
+    
+    def _group_strategy(self, request_type: str, segment: str, risk_tier: str,
+                        group: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute the strategy shared by one (request type, segment, risk tier) group"""
+        if request_type == "retention_strategy":
+            template = self.retention_templates.get(risk_tier, self.retention_templates["medium_risk"])
+            strategy = self._retention_offer_strategy(segment, template)
+            return {**strategy, "benefits": list(strategy["benefits"]), "success_rate": template["success_rate"]}
+        
+        aggregates = group.get("aggregates", {})
+        if request_type == "pricing_strategy" and group.get("customer_count", 0):
+            group_analysis = {
+                field: aggregates.get(f"avg_{field}", 0)
+                for field in ("lifetime_value", "churn_probability", "lead_score")
+            }
+            return asdict(self.develop_pricing_strategy(segment, group_analysis))
+        
+        return self.respond_to_delegation({
+            "type": request_type,
+            "priority": "medium",
+            "context": {"segment": segment, "risk_tier": risk_tier, "customer_count": group.get("customer_count", 0)}
+        })
+    
     def _map_segment_to_strategy(self, segment: str) -> str:
         """Map customer segment to pricing strategy"""
         mapping = {
@@ -702,11 +793,17 @@ class RevenueOptimizationAgent:
                                  template: Dict[str, Any], risk_level: str) -> Dict[str, Any]:
         """Customize retention offer based on customer profile"""
         monthly_spend = customer.get("monthly_spend", 100)
-        segment = customer.get("segment", "budget_conscious")
-        
-        # Calculate discount amount
-        discount_amount = monthly_spend * template["discount_percentage"] / 100
+        offer_strategy = self._retention_offer_strategy(customer.get("segment", "budget_conscious"), template)
         
+        return {
+            "offer_type": offer_strategy["offer_type"],
+            "discount_amount": monthly_spend * offer_strategy["discount_percentage"] / 100,
+            "benefits": offer_strategy["benefits"],
+            "duration": offer_strategy["duration"]
+        }
+    
+    def _retention_offer_strategy(self, segment: str, template: Dict[str, Any]) -> Dict[str, Any]:
+        """Segment-level retention offer design shared by customers with the same risk template"""
         # Determine offer type
         if segment == "premium_individual":
             offer_type = "Premium Retention Package"
@@ -726,7 +823,7 @@ class RevenueOptimizationAgent:
         
         return {
             "offer_type": offer_type,
-            "discount_amount": discount_amount,
+            "discount_percentage": template["discount_percentage"],
             "benefits": benefits,
             "duration": template["duration_months"]
         }
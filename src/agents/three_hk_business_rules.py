@@ -20,20 +20,25 @@ Key Features:
 import os
 import json
 import time
+import heapq
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Union
+import threading
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from enum import Enum
 import math
+from bisect import bisect_right
 from decimal import Decimal
 
+import numpy as np
+
 # Import existing components
 try:
-    from .customer_analysis import CustomerDataAnalyzer, FeatureSet, CustomerSegment
+    from .customer_analysis import CustomerDataAnalyzer, FeatureMatrix, FeatureSet, CustomerSegment
     from .lead_scoring import LeadScore, LeadPriority, LeadQualification
 except ImportError:
-    from customer_analysis import CustomerDataAnalyzer, FeatureSet, CustomerSegment
+    from customer_analysis import CustomerDataAnalyzer, FeatureMatrix, FeatureSet, CustomerSegment
     from lead_scoring import LeadScore, LeadPriority, LeadQualification
 
 # Configure logging
@@ -75,9 +80,9 @@ class EligibilityStatus(Enum):
     REQUIRES_VERIFICATION = "requires_verification"
 
 
-@dataclass
+@dataclass(frozen=True)
 class ThreeHKProduct:
-    """Comprehensive Three HK product definition."""
+    """Comprehensive Three HK product definition (immutable; shared by every engine in the process)."""
 
     # Product identification
     product_id: str
@@ -122,16 +127,9 @@ class ThreeHKProduct:
     priority_segments: List[str] = None
 
     def __post_init__(self):
-        if self.features is None:
-            self.features = []
-        if self.excluded_segments is None:
-            self.excluded_segments = []
-        if self.required_segments is None:
-            self.required_segments = []
-        if self.target_segments is None:
-            self.target_segments = []
-        if self.priority_segments is None:
-            self.priority_segments = []
+        for list_field in ("features", "excluded_segments", "required_segments", "target_segments", "priority_segments"):
+            if getattr(self, list_field) is None:
+                object.__setattr__(self, list_field, [])
 
 
 @dataclass
@@ -183,6 +181,223 @@ class OfferMatch:
         return asdict(self)
 
 
+@dataclass(frozen=True)
+class IndexedProduct:
+    """Catalog product with its eligibility pre-evaluated for one index key."""
+
+    catalog_position: int
+    product: ThreeHKProduct
+    status: EligibilityStatus
+    confidence: float
+    conditions: Tuple[str, ...]
+    segment_score: float
+    min_spend: float
+    score_bound: float  # Segment score plus the best spend score reachable in the spend band
+
+
+class EligibilityIndex:
+    """
+    Products pre-filtered by (segment, spend band, tenure band) for one catalog version.
+
+    Spend bands are delimited by the distinct minimum-spend requirements of the
+    catalog, so every spend-based eligibility outcome is constant within a band.
+    Each key maps to the products that are not ruled out for it, ordered by the
+    highest match score they can reach so matching can stop early.
+    """
+
+    def __init__(self, engine: "ThreeHKBusinessRulesEngine", version: Tuple[Any, ...]):
+        self.version = version
+        catalog = engine.product_catalog
+        self.spend_edges: List[Decimal] = sorted({product.min_monthly_spend for product in catalog})
+        self.entries: Dict[Tuple[str, int, int], List[IndexedProduct]] = {}
+
+        # Lowest spend in each band (band 0 lies below every requirement) and its exclusive ceiling
+        band_floors = [float(self.spend_edges[0]) - 1.0 if self.spend_edges else 0.0]
+        band_floors += [float(edge) for edge in self.spend_edges]
+        band_ceilings = [float(edge) for edge in self.spend_edges] + [None]
+
+        for segment in CustomerSegment:
+            for band, (band_spend, band_ceiling) in enumerate(zip(band_floors, band_ceilings)):
+                for tenure_category, tenure_months in engine.TENURE_MONTHS_BY_CATEGORY.items():
+                    probe = FeatureSet(monthly_spend=band_spend, tenure_category=tenure_category)
+                    self.entries[(segment.value, band, tenure_months)] = self._build_entries(
+                        engine, catalog, probe, segment, band_ceiling
+                    )
+
+        self._build_dense_arrays(engine, catalog)
+
+        logger.info(f"Eligibility index built: {len(self.entries)} keys over {len(catalog)} products")
+
+    def _build_dense_arrays(self, engine: "ThreeHKBusinessRulesEngine", catalog: List[ThreeHKProduct]) -> None:
+        """Lay the index out as arrays over (segment, spend band, tenure band, catalog position) for bulk matching."""
+        self.segment_codes = {segment: code for code, segment in enumerate(CustomerSegment)}
+        self.tenure_axis = list(dict.fromkeys(engine.TENURE_MONTHS_BY_CATEGORY.values()))
+        self.float_edges = np.array([float(edge) for edge in self.spend_edges])
+
+        self.eligible = np.zeros(
+            (len(self.segment_codes), len(self.spend_edges) + 1, len(self.tenure_axis), len(catalog)), dtype=bool
+        )
+        self.entries_by_position: Dict[Tuple[str, int, int], Dict[int, IndexedProduct]] = {}
+        for (segment_value, band, tenure_months), entries in self.entries.items():
+            segment_code = self.segment_codes[CustomerSegment(segment_value)]
+            positions = [entry.catalog_position for entry in entries]
+            self.eligible[segment_code, band, self.tenure_axis.index(tenure_months), positions] = True
+            self.entries_by_position[(segment_value, band, tenure_months)] = {
+                entry.catalog_position: entry for entry in entries
+            }
+
+        self.segment_scores = np.array(
+            [[engine._segment_match_score(product, segment) for product in catalog] for segment in CustomerSegment]
+        ).reshape(len(self.segment_codes), len(catalog))
+        min_spend = np.array([float(product.min_monthly_spend) for product in catalog])
+        self.min_spend = np.where(min_spend > 0, min_spend, np.inf)  # Non-positive requirements are never eligible
+        self.has_allowance = np.array([bool(product.data_allowance_gb) for product in catalog], dtype=bool)
+        self.data_allowance = np.array(
+            [float(product.data_allowance_gb) if product.data_allowance_gb else 0.0 for product in catalog]
+        )
+        self.positions_by_product_id: Dict[str, List[int]] = {}
+        for position, product in enumerate(catalog):
+            self.positions_by_product_id.setdefault(product.product_id, []).append(position)
+
+    def _build_entries(
+        self,
+        engine: "ThreeHKBusinessRulesEngine",
+        catalog: List[ThreeHKProduct],
+        probe: FeatureSet,
+        segment: CustomerSegment,
+        band_ceiling: Optional[float],
+    ) -> List[IndexedProduct]:
+        """Evaluate every product once for a representative customer of the key."""
+        entries = []
+        for position, product in enumerate(catalog):
+            eligibility = engine._evaluate_product_eligibility(product, probe, segment, [])
+            min_spend = float(product.min_monthly_spend)
+            if eligibility["status"] == EligibilityStatus.NOT_ELIGIBLE or min_spend <= 0:
+                continue
+
+            segment_score = engine._segment_match_score(product, segment)
+            spend_bound = 25.0 if band_ceiling is None else engine._spend_match_score(band_ceiling, min_spend)
+            entries.append(
+                IndexedProduct(
+                    catalog_position=position,
+                    product=product,
+                    status=eligibility["status"],
+                    confidence=eligibility["confidence"],
+                    conditions=tuple(eligibility["conditions"]),
+                    segment_score=segment_score,
+                    min_spend=min_spend,
+                    score_bound=segment_score + spend_bound,
+                )
+            )
+
+        entries.sort(key=lambda entry: entry.score_bound, reverse=True)
+        return entries
+
+    def candidates(self, segment: CustomerSegment, monthly_spend: float, tenure_months: int) -> List[IndexedProduct]:
+        """Products not ruled out for a customer, best reachable match score first."""
+        band = bisect_right(self.spend_edges, Decimal(str(monthly_spend)))
+        return self.entries.get((segment.value, band, tenure_months), [])
+
+
+class FrozenMapping(Mapping):
+    """Read-only dict view that, unlike MappingProxyType, can be pickled to worker processes."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping[str, Any]):
+        self._data = dict(data)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"FrozenMapping({self._data!r})"
+
+    def __reduce__(self):
+        return (FrozenMapping, (self._data,))
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only deep view of nested rule literals."""
+    if isinstance(value, dict):
+        return FrozenMapping({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """Immutable, versioned product catalog and business rules shared by every engine in the process."""
+
+    version: int
+    products: Tuple[ThreeHKProduct, ...]
+    eligibility_rules: Mapping[str, Any]
+    pricing_rules: Mapping[str, Any]
+    campaign_rules: Mapping[str, Any]
+
+
+class RuleSetRegistry:
+    """
+    Process-wide cache of the current RuleSet and its eligibility index.
+
+    The catalog and rules are defined in code, so the rule set is built once per
+    process; clear() drops it and the next lookup builds a new version.
+    """
+
+    def __init__(self):
+        self.builds = 0
+        self._lock = threading.Lock()
+        self._rule_set: Optional[RuleSet] = None
+        self._eligibility_index: Optional[EligibilityIndex] = None
+
+    def get(self, engine: "ThreeHKBusinessRulesEngine") -> RuleSet:
+        """Current rule set, built from engine's rule definitions when missing."""
+        with self._lock:
+            if self._rule_set is None:
+                self._rule_set = self._build(engine)
+                self._eligibility_index = None
+            return self._rule_set
+
+    def eligibility_index(self, rule_set: RuleSet, engine: "ThreeHKBusinessRulesEngine") -> EligibilityIndex:
+        """Shared eligibility index of rule_set; engine's catalog must be exactly rule_set.products."""
+        with self._lock:
+            if rule_set is not self._rule_set:
+                return EligibilityIndex(engine, ("rule_set", rule_set.version))
+            if self._eligibility_index is None:
+                self._eligibility_index = EligibilityIndex(engine, ("rule_set", rule_set.version))
+            return self._eligibility_index
+
+    def clear(self) -> None:
+        """Drop the cached rule set so the next lookup builds a new version."""
+        with self._lock:
+            self._rule_set = None
+            self._eligibility_index = None
+
+    def _build(self, engine: "ThreeHKBusinessRulesEngine") -> RuleSet:
+        """Build a new rule set version from the engine's rule definitions."""
+        self.builds += 1
+        rule_set = RuleSet(
+            version=self.builds,
+            products=tuple(engine._initialize_product_catalog()),
+            eligibility_rules=_freeze(engine._initialize_eligibility_rules()),
+            pricing_rules=_freeze(engine._initialize_pricing_rules()),
+            campaign_rules=_freeze(engine._initialize_campaign_rules()),
+        )
+        logger.info(f"Rule set version {rule_set.version} built with {len(rule_set.products)} products")
+        return rule_set
+
+
+# Process-wide registry used by every ThreeHKBusinessRulesEngine
+rule_set_registry = RuleSetRegistry()
+
+
 class ThreeHKBusinessRulesEngine:
     """
     Comprehensive business rules and offer matching engine for Three HK.
@@ -192,6 +407,9 @@ class ThreeHKBusinessRulesEngine:
     designed for Three HK's Hong Kong telecom operations.
     """
 
+    # Tenure in months assumed for each customer tenure category
+    TENURE_MONTHS_BY_CATEGORY = {"new": 3, "recent": 9, "established": 18, "loyal": 36}
+
     def __init__(self):
         """Initialize the Three HK business rules engine."""
 
@@ -227,16 +445,210 @@ class ThreeHKBusinessRulesEngine:
             "retention_max_discount": 0.25,  # Max 25% retention discount
         }
 
-        # Initialize product catalog
-        self.product_catalog = self._initialize_product_catalog()
+        # Product catalog and business rules, built once per process and shared read-only
+        self.rule_set = rule_set_registry.get(self)
+        self.product_catalog = list(self.rule_set.products)
+        self.eligibility_rules = self.rule_set.eligibility_rules
+        self.pricing_rules = self.rule_set.pricing_rules
+        self.campaign_rules = self.rule_set.campaign_rules
 
-        # Initialize business rules
-        self.eligibility_rules = self._initialize_eligibility_rules()
-        self.pricing_rules = self._initialize_pricing_rules()
-        self.campaign_rules = self._initialize_campaign_rules()
+        # Eligibility index, rebuilt lazily whenever the catalog version changes
+        self.catalog_version = 1
+        self._eligibility_index: Optional[EligibilityIndex] = None
+        self._eligibility_index_version: Optional[Tuple[int, int, int]] = None
 
         logger.info("Three HK Business Rules Engine initialized with comprehensive product catalog")
 
+    def get_eligibility_index(self) -> EligibilityIndex:
+        """Return the eligibility index for the current catalog version, building it if needed."""
+        version = (self.catalog_version, id(self.product_catalog), len(self.product_catalog))
+        if self._eligibility_index is None or self._eligibility_index_version != version:
+            if self.catalog_version == 1 and self._uses_shared_catalog():
+                self._eligibility_index = rule_set_registry.eligibility_index(self.rule_set, self)
+            else:
+                self._eligibility_index = EligibilityIndex(self, version)
+            self._eligibility_index_version = version
+        return self._eligibility_index
+
+    def _uses_shared_catalog(self) -> bool:
+        """Whether the catalog still holds exactly the shared rule set products."""
+        products = self.rule_set.products
+        return len(self.product_catalog) == len(products) and all(
+            product is shared for product, shared in zip(self.product_catalog, products)
+        )
+
+    def invalidate_eligibility_index(self) -> None:
+        """Mark the catalog as changed; call after editing products or eligibility parameters in place."""
+        self.catalog_version += 1
+
+    def score_offers_bulk(
+        self,
+        feature_matrix: FeatureMatrix,
+        lead_scores: List[LeadScore],
+        customer_segments: List[CustomerSegment],
+        current_products: Optional[List[List[str]]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Eligibility and match scores for every customer x product pair.
+
+        Args:
+            feature_matrix: Extracted features of the customers
+            lead_scores: Lead score of each customer, in feature matrix order
+            customer_segments: Segment of each customer, in feature matrix order
+            current_products: Currently subscribed product ids of each customer
+
+        Returns:
+            (eligible, match_scores): boolean and float arrays of shape (customers, catalog products).
+            A pair is offered when it is eligible and its match score reaches the minimum threshold.
+        """
+        index = self.get_eligibility_index()
+        spend = feature_matrix["monthly_spend"].astype(float)
+
+        # Index key of each customer: segment, spend band and tenure band
+        segment_codes = np.array([index.segment_codes[segment] for segment in customer_segments], dtype=np.intp)
+        bands = np.searchsorted(index.float_edges, spend, side="right")
+        categories, inverse = np.unique(feature_matrix["tenure_category"].astype(str), return_inverse=True)
+        category_codes = np.array(
+            [index.tenure_axis.index(self.TENURE_MONTHS_BY_CATEGORY.get(category, 3)) for category in categories],
+            dtype=np.intp,
+        )
+        tenure_codes = category_codes[inverse.reshape(-1)]
+
+        eligible = index.eligible[segment_codes, bands, tenure_codes]
+        eligible[np.isnan(spend)] = False  # Matching a single customer with unusable spend fails and offers nothing
+        for row, products in enumerate(current_products or []):
+            for product_id in products or []:
+                eligible[row, index.positions_by_product_id.get(product_id, [])] = False
+
+        # Customer-level components: lead score and engagement
+        overall = np.array([lead_score.overall_score for lead_score in lead_scores], dtype=float)
+        satisfaction = feature_matrix["satisfaction_score"].astype(float)
+        customer_score = (
+            np.where(overall >= 80, 20.0, np.where(overall >= 60, 15.0, np.where(overall >= 40, 10.0, 0.0)))
+            + np.where(satisfaction >= 8.0, 10.0, np.where(satisfaction >= 6.0, 5.0, 0.0))
+        )
+
+        # Product-level components broadcast over customers x products
+        spend_ratio = spend[:, None] / index.min_spend
+        spend_score = np.where(
+            spend_ratio >= 1.5, 25.0, np.where(spend_ratio >= 1.0, 20.0, np.where(spend_ratio >= 0.8, 10.0, 0.0))
+        )
+        usage = feature_matrix["data_usage_gb"].astype(float)[:, None]
+        usage_score = np.where(
+            index.has_allowance,
+            np.where(usage > index.data_allowance * 0.8, 15.0, np.where(usage > index.data_allowance * 0.5, 10.0, 0.0)),
+            np.where(usage > 50, 15.0, 0.0),
+        )
+
+        match_scores = index.segment_scores[segment_codes] + spend_score
+        match_scores += customer_score[:, None]
+        match_scores += usage_score
+        np.clip(match_scores, 0.0, 100.0, out=match_scores)
+        return eligible, match_scores
+
+    def rank_offers_bulk(
+        self,
+        feature_matrix: FeatureMatrix,
+        lead_scores: List[LeadScore],
+        customer_segments: List[CustomerSegment],
+        current_products: Optional[List[List[str]]] = None,
+        top_n: Optional[int] = None,
+        block_pairs: int = 1 << 21,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Select the best offers of every customer without building OfferMatch objects.
+
+        Customers are processed in blocks of about block_pairs customer x product pairs to bound memory.
+
+        Returns:
+            (positions, match_scores): arrays of shape (customers, top_n) holding the catalog positions of the
+            selected products, best first, and their match scores. Unused slots hold position -1.
+        """
+        top_n = self.business_params["maximum_concurrent_offers"] if top_n is None else top_n
+        customers, products = len(feature_matrix), len(self.product_catalog)
+        width = min(top_n, products)
+        positions = np.full((customers, top_n), -1, dtype=np.intp)
+        match_scores = np.zeros((customers, top_n))
+        if width <= 0:
+            return positions, match_scores
+
+        # Ties on match score keep catalog order; presentation priority only depends on the score per customer
+        tie_break = np.arange(products - 1, -1, -1, dtype=float)
+        block = max(1, block_pairs // max(products, 1))
+        for start in range(0, customers, block):
+            rows = slice(start, min(start + block, customers))
+            eligible, scores = self.score_offers_bulk(
+                feature_matrix.slice(rows), lead_scores[rows], customer_segments[rows],
+                current_products[rows] if current_products is not None else None,
+            )
+            keys = np.where(eligible & (scores >= 30.0), scores * products + tie_break, -1.0)  # Minimum match threshold
+
+            if width < products:
+                selected = np.argpartition(keys, products - width, axis=1)[:, products - width:]
+            else:
+                selected = np.broadcast_to(np.arange(products), keys.shape)
+            order = np.argsort(-np.take_along_axis(keys, selected, axis=1), axis=1, kind="stable")
+            selected = np.take_along_axis(selected, order, axis=1)
+            valid = np.take_along_axis(keys, selected, axis=1) >= 0
+
+            positions[rows, :width] = np.where(valid, selected, -1)
+            match_scores[rows, :width] = np.where(valid, np.take_along_axis(scores, selected, axis=1), 0.0)
+
+        return positions, match_scores
+
+    def match_offers_bulk(
+        self,
+        feature_matrix: FeatureMatrix,
+        lead_scores: List[LeadScore],
+        customer_segments: List[CustomerSegment],
+        current_products: Optional[List[List[str]]] = None,
+        market_context: Optional[Dict[str, Any]] = None,
+        top_n: Optional[int] = None,
+    ) -> List[List[OfferMatch]]:
+        """
+        Match offers for many customers at once.
+
+        Returns the same offers as calling match_offers_for_customer for each customer, with
+        OfferMatch objects built only for the selected customer-product pairs.
+
+        Args:
+            feature_matrix: Extracted features of the customers
+            lead_scores: Lead score of each customer, in feature matrix order
+            customer_segments: Segment of each customer, in feature matrix order
+            current_products: Currently subscribed product ids of each customer
+            market_context: Market and competitive context
+            top_n: Offers per customer (defaults to the maximum concurrent offers)
+
+        Returns:
+            Matched offers of each customer ranked by relevance
+        """
+        market_context = market_context or {}
+        index = self.get_eligibility_index()
+        positions, match_scores = self.rank_offers_bulk(
+            feature_matrix, lead_scores, customer_segments, current_products, top_n
+        )
+
+        bands = np.searchsorted(index.float_edges, feature_matrix["monthly_spend"].astype(float), side="right").tolist()
+        all_offers = []
+        for row, (customer_positions, customer_scores) in enumerate(zip(positions.tolist(), match_scores.tolist())):
+            offers = []
+            if customer_positions[0] >= 0:
+                features = feature_matrix.feature_set(row)
+                lead_score, segment = lead_scores[row], customer_segments[row]
+                products = current_products[row] if current_products is not None else []
+                entries = index.entries_by_position[(segment.value, bands[row], self._extract_tenure_months(features))]
+                for position, match_score in zip(customer_positions, customer_scores):
+                    if position < 0:
+                        break
+                    offers.append(self._build_offer_match(
+                        entries[position], match_score, self._calculate_presentation_priority(match_score, lead_score),
+                        features, lead_score, segment, products or [], market_context,
+                    ))
+            all_offers.append(offers)
+
+        logger.info(f"Matched {sum(len(offers) for offers in all_offers)} offers for {len(all_offers)} customers")
+        return all_offers
+
     def match_offers_for_customer(
         self,
         customer_features: FeatureSet,
@@ -261,70 +673,49 @@ class ThreeHKBusinessRulesEngine:
         try:
             current_products = current_products or []
             market_context = market_context or {}
+            max_offers = self.business_params["maximum_concurrent_offers"]
 
-            matched_offers = []
+            # Products that survive eligibility for this segment, spend band and tenure band
+            candidates = self.get_eligibility_index().candidates(
+                customer_segment, customer_features.monthly_spend, self._extract_tenure_months(customer_features)
+            )
 
-            # Evaluate each product for eligibility and relevance
-            for product in self.product_catalog:
+            # Customer-level match score components shared by every product; usage adds at most 15
+            customer_score = self._lead_match_score(lead_score) + self._engagement_match_score(customer_features)
+
+            # Score candidates best-bound first, stopping once no remaining product can make the cut
+            scored = []
+            top_scores = []
+            for entry in candidates:
+                threshold = top_scores[0] if len(top_scores) == max_offers else 30.0  # Minimum match threshold
+                if entry.score_bound + customer_score + 15.0 < threshold:
+                    break
+                if entry.product.product_id in current_products:
+                    continue
 
-                # Check basic eligibility
-                eligibility_result = self._evaluate_product_eligibility(
-                    product, customer_features, customer_segment, current_products
-                )
+                match_score = self._indexed_match_score(entry, customer_features, customer_score)
+                if match_score >= 30.0:
+                    scored.append((entry, match_score))
+                    heapq.heappush(top_scores, match_score)
+                    if len(top_scores) > max_offers:
+                        heapq.heappop(top_scores)
+
+            # Rank by match score and presentation priority, ties in catalog order
+            ranked = sorted(
+                ((entry, match_score, self._calculate_presentation_priority(match_score, lead_score))
+                 for entry, match_score in sorted(scored, key=lambda item: item[0].catalog_position)),
+                key=lambda item: (item[1], -item[2]),
+                reverse=True,
+            )
 
-                if eligibility_result["status"] != EligibilityStatus.NOT_ELIGIBLE:
-
-                    # Calculate match score
-                    match_score = self._calculate_match_score(product, customer_features, lead_score, customer_segment)
-
-                    if match_score >= 30.0:  # Minimum match threshold
-
-                        # Determine offer type
-                        offer_type = self._determine_offer_type(
-                            product, customer_features, current_products, lead_score
-                        )
-
-                        # Calculate personalized pricing
-                        pricing_result = self._calculate_personalized_pricing(
-                            product, customer_features, lead_score, market_context
-                        )
-
-                        # Generate sales strategy
-                        sales_strategy = self._generate_sales_strategy(
-                            product, customer_features, lead_score, customer_segment
-                        )
-
-                        # Create offer match
-                        offer_match = OfferMatch(
-                            product=product,
-                            offer_type=offer_type,
-                            eligibility_status=eligibility_result["status"],
-                            match_score=match_score,
-                            confidence_level=eligibility_result["confidence"],
-                            recommended_price=pricing_result["final_price"],
-                            discount_amount=pricing_result["discount_amount"],
-                            estimated_monthly_value=pricing_result["value_estimate"],
-                            offer_valid_until=self._calculate_offer_expiry(),
-                            conditions=eligibility_result["conditions"],
-                            presentation_priority=self._calculate_presentation_priority(match_score, lead_score),
-                            sales_approach=sales_strategy["approach"],
-                            key_selling_points=sales_strategy["selling_points"],
-                            potential_objections=sales_strategy["objections"],
-                            cross_sell_opportunities=self._identify_cross_sell_opportunities(
-                                product, customer_features
-                            ),
-                            upsell_potential=self._assess_upsell_potential(product, customer_features),
-                            retention_value=self._calculate_retention_value(product, customer_features),
-                        )
-
-                        matched_offers.append(offer_match)
-
-            # Sort offers by match score and presentation priority
-            matched_offers.sort(key=lambda x: (x.match_score, -x.presentation_priority), reverse=True)
-
-            # Limit to maximum concurrent offers
-            max_offers = self.business_params["maximum_concurrent_offers"]
-            final_offers = matched_offers[:max_offers]
+            # Pricing and sales strategy only for the offers that will be presented
+            final_offers = [
+                self._build_offer_match(
+                    entry, match_score, priority, customer_features, lead_score, customer_segment,
+                    current_products, market_context,
+                )
+                for entry, match_score, priority in ranked[:max_offers]
+            ]
 
             logger.info(f"Matched {len(final_offers)} offers for customer segment {customer_segment.value}")
 
@@ -334,6 +725,56 @@ class ThreeHKBusinessRulesEngine:
             logger.error(f"Offer matching failed: {e}")
             return []
 
+    def _build_offer_match(
+        self,
+        entry: IndexedProduct,
+        match_score: float,
+        presentation_priority: int,
+        customer_features: FeatureSet,
+        lead_score: LeadScore,
+        customer_segment: CustomerSegment,
+        current_products: List[str],
+        market_context: Dict[str, Any],
+    ) -> OfferMatch:
+        """Create the full offer for a selected product."""
+        product = entry.product
+        status, confidence, conditions = entry.status, entry.confidence, list(entry.conditions)
+
+        # Credit check depends on the customer's churn risk, not on the index key
+        if product.requires_credit_check and customer_features.churn_risk_score > 0.7:
+            status = EligibilityStatus.REQUIRES_VERIFICATION
+            conditions.append("Credit check required")
+            confidence *= 0.6
+
+        # Determine offer type
+        offer_type = self._determine_offer_type(product, customer_features, current_products, lead_score)
+
+        # Calculate personalized pricing
+        pricing_result = self._calculate_personalized_pricing(product, customer_features, lead_score, market_context)
+
+        # Generate sales strategy
+        sales_strategy = self._generate_sales_strategy(product, customer_features, lead_score, customer_segment)
+
+        return OfferMatch(
+            product=product,
+            offer_type=offer_type,
+            eligibility_status=status,
+            match_score=match_score,
+            confidence_level=confidence,
+            recommended_price=pricing_result["final_price"],
+            discount_amount=pricing_result["discount_amount"],
+            estimated_monthly_value=pricing_result["value_estimate"],
+            offer_valid_until=self._calculate_offer_expiry(),
+            conditions=conditions,
+            presentation_priority=presentation_priority,
+            sales_approach=sales_strategy["approach"],
+            key_selling_points=sales_strategy["selling_points"],
+            potential_objections=sales_strategy["objections"],
+            cross_sell_opportunities=self._identify_cross_sell_opportunities(product, customer_features),
+            upsell_potential=self._assess_upsell_potential(product, customer_features),
+            retention_value=self._calculate_retention_value(product, customer_features),
+        )
+
     def validate_offer_compliance(self, offer_match: OfferMatch, customer_features: FeatureSet) -> Dict[str, Any]:
         """
         Validate offer compliance with Three HK business rules and regulations.
@@ -761,48 +1202,29 @@ class ThreeHKBusinessRulesEngine:
     ) -> float:
         """Calculate relevance match score (0-100)."""
         try:
-            match_score = 0.0
-
-            # Segment match (30%)
-            if customer_segment.value in product.priority_segments:
-                match_score += 30.0
-            elif customer_segment.value in product.target_segments:
-                match_score += 20.0
-            elif customer_segment.value not in product.excluded_segments:
-                match_score += 10.0
-
-            # Spend alignment (25%)
-            spend_ratio = customer_features.monthly_spend / float(product.min_monthly_spend)
-            if spend_ratio >= 1.5:
-                match_score += 25.0
-            elif spend_ratio >= 1.0:
-                match_score += 20.0
-            elif spend_ratio >= 0.8:
-                match_score += 10.0
-
-            # Lead score integration (20%)
-            if lead_score.overall_score >= 80:
-                match_score += 20.0
-            elif lead_score.overall_score >= 60:
-                match_score += 15.0
-            elif lead_score.overall_score >= 40:
-                match_score += 10.0
-
-            # Usage pattern match (15%)
-            if product.data_allowance_gb:
-                if customer_features.data_usage_gb > product.data_allowance_gb * 0.8:
-                    match_score += 15.0
-                elif customer_features.data_usage_gb > product.data_allowance_gb * 0.5:
-                    match_score += 10.0
-            else:  # Unlimited plans
-                if customer_features.data_usage_gb > 50:
-                    match_score += 15.0
-
-            # Engagement and satisfaction (10%)
-            if customer_features.satisfaction_score >= 8.0:
-                match_score += 10.0
-            elif customer_features.satisfaction_score >= 6.0:
-                match_score += 5.0
+            match_score = (
+                self._segment_match_score(product, customer_segment)  # Segment match (30%)
+                + self._spend_match_score(customer_features.monthly_spend, float(product.min_monthly_spend))  # 25%
+                + self._lead_match_score(lead_score)  # Lead score integration (20%)
+                + self._usage_match_score(product, customer_features)  # Usage pattern match (15%)
+                + self._engagement_match_score(customer_features)  # Engagement and satisfaction (10%)
+            )
+
+            return min(100.0, max(0.0, match_score))
+
+        except Exception as e:
+            logger.error(f"Match score calculation failed: {e}")
+            return 0.0
+
+    def _indexed_match_score(self, entry: IndexedProduct, customer_features: FeatureSet, customer_score: float) -> float:
+        """Match score of an indexed product, reusing its segment score and the customer-level components."""
+        try:
+            match_score = (
+                entry.segment_score
+                + self._spend_match_score(customer_features.monthly_spend, entry.min_spend)
+                + customer_score
+                + self._usage_match_score(entry.product, customer_features)
+            )
 
             return min(100.0, max(0.0, match_score))
 
@@ -810,6 +1232,57 @@ class ThreeHKBusinessRulesEngine:
             logger.error(f"Match score calculation failed: {e}")
             return 0.0
 
+    def _segment_match_score(self, product: ThreeHKProduct, customer_segment: CustomerSegment) -> float:
+        """Segment component of the match score (0-30)."""
+        if customer_segment.value in product.priority_segments:
+            return 30.0
+        elif customer_segment.value in product.target_segments:
+            return 20.0
+        elif customer_segment.value not in product.excluded_segments:
+            return 10.0
+        return 0.0
+
+    def _spend_match_score(self, monthly_spend: float, min_monthly_spend: float) -> float:
+        """Spend alignment component of the match score (0-25)."""
+        spend_ratio = monthly_spend / min_monthly_spend
+        if spend_ratio >= 1.5:
+            return 25.0
+        elif spend_ratio >= 1.0:
+            return 20.0
+        elif spend_ratio >= 0.8:
+            return 10.0
+        return 0.0
+
+    def _lead_match_score(self, lead_score: LeadScore) -> float:
+        """Lead score component of the match score (0-20)."""
+        if lead_score.overall_score >= 80:
+            return 20.0
+        elif lead_score.overall_score >= 60:
+            return 15.0
+        elif lead_score.overall_score >= 40:
+            return 10.0
+        return 0.0
+
+    def _usage_match_score(self, product: ThreeHKProduct, customer_features: FeatureSet) -> float:
+        """Usage pattern component of the match score (0-15)."""
+        if product.data_allowance_gb:
+            if customer_features.data_usage_gb > product.data_allowance_gb * 0.8:
+                return 15.0
+            elif customer_features.data_usage_gb > product.data_allowance_gb * 0.5:
+                return 10.0
+        else:  # Unlimited plans
+            if customer_features.data_usage_gb > 50:
+                return 15.0
+        return 0.0
+
+    def _engagement_match_score(self, customer_features: FeatureSet) -> float:
+        """Engagement and satisfaction component of the match score (0-10)."""
+        if customer_features.satisfaction_score >= 8.0:
+            return 10.0
+        elif customer_features.satisfaction_score >= 6.0:
+            return 5.0
+        return 0.0
+
     def _determine_offer_type(
         self, product: ThreeHKProduct, customer_features: FeatureSet, current_products: List[str], lead_score: LeadScore
     ) -> OfferType:
@@ -1028,8 +1501,7 @@ class ThreeHKBusinessRulesEngine:
 
     def _extract_tenure_months(self, customer_features: FeatureSet) -> int:
         """Extract tenure in months from customer features."""
-        tenure_mapping = {"new": 3, "recent": 9, "established": 18, "loyal": 36}
-        return tenure_mapping.get(customer_features.tenure_category, 3)
+        return self.TENURE_MONTHS_BY_CATEGORY.get(customer_features.tenure_category, 3)
 
     def _estimate_monthly_value(self, product: ThreeHKProduct, customer_features: FeatureSet) -> Decimal:
         """Estimate monthly value for the customer."""
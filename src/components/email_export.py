@@ -14,6 +14,9 @@ from datetime import datetime
 # Import the email template generator
 from src.utils.email_templates import EmailTemplateGenerator
 
+# UI format names -> generate_batch template formats
+EXPORT_FORMATS = {"HTML": "html", "Plain Text": "text"}
+
 
 def render_email_export_section():
     """Render the complete email export section in the results page"""
@@ -233,38 +236,9 @@ def _generate_email_templates(
     
     all_templates = []
     
-    for i, customer in enumerate(customers):
+    batch = _iter_customer_templates(generator, customers, deliverables, formats, include_subjects)
+    for i, (_, _, customer_templates) in enumerate(batch):
         status_text.text(f"Generating templates for Customer {i+1}/{len(customers)}")
-        
-        # Extract customer-specific data
-        recommendations = _extract_recommendations_for_customer(customer, deliverables)
-        offers = _extract_offers_for_customer(customer, deliverables)
-        
-        customer_templates = {
-            "customer_id": customer.get("customer_id", f"CUST_{i+1:03d}"),
-            "templates": {}
-        }
-        
-        # Generate HTML template
-        if "HTML" in formats:
-            html_template = generator.generate_html_email_template(
-                customer, recommendations, offers, deliverables
-            )
-            customer_templates["templates"]["html"] = html_template
-        
-        # Generate plain text template
-        if "Plain Text" in formats:
-            text_template = generator.generate_plain_text_email_template(
-                customer, recommendations, offers, deliverables
-            )
-            customer_templates["templates"]["text"] = text_template
-        
-        # Generate subject lines
-        if include_subjects:
-            primary_offer = offers[0] if offers else {}
-            subject_lines = generator.create_subject_lines(customer, primary_offer, deliverables)
-            customer_templates["subject_lines"] = subject_lines
-        
         all_templates.append(customer_templates)
         
         # Update progress
@@ -282,6 +256,27 @@ def _generate_email_templates(
     _show_template_download_options(all_templates, formats)
 
 
+def _iter_customer_templates(
+    generator: EmailTemplateGenerator,
+    customers: List[Dict],
+    deliverables: Dict,
+    formats: List[str],
+    include_subjects: bool
+):
+    """Render the selected formats for each customer with one generate_batch pass"""
+    
+    recommendations = [_extract_recommendations_for_customer(customer, deliverables) for customer in customers]
+    offers = [_extract_offers_for_customer(customer, deliverables) for customer in customers]
+    batch_formats = [EXPORT_FORMATS[fmt] for fmt in formats if fmt in EXPORT_FORMATS]
+    
+    batch = generator.iter_batch(
+        customers, recommendations, offers, deliverables,
+        formats=batch_formats, include_subjects=include_subjects
+    )
+    for customer, customer_offers, customer_templates in zip(customers, offers, batch):
+        yield customer, customer_offers, customer_templates
+
+
 def _export_email_zip_package(
     customers: List[Dict], 
     deliverables: Dict, 
@@ -314,34 +309,22 @@ def _export_email_zip_package(
         zip_file.writestr("campaign_metadata.json", json.dumps(campaign_metadata, indent=2))
         
         # Generate templates for each customer
-        for i, customer in enumerate(customers):
-            customer_id = customer.get("customer_id", f"CUST_{i+1:03d}")
-            
-            # Extract customer-specific data
-            recommendations = _extract_recommendations_for_customer(customer, deliverables)
-            offers = _extract_offers_for_customer(customer, deliverables)
+        batch = _iter_customer_templates(generator, customers, deliverables, formats, include_subjects)
+        for customer, offers, customer_templates in batch:
+            customer_id = customer_templates["customer_id"]
+            templates = customer_templates["templates"]
             
             # Create customer folder
             customer_folder = f"customers/{customer_id}/"
             
-            # Generate HTML template
-            if "HTML" in formats:
-                html_template = generator.generate_html_email_template(
-                    customer, recommendations, offers, deliverables
-                )
-                zip_file.writestr(f"{customer_folder}email_template.html", html_template)
+            if "html" in templates:
+                zip_file.writestr(f"{customer_folder}email_template.html", templates["html"])
             
-            # Generate plain text template
-            if "Plain Text" in formats:
-                text_template = generator.generate_plain_text_email_template(
-                    customer, recommendations, offers, deliverables
-                )
-                zip_file.writestr(f"{customer_folder}email_template.txt", text_template)
+            if "text" in templates:
+                zip_file.writestr(f"{customer_folder}email_template.txt", templates["text"])
             
-            # Generate subject lines
             if include_subjects:
-                primary_offer = offers[0] if offers else {}
-                subject_lines = generator.create_subject_lines(customer, primary_offer, deliverables)
+                subject_lines = customer_templates["subject_lines"]
                 subject_content = "\n".join([f"{i+1}. {subject}" for i, subject in enumerate(subject_lines)])
                 zip_file.writestr(f"{customer_folder}subject_lines.txt", subject_content)
             
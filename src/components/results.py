@@ -10,20 +10,50 @@ import time
 import os
 import zipfile
 import io
+import itertools
 import re
+import secrets
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import plotly.express as px
 import plotly.graph_objects as go
 
-from src.utils.data_merging import DataMerger, MergeStrategy, MergeResult
-from src.utils.product_catalog_db import get_product_catalog, is_catalog_available
-from src.utils.openrouter_client import OpenRouterClient, OpenRouterConfig
+from src.utils.data_merging import MERGE_KEY_COLUMN, DataMerger, MergeStrategy, MergeResult
+from src.utils.partitioned_merge import merge_uploaded_datasets
+from src.utils.privacy_pipeline import privacy_pipeline
+from src.utils.analysis_jobs import JobStatus, current_job, get_analysis_job_manager
+from src.utils.openrouter_client import OpenRouterConfig
+from src.utils.result_pagination import (
+    DEFAULT_PAGE_SIZE,
+    LOG_PAGE_LINES,
+    PAGE_SIZE_OPTIONS,
+    RECOMMENDATION_SORT_COLUMNS,
+    ProcessingLog,
+    filter_options,
+    page_bounds,
+    recommendations_frame,
+    select_recommendations,
+)
+from src.utils.streamlit_cache import (
+    cache_by_fingerprint,
+    get_openrouter_client,
+    get_product_catalog,
+    is_catalog_available,
+    session_memo,
+)
+from src.utils.streaming_export import ExportFile, ZipEntry, iter_csv, iter_json, spool_zip
+from src.utils.collaboration_cache import get_collaboration_cache
 from loguru import logger
 
 # Initialize logger
 # Logger is available as 'logger' from loguru import
 
+# Seconds between progress polls of a background AI analysis
+ANALYSIS_POLL_SECONDS = 1.0
+
+# Session values a background AI analysis produces, copied into st.session_state when it finishes
+ANALYSIS_SESSION_KEYS = ("ai_debug_logs", "ai_debug_info", "ai_processing_log")
+
 
 def create_session_backup():
     """Create a file-based backup of current session state for recovery"""
@@ -200,84 +230,30 @@ def render_results_page():
                         st.success(log["message"])
                     elif log["status"] == "warning":
                         st.warning(log["message"])
+                    elif log["status"] == "info":
+                        st.info(log["message"])
                     else:
                         st.error(log["message"])
             
+            # Per-customer output, rendered only when asked for
+            render_processing_log()
+            
             # Show detailed AI debug info
             if "ai_debug_info" in st.session_state and st.session_state["ai_debug_info"]:
                 st.write("### 🤖 AI Processing Details")
-                
-                for i, debug_info in enumerate(st.session_state["ai_debug_info"]):
-                    with st.expander(f"Customer: {debug_info['customer_name']} (ID: {debug_info['customer_id']})", expanded=False):
-                        
-                        # API Key Status
-                        if debug_info.get("api_key_status"):
-                            if debug_info["api_key_status"]["found"]:
-                                st.success(f"✅ API Key: {debug_info['api_key_status']['masked_key']} ({debug_info['api_key_status']['length']} chars)")
-                            else:
-                                st.error("❌ API Key not found")
-                        
-                        # Client Status
-                        if debug_info.get("client_status"):
-                            if debug_info["client_status"]["initialized"]:
-                                st.success(f"✅ Client initialized: {debug_info['client_status']['model']}")
-                                st.write(f"   - Max tokens: {debug_info['client_status']['max_tokens']}")
-                                st.write(f"   - Temperature: {debug_info['client_status']['temperature']}")
-                            else:
-                                st.error(f"❌ Client failed: {debug_info['client_status']['error']}")
-                        
-                        # API Call Info
-                        if debug_info.get("api_call_info"):
-                            if debug_info["api_call_info"]["success"]:
-                                st.success(f"✅ API call successful: {debug_info['api_call_info']['duration']:.2f}s")
-                                st.write(f"   - Model: {debug_info['api_call_info']['model']}")
-                            else:
-                                st.error(f"❌ API call failed: {debug_info['api_call_info']['error']}")
-                        
-                        # Response Info
-                        if debug_info.get("response_info"):
-                            if debug_info["response_info"]["received"]:
-                                st.success(f"✅ Response received: {debug_info['response_info']['content_length']} chars")
-                                
-                                # Show model and token info if available
-                                if debug_info["response_info"].get("model_used"):
-                                    st.write(f"   - Model: {debug_info['response_info']['model_used']}")
-                                if debug_info["response_info"].get("tokens_used"):
-                                    st.write(f"   - Tokens: {debug_info['response_info']['tokens_used']}")
-                                
-                                if debug_info["response_info"].get("parsed_successfully"):
-                                    st.success("✅ JSON parsed successfully")
-                                    st.write(f"   - Fields: {', '.join(debug_info['response_info']['parsed_fields'])}")
-                                elif debug_info["response_info"].get("parsed_successfully") is False:
-                                    st.error(f"❌ JSON parsing failed: {debug_info['response_info']['parse_error']}")
-                                
-                                # Show raw response
-                                with st.expander("Raw AI Response", expanded=False):
-                                    st.code(debug_info["response_info"]["raw_content"], language="json")
-                            else:
-                                st.error("❌ No response received")
-                                if debug_info["response_info"].get("error"):
-                                    st.error(f"   - Error: {debug_info['response_info']['error']}")
-                        
-                        # Customer Profile
-                        if debug_info.get("customer_profile"):
-                            with st.expander("Customer Profile Sent to AI", expanded=False):
-                                st.json(debug_info["customer_profile"])
-                        
-                        # Prompt
-                        if debug_info.get("prompt"):
-                            with st.expander("Full Prompt Sent to AI", expanded=False):
-                                st.code(debug_info["prompt"], language="text")
-                        
-                        # Errors
-                        if debug_info.get("errors"):
-                            st.write("**Errors:**")
-                            for error in debug_info["errors"]:
-                                st.error(f"❌ {error}")
+                render_ai_debug_details(st.session_state["ai_debug_info"])
 
     # Clean up any corrupted session state first to prevent AttributeError issues
     validate_and_clean_session_state()
 
+    # A background AI analysis keeps running while the user works; follow its progress here
+    if "ai_analysis_job_id" in st.session_state:
+        render_analysis_progress()
+        render_partial_recommendations()
+    
+    if "ai_analysis_error" in st.session_state:
+        st.error(f"❌ Error during AI analysis: {st.session_state.pop('ai_analysis_error')}")
+
     # Check current session state
     has_ai_results = "ai_analysis_results" in st.session_state
     has_customer_data = "customer_data" in st.session_state
@@ -322,6 +298,134 @@ def render_results_page():
     st.markdown("---")
 
 
+def render_partial_recommendations():
+    """Render the recommendations a running background analysis has produced so far"""
+    partial = st.session_state.get("ai_analysis_partial_recommendations")
+    if not partial:
+        return
+    
+    with st.expander(f"👀 Recommendations so far ({len(partial)})", expanded=False):
+        render_recommendations_section({
+            "recommendations": {"recommendations": partial},
+            "metadata": {"timestamp": st.session_state.get("ai_analysis_job_id", "")},
+        })
+
+
+def render_processing_log():
+    """Render the processing log of the last analysis one page at a time, only when switched on"""
+    log = st.session_state.get("ai_processing_log")
+    if not log or not log.count():
+        return
+    
+    st.write("### 🧾 Processing Log")
+    st.caption(
+        f"{log.count()} lines, {log.count('error')} errors, {log.count('warning')} warnings"
+        + (f" ({log.dropped} further lines not kept)" if log.dropped else "")
+    )
+    if not st.toggle("Show processing log", value=False, key="ai_processing_log_visible"):
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        level = st.selectbox(
+            "Lines",
+            options=["all", "error", "warning", "success", "info"],
+            index=0,
+            key="ai_processing_log_level"
+        )
+    level = None if level == "all" else level
+    _, _, page_count = page_bounds(log.count(level), 1, LOG_PAGE_LINES)
+    with col2:
+        page = st.number_input(
+            f"Page (of {page_count})",
+            min_value=1,
+            max_value=page_count,
+            value=1,
+            step=1,
+            key=f"ai_processing_log_page_{level}"
+        )
+    st.code(log.page_text(page, LOG_PAGE_LINES, level), language="text")
+
+
+def render_ai_debug_details(debug_infos: List[Dict[str, Any]]):
+    """Render the AI debug details of one customer picked from the analysed customers"""
+    if not st.toggle(f"Show AI call details ({len(debug_infos)} customers)", value=False, key="ai_debug_details_visible"):
+        return
+    
+    selected = st.selectbox(
+        "Customer",
+        options=range(len(debug_infos)),
+        format_func=lambda x: f"{debug_infos[x]['customer_name']} (ID: {debug_infos[x]['customer_id']})",
+        key="ai_debug_details_customer"
+    )
+    debug_info = debug_infos[selected]
+    
+    # API Key Status
+    if debug_info.get("api_key_status"):
+        if debug_info["api_key_status"]["found"]:
+            st.success(f"✅ API Key: {debug_info['api_key_status']['masked_key']} ({debug_info['api_key_status']['length']} chars)")
+        else:
+            st.error("❌ API Key not found")
+
+    # Client Status
+    if debug_info.get("client_status"):
+        if debug_info["client_status"]["initialized"]:
+            st.success(f"✅ Client initialized: {debug_info['client_status']['model']}")
+            st.write(f"   - Max tokens: {debug_info['client_status']['max_tokens']}")
+            st.write(f"   - Temperature: {debug_info['client_status']['temperature']}")
+        else:
+            st.error(f"❌ Client failed: {debug_info['client_status']['error']}")
+
+    # API Call Info
+    if debug_info.get("api_call_info"):
+        if debug_info["api_call_info"]["success"]:
+            st.success(f"✅ API call successful: {debug_info['api_call_info']['duration']:.2f}s")
+            st.write(f"   - Model: {debug_info['api_call_info']['model']}")
+        else:
+            st.error(f"❌ API call failed: {debug_info['api_call_info']['error']}")
+
+    # Response Info
+    if debug_info.get("response_info"):
+        if debug_info["response_info"]["received"]:
+            st.success(f"✅ Response received: {debug_info['response_info']['content_length']} chars")
+
+            # Show model and token info if available
+            if debug_info["response_info"].get("model_used"):
+                st.write(f"   - Model: {debug_info['response_info']['model_used']}")
+            if debug_info["response_info"].get("tokens_used"):
+                st.write(f"   - Tokens: {debug_info['response_info']['tokens_used']}")
+
+            if debug_info["response_info"].get("parsed_successfully"):
+                st.success("✅ JSON parsed successfully")
+                st.write(f"   - Fields: {', '.join(debug_info['response_info']['parsed_fields'])}")
+            elif debug_info["response_info"].get("parsed_successfully") is False:
+                st.error(f"❌ JSON parsing failed: {debug_info['response_info']['parse_error']}")
+
+            # Show raw response
+            with st.expander("Raw AI Response", expanded=False):
+                st.code(debug_info["response_info"]["raw_content"], language="json")
+        else:
+            st.error("❌ No response received")
+            if debug_info["response_info"].get("error"):
+                st.error(f"   - Error: {debug_info['response_info']['error']}")
+
+    # Customer Profile
+    if debug_info.get("customer_profile"):
+        with st.expander("Customer Profile Sent to AI", expanded=False):
+            st.json(debug_info["customer_profile"])
+
+    # Prompt
+    if debug_info.get("prompt"):
+        with st.expander("Full Prompt Sent to AI", expanded=False):
+            st.code(debug_info["prompt"], language="text")
+
+    # Errors
+    if debug_info.get("errors"):
+        st.write("**Errors:**")
+        for error in debug_info["errors"]:
+            st.error(f"❌ {error}")
+
+
 def attempt_session_recovery() -> bool:
     """Attempt to recover session state from file-based backup"""
     import os
@@ -532,7 +636,7 @@ def render_dashboard_metrics(results: Dict[str, Any]):
 
 
 def render_recommendations_section(results: Dict[str, Any]):
-    """Render the AI recommendations with interactive controls"""
+    """Render the AI recommendations with interactive controls, one page of cards at a time"""
     
     recommendations = results.get("recommendations", {}).get("recommendations", [])
     
@@ -540,13 +644,21 @@ def render_recommendations_section(results: Dict[str, Any]):
         st.warning("No recommendations generated. Please check your data and try again.")
         return
     
+    # Filter/sort table, built once per analysis rather than on every rerun
+    analysis_stamp = results.get("metadata", {}).get("timestamp", "")
+    frame, _ = session_memo(
+        "recommendations_table",
+        f"{analysis_stamp}:{id(recommendations)}:{len(recommendations)}",
+        lambda: recommendations_frame(recommendations),
+    )
+    
     # Filtering controls
     col1, col2, col3 = st.columns(3)
     
     with col1:
         priority_filter = st.selectbox(
             "Filter by Priority",
-            options=["All"] + list(set(r.get("priority", "unknown") for r in recommendations)),
+            options=filter_options(frame, "priority"),
             index=0,
             key="recommendations_priority_filter"
         )
@@ -554,7 +666,7 @@ def render_recommendations_section(results: Dict[str, Any]):
     with col2:
         action_filter = st.selectbox(
             "Filter by Action Type",
-            options=["All"] + list(set(r.get("action_type", "unknown") for r in recommendations)),
+            options=filter_options(frame, "action_type"),
             index=0,
             key="recommendations_action_filter"
         )
@@ -562,36 +674,76 @@ def render_recommendations_section(results: Dict[str, Any]):
     with col3:
         sort_by = st.selectbox(
             "Sort by",
-            options=["Business Impact", "Expected Revenue", "Conversion Probability", "Urgency Score"],
+            options=list(RECOMMENDATION_SORT_COLUMNS),
             index=0,
             key="recommendations_sort_by"
         )
     
-    # Filter recommendations
-    filtered_recs = recommendations.copy()
+    col1, col2, col3 = st.columns([3, 1, 1])
     
-    if priority_filter != "All":
-        filtered_recs = [r for r in filtered_recs if r.get("priority") == priority_filter]
+    with col1:
+        search = st.text_input(
+            "Search customers",
+            placeholder="Customer name or ID",
+            key="recommendations_search"
+        )
     
-    if action_filter != "All":
-        filtered_recs = [r for r in filtered_recs if r.get("action_type") == action_filter]
+    with col2:
+        page_size = st.selectbox(
+            "Per page",
+            options=list(PAGE_SIZE_OPTIONS),
+            index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+            key="recommendations_page_size"
+        )
     
-    # Sort recommendations
-    sort_key_map = {
-        "Business Impact": "business_impact_score",
-        "Expected Revenue": "expected_revenue", 
-        "Conversion Probability": "conversion_probability",
-        "Urgency Score": "urgency_score"
-    }
+    with col3:
+        view_mode = st.selectbox(
+            "View",
+            options=["Cards", "Table"],
+            index=0,
+            key="recommendations_view_mode"
+        )
+    
+    # Filter and sort on the table; only positions of the selected recommendations come back
+    positions = select_recommendations(frame, priority_filter, action_filter, sort_by, search)
     
-    sort_key = sort_key_map.get(sort_by, "business_impact_score")
-    filtered_recs.sort(key=lambda x: x.get(sort_key, 0), reverse=True)
+    st.write(f"Showing {len(positions)} of {len(recommendations)} recommendations")
     
-    st.write(f"Showing {len(filtered_recs)} of {len(recommendations)} recommendations")
+    if view_mode == "Table":
+        # st.dataframe only sends the visible rows to the browser
+        table = frame.iloc[positions][
+            ["customer_name", "customer_id", "priority", "action_type", "title", *RECOMMENDATION_SORT_COLUMNS.values()]
+        ]
+        st.dataframe(table, hide_index=True, use_container_width=True)
+        return
     
-    # Display recommendations
-    for i, rec in enumerate(filtered_recs):
-        render_recommendation_card(rec, i + 1)
+    # Back to the first page whenever the selection changes
+    selection = (priority_filter, action_filter, sort_by, search, page_size)
+    if st.session_state.get("recommendations_selection") != selection:
+        st.session_state["recommendations_selection"] = selection
+        st.session_state["recommendations_page"] = 1
+    
+    _, _, page_count = page_bounds(len(positions), 1, page_size)
+    st.session_state["recommendations_page"] = min(max(st.session_state.get("recommendations_page", 1), 1), page_count)
+    
+    if page_count > 1:
+        page = st.number_input(
+            f"Page (of {page_count})",
+            min_value=1,
+            max_value=page_count,
+            step=1,
+            key="recommendations_page"
+        )
+    else:
+        page = 1
+    
+    start, end, _ = page_bounds(len(positions), page, page_size)
+    if len(positions):
+        st.caption(f"Recommendations {start + 1}-{end}")
+    
+    # Display only the current page of recommendations
+    for rank, position in enumerate(positions[start:end], start + 1):
+        render_recommendation_card(recommendations[position], rank)
 
 
 def render_recommendation_card(rec: Dict[str, Any], index: int):
@@ -894,15 +1046,15 @@ def render_export_section(results: Dict[str, Any]):
         with col2:
             st.markdown("#### 📧 **Email Templates**")
             # Pre-calculate template data to avoid session state reset
-            template_data = export_email_templates_package(results)
-            st.download_button(
-                label="� Export Templates",
-                data=template_data,
-                file_name=f"email_templates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                mime="application/zip",
-                key="download_templates",
-                help="Export email marketing templates"
-            )
+            with open_email_templates_package(results) as template_package:
+                st.download_button(
+                    label="� Export Templates",
+                    data=template_package,
+                    file_name=f"email_templates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                    mime="application/zip",
+                    key="download_templates",
+                    help="Export email marketing templates"
+                )
         
         with col3:
             st.markdown("#### 📋 **Recommendations**")
@@ -920,15 +1072,15 @@ def render_export_section(results: Dict[str, Any]):
         with col4:
             st.markdown("#### 📦 **Complete Package**")
             # Pre-calculate zip data to avoid session state reset
-            zip_data = export_complete_business_package(results)
-            st.download_button(
-                label="� Export All ZIP",
-                data=zip_data,
-                file_name=f"ai_business_intelligence_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                mime="application/zip",
-                key="download_all",
-                help="Export complete business intelligence package"
-            )
+            with open_complete_business_package(results) as zip_package:
+                st.download_button(
+                    label="� Export All ZIP",
+                    data=zip_package,
+                    file_name=f"ai_business_intelligence_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                    mime="application/zip",
+                    key="download_all",
+                    help="Export complete business intelligence package"
+                )
         
         # Additional export options
         st.markdown("---")
@@ -1041,7 +1193,7 @@ def render_ai_analysis_trigger():
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("🚀 Run AI Analysis", type="primary"):
+        if st.button("🚀 Run AI Analysis", type="primary", disabled="ai_analysis_job_id" in st.session_state):
             run_ai_analysis()
     
     with col2:
@@ -1060,12 +1212,16 @@ def render_ai_analysis_trigger():
 def generate_recommendations_from_real_data(df: pd.DataFrame):
     """Generate personalized recommendations from real customer data"""
     
-    # Initialize debug storage in session state
-    if "ai_debug_logs" not in st.session_state:
-        st.session_state["ai_debug_logs"] = []
+    # Session values of this analysis (the job's store when running in the background)
+    state = analysis_state()
+    job = current_job()
     
     # Clear previous debug logs
-    st.session_state["ai_debug_logs"] = []
+    state["ai_debug_logs"] = []
+    state["ai_debug_info"] = []
+    
+    # Per-customer output goes to the processing log, shown on request in the debug panel
+    state["ai_processing_log"] = ProcessingLog()
     
     # Quick API key test - store in session state
     debug_log = {"type": "api_test", "title": "🔑 API Key Test"}
@@ -1085,7 +1241,7 @@ def generate_recommendations_from_real_data(df: pd.DataFrame):
         debug_log["status"] = "error"
         debug_log["message"] = f"❌ Environment test failed: {e}"
     
-    st.session_state["ai_debug_logs"].append(debug_log)
+    state["ai_debug_logs"].append(debug_log)
     
     try:
         from src.agents.recommendation_generator import ActionableRecommendation, RecommendationPriority, ActionType, RecommendationExplanation
@@ -1093,31 +1249,38 @@ def generate_recommendations_from_real_data(df: pd.DataFrame):
         recommendations = []
         
         # Debug logging
-        st.write("🔍 **DEBUG - Processing Real Customer Data:**")
-        st.write(f"📊 DataFrame shape: {df.shape}")
-        st.write(f"📋 Available columns: {list(df.columns)}")
+        log_processing(f"📊 DataFrame shape: {df.shape}")
+        log_processing(f"📋 Available columns: {list(df.columns)}")
+        failed_customers = 0
         
         # If we have real customer data, create personalized recommendations
         if not df.empty and len(df) > 0:
             # Get user-configured customer limit from session state, default to 5 for backwards compatibility
-            customers_to_analyze = st.session_state.get("customers_to_analyze", 5)
+            customers_to_analyze = state.get("customers_to_analyze", 5)
             
             # Process up to the specified number of customers for recommendations
             actual_customers_to_process = min(customers_to_analyze, len(df))
             real_customers = df.head(actual_customers_to_process)
             
-            st.write(f"🎯 Processing {len(real_customers)} customers for recommendations (selected: {customers_to_analyze}, available: {len(df)})")
+            analysis_notice(f"🎯 Processing {len(real_customers)} customers for recommendations (selected: {customers_to_analyze}, available: {len(df)})")
+            if job is not None:
+                job.set_stage("Generating recommendations", total=len(real_customers))
             
             if customers_to_analyze > len(df):
-                st.info(f"📊 Note: You selected {customers_to_analyze} customers, but only {len(df)} are available in your dataset.")
+                analysis_notice(f"📊 Note: You selected {customers_to_analyze} customers, but only {len(df)} are available in your dataset.")
             
             for i, (_, row) in enumerate(real_customers.iterrows()):
+                if job is not None and job.cancel_requested:
+                    analysis_notice(f"⏹️ Analysis cancelled after {i} of {len(real_customers)} customers", "warning")
+                    break
+                
+                recommendation = None
                 try:
                     # Extract customer information
                     customer_name = extract_customer_name(row)
                     customer_id = str(row.get('Account_ID', f'CUST_{i+1:03d}'))
                     
-                    st.write(f"👤 **Customer {i+1}:** {customer_name} (ID: {customer_id})")
+                    log_processing(f"👤 Customer {i+1}: {customer_name} (ID: {customer_id})")
                     
                     # Debug customer data
                     customer_type = row.get('Customer_Type', 'N/A')
@@ -1127,56 +1290,62 @@ def generate_recommendations_from_real_data(df: pd.DataFrame):
                     contract_status = row.get('Contract_Status', 'N/A')
                     spending_tier = row.get('Spending_Tier', 'N/A')
                     
-                    st.write(f"   - Type: {customer_type}, Plan: {plan_id}, Monthly Fee: HK${monthly_fee}")
-                    st.write(f"   - Churn Risk: {churn_risk}, Contract: {contract_status}, Spending: {spending_tier}")
+                    log_processing(f"   - Type: {customer_type}, Plan: {plan_id}, Monthly Fee: HK${monthly_fee}")
+                    log_processing(f"   - Churn Risk: {churn_risk}, Contract: {contract_status}, Spending: {spending_tier}")
                     
-                    # Show all available columns for this customer
-                    st.write(f"   - Available fields: {[col for col in row.index if pd.notna(row[col]) and str(row[col]).strip()]}")
+                    # Log all available columns for this customer
+                    log_processing(f"   - Available fields: {[col for col in row.index if pd.notna(row[col]) and str(row[col]).strip()]}")
                     
                     # Analyze customer profile for personalized recommendations
                     recommendation = generate_personalized_recommendation(row, customer_name, customer_id, i)
                     if recommendation:
                         recommendations.append(recommendation)
-                        st.write(f"   ✅ Generated recommendation: {recommendation.title}")
+                        log_processing(f"   ✅ Generated recommendation: {recommendation.title}", "success")
                     else:
-                        st.write(f"   ❌ Failed to generate recommendation")
+                        log_processing("   ❌ Failed to generate recommendation", "error")
                         
                 except Exception as e:
-                    st.error(f"❌ Could not process customer {customer_id}: {e}")
+                    failed_customers += 1
                     import traceback
-                    st.code(traceback.format_exc())
-                    continue
+                    log_processing(f"❌ Could not process customer {customer_id}: {e}\n{traceback.format_exc()}", "error")
+                finally:
+                    # Incremental results for the progress view
+                    if job is not None:
+                        job.advance(format_recommendation_for_display(recommendation) if recommendation else None)
+        
+        if failed_customers:
+            analysis_notice(f"⚠️ {failed_customers} customers could not be processed - see the processing log in the debug panel", "warning")
         
-        st.write(f"📋 **Total recommendations generated: {len(recommendations)}**")
+        analysis_notice(f"📋 Total recommendations generated: {len(recommendations)}")
         
         # Show data quality analysis
         if recommendations:
-            st.write("📊 **Data Quality Analysis:**")
             sample_rec = recommendations[0]
             
             # Check revenue distribution
             revenues = [rec.expected_revenue for rec in recommendations]
             unique_revenues = set(revenues)
             if len(unique_revenues) == 1 and list(unique_revenues)[0] > 0:
-                st.warning("⚠️ All customers have similar revenue estimates - using fallback calculations")
+                analysis_notice("⚠️ All customers have similar revenue estimates - using fallback calculations", "warning")
             elif all(r == 0 for r in revenues):
-                st.error("❌ All customers show HK$0 revenue - missing Monthly_Fee data in uploaded files")
+                analysis_notice("❌ All customers show HK$0 revenue - missing Monthly_Fee data in uploaded files", "error")
             
             # Check priority distribution
             priorities = [rec.priority.value for rec in recommendations]
             priority_counts = {p: priorities.count(p) for p in set(priorities)}
-            st.write(f"   - Priority distribution: {priority_counts}")
+            analysis_notice(f"📊 Priority distribution: {priority_counts}")
             
             # Check if using AI or rule-based
             ai_generated = any("ai_generated" in rec.tags for rec in recommendations)
             if ai_generated:
-                st.success("✅ Using AI-powered recommendations")
+                analysis_notice("✅ Using AI-powered recommendations", "success")
             else:
-                st.info("📋 Using rule-based recommendations (no OPENROUTER_API_KEY found)")
+                analysis_notice("📋 Using rule-based recommendations (no OPENROUTER_API_KEY found)")
         
         # Data improvement suggestions
-        st.write("💡 **To Improve Recommendations:**")
-        st.info("""
+        analysis_notice("""
+        💡 **To Improve Recommendations:**
+        
         **For Better Revenue Calculations:**
         - Upload customer data with 'Monthly_Fee' or 'revenue' columns
         - Include 'Customer_Class' (Standard/Premium/Enterprise) for better segmentation
@@ -1192,27 +1361,56 @@ def generate_recommendations_from_real_data(df: pd.DataFrame):
         
         # If no real data or errors, return sample recommendations
         if not recommendations:
-            st.warning("⚠️ No recommendations generated from real data - falling back to sample data")
+            analysis_notice("⚠️ No recommendations generated from real data - falling back to sample data", "warning")
             from src.agents.recommendation_generator import create_sample_recommendations
             recommendations = create_sample_recommendations()
         else:
-            st.success(f"✅ Successfully generated {len(recommendations)} recommendations from real customer data!")
+            analysis_notice(f"✅ Successfully generated {len(recommendations)} recommendations from real customer data!", "success")
         
         return recommendations
         
     except ImportError as e:
-        st.error(f"❌ Import error: {e}")
+        analysis_notice(f"❌ Import error: {e}", "error")
         # Fallback if recommendation generator not available
         from src.agents.recommendation_generator import create_sample_recommendations
         return create_sample_recommendations()
     except Exception as e:
-        st.error(f"❌ Unexpected error in generate_recommendations_from_real_data: {e}")
         import traceback
-        st.code(traceback.format_exc())
+        analysis_notice(f"❌ Unexpected error in generate_recommendations_from_real_data: {e}", "error")
+        log_processing(traceback.format_exc(), "error")
         from src.agents.recommendation_generator import create_sample_recommendations
         return create_sample_recommendations()
 
 
+def analysis_state():
+    """Session values of the running analysis: the job's store in a background job, else st.session_state"""
+    job = current_job()
+    return job.session_data if job is not None else st.session_state
+
+
+def analysis_notice(message: str, status: str = "info"):
+    """Show an analysis message, or keep it for the debug panel when running as a background job"""
+    if current_job() is None:
+        getattr(st, status)(message)
+    else:
+        analysis_state().setdefault("ai_debug_logs", []).append(
+            {"type": "notice", "title": "📋 Analysis", "status": status, "message": message}
+        )
+
+
+def log_processing(message: str, level: str = "info"):
+    """Append a line to the current analysis' processing log"""
+    state = analysis_state()
+    if "ai_processing_log" not in state:
+        state["ai_processing_log"] = ProcessingLog()
+    state["ai_processing_log"].add(message, level)
+
+
+def record_ai_debug_info(debug_info: Dict[str, Any]):
+    """Keep the AI call details of one customer for the debug panel"""
+    analysis_state().setdefault("ai_debug_info", []).append(debug_info)
+
+
 def extract_customer_name(row):
     """Extract customer name from row data"""
     # Try Company Name first for business customers
@@ -1304,12 +1502,10 @@ Available Three HK Plans:
 """
     except Exception as e:
         catalog_context = "Product catalog not available"
-        st.warning(f"Could not load product catalog: {e}")
+        log_processing(f"   ⚠️ Could not load product catalog: {e}", "warning")
     
     # Generate AI-powered recommendation
-    st.write(f"🔍 **About to call AI function for {customer_name}**")
     try:
-        st.write("🚀 Calling generate_ai_recommendation_with_debug...")
         ai_recommendation = generate_ai_recommendation_with_debug(
             customer_name=customer_name,
             customer_id=customer_id,
@@ -1325,15 +1521,14 @@ Available Three HK Plans:
         )
         
         if ai_recommendation:
-            st.success(f"✅ AI recommendation returned for {customer_name}")
+            log_processing(f"   ✅ AI recommendation returned for {customer_name}", "success")
             return ai_recommendation
         else:
-            st.warning(f"⚠️ AI function returned None for {customer_name}")
+            log_processing(f"   ⚠️ AI function returned None for {customer_name}", "warning")
             
     except Exception as e:
-        st.error(f"❌ AI recommendation failed for {customer_name}: {e}")
         import traceback
-        st.code(traceback.format_exc())
+        log_processing(f"   ❌ AI recommendation failed for {customer_name}: {e}\n{traceback.format_exc()}", "error")
     
     # Fallback to rule-based recommendations if AI fails
     
@@ -1473,7 +1668,9 @@ def generate_ai_recommendation_with_debug(customer_name, customer_id, customer_t
                     max_tokens=2000,
                     temperature=0.7
                 )
-                client = OpenRouterClient(config)
+                client = get_openrouter_client(
+                    config.api_key, config.default_model, config.max_tokens, config.temperature
+                )
                 debug_info["client_status"] = {
                     "initialized": True,
                     "model": config.default_model,
@@ -1634,9 +1831,7 @@ REVENUE CALCULATION GUIDELINES:
                     debug_info["response_info"]["cleaned_content"] = clean_content
                     
                     # Store debug info in session state
-                    if "ai_debug_info" not in st.session_state:
-                        st.session_state["ai_debug_info"] = []
-                    st.session_state["ai_debug_info"].append(debug_info)
+                    record_ai_debug_info(debug_info)
                     
                     # Convert to recommendation object
                     return convert_ai_to_recommendation(ai_data, customer_name, customer_id, customer_type, customer_class, spending_tier)
@@ -1647,9 +1842,7 @@ REVENUE CALCULATION GUIDELINES:
                     debug_info["errors"].append(f"JSON parsing failed: {e}")
                     
                     # Store debug info even on failure
-                    if "ai_debug_info" not in st.session_state:
-                        st.session_state["ai_debug_info"] = []
-                    st.session_state["ai_debug_info"].append(debug_info)
+                    record_ai_debug_info(debug_info)
                     return None
             else:
                 # Handle APIResponse error
@@ -1660,9 +1853,7 @@ REVENUE CALCULATION GUIDELINES:
                     "error": error_msg
                 }
                 debug_info["errors"].append(f"API response failed: {error_msg}")
-                if "ai_debug_info" not in st.session_state:
-                    st.session_state["ai_debug_info"] = []
-                st.session_state["ai_debug_info"].append(debug_info)
+                record_ai_debug_info(debug_info)
                 return None
                 
         except Exception as e:
@@ -1671,16 +1862,12 @@ REVENUE CALCULATION GUIDELINES:
                 "error": str(e)
             }
             debug_info["errors"].append(f"API call failed: {e}")
-            if "ai_debug_info" not in st.session_state:
-                st.session_state["ai_debug_info"] = []
-            st.session_state["ai_debug_info"].append(debug_info)
+            record_ai_debug_info(debug_info)
             return None
             
     except Exception as e:
         debug_info["errors"].append(f"Overall function failed: {e}")
-        if "ai_debug_info" not in st.session_state:
-            st.session_state["ai_debug_info"] = []
-        st.session_state["ai_debug_info"].append(debug_info)
+        record_ai_debug_info(debug_info)
         return None
 
 
@@ -1741,10 +1928,11 @@ def convert_ai_to_recommendation(ai_data, customer_name, customer_id, customer_t
         return recommendation
         
     except Exception as e:
-        st.error(f"❌ Failed to convert AI response to recommendation: {e}")
+        log_processing(f"   ❌ Failed to convert AI response to recommendation: {e}", "error")
         return None
 
 
+@cache_by_fingerprint
 def analyze_customer_data(df: pd.DataFrame):
     """Analyze customer data and return insights"""
     if df.empty:
@@ -1781,6 +1969,29 @@ def analyze_customer_data(df: pd.DataFrame):
     return analysis
 
 
+def add_engagement_insights(analysis: Dict[str, Any], df: pd.DataFrame, engagement: pd.DataFrame) -> Dict[str, Any]:
+    """Add engagement features of the merged customers, parsed from the purchase Engagement Data column"""
+    from src.agents import CustomerDataAnalyzer
+    
+    customers = df.drop_duplicates(MERGE_KEY_COLUMN)
+    features = CustomerDataAnalyzer().extract_feature_matrix(
+        customers, customer_key=MERGE_KEY_COLUMN, engagement=engagement
+    )
+    responded = int((features["promotion_response_rate"] > 0).sum())
+    engaged = engagement.loc[engagement.drop(columns="account_id").notna().any(axis=1), "account_id"]
+    
+    return {
+        **analysis,
+        "engagement": {
+            "customers_with_engagement": int(customers[MERGE_KEY_COLUMN].astype(str).isin(engaged).sum()),
+            "average_digital_engagement": float(features["digital_engagement"].mean()),
+            "average_promotion_response_rate": float(features["promotion_response_rate"].mean()),
+        },
+        "patterns": analysis.get("patterns", []) + [f"{responded} of {len(customers)} customers responded to campaigns"],
+    }
+
+
+@cache_by_fingerprint
 def generate_lead_scores(df: pd.DataFrame):
     """Generate lead scoring results from real data"""
     if df.empty:
@@ -1821,150 +2032,235 @@ def generate_lead_scores(df: pd.DataFrame):
 
 
 def run_ai_analysis():
-    """Run the AI analysis using Task 9 components"""
+    """Submit the AI analysis as a background job; render_analysis_progress follows it"""
     
-    try:
-        # Clear any cached results first
-        if "ai_analysis_results" in st.session_state:
-            del st.session_state["ai_analysis_results"]
+    manager = get_analysis_job_manager()
+    running = manager.get(st.session_state.get("ai_analysis_job_id"))
+    if running is not None and not running.done:
+        st.info("⏳ An AI analysis is already running for this session.")
+        return
+    
+    # Clear any cached results first
+    for key in ("ai_analysis_results", "ai_analysis_error", "ai_analysis_partial_recommendations"):
+        st.session_state.pop(key, None)
+    
+    # The job works on a snapshot of the session; st.session_state belongs to the script run
+    inputs = {
+        "customer_data": st.session_state.get("customer_data", {}),
+        "purchase_data": st.session_state.get("purchase_data", {}),
+        "merged_data": st.session_state.get("merged_data_result"),
+        "data_sources": [
+            source for source in ["customer_data", "purchase_data", "product_catalog"]
+            if st.session_state.get(source)
+        ],
+    }
+    job_id = manager.submit(
+        execute_ai_analysis,
+        inputs,
+        session_data={"customers_to_analyze": st.session_state.get("customers_to_analyze", 5)},
+    )
+    st.session_state["ai_analysis_job_id"] = job_id
+    logger.info(f"AI analysis submitted as background job {job_id}")
+    st.rerun()
+
+
+def execute_ai_analysis(job, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Run the AI analysis using Task 9 components; runs on a job worker thread.
+    
+    Messages go to job.session_data (see analysis_notice), incremental
+    recommendations to job.partial_results.
+    
+    Returns:
+        Dashboard results, or None if the job was cancelled
+    """
+    
+    # Import AI components
+    job.set_stage("Loading AI components")
+    from src.agents.recommendation_generator import create_sample_recommendations
+    from src.agents import CustomerDataAnalyzer, LeadScoringEngine, ThreeHKBusinessRulesEngine
+    
+    # Get data from the session snapshot
+    customer_data = inputs["customer_data"]
+    purchase_data = inputs["purchase_data"]
+    merged_data = inputs["merged_data"]
+    
+    # Always load product catalog from persistent database
+    product_catalog_df = get_product_catalog() if is_catalog_available() else pd.DataFrame()
+    has_persistent_catalog = not product_catalog_df.empty
+    
+    # Check for any available data to analyze
+    has_merged_data = (merged_data and 
+                     hasattr(merged_data, 'success') and 
+                     merged_data.success and 
+                     hasattr(merged_data, 'merged_data') and 
+                     merged_data.merged_data is not None)
+    
+    has_individual_data = (customer_data and 
+                         customer_data.get("processed_data") is not None and
+                         purchase_data and 
+                         purchase_data.get("processed_data") is not None)
+    
+    # Process actual customer data if available
+    if has_merged_data:
+        # Use real merged data for analysis
+        df = merged_data.merged_data
+        analysis_notice(f"🎯 Processing {len(df)} real customer records from your uploaded data...")
         
-        with st.spinner("🤖 Running AI analysis... This may take a moment."):
-            
-            # Import AI components
-            from src.agents.recommendation_generator import create_sample_recommendations
-            from src.agents import CustomerDataAnalyzer, LeadScoringEngine, ThreeHKBusinessRulesEngine
-            
-            # Get data from session state
-            customer_data = st.session_state.get("customer_data", {})
-            purchase_data = st.session_state.get("purchase_data", {})
-            merged_data = st.session_state.get("merged_data_result")
-            
-            # Always load product catalog from persistent database
-            product_catalog_df = get_product_catalog() if is_catalog_available() else pd.DataFrame()
-            has_persistent_catalog = not product_catalog_df.empty
-            
-            # Check for any available data to analyze
-            has_merged_data = (merged_data and 
-                             hasattr(merged_data, 'success') and 
-                             merged_data.success and 
-                             hasattr(merged_data, 'merged_data') and 
-                             merged_data.merged_data is not None)
-            
-            has_individual_data = (customer_data and 
-                                 customer_data.get("processed_data") is not None and
-                                 purchase_data and 
-                                 purchase_data.get("processed_data") is not None)
-            
-            # Process actual customer data if available
-            if has_merged_data:
-                # Use real merged data for analysis
-                df = merged_data.merged_data
-                st.info(f"🎯 Processing {len(df)} real customer records from your uploaded data...")
-                
-                # Debug: Show available columns and sample data
-                st.write("🔍 **Debug - Enhanced customer data detected:**")
-                
-                # Show key enhanced fields
-                enhanced_fields = ['Plan_ID', 'Monthly_Fee', 'Contract_Status', 'Churn_Risk', 'Customer_Type', 'Customer_Class', 'Spending_Tier']
-                found_fields = [field for field in enhanced_fields if field in df.columns]
-                st.write(f"✅ Enhanced fields available: {found_fields}")
-                
-                # Show sample customer profile
-                if not df.empty:
-                    sample_customer = df.iloc[0]
-                    st.write("👤 **Sample Customer Profile:**")
-                    st.write(f"- Name: {extract_customer_name(sample_customer)}")
-                    st.write(f"- Account ID: {sample_customer.get('Account_ID', 'N/A')}")
-                    st.write(f"- Plan: {sample_customer.get('Plan_ID', 'N/A')}")
-                    st.write(f"- Monthly Fee: HK${sample_customer.get('Monthly_Fee', 0):,.0f}")
-                    st.write(f"- Customer Type: {sample_customer.get('Customer_Type', 'N/A')}")
-                    st.write(f"- Contract Status: {sample_customer.get('Contract_Status', 'N/A')}")
-                    st.write(f"- Churn Risk: {sample_customer.get('Churn_Risk', 'N/A')}")
-                
-                st.write(f"📊 Total customers to analyze: {len(df)}")
-                
-                # Show enhanced vs basic data status
-                if all(field in df.columns for field in enhanced_fields):
-                    st.success("🎯 **Full enhanced dataset detected** - AI will generate highly personalized recommendations!")
-                else:
-                    st.info("📋 **Basic dataset** - AI will use available data for recommendations")
-                
-                # Show catalog status
-                if has_persistent_catalog:
-                    st.info(f"📦 Using persistent product catalog: {len(product_catalog_df)} plans loaded for enhanced recommendations")
-                else:
-                    st.warning("📦 No product catalog found - using default plan recommendations")
-                
-                # Generate recommendations based on real data
-                recommendations = generate_recommendations_from_real_data(df)
-                customer_analysis_results = analyze_customer_data(df)
-                lead_scoring_results = generate_lead_scores(df)
-                st.success(f"✅ Analyzing {len(df)} real customer records from your merged data!")
-            elif has_individual_data:
-                # Try to work with individual data files
-                st.info("🔄 Using individual data files (customer + purchase data separately)")
-                customer_df = customer_data["processed_data"]
-                purchase_df = purchase_data["processed_data"]
-                
-                # Generate analysis from individual files
-                recommendations = generate_recommendations_from_real_data(customer_df)
-                customer_analysis_results = analyze_customer_data(customer_df)
-                lead_scoring_results = generate_lead_scores(customer_df)
-                st.success(f"✅ Analyzing {len(customer_df)} real customer records from individual files!")
-            else:
-                # Fallback to sample data if no real data available
-                st.warning("⚠️ No real data available. Using sample recommendations for demonstration.")
-                st.info("💡 To analyze your real data: Upload files → Merge data → Run AI Analysis")
-                recommendations = create_sample_recommendations()
-                customer_analysis_results = None
-                lead_scoring_results = None
-            
-            # Format results for dashboard
-            results = {
-                "success": True,
-                "processing_time": 1.5,  # Mock processing time
-                "recommendations": {
-                    "recommendations": [format_recommendation_for_display(rec) for rec in recommendations],
-                    "summary": {
-                        "total_recommendations": len(recommendations),
-                        "total_expected_revenue": sum(rec.expected_revenue for rec in recommendations),
-                        "average_conversion_probability": sum(rec.conversion_probability for rec in recommendations) / len(recommendations) if recommendations else 0,
-                    }
-                },
-                "customer_analysis": customer_analysis_results,
-                "lead_scores": lead_scoring_results,
-                "metadata": {
-                    "timestamp": datetime.now().isoformat(),
-                    "ai_engine": "Task 9 AI Agent",
-                    "data_sources": [
-                        source for source in ["customer_data", "purchase_data", "product_catalog"] 
-                        if st.session_state.get(source)
-                    ],
-                    "data_source_type": "merged_data" if has_merged_data else ("individual_files" if has_individual_data else "sample_data"),
-                    "analysis_id": f"analysis_{int(time.time())}",
-                    "has_product_catalog": has_persistent_catalog,
-                    "catalog_plans_count": len(product_catalog_df) if has_persistent_catalog else 0
-                }
+        # Debug: Log available columns and sample data
+        enhanced_fields = ['Plan_ID', 'Monthly_Fee', 'Contract_Status', 'Churn_Risk', 'Customer_Type', 'Customer_Class', 'Spending_Tier']
+        found_fields = [field for field in enhanced_fields if field in df.columns]
+        log_processing(f"✅ Enhanced fields available: {found_fields}")
+        
+        # Log sample customer profile
+        if not df.empty:
+            sample_customer = df.iloc[0]
+            log_processing("👤 Sample Customer Profile:")
+            log_processing(f"- Name: {extract_customer_name(sample_customer)}")
+            log_processing(f"- Account ID: {sample_customer.get('Account_ID', 'N/A')}")
+            log_processing(f"- Plan: {sample_customer.get('Plan_ID', 'N/A')}")
+            log_processing(f"- Monthly Fee: HK${sample_customer.get('Monthly_Fee', 0):,.0f}")
+            log_processing(f"- Customer Type: {sample_customer.get('Customer_Type', 'N/A')}")
+            log_processing(f"- Contract Status: {sample_customer.get('Contract_Status', 'N/A')}")
+            log_processing(f"- Churn Risk: {sample_customer.get('Churn_Risk', 'N/A')}")
+        
+        log_processing(f"📊 Total customers to analyze: {len(df)}")
+        
+        # Show enhanced vs basic data status
+        if all(field in df.columns for field in enhanced_fields):
+            analysis_notice("🎯 **Full enhanced dataset detected** - AI will generate highly personalized recommendations!", "success")
+        else:
+            analysis_notice("📋 **Basic dataset** - AI will use available data for recommendations")
+        
+        # Show catalog status
+        if has_persistent_catalog:
+            analysis_notice(f"📦 Using persistent product catalog: {len(product_catalog_df)} plans loaded for enhanced recommendations")
+        else:
+            analysis_notice("📦 No product catalog found - using default plan recommendations", "warning")
+        
+        # Generate recommendations based on real data
+        recommendations = generate_recommendations_from_real_data(df)
+        if job.cancel_requested:
+            return None
+        job.set_stage("Analyzing customers and scoring leads")
+        customer_analysis_results = analyze_customer_data(df)
+        engagement = merged_data.engagement_features()
+        if customer_analysis_results is not None and engagement is not None:
+            customer_analysis_results = add_engagement_insights(customer_analysis_results, df, engagement)
+        lead_scoring_results = generate_lead_scores(df)
+    elif has_individual_data:
+        # Try to work with individual data files
+        analysis_notice("🔄 Using individual data files (customer + purchase data separately)")
+        customer_df = customer_data["processed_data"]
+        purchase_df = purchase_data["processed_data"]
+        
+        # Generate analysis from individual files
+        recommendations = generate_recommendations_from_real_data(customer_df)
+        if job.cancel_requested:
+            return None
+        job.set_stage("Analyzing customers and scoring leads")
+        customer_analysis_results = analyze_customer_data(customer_df)
+        lead_scoring_results = generate_lead_scores(customer_df)
+    else:
+        # Fallback to sample data if no real data available
+        analysis_notice("⚠️ No real data available. Using sample recommendations for demonstration.", "warning")
+        analysis_notice("💡 To analyze your real data: Upload files → Merge data → Run AI Analysis")
+        recommendations = create_sample_recommendations()
+        customer_analysis_results = None
+        lead_scoring_results = None
+    
+    # Format results for dashboard
+    job.set_stage("Formatting results")
+    results = {
+        "success": True,
+        "processing_time": job.elapsed,
+        "recommendations": {
+            "recommendations": [format_recommendation_for_display(rec) for rec in recommendations],
+            "summary": {
+                "total_recommendations": len(recommendations),
+                "total_expected_revenue": sum(rec.expected_revenue for rec in recommendations),
+                "average_conversion_probability": sum(rec.conversion_probability for rec in recommendations) / len(recommendations) if recommendations else 0,
             }
-            
-            # Store results in session state
-            st.session_state["ai_analysis_results"] = results
-            
-            data_source_msg = {
-                "merged_data": "✅ Analysis using your merged customer + purchase data!",
-                "individual_files": "✅ Analysis using your individual data files!",
-                "sample_data": "⚠️ Analysis using sample data (no real data available)"
-            }.get(results["metadata"]["data_source_type"], "✅ Analysis completed!")
-            
-            st.success(data_source_msg)
-            st.info(f"📊 Fresh analysis completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            st.rerun()
-            
-    except ImportError as e:
-        st.error(f"❌ AI components not available: {e}")
-        st.info("💡 AI analysis requires Task 9 components to be properly installed.")
-    except Exception as e:
-        st.error(f"❌ Error during AI analysis: {e}")
+        },
+        "customer_analysis": customer_analysis_results,
+        "lead_scores": lead_scoring_results,
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "ai_engine": "Task 9 AI Agent",
+            "data_sources": inputs["data_sources"],
+            "data_source_type": "merged_data" if has_merged_data else ("individual_files" if has_individual_data else "sample_data"),
+            "analysis_id": f"analysis_{int(time.time())}",
+            "job_id": job.job_id,
+            "has_product_catalog": has_persistent_catalog,
+            "catalog_plans_count": len(product_catalog_df) if has_persistent_catalog else 0
+        }
+    }
+    
+    return results
+
+
+def collect_analysis_job() -> Optional[Dict[str, Any]]:
+    """
+    Copy a background analysis' progress into the session.
+    
+    New incremental recommendations are appended to
+    "ai_analysis_partial_recommendations". Once the job has finished, its
+    results and debug output are stored in the session and the job is released.
+    
+    Returns:
+        Progress snapshot of the job, or None if the session has no job
+    """
+    job_id = st.session_state.get("ai_analysis_job_id")
+    manager = get_analysis_job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        st.session_state.pop("ai_analysis_job_id", None)
+        return None
+    
+    partial = st.session_state.setdefault("ai_analysis_partial_recommendations", [])
+    partial.extend(job.partial_results_since(len(partial)))
+    snapshot = job.snapshot()
+    
+    if job.done:
+        for key in ANALYSIS_SESSION_KEYS:
+            if key in job.session_data:
+                st.session_state[key] = job.session_data[key]
+        if job.status == JobStatus.COMPLETED and job.result:
+            st.session_state["ai_analysis_results"] = job.result
+        elif job.status == JobStatus.FAILED:
+            st.session_state["ai_analysis_error"] = job.error
+        st.session_state.pop("ai_analysis_job_id", None)
+        st.session_state.pop("ai_analysis_partial_recommendations", None)
+        manager.discard(job_id)
+    
+    return snapshot
+
+
+@st.fragment(run_every=ANALYSIS_POLL_SECONDS)
+def render_analysis_progress():
+    """Poll the session's background analysis; only this fragment reruns while the job is busy"""
+    snapshot = collect_analysis_job()
+    if snapshot is None:
+        return
+    
+    status = snapshot["status"]
+    if status in (JobStatus.QUEUED, JobStatus.RUNNING):
+        total = snapshot["total"]
+        fraction = snapshot["completed"] / total if total else 0.0
+        label = f"{snapshot['stage']} ({snapshot['completed']}/{total})" if total else snapshot["stage"]
+        st.markdown("### 🤖 AI Analysis Running")
+        st.progress(min(fraction, 1.0), text=label)
+        st.caption(f"⏱️ {snapshot['elapsed']:.0f}s elapsed · {snapshot['partial_count']} recommendations so far")
+        if st.button("⏹️ Cancel Analysis", key="cancel_ai_analysis"):
+            get_analysis_job_manager().cancel(snapshot["job_id"])
+        return
+    
+    # Finished: show the outcome on the full page
+    if status == JobStatus.COMPLETED:
+        st.toast(f"✅ AI analysis completed in {snapshot['elapsed']:.1f}s")
+    elif status == JobStatus.CANCELLED:
+        st.toast("⏹️ AI analysis cancelled")
+    st.rerun()
 
 
 def generate_plan_recommendations(current_plan, customer_type, spending_tier):
@@ -2193,18 +2489,10 @@ def format_recommendation_for_display(rec) -> Dict[str, Any]:
     }
 
 
-def export_recommendations_csv(results: Dict[str, Any]) -> str:
-    """Export recommendations as CSV"""
-    
-    recommendations = results.get("recommendations", {}).get("recommendations", [])
-    
-    if not recommendations:
-        return "No recommendations to export"
-    
-    # Create DataFrame for export
-    export_data = []
+def recommendation_export_rows(recommendations: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Legacy recommendations export rows, one per recommendation"""
     for rec in recommendations:
-        export_data.append({
+        yield {
             "Customer_ID": rec.get("customer_id"),
             "Customer_Name": rec.get("customer_name"),
             "Priority": rec.get("priority"),
@@ -2218,10 +2506,28 @@ def export_recommendations_csv(results: Dict[str, Any]) -> str:
             "Next_Steps": "; ".join(rec.get("next_steps", [])),
             "Created_At": rec.get("created_at"),
             "Expires_At": rec.get("expires_at"),
-        })
+        }
+
+
+def iter_recommendations_csv(results: Dict[str, Any]) -> Iterator[str]:
+    """Legacy recommendations CSV as text chunks"""
     
-    df = pd.DataFrame(export_data)
-    return df.to_csv(index=False)
+    recommendations = results.get("recommendations", {}).get("recommendations", [])
+    
+    if not recommendations:
+        return iter(["No recommendations to export"])
+    
+    return iter_csv(recommendation_export_rows(recommendations))
+
+
+def export_recommendations_csv(results: Dict[str, Any]) -> str:
+    """Export recommendations as CSV"""
+    return "".join(iter_recommendations_csv(results))
+
+
+def iter_detailed_json(results: Dict[str, Any]) -> Iterator[str]:
+    """Detailed analysis JSON as text chunks (same text as export_detailed_json)"""
+    return iter_json(results, indent=2, default=str)
 
 
 def export_detailed_json(results: Dict[str, Any]) -> str:
@@ -2229,8 +2535,8 @@ def export_detailed_json(results: Dict[str, Any]) -> str:
     return json.dumps(results, indent=2, default=str)
 
 
-def export_crewai_offers_csv(results: Dict[str, Any]) -> str:
-    """Export CrewAI personalized offers as CSV for CRM integration"""
+def iter_crewai_offers_csv(results: Dict[str, Any]) -> Iterator[str]:
+    """CrewAI personalized offers CSV as text chunks"""
     
     # Check for CrewAI results in session state first (most recent)
     if "crewai_deliverables" in st.session_state:
@@ -2249,12 +2555,20 @@ def export_crewai_offers_csv(results: Dict[str, Any]) -> str:
         # Add null safety check
         offers = deliverables.get('personalized_offers', []) if deliverables else []
     
-    # Create comprehensive export data for CRM systems
-    export_data = []
+    return iter_csv(crewai_offer_rows(offers))
+
+
+def export_crewai_offers_csv(results: Dict[str, Any]) -> str:
+    """Export CrewAI personalized offers as CSV for CRM integration"""
+    return "".join(iter_crewai_offers_csv(results))
+
+
+def crewai_offer_rows(offers: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """CRM export rows for personalized offers (a sample row when there are none)"""
     
     if not offers:
         # Create sample data to show the structure when no real data is available
-        export_data = [{
+        yield {
             "Customer_ID": "SAMPLE_001",
             "Customer_Name": "Sample Customer",
             "Offer_Type": "No Data Available",
@@ -2270,34 +2584,32 @@ def export_crewai_offers_csv(results: Dict[str, Any]) -> str:
             "Campaign_Code": "NO_DATA",
             "Priority": "N/A",
             "Status": "No Data - Please Upload Customer Data First"
-        }]
-    else:
-        for offer in offers:
-            export_data.append({
-                "Customer_ID": offer.get("customer_id", ""),
-                "Customer_Name": offer.get("customer_name", ""),
-                "Offer_Type": offer.get("offer_type", ""),
-                "Offer_Title": offer.get("title", ""),
-                "Offer_Description": offer.get("description", ""),
-                "Current_Plan": offer.get("current_plan", ""),
-                "Recommended_Plan": offer.get("recommended_plan", ""),
-                "Discount_Details": offer.get("discount", ""),
-                "Monthly_Value_HKD": offer.get("estimated_value", ""),
-                "Revenue_Impact_HKD": offer.get("revenue_impact", ""),
-                "Confidence_Score": f"{offer.get('confidence', 0) * 100:.0f}%",
-                "Expiry_Date": offer.get("expiry_date", ""),
-                "Campaign_Code": f"THREE_HK_{offer.get('offer_type', 'GENERAL').upper().replace(' ', '_')}",
-                "Priority": "High" if offer.get('confidence', 0) > 0.8 else "Medium" if offer.get('confidence', 0) > 0.6 else "Low",
-                "Status": "Ready for CRM Import"
-            })
-    
-    # Convert to DataFrame and export
-    df = pd.DataFrame(export_data)
-    return df.to_csv(index=False)
+        }
+        return
+    
+    # Create comprehensive export data for CRM systems
+    for offer in offers:
+        yield {
+            "Customer_ID": offer.get("customer_id", ""),
+            "Customer_Name": offer.get("customer_name", ""),
+            "Offer_Type": offer.get("offer_type", ""),
+            "Offer_Title": offer.get("title", ""),
+            "Offer_Description": offer.get("description", ""),
+            "Current_Plan": offer.get("current_plan", ""),
+            "Recommended_Plan": offer.get("recommended_plan", ""),
+            "Discount_Details": offer.get("discount", ""),
+            "Monthly_Value_HKD": offer.get("estimated_value", ""),
+            "Revenue_Impact_HKD": offer.get("revenue_impact", ""),
+            "Confidence_Score": f"{offer.get('confidence', 0) * 100:.0f}%",
+            "Expiry_Date": offer.get("expiry_date", ""),
+            "Campaign_Code": f"THREE_HK_{offer.get('offer_type', 'GENERAL').upper().replace(' ', '_')}",
+            "Priority": "High" if offer.get('confidence', 0) > 0.8 else "Medium" if offer.get('confidence', 0) > 0.6 else "Low",
+            "Status": "Ready for CRM Import"
+        }
 
 
-def export_crewai_recommendations_csv(results: Dict[str, Any]) -> str:
-    """Export CrewAI customer action recommendations as CSV"""
+def iter_crewai_recommendations_csv(results: Dict[str, Any]) -> Iterator[str]:
+    """CrewAI customer action recommendations CSV as text chunks"""
     
     # Check for CrewAI results in session state first (most recent)
     if "crewai_deliverables" in st.session_state:
@@ -2316,12 +2628,25 @@ def export_crewai_recommendations_csv(results: Dict[str, Any]) -> str:
         # Add null safety check
         recommendations = deliverables.get('customer_recommendations', []) if deliverables else []
     
-    # Create actionable recommendations export for sales teams
-    export_data = []
+    return iter_csv(crewai_recommendation_rows(recommendations))
+
+
+def export_crewai_recommendations_csv(results: Dict[str, Any]) -> str:
+    """Export CrewAI customer action recommendations as CSV"""
+    return "".join(iter_crewai_recommendations_csv(results))
+
+
+def crewai_recommendation_rows(recommendations: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Sales team export rows for action recommendations (a sample row when there are none)"""
+    
+    # One timestamp for the whole export
+    now = datetime.now()
+    created_date = now.strftime('%Y-%m-%d')
+    created_time = now.strftime('%H:%M:%S')
     
     if not recommendations:
         # Create sample data to show the structure when no real data is available
-        export_data = [{
+        yield {
             "Customer_ID": "SAMPLE_001",
             "Customer_Name": "Sample Customer",
             "Priority_Level": "No Data Available",
@@ -2340,39 +2665,39 @@ def export_crewai_recommendations_csv(results: Dict[str, Any]) -> str:
             "Revenue_Potential": "N/A",
             "Notes": "No recommendations generated - customer data required",
             "Assigned_To": "N/A",
-            "Created_Date": datetime.now().strftime('%Y-%m-%d'),
-            "Created_Time": datetime.now().strftime('%H:%M:%S')
-        }]
-    else:
-        for rec in recommendations:
-            # Join talking points into a single string
-            talking_points = "; ".join(rec.get('talking_points', []))
-            
-            export_data.append({
-                "Customer_ID": rec.get("customer_id", ""),
-                "Customer_Name": rec.get("customer_name", ""),
-                "Priority_Level": rec.get("priority", ""),
-                "Action_Required": rec.get("action", ""),
-                "Expected_Outcome": rec.get("expected_outcome", ""),
-                "Timeline": rec.get("timeline", ""),
-                "Success_Probability": rec.get("success_probability", ""),
-                "Talking_Points": talking_points,
-                "Contact_Method": "Phone Call + Email",
-                "Department": "Sales Team",
-                "Territory": "Hong Kong",
-                "Follow_Up_Date": (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d'),
-                "Status": "Pending Action",
-                "Lead_Score": "Hot" if rec.get("priority") == "High" else "Warm",
-                "Campaign_Type": "AI_Generated_Recommendation",
-                "Revenue_Potential": rec.get("expected_outcome", ""),
-                "Notes": f"AI-generated recommendation based on customer behavior analysis",
-                "Assigned_To": "Sales Representative",
-                "Created_Date": datetime.now().strftime('%Y-%m-%d'),
-                "Created_Time": datetime.now().strftime('%H:%M:%S')
-            })
+            "Created_Date": created_date,
+            "Created_Time": created_time
+        }
+        return
     
-    df = pd.DataFrame(export_data)
-    return df.to_csv(index=False)
+    # Create actionable recommendations export for sales teams
+    follow_up_date = (now + timedelta(days=7)).strftime('%Y-%m-%d')
+    for rec in recommendations:
+        # Join talking points into a single string
+        talking_points = "; ".join(rec.get('talking_points', []))
+        
+        yield {
+            "Customer_ID": rec.get("customer_id", ""),
+            "Customer_Name": rec.get("customer_name", ""),
+            "Priority_Level": rec.get("priority", ""),
+            "Action_Required": rec.get("action", ""),
+            "Expected_Outcome": rec.get("expected_outcome", ""),
+            "Timeline": rec.get("timeline", ""),
+            "Success_Probability": rec.get("success_probability", ""),
+            "Talking_Points": talking_points,
+            "Contact_Method": "Phone Call + Email",
+            "Department": "Sales Team",
+            "Territory": "Hong Kong",
+            "Follow_Up_Date": follow_up_date,
+            "Status": "Pending Action",
+            "Lead_Score": "Hot" if rec.get("priority") == "High" else "Warm",
+            "Campaign_Type": "AI_Generated_Recommendation",
+            "Revenue_Potential": rec.get("expected_outcome", ""),
+            "Notes": f"AI-generated recommendation based on customer behavior analysis",
+            "Assigned_To": "Sales Representative",
+            "Created_Date": created_date,
+            "Created_Time": created_time
+        }
 
 
 def export_campaign_summary_csv(results: Dict[str, Any]) -> str:
@@ -2457,78 +2782,14 @@ def export_campaign_summary_csv(results: Dict[str, Any]) -> str:
     return df.to_csv(index=False)
 
 
-def export_email_templates_package(results: Dict[str, Any]) -> bytes:
-    """Export email templates as individual files in a ZIP package"""
-    import zipfile
-    import io
+def email_template_files(template: Dict[str, Any], index: int, generated: datetime) -> List[Tuple[str, str]]:
+    """HTML and plain text files of one email template as (file name, content) pairs"""
+    template_id = template.get('template_id', f'TEMPLATE_{index+1:03d}')
+    template_name = template.get('template_name', 'Unknown Template')
+    file_stem = f"{template_id}_{template_name.replace(' ', '_')}"
     
-    # Check for CrewAI results in session state first (most recent)
-    if "crewai_deliverables" in st.session_state:
-        deliverables = st.session_state["crewai_deliverables"]
-        # Add null safety check for persistent state corruption
-        templates = deliverables.get('email_templates', []) if deliverables else []
-    elif "ai_analysis_results" in st.session_state and "crewai_deliverables" in st.session_state["ai_analysis_results"]:
-        # Backup location in main results
-        deliverables = st.session_state["ai_analysis_results"]["crewai_deliverables"]
-        # Add null safety check for persistent state corruption
-        templates = deliverables.get('email_templates', []) if deliverables else []
-    else:
-        # Fallback to results parameter
-        collaboration_results = results.get('collaboration_results', {})
-        deliverables = collaboration_results.get('deliverables', {})
-        # Add null safety check
-        templates = deliverables.get('email_templates', []) if deliverables else []
-    
-    if not templates:
-        # Return ZIP with explanation file
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            explanation = """Three HK Email Marketing Templates - No Data Available
-
-Generated: {datetime}
-
-STATUS: No email templates available for export
-
-REASON: No customer data was provided to the CrewAI collaboration system.
-
-TO GENERATE EMAIL TEMPLATES:
-1. Upload customer data (CSV files) using the Upload Data page
-2. Navigate to Analysis Results page  
-3. Click "Launch Collaboration" to run CrewAI multi-agent analysis
-4. Download generated email templates after analysis completes
-
-The CrewAI system will generate personalized email templates based on:
-- Customer segmentation analysis
-- Behavioral patterns and preferences
-- Revenue optimization recommendations
-- Hong Kong market localization
-
-For support, contact the AI Revenue Assistant team.
-""".format(datetime=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-            
-            zip_file.writestr("NO_DATA_EXPLANATION.txt", explanation)
-        return zip_buffer.getvalue()
-    
-    # Create ZIP file with email templates
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        
-        # Add README file
-        readme_content = f"""Three HK Email Marketing Templates
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Templates: {len(templates)}
-
-This package contains ready-to-use email marketing templates generated by AI analysis.
-
-Files included:
-"""
-        
-        for i, template in enumerate(templates):
-            template_id = template.get('template_id', f'TEMPLATE_{i+1:03d}')
-            template_name = template.get('template_name', 'Unknown Template')
-            
-            # Add template as HTML file
-            html_content = f"""<!DOCTYPE html>
+    # Template as HTML file
+    html_content = f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -2561,16 +2822,13 @@ Files included:
     </div>
     
     <div class="footer">
-        Generated by Three HK AI Revenue Assistant | {datetime.now().strftime('%Y-%m-%d')}
+        Generated by Three HK AI Revenue Assistant | {generated.strftime('%Y-%m-%d')}
     </div>
 </body>
 </html>"""
-            
-            # Add HTML template to ZIP
-            zip_file.writestr(f"{template_id}_{template_name.replace(' ', '_')}.html", html_content)
-            
-            # Add plain text version
-            txt_content = f"""Template: {template_name}
+    
+    # Plain text version
+    txt_content = f"""Template: {template_name}
 Template ID: {template_id}
 Subject: {template.get('subject', 'No subject')}
 Target Audience: {template.get('target_audience', 'All customers')}
@@ -2584,19 +2842,91 @@ Email Body:
 
 ---
 Generated by Three HK AI Revenue Assistant
-Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Date: {generated.strftime('%Y-%m-%d %H:%M:%S')}
 """
-            
-            zip_file.writestr(f"{template_id}_{template_name.replace(' ', '_')}.txt", txt_content)
-            
-            # Update README
-            readme_content += f"- {template_id}_{template_name.replace(' ', '_')}.html\n"
-            readme_content += f"- {template_id}_{template_name.replace(' ', '_')}.txt\n"
-        
-        # Add README to ZIP
-        zip_file.writestr("README.txt", readme_content)
     
-    return zip_buffer.getvalue()
+    return [(f"{file_stem}.html", html_content), (f"{file_stem}.txt", txt_content)]
+
+
+def email_template_package_entries(templates: List[Dict[str, Any]]) -> Iterator[ZipEntry]:
+    """
+    Files of the email templates package, produced one template at a time.
+    
+    The README lists every file, so it is written last from the collected names.
+    """
+    generated = datetime.now()
+    
+    if not templates:
+        # Package with explanation file only
+        explanation = """Three HK Email Marketing Templates - No Data Available
+
+Generated: {datetime}
+
+STATUS: No email templates available for export
+
+REASON: No customer data was provided to the CrewAI collaboration system.
+
+TO GENERATE EMAIL TEMPLATES:
+1. Upload customer data (CSV files) using the Upload Data page
+2. Navigate to Analysis Results page  
+3. Click "Launch Collaboration" to run CrewAI multi-agent analysis
+4. Download generated email templates after analysis completes
+
+The CrewAI system will generate personalized email templates based on:
+- Customer segmentation analysis
+- Behavioral patterns and preferences
+- Revenue optimization recommendations
+- Hong Kong market localization
+
+For support, contact the AI Revenue Assistant team.
+""".format(datetime=generated.strftime('%Y-%m-%d %H:%M:%S'))
+        yield "NO_DATA_EXPLANATION.txt", [explanation]
+        return
+    
+    file_names = []
+    for i, template in enumerate(templates):
+        for file_name, content in email_template_files(template, i, generated):
+            file_names.append(file_name)
+            yield file_name, [content]
+    
+    readme_header = f"""Three HK Email Marketing Templates
+Generated: {generated.strftime('%Y-%m-%d %H:%M:%S')}
+Templates: {len(templates)}
+
+This package contains ready-to-use email marketing templates generated by AI analysis.
+
+Files included:
+"""
+    yield "README.txt", itertools.chain([readme_header], (f"- {file_name}\n" for file_name in file_names))
+
+
+def open_email_templates_package(results: Dict[str, Any]) -> ExportFile:
+    """Email templates ZIP package, streamed into a spooled temporary file"""
+    
+    # Check for CrewAI results in session state first (most recent)
+    if "crewai_deliverables" in st.session_state:
+        deliverables = st.session_state["crewai_deliverables"]
+        # Add null safety check for persistent state corruption
+        templates = deliverables.get('email_templates', []) if deliverables else []
+    elif "ai_analysis_results" in st.session_state and "crewai_deliverables" in st.session_state["ai_analysis_results"]:
+        # Backup location in main results
+        deliverables = st.session_state["ai_analysis_results"]["crewai_deliverables"]
+        # Add null safety check for persistent state corruption
+        templates = deliverables.get('email_templates', []) if deliverables else []
+    else:
+        # Fallback to results parameter
+        collaboration_results = results.get('collaboration_results', {})
+        deliverables = collaboration_results.get('deliverables', {})
+        # Add null safety check
+        templates = deliverables.get('email_templates', []) if deliverables else []
+    
+    return spool_zip(email_template_package_entries(templates))
+
+
+def export_email_templates_package(results: Dict[str, Any]) -> bytes:
+    """Export email templates as individual files in a ZIP package"""
+    with open_email_templates_package(results) as package:
+        return package.read()
 
 
 # Task 29: Individual Email Template Files Export Functions
@@ -2771,45 +3101,33 @@ def get_email_templates_from_session() -> List[Dict[str, Any]]:
     return templates if templates else []
 
 
-def export_complete_business_package(results: Dict[str, Any]) -> bytes:
-    """Export complete business intelligence package as ZIP"""
-    import zipfile
-    import io
+def business_package_entries(results: Dict[str, Any]) -> Iterator[ZipEntry]:
+    """
+    Files of the complete business intelligence package, in archive order.
     
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        
-        # Add customer offers CSV
-        offers_csv = export_crewai_offers_csv(results)
-        zip_file.writestr("1_Customer_Offers.csv", offers_csv)
-        
-        # Add action recommendations CSV
-        recommendations_csv = export_crewai_recommendations_csv(results)
-        zip_file.writestr("2_Action_Recommendations.csv", recommendations_csv)
-        
-        # Add campaign summary CSV
-        summary_csv = export_campaign_summary_csv(results)
-        zip_file.writestr("3_Campaign_Summary.csv", summary_csv)
-        
-        # Add legacy recommendations CSV
-        legacy_csv = export_recommendations_csv(results)
-        zip_file.writestr("4_Legacy_Recommendations.csv", legacy_csv)
-        
-        # Add detailed JSON report
-        json_report = export_detailed_json(results)
-        zip_file.writestr("5_Detailed_Analysis_Report.json", json_report)
-        
-        # Add email templates (extract from ZIP)
-        collaboration_results = results.get('collaboration_results', {})
-        deliverables = collaboration_results.get('deliverables', {}) if collaboration_results else {}
-        templates = deliverables.get('email_templates', []) if deliverables else []
+    CSV reports and the JSON report are produced in chunks, so no report is
+    held in memory as a whole while the archive is written.
+    """
+    # Customer offers, action recommendations and campaign summary CSVs
+    yield "1_Customer_Offers.csv", iter_crewai_offers_csv(results)
+    yield "2_Action_Recommendations.csv", iter_crewai_recommendations_csv(results)
+    yield "3_Campaign_Summary.csv", [export_campaign_summary_csv(results)]
+    
+    # Legacy recommendations CSV and detailed JSON report
+    yield "4_Legacy_Recommendations.csv", iter_recommendations_csv(results)
+    yield "5_Detailed_Analysis_Report.json", iter_detailed_json(results)
+    
+    # Add email templates
+    collaboration_results = results.get('collaboration_results', {})
+    deliverables = collaboration_results.get('deliverables', {}) if collaboration_results else {}
+    templates = deliverables.get('email_templates', []) if deliverables else []
+    
+    for i, template in enumerate(templates):
+        template_id = template.get('template_id', f'TEMPLATE_{i+1:03d}')
+        template_name = template.get('template_name', 'Unknown Template')
         
-        for i, template in enumerate(templates):
-            template_id = template.get('template_id', f'TEMPLATE_{i+1:03d}')
-            template_name = template.get('template_name', 'Unknown Template')
-            
-            # Add template as text file in templates folder
-            txt_content = f"""Template: {template_name}
+        # Add template as text file in templates folder
+        txt_content = f"""Template: {template_name}
 Template ID: {template_id}
 Subject: {template.get('subject', 'No subject')}
 Target Audience: {template.get('target_audience', 'All customers')}
@@ -2821,13 +3139,13 @@ Personalization Fields:
 Email Body:
 {template.get('body', 'No content available')}
 """
-            zip_file.writestr(f"Email_Templates/{template_id}_{template_name.replace(' ', '_')}.txt", txt_content)
-        
-        # Add executive summary
-        summary = deliverables.get('summary_count', {}) if deliverables else {}
-        performance_metrics = collaboration_results.get('performance_metrics', {}) if collaboration_results else {}
-        
-        executive_summary = f"""THREE HK AI REVENUE ASSISTANT
+        yield f"Email_Templates/{template_id}_{template_name.replace(' ', '_')}.txt", [txt_content]
+    
+    # Add executive summary
+    summary = deliverables.get('summary_count', {}) if deliverables else {}
+    performance_metrics = collaboration_results.get('performance_metrics', {}) if collaboration_results else {}
+    
+    executive_summary = f"""THREE HK AI REVENUE ASSISTANT
 BUSINESS INTELLIGENCE PACKAGE
 ===============================================
 
@@ -2892,10 +3210,19 @@ For technical support or questions about this analysis:
 This package represents the transformation of raw customer data into
 actionable business intelligence ready for revenue optimization.
 """
-        
-        zip_file.writestr("EXECUTIVE_SUMMARY.txt", executive_summary)
     
-    return zip_buffer.getvalue()
+    yield "EXECUTIVE_SUMMARY.txt", [executive_summary]
+
+
+def open_complete_business_package(results: Dict[str, Any]) -> ExportFile:
+    """Complete business intelligence package ZIP, streamed into a spooled temporary file"""
+    return spool_zip(business_package_entries(results))
+
+
+def export_complete_business_package(results: Dict[str, Any]) -> bytes:
+    """Export complete business intelligence package as ZIP"""
+    with open_complete_business_package(results) as package:
+        return package.read()
 
 
 def standardize_crewai_export_data(crewai_results: Dict[str, Any]) -> Dict[str, Any]:
@@ -3098,13 +3425,18 @@ def perform_data_merge(strategy: str, show_sensitive: bool):
         merger = DataMerger()
         strategy_enum = MergeStrategy(strategy)
 
-        # Perform merge
-        result = merger.merge_datasets(
-            customer_data_dict=customer_data,
-            purchase_data_dict=purchase_data,
-            strategy=strategy_enum,
-            show_sensitive=show_sensitive,
-        )
+        # Perform merge; streamed uploads are merged out of core from their storage keys
+        if customer_data.get("streamed") or purchase_data.get("streamed"):
+            result = merge_uploaded_datasets(
+                privacy_pipeline.encrypted_storage, customer_data, purchase_data, strategy_enum
+            )
+        else:
+            result = merger.merge_datasets(
+                customer_data_dict=customer_data,
+                purchase_data_dict=purchase_data,
+                strategy=strategy_enum,
+                show_sensitive=show_sensitive,
+            )
 
         # Store result in session state
         st.session_state["merged_data_result"] = result
@@ -3334,6 +3666,7 @@ def render_agent_collaboration_section(results: Dict[str, Any]):
         customers_to_analyze = st.session_state.get("customers_to_analyze", 5)
         
         if full_customer_data:
+            customer_frame = None
             # Extract actual customer records based on storage format
             if isinstance(full_customer_data, dict) and "original_data" in full_customer_data:
                 # New format: extract DataFrame from privacy pipeline
@@ -3341,6 +3674,7 @@ def render_agent_collaboration_section(results: Dict[str, Any]):
                 if df is not None and not df.empty:
                     # Convert DataFrame to list of dicts and limit to analysis count
                     customer_records = df.head(customers_to_analyze).to_dict('records')
+                    customer_frame = df  # Full dataset is summarized into token-bounded digests
                 else:
                     customer_records = []
                 total_available = len(df) if df is not None else 0
@@ -3367,6 +3701,8 @@ def render_agent_collaboration_section(results: Dict[str, Any]):
                     'revenue_baseline': 175000,  # HK$ monthly baseline
                     'analysis_limit': customers_to_analyze
                 }
+                if customer_frame is not None:
+                    structured_customer_data['customer_frame'] = customer_frame
                 
                 st.info(f"🔍 **Analysis Scope:** Processing {len(customer_records)} customers out of {total_available} total (Analysis Limit: {customers_to_analyze})")
                 process_agent_collaboration_from_results(results, collaboration_mode, structured_customer_data)
@@ -3378,6 +3714,13 @@ def render_agent_collaboration_section(results: Dict[str, Any]):
             st.info("💡 **Tip:** Upload customer data and run Lead Intelligence analysis first.")
 
 
+def collaboration_cache_scope() -> str:
+    """Scope of this browser session's memoized collaboration stages"""
+    if "collaboration_cache_scope" not in st.session_state:
+        st.session_state["collaboration_cache_scope"] = f"session_{secrets.token_hex(8)}"
+    return st.session_state["collaboration_cache_scope"]
+
+
 def process_agent_collaboration_from_results(lead_results: Dict[str, Any], mode: str = "standard", customer_data: Dict[str, Any] = None):
     """Process agent collaboration using Lead Intelligence results with enhanced CrewAI integration"""
     
@@ -3416,17 +3759,17 @@ def process_agent_collaboration_from_results(lead_results: Dict[str, Any], mode:
                 
                 # Use CrewAI enhanced integration with actual customer data
                 collaboration_results = process_agent_collaboration_with_crewai(
-                    lead_results, mode, customer_data
+                    lead_results, mode, customer_data, collaboration_cache_scope()
                 )
             elif mode in ["crewai_enhanced", "hybrid"] and crewai_available:
                 # Use CrewAI with transformed results only (fallback)
                 st.warning("⚠️ No customer data provided, using transformed results only")
                 collaboration_results = process_agent_collaboration_with_crewai(
-                    transformed_results, mode
+                    transformed_results, mode, cache_scope=collaboration_cache_scope()
                 )
             else:
-                # Use standard integration
-                integration_service = create_integration_service()
+                # Use standard integration (agent stages memoized for this session)
+                integration_service = create_integration_service(get_collaboration_cache(collaboration_cache_scope()))
                 collaboration_results = integration_service.process_lead_intelligence_completion(
                     transformed_results
                 )
@@ -3917,15 +4260,15 @@ def process_agent_collaboration_from_results(lead_results: Dict[str, Any], mode:
                 with col2:
                     # Direct download button for email templates
                     try:
-                        template_data = export_email_templates_package(session_collaboration_results)
-                        st.download_button(
-                            label="� Download Email Templates",
-                            data=template_data,
-                            file_name=f"crewai_email_templates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                            mime="application/zip",
-                            help="Marketing-ready email templates with personalization",
-                            key="download_templates_zip"
-                        )
+                        with open_email_templates_package(session_collaboration_results) as template_package:
+                            st.download_button(
+                                label="� Download Email Templates",
+                                data=template_package,
+                                file_name=f"crewai_email_templates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                                mime="application/zip",
+                                help="Marketing-ready email templates with personalization",
+                                key="download_templates_zip"
+                            )
                     except Exception as e:
                         st.button("📧 Export Email Templates", disabled=True, help=f"Export error: {str(e)}")
                 
@@ -3962,15 +4305,15 @@ def process_agent_collaboration_from_results(lead_results: Dict[str, Any], mode:
                 # Complete package option
                 st.markdown("#### 📦 **Complete Package**")
                 try:
-                    zip_data = export_complete_business_package(session_collaboration_results)
-                    st.download_button(
-                        label="� Download Complete Business Intelligence Package",
-                        data=zip_data,
-                        file_name=f"crewai_business_intelligence_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                        mime="application/zip",
-                        help="Complete business intelligence package with all deliverables",
-                        key="download_complete_zip"
-                    )
+                    with open_complete_business_package(session_collaboration_results) as zip_package:
+                        st.download_button(
+                            label="� Download Complete Business Intelligence Package",
+                            data=zip_package,
+                            file_name=f"crewai_business_intelligence_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                            mime="application/zip",
+                            help="Complete business intelligence package with all deliverables",
+                            key="download_complete_zip"
+                        )
                 except Exception as e:
                     st.button("🚀 Export All ZIP", disabled=True, help=f"Export error: {str(e)}")
                 
@@ -4087,10 +4430,9 @@ def process_agent_collaboration_from_results(lead_results: Dict[str, Any], mode:
                 
                 with tab2:
                     try:
-                        template_data = export_email_templates_package(session_collaboration_results)
                         import zipfile
-                        zip_buffer = io.BytesIO(template_data)
-                        with zipfile.ZipFile(zip_buffer, 'r') as zip_file:
+                        with open_email_templates_package(session_collaboration_results) as template_package, \
+                                zipfile.ZipFile(template_package, 'r') as zip_file:
                             file_list = zip_file.namelist()
                             st.markdown("**📧 Email Templates Package Contents:**")
                             for file_name in file_list:
@@ -4146,9 +4488,8 @@ def process_agent_collaboration_from_results(lead_results: Dict[str, Any], mode:
                 
                 with tab5:
                     try:
-                        zip_data = export_complete_business_package(session_collaboration_results)
-                        zip_buffer = io.BytesIO(zip_data)
-                        with zipfile.ZipFile(zip_buffer, 'r') as zip_file:
+                        with open_complete_business_package(session_collaboration_results) as zip_package, \
+                                zipfile.ZipFile(zip_package, 'r') as zip_file:
                             file_list = zip_file.namelist()
                             st.markdown("**📦 Complete Business Intelligence Package Contents:**")
                             
@@ -4402,6 +4743,9 @@ def clear_all_persistent_data():
     for key in keys_to_remove:
         del st.session_state[key]
     
+    # Drop this session's memoized collaboration results so the next run starts fresh
+    get_collaboration_cache(collaboration_cache_scope()).invalidate()
+    
     # Clear file backups
     try:
         backup_dir = "data/session_backups"
@@ -4421,6 +4765,8 @@ def clear_analysis_results_only():
     
     for key in keys_to_remove:
         del st.session_state[key]
+    
+    get_collaboration_cache(collaboration_cache_scope()).invalidate()
 
 
 def show_session_debug_info():
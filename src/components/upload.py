@@ -6,17 +6,44 @@ Enhanced implementation for Task 3 - CSV File Upload Component with Privacy Pipe
 import streamlit as st
 import pandas as pd
 import os
+import codecs
+import random
 import chardet
 import tempfile
-from io import StringIO
+from io import BytesIO
 from typing import Tuple, Dict, Any
 from src.utils.privacy_pipeline import privacy_pipeline, PipelineResult
-from src.utils.product_catalog_db import catalog_db, get_catalog_stats, is_catalog_available
+from src.utils.product_catalog_db import catalog_db
+from src.utils.streamlit_cache import (
+    get_catalog_stats,
+    get_product_catalog,
+    is_catalog_available,
+    session_memo,
+    upload_fingerprint,
+)
 
 # File size limits (in bytes)
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB, read into memory
+MAX_STREAMED_FILE_SIZE = 200 * 1024 * 1024  # 200MB (Streamlit's default upload limit), streamed in chunks
 MAX_PREVIEW_ROWS = 5
 
+# Encoding detection: byte order marks, UTF-8 validation chunk and chardet sample
+BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+UTF8_VALIDATION_CHUNK_BYTES = 1024 * 1024
+ENCODING_SNIFF_HEAD_BYTES = 64 * 1024
+ENCODING_SNIFF_SLICE_BYTES = 8 * 1024
+ENCODING_SNIFF_SLICES = 8
+
+# Supersets of the encodings chardet reports, and encodings tried when detection is wrong
+ENCODING_SUPERSETS = {"gb2312": "gb18030", "gbk": "gb18030", "big5": "big5hkscs", "ascii": "utf-8"}
+FALLBACK_ENCODINGS = ("gb18030", "big5hkscs")
+
 
 def process_data_through_privacy_pipeline(
     df: pd.DataFrame, identifier: str, filename: str
@@ -68,19 +95,158 @@ def process_data_through_privacy_pipeline(
         return False, f"Error processing data through privacy pipeline: {str(e)}", {}
 
 
+def process_large_upload(
+    uploaded_file, identifier: str, required_column_groups, auto_correct_encoding: bool = True
+) -> Tuple[bool, str, Dict[str, Any]]:
+    """
+    Stream an upload over MAX_FILE_SIZE through the privacy pipeline in chunks.
+
+    Only the masked display head, the matching original rows and column
+    statistics are kept in the session; the full original and pseudonymized
+    data stay in chunked encrypted storage under their storage keys.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile (or any seekable binary file with name and size)
+        identifier: Unique identifier for this dataset
+        required_column_groups: Column groups checked with validate_flexible_columns
+        auto_correct_encoding: Detect the encoding from the head of the file (UTF-8 otherwise)
+
+    Returns:
+        Tuple of (success, message, processed_data_dict)
+    """
+    if not uploaded_file.name.lower().endswith(".csv"):
+        return False, "Please upload a CSV file", {}
+    if uploaded_file.size > MAX_STREAMED_FILE_SIZE:
+        return (
+            False,
+            f"File size ({uploaded_file.size/1024/1024:.1f}MB) exceeds limit "
+            f"({MAX_STREAMED_FILE_SIZE/1024/1024:.0f}MB)",
+            {},
+        )
+
+    try:
+        encoding = "utf-8"
+        if auto_correct_encoding:
+            uploaded_file.seek(0)
+            head = uploaded_file.read(ENCODING_SNIFF_HEAD_BYTES * 4)
+            # Cut at a line break so no multi-byte character is cut in half
+            encoding = detect_file_encoding(head[: head.rfind(b"\n") + 1] or head).get("encoding") or "utf-8"
+
+        uploaded_file.seek(0)
+        columns = pd.read_csv(uploaded_file, nrows=0, encoding=encoding).columns.tolist()
+        columns_valid, missing_columns = validate_flexible_columns(columns, required_column_groups)
+        if not columns_valid:
+            return False, f"Missing required columns: {', '.join(missing_columns)}", {}
+
+        metadata = {
+            "filename": uploaded_file.name,
+            "uploaded_at": pd.Timestamp.now().isoformat(),
+            "encoding": encoding,
+            "streamed": True,
+        }
+        uploaded_file.seek(0)
+        with st.spinner("🔒 Streaming data through privacy pipeline..."):
+            result: PipelineResult = privacy_pipeline.process_upload_stream(
+                uploaded_file, identifier, metadata, encoding=encoding
+            )
+
+        if not result.success:
+            error_msg = f"Privacy pipeline processing failed: {result.message}"
+            if result.errors:
+                error_msg += f" Errors: {'; '.join(result.errors)}"
+            return False, error_msg, {}
+
+        first_chunk = next(iter(privacy_pipeline.iter_stored_chunks(result.storage_key)), pd.DataFrame(columns=columns))
+        processed_data = {
+            "original_data": first_chunk.head(len(result.display_data)),  # Rows behind the display head
+            "pseudonymized_data": None,  # In storage under pseudonymized_storage_key
+            "display_data": result.display_data,
+            "storage_key": result.storage_key,
+            "pseudonymized_storage_key": result.metadata["pseudonymized_storage_key"],
+            "metadata": result.metadata,
+            "filename": uploaded_file.name,
+            "processed_at": pd.Timestamp.now().isoformat(),
+            "streamed": True,
+        }
+        return True, result.message, processed_data
+
+    except Exception as e:
+        return False, f"Error streaming data through privacy pipeline: {str(e)}", {}
+
+
+def uploaded_row_count(processed_data_dict: Dict[str, Any]) -> int:
+    """Rows of an uploaded dataset, including those of streamed uploads kept only in storage"""
+    if processed_data_dict.get("streamed"):
+        return processed_data_dict["metadata"]["shape"][0]
+    return len(processed_data_dict["original_data"])
+
+
+def _sample_for_detection(file_content: bytes) -> bytes:
+    """Head of the file plus seeded random slices of the rest, for chardet"""
+    head = file_content[:ENCODING_SNIFF_HEAD_BYTES]
+    rest = len(file_content) - ENCODING_SNIFF_HEAD_BYTES
+    if rest <= ENCODING_SNIFF_SLICES * ENCODING_SNIFF_SLICE_BYTES:
+        return file_content
+
+    rng = random.Random(len(file_content))
+    starts = sorted(
+        ENCODING_SNIFF_HEAD_BYTES + rng.randrange(rest - ENCODING_SNIFF_SLICE_BYTES)
+        for _ in range(ENCODING_SNIFF_SLICES)
+    )
+    # Slices start and end on line breaks so no multi-byte character is cut in half
+    slices = []
+    for start in starts:
+        start = file_content.find(b"\n", start) + 1
+        end = file_content.rfind(b"\n", start, start + ENCODING_SNIFF_SLICE_BYTES) + 1
+        if 0 < start < end:
+            slices.append(file_content[start:end])
+    head_end = head.rfind(b"\n") + 1 or len(head)
+    return head[:head_end] + b"".join(slices)
+
+
+def _is_valid_utf8(file_content: bytes) -> bool:
+    """Strictly validate UTF-8 in bounded chunks, without holding the decoded text"""
+    if file_content.isascii():
+        return True
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="strict")
+    view = memoryview(file_content)
+    try:
+        for start in range(0, len(view), UTF8_VALIDATION_CHUNK_BYTES):
+            decoder.decode(view[start:start + UTF8_VALIDATION_CHUNK_BYTES])
+        decoder.decode(b"", final=True)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
 def detect_file_encoding(file_content: bytes) -> Any:
     """
-    Automatically detect the encoding of a file using chardet
+    Detect the encoding of a file without running chardet over every byte
+
+    A byte order mark decides immediately; otherwise the whole buffer is
+    validated as UTF-8, and only non-UTF-8 files are passed to chardet, on a
+    sample of the head plus random slices.
 
     Args:
         file_content: Raw bytes from the file
 
     Returns:
-        dict: Detection result with encoding, confidence, and language
+        dict: Detection result with encoding, confidence, language and method
     """
     try:
-        result = chardet.detect(file_content)
-        return result
+        for bom, encoding in BYTE_ORDER_MARKS:
+            if file_content.startswith(bom):
+                return {"encoding": encoding, "confidence": 1.0, "language": "", "method": "bom"}
+
+        if _is_valid_utf8(file_content):
+            return {"encoding": "utf-8", "confidence": 1.0, "language": "", "method": "utf-8"}
+
+        result = chardet.detect(_sample_for_detection(file_content))
+        encoding = result.get("encoding")
+        if encoding:
+            # A sample can miss characters that only the superset encoding covers
+            encoding = ENCODING_SUPERSETS.get(encoding.lower(), encoding.lower())
+        return {**result, "encoding": encoding, "method": "sampled"}
     except Exception as e:
         return {"encoding": None, "confidence": 0, "language": None, "error": str(e)}
 
@@ -91,24 +257,61 @@ def convert_to_utf8(file_content: bytes, detected_encoding: str) -> tuple[bool,
 
     Args:
         file_content: Raw bytes from the file
-        detected_encoding: Encoding detected by chardet
+        detected_encoding: Encoding detected by detect_file_encoding
 
     Returns:
         tuple: (success, message, utf8_content)
     """
     try:
-        # Decode with detected encoding
+        # Python strings are Unicode, so decoding is the whole conversion
         text_content = file_content.decode(detected_encoding)
 
-        # Re-encode as UTF-8
-        utf8_content = text_content.encode("utf-8").decode("utf-8")
-
-        return True, f"Successfully converted from {detected_encoding} to UTF-8", utf8_content
+        return True, f"Successfully converted from {detected_encoding} to UTF-8", text_content
 
     except Exception as e:
         return False, f"Failed to convert from {detected_encoding} to UTF-8: {str(e)}", ""
 
 
+def _encoding_message(encoding_result: Dict[str, Any], encoding: str) -> str:
+    """Describe the encoding a file was read with"""
+    confidence = encoding_result.get("confidence", 0)
+    if encoding.lower().replace("_", "-") in ("utf-8", "utf-8-sig"):
+        return f"File is already UTF-8 encoded (confidence: {confidence:.2f})"
+    return (
+        f"Successfully converted from {encoding} to UTF-8. "
+        f"Detected: {encoding_result.get('encoding')} (confidence: {confidence:.2f})"
+    )
+
+
+def read_csv_with_detected_encoding(file_content: bytes) -> tuple[bool, str, Any, dict]:
+    """
+    Parse CSV bytes with their detected encoding
+
+    pandas decodes while parsing, so no decoded copy of the file is held. When
+    the detected encoding fails on a later part of the file, the fallback
+    encodings are tried before giving up.
+
+    Args:
+        file_content: Raw bytes from the file
+
+    Returns:
+        tuple: (success, message, dataframe, encoding_info)
+    """
+    encoding_result = detect_file_encoding(file_content)
+    detected_encoding = encoding_result.get("encoding")
+    if not detected_encoding:
+        return False, "Could not detect file encoding", None, encoding_result
+
+    candidates = [detected_encoding] + [e for e in FALLBACK_ENCODINGS if e != detected_encoding.lower()]
+    for encoding in candidates:
+        try:
+            df = pd.read_csv(BytesIO(file_content), encoding=encoding)
+            return True, _encoding_message(encoding_result, encoding), df, encoding_result
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return False, f"Failed to convert from {detected_encoding} to UTF-8", None, encoding_result
+
+
 def auto_detect_and_correct_encoding(uploaded_file) -> tuple[bool, str, str, dict]:
     """
     Automatically detect and correct file encoding to UTF-8
@@ -127,31 +330,13 @@ def auto_detect_and_correct_encoding(uploaded_file) -> tuple[bool, str, str, dic
         # Detect encoding
         encoding_result = detect_file_encoding(file_content)
         detected_encoding = encoding_result.get("encoding")
-        confidence = encoding_result.get("confidence", 0)
 
         if not detected_encoding:
             return False, "Could not detect file encoding", "", encoding_result
 
-        # If already UTF-8 with high confidence, return as-is
-        if detected_encoding.lower() in ["utf-8", "ascii"] and confidence > 0.7:
-            try:
-                content = file_content.decode("utf-8")
-                return (
-                    True,
-                    f"File is already UTF-8 encoded (confidence: {confidence:.2f})",
-                    content,
-                    encoding_result,
-                )
-            except UnicodeDecodeError:
-                pass  # Continue with conversion process
-
-        # Convert to UTF-8
         success, message, utf8_content = convert_to_utf8(file_content, detected_encoding)
-
         if success:
-            encoding_info = f"Detected: {detected_encoding} (confidence: {confidence:.2f})"
-            full_message = f"{message}. {encoding_info}"
-            return True, full_message, utf8_content, encoding_result
+            return True, _encoding_message(encoding_result, detected_encoding), utf8_content, encoding_result
         else:
             return False, message, "", encoding_result
 
@@ -242,29 +427,24 @@ def validate_csv_file(uploaded_file, expected_columns=None, auto_correct_encodin
     encoding_messages = []
 
     try:
+        file_content = uploaded_file.read()
+
         if auto_correct_encoding:
-            # Use automatic encoding detection and correction
-            success, encoding_message, corrected_content, encoding_info = auto_detect_and_correct_encoding(
-                uploaded_file
-            )
+            # Detect the encoding and parse straight from the bytes
+            success, encoding_message, df, encoding_info = read_csv_with_detected_encoding(file_content)
 
             if success:
                 encoding_messages.append(f"🔧 {encoding_message}")
-                # Parse CSV from corrected content
-                df = pd.read_csv(StringIO(corrected_content))
             else:
                 return False, f"Encoding detection failed: {encoding_message}", None
         else:
             # Use original method (UTF-8 first, then fallbacks)
             try:
-                string_data = uploaded_file.read().decode("utf-8")
-                df = pd.read_csv(StringIO(string_data))
+                df = pd.read_csv(BytesIO(file_content), encoding="utf-8")
                 encoding_messages.append("✅ UTF-8 encoding confirmed")
             except UnicodeDecodeError:
                 # Try with GBK encoding as fallback
-                uploaded_file.seek(0)
-                string_data = uploaded_file.read().decode("gbk")
-                df = pd.read_csv(StringIO(string_data))
+                df = pd.read_csv(BytesIO(file_content), encoding="gbk")
                 encoding_messages.append("🔧 Converted from GBK to UTF-8")
 
         # Reset file pointer for potential reuse
@@ -359,7 +539,7 @@ def display_data_preview(processed_data_dict, title, max_rows=MAX_PREVIEW_ROWS):
     # Show basic info and privacy controls
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Rows", len(original_df))
+        st.metric("Rows", uploaded_row_count(processed_data_dict))
     with col2:
         st.metric("Columns", len(original_df.columns))
     with col3:
@@ -392,6 +572,12 @@ def display_data_preview(processed_data_dict, title, max_rows=MAX_PREVIEW_ROWS):
     st.markdown("**Columns:**")
     st.write(", ".join(original_df.columns.tolist()))
 
+    if processed_data_dict.get("streamed"):
+        st.caption(
+            f"📦 Streamed in {metadata.get('chunks', 0)} chunks; the first {len(original_df)} rows are kept "
+            "for preview, the full dataset stays in encrypted storage"
+        )
+
     # Show preview
     st.markdown(f"**First {min(max_rows, len(preview_df))} rows:**")
     st.dataframe(preview_df.head(max_rows), use_container_width=True)
@@ -436,6 +622,34 @@ def display_data_preview(processed_data_dict, title, max_rows=MAX_PREVIEW_ROWS):
             )
 
 
+def render_streamed_upload(
+    uploaded_file, session_key: str, filename_key: str, title: str, required_column_groups, auto_correct_encoding: bool
+):
+    """Stream an upload over MAX_FILE_SIZE into session state, showing its preview"""
+    # Reruns with the same file and settings reuse this session's results
+    upload_key = upload_fingerprint(uploaded_file, auto_correct_encoding)
+    st.info(
+        f"📦 Large file ({uploaded_file.size/1024/1024:.1f}MB): processing in chunks. "
+        "The full dataset stays in encrypted storage; a preview is kept for display."
+    )
+    (pipeline_success, pipeline_message, processed_data), _ = session_memo(
+        f"{session_key}_stream_pipeline",
+        upload_key,
+        lambda: process_large_upload(uploaded_file, session_key, required_column_groups, auto_correct_encoding),
+        cacheable=lambda result: result[0],
+    )
+
+    if pipeline_success:
+        st.success(f"🔒 {pipeline_message}")
+        display_data_preview(processed_data, title)
+        st.session_state[session_key] = processed_data
+        st.session_state[filename_key] = uploaded_file.name
+    else:
+        st.error(f"❌ {pipeline_message}")
+        if session_key in st.session_state:
+            del st.session_state[session_key]
+
+
 def render_upload_page():
     """Render the data upload page"""
 
@@ -443,7 +657,7 @@ def render_upload_page():
     
     # Auto-load persistent product catalog into session if available
     if is_catalog_available() and "product_catalog" not in st.session_state:
-        catalog_df = catalog_db.load_catalog()
+        catalog_df = get_product_catalog()
         if not catalog_df.empty:
             st.session_state["product_catalog"] = {
                 "original_data": catalog_df,
@@ -514,17 +728,28 @@ def render_upload_page():
         uploaded_customer_file = st.file_uploader(
             "Choose customer data CSV file",
             type=["csv"],
-            help="Upload customer profile and demographic data (Max 10MB)",
+            help="Upload customer profile and demographic data (files over 10MB are processed in chunks)",
             key="customer_upload",
         )
 
-        if uploaded_customer_file:
+        if uploaded_customer_file and uploaded_customer_file.size > MAX_FILE_SIZE:
+            render_streamed_upload(
+                uploaded_customer_file, "customer_data", "customer_filename", "Customer Data Preview",
+                CUSTOMER_COLUMNS_FLEXIBLE, auto_correct_encoding,
+            )
+        elif uploaded_customer_file:
+            # Reruns with the same file and settings reuse this session's results
+            upload_key = upload_fingerprint(uploaded_customer_file, auto_correct_encoding)
             with st.spinner("Validating and processing customer data..."):
                 # First validate the basic file format
-                is_valid, message, df = validate_csv_file(
-                    uploaded_customer_file,
-                    expected_columns=None,  # Skip basic column validation
-                    auto_correct_encoding=auto_correct_encoding,
+                (is_valid, message, df), _ = session_memo(
+                    "customer_upload_validation",
+                    upload_key,
+                    lambda: validate_csv_file(
+                        uploaded_customer_file,
+                        expected_columns=None,  # Skip basic column validation
+                        auto_correct_encoding=auto_correct_encoding,
+                    ),
                 )
                 
                 if is_valid:
@@ -541,8 +766,11 @@ def render_upload_page():
                     st.success(f"✅ {message}")
 
                     # Process through privacy pipeline
-                    pipeline_success, pipeline_message, processed_data = process_data_through_privacy_pipeline(
-                        df, "customer_data", uploaded_customer_file.name
+                    (pipeline_success, pipeline_message, processed_data), _ = session_memo(
+                        "customer_upload_pipeline",
+                        upload_key,
+                        lambda: process_data_through_privacy_pipeline(df, "customer_data", uploaded_customer_file.name),
+                        cacheable=lambda result: result[0],
                     )
 
                     if pipeline_success:
@@ -601,17 +829,28 @@ def render_upload_page():
         uploaded_purchase_file = st.file_uploader(
             "Choose purchase history CSV file",
             type=["csv"],
-            help="Upload transaction and engagement data (Max 10MB)",
+            help="Upload transaction and engagement data (files over 10MB are processed in chunks)",
             key="purchase_upload",
         )
 
-        if uploaded_purchase_file:
+        if uploaded_purchase_file and uploaded_purchase_file.size > MAX_FILE_SIZE:
+            render_streamed_upload(
+                uploaded_purchase_file, "purchase_data", "purchase_filename", "Purchase History Preview",
+                [PURCHASE_COLUMNS], auto_correct_encoding_purchase,
+            )
+        elif uploaded_purchase_file:
+            # Reruns with the same file and settings reuse this session's results
+            upload_key = upload_fingerprint(uploaded_purchase_file, auto_correct_encoding_purchase)
             with st.spinner("Validating and processing purchase history..."):
                 # First validate the basic file format
-                is_valid, message, df = validate_csv_file(
-                    uploaded_purchase_file,
-                    expected_columns=None,  # Skip basic column validation for purchase history
-                    auto_correct_encoding=auto_correct_encoding_purchase,
+                (is_valid, message, df), _ = session_memo(
+                    "purchase_upload_validation",
+                    upload_key,
+                    lambda: validate_csv_file(
+                        uploaded_purchase_file,
+                        expected_columns=None,  # Skip basic column validation for purchase history
+                        auto_correct_encoding=auto_correct_encoding_purchase,
+                    ),
                 )
                 
                 if is_valid:
@@ -625,8 +864,11 @@ def render_upload_page():
                     st.success(f"✅ {message}")
 
                     # Process through privacy pipeline
-                    pipeline_success, pipeline_message, processed_data = process_data_through_privacy_pipeline(
-                        df, "purchase_data", uploaded_purchase_file.name
+                    (pipeline_success, pipeline_message, processed_data), _ = session_memo(
+                        "purchase_upload_pipeline",
+                        upload_key,
+                        lambda: process_data_through_privacy_pipeline(df, "purchase_data", uploaded_purchase_file.name),
+                        cacheable=lambda result: result[0],
                     )
 
                     if pipeline_success:
@@ -679,7 +921,7 @@ def render_upload_page():
             
             # Show current catalog preview
             with st.expander("📋 Current Catalog Preview", expanded=False):
-                current_catalog = catalog_db.load_catalog()
+                current_catalog = get_product_catalog()
                 st.dataframe(current_catalog.head(10), use_container_width=True)
                 st.caption(f"Showing first 10 of {len(current_catalog)} plans. Last updated: {stats['last_updated'][:19]}")
             
@@ -878,7 +1120,7 @@ def render_upload_page():
             if isinstance(customer_data, dict):
                 original_df = customer_data.get("original_data")
                 if original_df is not None:
-                    st.caption(f"Rows: {len(original_df)} | Privacy: Protected")
+                    st.caption(f"Rows: {uploaded_row_count(customer_data)} | Privacy: Protected")
                     # Show PII information
                     metadata = customer_data.get("metadata", {})
                     pii_fields = metadata.get("pii_fields_identified", [])
@@ -901,7 +1143,7 @@ def render_upload_page():
             if isinstance(purchase_data, dict):
                 original_df = purchase_data.get("original_data")
                 if original_df is not None:
-                    st.caption(f"Rows: {len(original_df)} | Privacy: Protected")
+                    st.caption(f"Rows: {uploaded_row_count(purchase_data)} | Privacy: Protected")
                     # Show PII information
                     metadata = purchase_data.get("metadata", {})
                     pii_fields = metadata.get("pii_fields_identified", [])
@@ -1102,14 +1344,14 @@ def render_upload_page():
         **Customer Data CSV Requirements:**
         - Must include: Account ID (or Account_ID), Family Name (or Family_Name), Given Name (or Given_Name), Gender, Email, Birth Date (or Date_of_Birth), Customer Type (or Customer_Type), Customer Class (or Customer_Class)
         - Optional: Chinese Given Name, ID Type, ID Number, Company Name (or Company_Name), Brand
-        - File size limit: 10MB
+        - File size limit: 200MB (files over 10MB are processed in chunks)
         - Encoding: UTF-8
         - Note: Column names can use either spaces or underscores
 
         **Purchase History CSV Requirements:**
         - Must include: Account ID
         - Recommended: Purchase History columns, Engagement Data
-        - File size limit: 10MB
+        - File size limit: 200MB (files over 10MB are processed in chunks)
         - Encoding: UTF-8
 
         **Product Catalog CSV Requirements:**
@@ -86,6 +86,13 @@ def main():
 
     page = st.session_state.current_page
 
+    # A background AI analysis follows the user across pages (the results page shows it in place)
+    if "ai_analysis_job_id" in st.session_state and page != "Analysis Results":
+        from src.components.results import render_analysis_progress
+
+        with st.sidebar:
+            render_analysis_progress()
+
     # Main content area
     if page == "Home":
         from src.components.home import render_home_page
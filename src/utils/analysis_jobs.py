@@ -0,0 +1,255 @@
+"""
+Background Analysis Jobs
+Part of the Agentic AI Revenue Assistant
+
+Runs long analyses outside the Streamlit script run. A job is submitted to a
+process-wide worker pool and identified by a job ID that the session keeps;
+widget interactions and page changes rerun the script without touching the
+job. The job records progress, incremental results and the session values it
+produces, and the UI copies them into st.session_state while polling.
+
+Features:
+- Thread pool workers (analyses wait on LLM calls, not on the CPU)
+- Per-job progress, stage text and incremental results behind a lock
+- Cooperative cancellation
+- Wall-clock timing from start to finish
+- current_job() for code that runs both inside and outside a job
+
+Jobs never import Streamlit: code running in a job reads and writes
+job.session_data instead of st.session_state, which belongs to the script run.
+"""
+
+import logging
+import secrets
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for sessions that have not collected their results yet
+MAX_FINISHED_JOBS = 32
+
+_job_context = threading.local()
+
+
+class JobStatus(Enum):
+    """Lifecycle of a background job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class AnalysisJob:
+    """State of one background analysis, shared between its worker and the UI"""
+
+    job_id: str
+    session_data: Dict[str, Any] = field(default_factory=dict)
+    status: JobStatus = JobStatus.QUEUED
+    stage: str = "Waiting for a worker"
+    total: int = 0
+    completed: int = 0
+    partial_results: List[Any] = field(default_factory=list)
+    result: Any = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not"""
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Whether the job should stop at its next checkpoint"""
+        return self._cancel_event.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds the job has been running (total run time once finished)"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def set_stage(self, stage: str, total: Optional[int] = None) -> None:
+        """Describe the current step; optionally (re)set the number of items it processes"""
+        with self._lock:
+            self.stage = stage
+            if total is not None:
+                self.total = total
+                self.completed = 0
+
+    def advance(self, item: Any = None) -> None:
+        """Count one processed item and keep its result, if any, as an incremental result"""
+        with self._lock:
+            self.completed += 1
+            if item is not None:
+                self.partial_results.append(item)
+
+    def cancel(self) -> None:
+        """Ask the job to stop at its next checkpoint"""
+        self._cancel_event.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent copy of the progress fields for rendering"""
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "stage": self.stage,
+                "total": self.total,
+                "completed": self.completed,
+                "partial_count": len(self.partial_results),
+                "elapsed": self.elapsed,
+                "error": self.error,
+            }
+
+    def partial_results_since(self, start: int) -> List[Any]:
+        """Incremental results from position start on"""
+        with self._lock:
+            return self.partial_results[start:]
+
+
+def current_job() -> Optional[AnalysisJob]:
+    """The job running on this thread, or None outside a job worker"""
+    return getattr(_job_context, "job", None)
+
+
+class AnalysisJobManager:
+    """
+    Worker pool and registry of background analysis jobs.
+
+    Jobs are looked up by ID, so a job outlives the script run (and the page)
+    that submitted it.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """
+        Initialize the manager.
+
+        Args:
+            max_workers: Number of analyses that run at the same time
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._lock = threading.Lock()
+        logger.info(f"AnalysisJobManager initialized with {max_workers} workers")
+
+    def submit(self, func: Callable[..., Any], *args, session_data: Optional[Dict[str, Any]] = None, **kwargs) -> str:
+        """
+        Queue func(job, *args, **kwargs) on the worker pool.
+
+        Args:
+            func: Analysis to run; receives the AnalysisJob first and returns the job result
+            session_data: Initial session values the analysis may read (settings snapshot)
+
+        Returns:
+            Job ID
+        """
+        job = AnalysisJob(job_id=f"job_{secrets.token_hex(8)}", session_data=dict(session_data or {}))
+        with self._lock:
+            self._prune_finished()
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, func, args, kwargs)
+        logger.info(f"Submitted background job {job.job_id}")
+        return job.job_id
+
+    def get(self, job_id: Optional[str]) -> Optional[AnalysisJob]:
+        """Job by ID, or None if unknown or already discarded"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation of a job; returns False if it is unknown or finished"""
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel()
+        return True
+
+    def discard(self, job_id: str) -> None:
+        """Forget a finished job once its results have been collected"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.done:
+                del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel running jobs and stop the workers"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: AnalysisJob, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> None:
+        """Execute a job on a worker thread, recording its outcome and timing"""
+        _job_context.job = job
+        with job._lock:
+            job.status = JobStatus.RUNNING
+            job.stage = "Starting"
+            job.started_at = time.time()
+        try:
+            if job.cancel_requested:
+                status, result, error = JobStatus.CANCELLED, None, None
+            else:
+                result = func(job, *args, **kwargs)
+                status = JobStatus.CANCELLED if job.cancel_requested else JobStatus.COMPLETED
+                error = None
+        except Exception as e:
+            logger.error(f"Background job {job.job_id} failed: {e}\n{traceback.format_exc()}")
+            status, result, error = JobStatus.FAILED, None, str(e)
+        finally:
+            _job_context.job = None
+
+        with job._lock:
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            job.status = status
+        logger.info(f"Background job {job.job_id} {status.value} after {job.elapsed:.2f}s")
+
+    def _prune_finished(self) -> None:
+        """Drop the oldest finished jobs beyond MAX_FINISHED_JOBS (caller holds the lock)"""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.done), key=lambda job: job.finished_at or 0.0
+        )
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.job_id]
+
+
+# Global job manager instance
+_analysis_job_manager: Optional[AnalysisJobManager] = None
+_analysis_job_manager_lock = threading.Lock()
+
+
+def get_analysis_job_manager(**kwargs) -> AnalysisJobManager:
+    """
+    Get or create the global analysis job manager.
+
+    Args:
+        **kwargs: Arguments for AnalysisJobManager constructor
+
+    Returns:
+        Global AnalysisJobManager instance
+    """
+    global _analysis_job_manager
+
+    with _analysis_job_manager_lock:
+        if _analysis_job_manager is None:
+            _analysis_job_manager = AnalysisJobManager(**kwargs)
+        return _analysis_job_manager
@@ -0,0 +1,295 @@
+"""
+Collaboration Result Cache - Incremental Multi-Agent Reruns
+Part of the Agentic AI Revenue Assistant
+
+Memoizes the output of each agent stage of a collaboration run so that
+Streamlit reruns and repeat views of the same analysis do not re-execute the
+multi-agent workflow. A stage is keyed on the inputs it depends on, including
+the outputs of the stages before it, so when one input changes only the
+stages downstream of it rerun.
+
+Features:
+- Content fingerprints of lead-intelligence results, customer data and model config
+- Per-agent-stage keys (see STAGE_DEPENDENCIES)
+- One cache per scope (a Streamlit session), so invalidation stays with its caller
+- In-memory LRU layer for millisecond repeat views; callers receive copies
+- Encrypted persistence through the secure session store (survives cache eviction)
+
+Security considerations:
+- Persisted entries are encrypted with the session's in-memory key
+- Fingerprints are one-way hashes; no raw data is used as a key
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Keys whose values change on every call without changing the analysis
+VOLATILE_KEYS = {"timestamp", "integration_id", "processing_time", "merge_timestamp"}
+
+# Which inputs each agent stage depends on; a stage name among the inputs is
+# that stage's output
+STAGE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    # Standard workflow: Sales Optimization Agent, then Agent Protocol handoffs
+    "sales_optimization": ("lead_results",),
+    "agent_protocol_tasks": ("lead_results", "sales_optimization"),
+    # CrewAI workflow: hierarchical analysis crew, then consensus validation crew
+    "crewai_analysis": ("customer_data", "model_config"),
+    "crewai_consensus": ("crewai_analysis", "customer_data", "model_config"),
+}
+
+# Scopes (sessions) whose caches are kept in memory
+MAX_CACHE_SCOPES = 64
+
+
+def _normalize(value: Any) -> Any:
+    """Convert a value into a canonical, JSON-serializable structure for hashing"""
+    if isinstance(value, pd.DataFrame):
+        row_hashes = pd.util.hash_pandas_object(value, index=False).values
+        return {
+            "__dataframe__": hashlib.sha256(row_hashes.tobytes()).hexdigest(),
+            "columns": [str(c) for c in value.columns],
+        }
+    if isinstance(value, pd.Series):
+        return _normalize(value.to_frame())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))
+                if str(k) not in VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def fingerprint(value: Any) -> str:
+    """Stable SHA-256 fingerprint of arbitrary analysis inputs"""
+    canonical = json.dumps(_normalize(value), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def current_model_config() -> Dict[str, Any]:
+    """Snapshot of the model configuration that affects LLM-backed stages"""
+    try:
+        from .free_models_manager import get_free_models_manager
+
+        manager = get_free_models_manager()
+        models = {use_case: manager.get_model_for_litellm(use_case) for use_case in ("analysis", "general", "creative")}
+    except Exception as e:
+        logger.warning(f"Could not resolve model config from models manager: {e}")
+        models = {}
+
+    return {
+        "models": models,
+        "default_model": os.getenv("DEFAULT_MODEL", ""),
+        "fallback_model": os.getenv("FALLBACK_MODEL", ""),
+    }
+
+
+class CollaborationResultCache:
+    """
+    Two-level memoization cache for multi-agent collaboration stages.
+
+    Entries are keyed by stage name plus the fingerprint of that stage's inputs,
+    held in an in-memory LRU and mirrored to the encrypted session store. Values
+    are copied on the way in and out, so callers may modify what they get.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        persist: bool = True,
+        session_id: Optional[str] = None,
+        session_manager=None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of stage results kept in memory
+            persist: Whether to mirror entries into the encrypted session store
+            session_id: Existing secure session to persist into (created lazily if None)
+            session_manager: SecureSessionManager to use (defaults to the global manager)
+        """
+        self.max_entries = max_entries
+        self.persist = persist
+        self.session_id = session_id
+        self._session_manager = session_manager
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "persisted_hits": 0, "misses": 0, "stores": 0}
+        logger.info(f"CollaborationResultCache initialized (max_entries={max_entries}, persist={persist})")
+
+    def stage_key(self, stage: str, inputs: Dict[str, Any]) -> str:
+        """Cache key for a stage, built only from the inputs the stage depends on"""
+        dependencies = STAGE_DEPENDENCIES.get(stage, tuple(sorted(inputs)))
+        stage_inputs = {name: inputs.get(name) for name in dependencies}
+        return f"collab_{stage}_{fingerprint(stage_inputs)[:32]}"
+
+    def get(self, stage: str, inputs: Dict[str, Any]) -> Optional[Any]:
+        """Return the cached output of a stage, or None on a miss"""
+        key = self.stage_key(stage, inputs)
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                return copy.deepcopy(self._memory[key])
+
+        persisted = self._load_persisted(key)
+        if persisted is not None:
+            self._remember(key, copy.deepcopy(persisted))
+            with self._lock:
+                self.stats["persisted_hits"] += 1
+            return persisted
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, stage: str, inputs: Dict[str, Any], value: Any) -> str:
+        """Store the output of a stage"""
+        key = self.stage_key(stage, inputs)
+        self._remember(key, copy.deepcopy(value))
+        self._store_persisted(key, stage, value)
+        with self._lock:
+            self.stats["stores"] += 1
+        return key
+
+    def get_or_compute(
+        self, stage: str, inputs: Dict[str, Any], compute: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = lambda result: True,
+    ) -> Tuple[Any, bool]:
+        """
+        Return a stage's cached output, computing and storing it on a miss.
+
+        Returns:
+            Tuple of (result, cache_hit)
+        """
+        cached = self.get(stage, inputs)
+        if cached is not None:
+            logger.info(f"Collaboration stage '{stage}' served from cache")
+            return cached, True
+
+        result = compute()
+        if result is not None and cacheable(result):
+            self.put(stage, inputs, result)
+        return result, False
+
+    def invalidate(self, stages: Optional[Iterable[str]] = None) -> int:
+        """Drop in-memory entries for the given stages (all stages if None)"""
+        def is_stale(key: str) -> bool:
+            return key.startswith("collab_") and (not stages or key.rsplit("_", 1)[0] in targets)
+
+        targets = {f"collab_{stage}" for stage in stages or ()}
+        with self._lock:
+            stale = [key for key in self._memory if is_stale(key)]
+            for key in stale:
+                del self._memory[key]
+        if self.persist and self.session_id:
+            try:
+                manager = self._get_session_manager()
+                for filename in manager.list_session_files(self.session_id) or []:
+                    if is_stale(filename):
+                        manager.delete_session_file(self.session_id, filename)
+            except Exception as e:
+                logger.warning(f"Failed to invalidate persisted collaboration results: {e}")
+        logger.info(f"Invalidated {len(stale)} cached collaboration results")
+        return len(stale)
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entries"""
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _get_session_manager(self):
+        """Return the configured session manager or the global one"""
+        if self._session_manager is None:
+            from .session_manager import get_session_manager
+
+            self._session_manager = get_session_manager()
+        return self._session_manager
+
+    def _ensure_session(self):
+        """Return the session manager with a valid session for persistence"""
+        manager = self._get_session_manager()
+        if not self.session_id or manager.get_session(self.session_id) is None:
+            self.session_id = manager.create_session("collaboration_cache")
+        return manager
+
+    def _store_persisted(self, key: str, stage: str, value: Any) -> None:
+        """Mirror an entry into the encrypted session store"""
+        if not self.persist:
+            return
+        try:
+            manager = self._ensure_session()
+            payload = json.loads(json.dumps({"stage": stage, "result": value}, default=str))
+            manager.store_data(self.session_id, key, payload, {"cached_at": datetime.now().isoformat()})
+        except Exception as e:
+            logger.warning(f"Failed to persist collaboration stage '{stage}': {e}")
+
+    def _load_persisted(self, key: str) -> Optional[Any]:
+        """Load an entry from the encrypted session store"""
+        if not self.persist or not self.session_id:
+            return None
+        try:
+            manager = self._get_session_manager()
+            if key not in (manager.list_session_files(self.session_id) or []):
+                return None
+            payload = manager.load_data(self.session_id, key)
+            return payload.get("result") if payload else None
+        except Exception as e:
+            logger.warning(f"Failed to load persisted collaboration result {key}: {e}")
+            return None
+
+
+def run_stage(
+    cache: Optional[CollaborationResultCache], stage: str, inputs: Dict[str, Any], compute: Callable[[], Any],
+    cacheable: Callable[[Any], bool] = lambda result: True,
+) -> Any:
+    """Run an agent stage through cache, or directly when there is no cache"""
+    if cache is None:
+        return compute()
+    result, _ = cache.get_or_compute(stage, inputs, compute, cacheable)
+    return result
+
+
+# Cache instances per scope, least recently used first
+_collaboration_caches: "OrderedDict[Optional[str], CollaborationResultCache]" = OrderedDict()
+_collaboration_cache_lock = threading.Lock()
+
+
+def get_collaboration_cache(scope: Optional[str] = None, **kwargs) -> CollaborationResultCache:
+    """
+    Get or create the collaboration result cache of a scope.
+
+    Args:
+        scope: Owner of the cache, e.g. a Streamlit session; None for the shared
+            cache of scripts and tests
+        **kwargs: Arguments for CollaborationResultCache constructor
+
+    Returns:
+        CollaborationResultCache of the scope
+    """
+    with _collaboration_cache_lock:
+        cache = _collaboration_caches.get(scope)
+        if cache is None:
+            cache = _collaboration_caches[scope] = CollaborationResultCache(**kwargs)
+            while len(_collaboration_caches) > MAX_CACHE_SCOPES:
+                _collaboration_caches.popitem(last=False)
+        _collaboration_caches.move_to_end(scope)
+        return cache
@@ -0,0 +1,382 @@
+"""
+Customer Data Digest - Context-Budget-Aware Summarization
+Part of the Agentic AI Revenue Assistant
+
+This module turns the merged customer DataFrame into compact, token-counted
+statistical digests that can be interpolated into CrewAI task prompts.
+
+Features:
+- Segment aggregates (count, value, churn share per segment)
+- Top-K lead listing ranked by customer value
+- Numeric distributions and categorical breakdowns
+- Per-agent digests tailored to each agent's token budget
+- Hard token ceiling regardless of dataset size
+
+Compliance: sensitive columns (names, emails, ID numbers...) are never included
+"""
+
+import math
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from config.app_config import config
+from .enhanced_field_identification import get_sensitive_columns_enhanced
+
+# Token counting - tiktoken is optional, fall back to a character heuristic
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+    TIKTOKEN_AVAILABLE = True
+except Exception:
+    _ENCODING = None
+    TIKTOKEN_AVAILABLE = False
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+# Token budget per agent role (clamped to the configured ceiling)
+AGENT_DIGEST_BUDGETS: Dict[str, int] = {
+    "customer_intelligence": 2500,
+    "market_intelligence": 600,
+    "revenue_optimization": 1500,
+    "retention_strategy": 1500,
+    "campaign_execution": 1000,
+    "consensus_validation": 800,
+    "simplified_analysis": 1200,
+}
+
+# Section priority per agent role - earlier sections are kept first when trimming
+AGENT_DIGEST_SECTIONS: Dict[str, List[str]] = {
+    "customer_intelligence": ["overview", "segments", "distributions", "categories", "top_leads"],
+    "market_intelligence": ["overview", "segments", "categories"],
+    "revenue_optimization": ["overview", "segments", "top_leads", "distributions"],
+    "retention_strategy": ["overview", "churn_risk", "segments", "top_leads"],
+    "campaign_execution": ["overview", "segments", "categories"],
+    "consensus_validation": ["overview", "segments"],
+    "simplified_analysis": ["overview", "segments", "distributions", "top_leads"],
+}
+
+# Column name candidates (first match wins)
+ACCOUNT_ID_COLUMNS = ["Account_ID", "Account ID", "customer_Account_ID", "customer_Account ID"]
+VALUE_COLUMNS = ["Monthly_Fee", "Monthly Fee", "customer_Monthly_Fee", "Total_Contract_Value", "Amount", "purchase_Amount"]
+SEGMENT_COLUMNS = ["Customer_Type", "Customer Type", "customer_Customer_Type", "customer_Customer Type",
+                   "Customer_Class", "Customer Class", "Spending_Tier"]
+CHURN_COLUMNS = ["Churn_Risk", "Churn Risk", "customer_Churn_Risk"]
+
+
+def count_tokens(text: str) -> int:
+    """Count prompt tokens (tiktoken when available, ~4 chars per token otherwise)"""
+    if not text:
+        return 0
+    if TIKTOKEN_AVAILABLE:
+        return len(_ENCODING.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, suffix: str = "...") -> str:
+    """Truncate text so that it fits within max_tokens"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if TIKTOKEN_AVAILABLE:
+        return _ENCODING.decode(_ENCODING.encode(text)[: max(0, max_tokens - 1)]) + suffix
+    return text[: max(0, max_tokens - 1) * 4] + suffix
+
+
+@dataclass
+class CustomerDataDigest:
+    """Token-counted digest of a customer dataset for a single agent"""
+
+    agent_role: str
+    text: str
+    token_count: int
+    token_budget: int
+    total_customers: int
+    sections: List[str] = field(default_factory=list)
+    dropped_sections: List[str] = field(default_factory=list)
+
+    @property
+    def truncated(self) -> bool:
+        """Whether any section had to be dropped to stay within budget"""
+        return bool(self.dropped_sections)
+
+
+def customer_data_to_frame(customer_data: Any) -> pd.DataFrame:
+    """
+    Normalize the customer data structures passed around the orchestrators into a DataFrame.
+
+    Accepts a DataFrame, a list of records, or the structured dict used by the
+    dashboard ({'customer_frame': DataFrame, 'customers': [...], ...}).
+    """
+    if isinstance(customer_data, pd.DataFrame):
+        return customer_data
+    if isinstance(customer_data, list):
+        return pd.DataFrame(customer_data)
+    if isinstance(customer_data, dict):
+        for key in ("customer_frame", "original_data", "merged_data"):
+            frame = customer_data.get(key)
+            if isinstance(frame, pd.DataFrame):
+                return frame
+        for key in ("customers", "data"):
+            records = customer_data.get(key)
+            if isinstance(records, list):
+                return pd.DataFrame(records)
+    return pd.DataFrame()
+
+
+class CustomerDataDigester:
+    """
+    Builds token-bounded statistical digests of customer data for LLM prompts.
+
+    Every digest is rendered section by section in the agent's priority order;
+    sections are shrunk (fewer rows) or dropped until the digest fits the budget,
+    so prompt size is independent of the number of customers.
+    """
+
+    def __init__(
+        self,
+        token_ceiling: Optional[int] = None,
+        top_k: int = 10,
+        max_categories: int = 6,
+        max_category_cardinality: int = 50,
+        agent_budgets: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize the digester.
+
+        Args:
+            token_ceiling: Hard upper bound for any digest (defaults to Config.PROMPT_TOKEN_CEILING)
+            top_k: Number of top leads listed in the full-size digest
+            max_categories: Number of values listed per categorical column
+            max_category_cardinality: Columns with more distinct values are not summarized
+            agent_budgets: Optional overrides for AGENT_DIGEST_BUDGETS
+        """
+        self.token_ceiling = token_ceiling or config.PROMPT_TOKEN_CEILING
+        self.top_k = top_k
+        self.max_categories = max_categories
+        self.max_category_cardinality = max_category_cardinality
+        self.agent_budgets = {**AGENT_DIGEST_BUDGETS, **(agent_budgets or {})}
+        logger.info(f"CustomerDataDigester initialized (ceiling: {self.token_ceiling} tokens)")
+
+    def budget_for(self, agent_role: str) -> int:
+        """Token budget for an agent role, clamped to the ceiling"""
+        return min(self.agent_budgets.get(agent_role, self.token_ceiling), self.token_ceiling)
+
+    def build_agent_digests(self, customer_data: Any) -> Dict[str, CustomerDataDigest]:
+        """Build one digest per agent role from a single profiling pass"""
+        profile = self._profile(customer_data_to_frame(customer_data))
+        return {role: self._render(profile, role) for role in self.agent_budgets}
+
+    def digest_for_agent(self, customer_data: Any, agent_role: str) -> CustomerDataDigest:
+        """Build the digest for a single agent role"""
+        return self._render(self._profile(customer_data_to_frame(customer_data)), agent_role)
+
+    # ------------------------------------------------------------------
+    # Profiling
+    # ------------------------------------------------------------------
+
+    def _profile(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Compute the column roles and aggregates shared by every digest"""
+        profile: Dict[str, Any] = {"total_customers": len(df), "total_columns": len(df.columns)}
+        if df.empty:
+            return profile
+
+        sensitive = set(get_sensitive_columns_enhanced(df))
+        id_col = self._first_present(df, ACCOUNT_ID_COLUMNS)
+        usable = [c for c in df.columns if c not in sensitive and c != id_col]
+
+        numeric_cols: List[str] = []
+        numeric_data: Dict[str, pd.Series] = {}
+        for col in usable:
+            series = df[col]
+            if not pd.api.types.is_numeric_dtype(series):
+                if series.dtype != object:
+                    continue
+                series = pd.to_numeric(series, errors="coerce")
+                if series.notna().mean() < 0.9:
+                    continue
+            numeric_cols.append(col)
+            numeric_data[col] = series.astype(float)
+
+        categorical_cols = [
+            c for c in usable
+            if c not in numeric_data and df[c].nunique(dropna=True) <= self.max_category_cardinality
+        ]
+
+        value_col = self._first_present(df, VALUE_COLUMNS, within=numeric_cols) or (numeric_cols[0] if numeric_cols else None)
+        segment_col = self._first_present(df, SEGMENT_COLUMNS, within=categorical_cols)
+        churn_col = self._first_present(df, CHURN_COLUMNS, within=categorical_cols)
+
+        profile.update(
+            id_col=id_col,
+            value_col=value_col,
+            segment_col=segment_col,
+            churn_col=churn_col,
+            distributions={
+                col: numeric_data[col].describe(percentiles=[0.25, 0.5, 0.75]) for col in numeric_cols
+            },
+            categories={
+                col: df[col].value_counts(normalize=True, dropna=True).head(self.max_categories)
+                for col in categorical_cols
+            },
+        )
+
+        value = numeric_data.get(value_col)
+        churn_high = df[churn_col].astype(str).str.lower().eq("high") if churn_col else None
+
+        if segment_col:
+            grouped = pd.DataFrame({"segment": df[segment_col].fillna("Unknown")})
+            if value is not None:
+                grouped["value"] = value
+            if churn_high is not None:
+                grouped["churn_high"] = churn_high
+            aggregations = {"count": ("segment", "size")}
+            if value is not None:
+                aggregations.update(avg_value=("value", "mean"), total_value=("value", "sum"))
+            if churn_high is not None:
+                aggregations["high_churn_share"] = ("churn_high", "mean")
+            profile["segments"] = (
+                grouped.groupby("segment").agg(**aggregations).sort_values("count", ascending=False)
+            )
+
+        if churn_col:
+            profile["churn_distribution"] = df[churn_col].fillna("Unknown").value_counts()
+
+        # Rank once at the largest K any digest can use
+        if value is not None:
+            profile["top_leads"] = self._lead_rows(df, value.nlargest(self.top_k).index, id_col, segment_col, churn_col, value, value_col)
+        if churn_high is not None and value is not None:
+            at_risk_index = value[churn_high].nlargest(self.top_k).index
+            profile["at_risk_leads"] = self._lead_rows(df, at_risk_index, id_col, segment_col, churn_col, value, value_col)
+
+        return profile
+
+    def _lead_rows(self, df, index, id_col, segment_col, churn_col, value, value_col) -> List[str]:
+        """Format the selected leads as compact one-line records"""
+        rows = []
+        for rank, idx in enumerate(index, 1):
+            parts = [f"#{rank}"]
+            if id_col:
+                parts.append(str(df.at[idx, id_col]))
+            if segment_col:
+                parts.append(f"{segment_col}={df.at[idx, segment_col]}")
+            parts.append(f"{value_col}={value.at[idx]:,.0f}")
+            if churn_col:
+                parts.append(f"{churn_col}={df.at[idx, churn_col]}")
+            rows.append(" | ".join(parts))
+        return rows
+
+    @staticmethod
+    def _first_present(df: pd.DataFrame, candidates: List[str], within: Optional[List[str]] = None) -> Optional[str]:
+        """Return the first candidate column present in the frame"""
+        allowed = set(within) if within is not None else set(df.columns)
+        for candidate in candidates:
+            if candidate in allowed:
+                return candidate
+        return None
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _render(self, profile: Dict[str, Any], agent_role: str) -> CustomerDataDigest:
+        """Render the digest for an agent, trimming sections to fit its budget"""
+        budget = self.budget_for(agent_role)
+        section_order = AGENT_DIGEST_SECTIONS.get(agent_role, AGENT_DIGEST_SECTIONS["customer_intelligence"])
+
+        parts: List[str] = []
+        kept: List[str] = []
+        dropped: List[str] = []
+        used = 0
+
+        for section in section_order:
+            rendered = None
+            # Try the full section first, then progressively smaller versions
+            for limit in (self.top_k, max(1, self.top_k // 2), 3, 1):
+                candidate = self._render_section(profile, section, limit)
+                if candidate is None:
+                    break
+                cost = count_tokens(candidate + "\n")
+                if used + cost <= budget:
+                    rendered = candidate
+                    used += cost
+                    break
+            if rendered:
+                parts.append(rendered)
+                kept.append(section)
+            elif self._render_section(profile, section, 1) is not None:
+                dropped.append(section)
+
+        text = "\n".join(parts)
+        if dropped:
+            logger.debug(f"Digest for {agent_role} dropped sections {dropped} to fit {budget} tokens")
+
+        return CustomerDataDigest(
+            agent_role=agent_role,
+            text=text,
+            token_count=count_tokens(text),
+            token_budget=budget,
+            total_customers=profile["total_customers"],
+            sections=kept,
+            dropped_sections=dropped,
+        )
+
+    def _render_section(self, profile: Dict[str, Any], section: str, limit: int) -> Optional[str]:
+        """Render a single section with at most `limit` rows, or None if not applicable"""
+        if section == "overview":
+            if not profile["total_customers"]:
+                return "No customer-level records available"
+            line = f"Customers: {profile['total_customers']:,} | Columns: {profile['total_columns']}"
+            if profile.get("value_col") and profile.get("distributions"):
+                stats = profile["distributions"][profile["value_col"]]
+                line += f" | Total {profile['value_col']}: {stats['mean'] * stats['count']:,.0f}"
+            return line
+
+        if section == "segments" and "segments" in profile:
+            lines = [f"Segments by {profile['segment_col']}:"]
+            for name, row in profile["segments"].head(limit).iterrows():
+                entry = f"- {name}: {int(row['count']):,} customers"
+                if "avg_value" in row:
+                    entry += f", avg {row['avg_value']:,.0f}, total {row['total_value']:,.0f}"
+                if "high_churn_share" in row:
+                    entry += f", high churn {row['high_churn_share']:.0%}"
+                lines.append(entry)
+            return "\n".join(lines)
+
+        if section == "distributions" and profile.get("distributions"):
+            lines = ["Numeric distributions (min/p25/median/p75/max, mean):"]
+            for col, stats in list(profile["distributions"].items())[:limit]:
+                lines.append(
+                    f"- {col}: {stats['min']:,.0f}/{stats['25%']:,.0f}/{stats['50%']:,.0f}/"
+                    f"{stats['75%']:,.0f}/{stats['max']:,.0f}, mean {stats['mean']:,.1f}"
+                )
+            return "\n".join(lines)
+
+        if section == "categories" and profile.get("categories"):
+            lines = ["Categorical breakdown:"]
+            for col, shares in list(profile["categories"].items())[:limit]:
+                values = ", ".join(f"{value} {share:.0%}" for value, share in shares.head(limit).items())
+                lines.append(f"- {col}: {values}")
+            return "\n".join(lines)
+
+        if section == "churn_risk" and "churn_distribution" in profile:
+            counts = profile["churn_distribution"]
+            lines = [f"Churn risk ({profile['churn_col']}): " + ", ".join(f"{k} {v:,}" for k, v in counts.items())]
+            at_risk = profile.get("at_risk_leads", [])[:limit]
+            if at_risk:
+                lines.append(f"Top {len(at_risk)} high-risk customers by value:")
+                lines.extend(at_risk)
+            return "\n".join(lines)
+
+        if section == "top_leads" and profile.get("top_leads"):
+            leads = profile["top_leads"][:limit]
+            return "\n".join([f"Top {len(leads)} customers by {profile['value_col']}:"] + leads)
+
+        return None
+
+
+# Global instance for easy access
+customer_data_digester = CustomerDataDigester()
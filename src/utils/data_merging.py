@@ -11,20 +11,86 @@ Features:
 - Privacy masking integration (respects toggle state)
 - Unified data structure for AI analysis
 - Comprehensive error handling and data quality reporting
+- Account IDs factorized and joined once; original and display frames taken from the shared join
 
 Compliance: GDPR and Hong Kong PDPO compliant with privacy-first design
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import logging
 from datetime import datetime
 
+from .purchase_history_parsing import engagement_features, find_engagement_column, parse_engagement
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Account ID column of merged frames
+MERGE_KEY_COLUMN = "Account_ID"
+
+
+def _take_with_fill(series: pd.Series, rows: np.ndarray):
+    """Values of series at rows, with NaN (upcasting as pd.merge does) where rows is -1"""
+    values = series.to_numpy() if isinstance(series.dtype, np.dtype) else series.array
+    return pd.api.extensions.take(values, rows, allow_fill=True)
+
+
+def _as_string_ids(ids: pd.Series) -> pd.Series:
+    """Account IDs as strings, nulls kept; IDs that already are strings are used as they are rather than copied"""
+    if pd.api.types.infer_dtype(ids, skipna=True) == "string":
+        return ids
+    return ids.where(ids.isna(), ids.astype(str))
+
+
+def _join_rows(
+    left_codes: np.ndarray, right_codes: np.ndarray, n_keys: int, keep_unmatched: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row positions of a join on factorized keys, in pd.merge order for a left join.
+
+    Every left row with a key is emitted in order, followed by its right matches
+    in right order; left rows without a match get right position -1 when
+    keep_unmatched is set and are dropped otherwise (inner join).
+
+    Returns:
+        Tuple of (left_rows, right_rows)
+    """
+    left_rows = np.flatnonzero(left_codes >= 0)
+    left_keys = left_codes[left_rows]
+
+    # Right rows grouped by key, right order kept within each group
+    right_valid = right_codes[right_codes >= 0]
+    right_sorted = np.flatnonzero(right_codes >= 0)[np.argsort(right_valid, kind="stable")]
+    counts = np.bincount(right_valid, minlength=n_keys)
+    starts = np.cumsum(counts) - counts
+
+    matches = counts[left_keys]
+    repeats = np.maximum(matches, 1) if keep_unmatched else matches
+    total = int(repeats.sum())
+    out_left = np.repeat(left_rows, repeats)
+    out_right = np.full(total, -1, dtype=np.intp)
+
+    matched = np.repeat(matches > 0, repeats)
+    group_ends = np.cumsum(repeats)
+    offsets = np.arange(total) - np.repeat(group_ends - repeats, repeats)
+    out_right[matched] = right_sorted[np.repeat(starts[left_keys], repeats)[matched] + offsets[matched]]
+    return out_left, out_right
+
+
+def _codes_at(
+    customer_codes: np.ndarray, customer_rows: np.ndarray, purchase_codes: np.ndarray, purchase_rows: np.ndarray
+) -> np.ndarray:
+    """Key code of each merged row, from whichever side the row has"""
+    has_customer = customer_rows >= 0
+    key_codes = np.empty(len(customer_rows), dtype=np.intp)
+    key_codes[has_customer] = customer_codes[customer_rows[has_customer]]
+    key_codes[~has_customer] = purchase_codes[purchase_rows[~has_customer]]
+    return key_codes
+
 
 class MergeStrategy(Enum):
     """Merge strategy options"""
@@ -46,6 +112,24 @@ class MergeResult:
     metadata: Dict[str, Any]
     quality_report: Dict[str, Any]
     errors: List[str]
+    _engagement: Optional[pd.DataFrame] = field(default=None, init=False, repr=False, compare=False)
+
+    def engagement_features(self) -> Optional[pd.DataFrame]:
+        """
+        Engagement metrics per account, parsed from the merged "Engagement Data" column.
+
+        Parsed on first use and kept on the result, so merges without a consumer
+        never pay for it and repeat reads (the result lives in session state) are free.
+
+        Returns:
+            Frame of account_id plus CustomerDataAnalyzer engagement fields (see
+            purchase_history_parsing.engagement_features), or None without engagement data
+        """
+        if self._engagement is None:
+            if self.merged_data is None or find_engagement_column(self.merged_data) is None:
+                return None
+            self._engagement = engagement_features(parse_engagement(self.merged_data, MERGE_KEY_COLUMN))
+        return self._engagement
 
 
 @dataclass
@@ -64,6 +148,113 @@ class DataQualityReport:
     quality_score: float  # 0.0 to 1.0
 
 
+class QualityReportBuilder:
+    """
+    Accumulates DataQualityReport figures over groups of records.
+
+    add_records counts rows and null Account IDs and may see the records in any
+    number of pieces. add_keys counts matches and duplicates of the non-null
+    IDs; an Account ID must not appear in more than one add_keys group (as with
+    hash partitions), so the per-group figures add up to those of the full data.
+    """
+
+    def __init__(self, unmatched_limit: int = 10):
+        self.unmatched_limit = unmatched_limit
+        self.records = {"customer": 0, "purchase": 0}
+        self.missing_ids = {"customer": 0, "purchase": 0}
+        self.duplicate_ids = {"customer": [], "purchase": []}
+        self.null_duplicate_ids = {"customer": [], "purchase": []}
+        self.unmatched_ids = {"customer": [], "purchase": []}
+        self.matched_records = 0
+        self.unique_ids = 0
+
+    def add_records(self, dataset: str, account_ids: pd.Series) -> None:
+        """Count records of a dataset ("customer" or "purchase") and their null Account IDs"""
+        nulls = account_ids[account_ids.isna()].tolist()
+        # Series.duplicated treats every null after the first as a duplicate
+        if nulls and self.missing_ids[dataset] == 0:
+            nulls = nulls[1:]
+        self.null_duplicate_ids[dataset].extend(nulls)
+        self.records[dataset] += len(account_ids)
+        self.missing_ids[dataset] += int(account_ids.isna().sum())
+
+    def add_keys(
+        self,
+        customer_ids: pd.Series,
+        purchase_ids: pd.Series,
+        keys: pd.Index,
+        customer_codes: np.ndarray,
+        purchase_codes: np.ndarray,
+    ) -> None:
+        """Count matches and duplicates of one group of factorized Account IDs"""
+
+        # Which distinct Account IDs occur on each side
+        in_customer = np.zeros(len(keys), dtype=bool)
+        in_purchase = np.zeros(len(keys), dtype=bool)
+        in_customer[customer_codes[customer_codes >= 0]] = True
+        in_purchase[purchase_codes[purchase_codes >= 0]] = True
+
+        self.matched_records += int(np.count_nonzero(in_customer & in_purchase))
+        self.unique_ids += int(np.count_nonzero(in_customer | in_purchase))
+        for dataset, present, absent in (("customer", in_customer, in_purchase), ("purchase", in_purchase, in_customer)):
+            room = self.unmatched_limit - len(self.unmatched_ids[dataset])
+            if room > 0:
+                self.unmatched_ids[dataset].extend(keys[np.flatnonzero(present & ~absent)[:room]].tolist())
+
+        for dataset, account_ids, codes in (("customer", customer_ids, customer_codes), ("purchase", purchase_ids, purchase_codes)):
+            duplicated = pd.Series(codes).duplicated().to_numpy() & (codes >= 0)
+            self.duplicate_ids[dataset].extend(account_ids.to_numpy()[duplicated].tolist())
+
+    def build(self) -> DataQualityReport:
+        """Report over everything added so far"""
+        customer_duplicates = self.duplicate_ids["customer"] + self.null_duplicate_ids["customer"]
+        purchase_duplicates = self.duplicate_ids["purchase"] + self.null_duplicate_ids["purchase"]
+
+        # Calculate quality score
+        total_records = self.records["customer"] + self.records["purchase"]
+        if self.unique_ids > 0:
+            match_rate = self.matched_records / self.unique_ids
+            duplicate_penalty = (len(customer_duplicates) + len(purchase_duplicates)) / total_records
+            missing_penalty = sum(self.missing_ids.values()) / total_records
+            quality_score = max(0.0, match_rate - duplicate_penalty - missing_penalty)
+        else:
+            quality_score = 0.0
+
+        return DataQualityReport(
+            total_customer_records=self.records["customer"],
+            total_purchase_records=self.records["purchase"],
+            matched_records=self.matched_records,
+            unmatched_customer_ids=list(self.unmatched_ids["customer"]),  # Limited for display
+            unmatched_purchase_ids=list(self.unmatched_ids["purchase"]),
+            duplicate_customer_ids=customer_duplicates,
+            duplicate_purchase_ids=purchase_duplicates,
+            missing_account_ids=dict(self.missing_ids),
+            data_types_consistent=True,  # Can be enhanced with type checking
+            quality_score=quality_score,
+        )
+
+
+@dataclass
+class JoinIndexer:
+    """
+    Account ID join of a customer and a purchase frame, computed once.
+
+    Row positions refer to the full input frames (rows with null Account IDs
+    included, never selected), so any row-aligned copy of the inputs, such as
+    the privacy-masked display frames, is merged by taking the same positions.
+    """
+
+    keys: pd.Index  # distinct Account IDs as strings
+    customer_codes: np.ndarray  # position in keys per customer row, -1 for null IDs
+    purchase_codes: np.ndarray  # position in keys per purchase row, -1 for null IDs
+    customer_rows: np.ndarray  # customer row per merged row, -1 where absent
+    purchase_rows: np.ndarray  # purchase row per merged row, -1 where absent
+    key_codes: np.ndarray  # position in keys per merged row
+
+    def __len__(self) -> int:
+        return len(self.key_codes)
+
+
 class DataMerger:
     """
     Data merging and alignment system for customer and purchase data.
@@ -142,12 +333,26 @@ class DataMerger:
                     errors=validation_result["errors"],
                 )
 
+            # Factorize Account IDs and compute the join once; report and both merges reuse it
+            indexer = self._build_join_indexer(customer_df, purchase_df, strategy)
+
             # Generate data quality report
-            quality_report = self._generate_quality_report(customer_df, purchase_df)
+            quality_report = self._quality_report_from_codes(
+                customer_df[self.customer_account_col],
+                purchase_df[self.purchase_account_col],
+                indexer.keys,
+                indexer.customer_codes,
+                indexer.purchase_codes,
+            )
 
             # Perform the merge operation
-            merge_result = self._perform_merge(customer_df, purchase_df, strategy)
-            display_result = self._perform_merge(customer_display, purchase_display, strategy)
+            merge_result = self._perform_merge(customer_df, purchase_df, strategy, indexer=indexer)
+            if len(customer_display) == len(customer_df) and len(purchase_display) == len(purchase_df):
+                display_result = self._perform_merge(
+                    customer_display, purchase_display, strategy, indexer=indexer, display=True
+                )
+            else:
+                display_result = self._perform_merge(customer_display, purchase_display, strategy)
 
             if not merge_result["success"]:
                 return MergeResult(
@@ -241,87 +446,173 @@ class DataMerger:
         customer_account_col = getattr(self, 'customer_account_col', self._find_account_id_column(customer_df))
         purchase_account_col = getattr(self, 'purchase_account_col', self._find_account_id_column(purchase_df))
 
-        # Get unique Account IDs from each dataset
-        customer_ids = set(customer_df[customer_account_col].dropna().astype(str))
-        purchase_ids = set(purchase_df[purchase_account_col].dropna().astype(str))
-
-        # Find matches and mismatches
-        matched_ids = customer_ids.intersection(purchase_ids)
-        unmatched_customer = list(customer_ids - purchase_ids)
-        unmatched_purchase = list(purchase_ids - customer_ids)
-
-        # Check for duplicates
-        customer_duplicates = customer_df[customer_df[customer_account_col].duplicated()][
-            customer_account_col
-        ].tolist()
-        purchase_duplicates = purchase_df[purchase_df[purchase_account_col].duplicated()][
-            purchase_account_col
-        ].tolist()
-
-        # Count missing Account IDs
-        missing_ids = {
-            "customer": customer_df[customer_account_col].isnull().sum(),
-            "purchase": purchase_df[purchase_account_col].isnull().sum(),
-        }
+        keys, customer_codes, purchase_codes = self._factorize_account_ids(
+            customer_df[customer_account_col], purchase_df[purchase_account_col]
+        )
+        return self._quality_report_from_codes(
+            customer_df[customer_account_col], purchase_df[purchase_account_col], keys, customer_codes, purchase_codes
+        )
 
-        # Calculate quality score
-        total_unique_ids = len(customer_ids.union(purchase_ids))
-        if total_unique_ids > 0:
-            match_rate = len(matched_ids) / total_unique_ids
-            duplicate_penalty = (len(customer_duplicates) + len(purchase_duplicates)) / (
-                len(customer_df) + len(purchase_df)
-            )
-            missing_penalty = sum(missing_ids.values()) / (len(customer_df) + len(purchase_df))
-            quality_score = max(0.0, match_rate - duplicate_penalty - missing_penalty)
+    def _quality_report_from_codes(
+        self,
+        customer_ids: pd.Series,
+        purchase_ids: pd.Series,
+        keys: pd.Index,
+        customer_codes: np.ndarray,
+        purchase_codes: np.ndarray,
+    ) -> DataQualityReport:
+        """Build the quality report from factorized Account IDs (see _factorize_account_ids)"""
+        builder = QualityReportBuilder()
+        builder.add_records("customer", customer_ids)
+        builder.add_records("purchase", purchase_ids)
+        builder.add_keys(customer_ids, purchase_ids, keys, customer_codes, purchase_codes)
+        return builder.build()
+
+    def _factorize_account_ids(
+        self, customer_ids: pd.Series, purchase_ids: pd.Series, sort: bool = False
+    ) -> Tuple[pd.Index, np.ndarray, np.ndarray]:
+        """
+        Encode both Account ID columns against one set of distinct string keys.
+
+        Args:
+            customer_ids: Customer Account ID column
+            purchase_ids: Purchase Account ID column
+            sort: Number keys in lexicographic order (needed to reproduce outer join order)
+
+        Returns:
+            Tuple of (keys, customer_codes, purchase_codes); null IDs get code -1
+        """
+        combined = pd.concat([_as_string_ids(customer_ids), _as_string_ids(purchase_ids)], ignore_index=True)
+        codes, keys = pd.factorize(combined, sort=sort)
+        return keys, codes[: len(customer_ids)], codes[len(customer_ids):]
+
+    def _build_join_indexer(
+        self, customer_df: pd.DataFrame, purchase_df: pd.DataFrame, strategy: MergeStrategy
+    ) -> JoinIndexer:
+        """
+        Factorize the Account IDs once and compute the merged row positions.
+
+        The join runs on integer codes only; row order matches pd.merge on the
+        string keys (outer joins sort keys, which sorted codes preserve).
+        """
+        customer_account_col = getattr(self, 'customer_account_col', self._find_account_id_column(customer_df))
+        purchase_account_col = getattr(self, 'purchase_account_col', self._find_account_id_column(purchase_df))
+
+        keys, customer_codes, purchase_codes = self._factorize_account_ids(
+            customer_df[customer_account_col],
+            purchase_df[purchase_account_col],
+            sort=strategy == MergeStrategy.OUTER,
+        )
+
+        if strategy == MergeStrategy.RIGHT:
+            purchase_rows, customer_rows = _join_rows(purchase_codes, customer_codes, len(keys), keep_unmatched=True)
         else:
-            quality_score = 0.0
+            customer_rows, purchase_rows = _join_rows(
+                customer_codes, purchase_codes, len(keys), keep_unmatched=strategy != MergeStrategy.INNER
+            )
 
-        return DataQualityReport(
-            total_customer_records=len(customer_df),
-            total_purchase_records=len(purchase_df),
-            matched_records=len(matched_ids),
-            unmatched_customer_ids=unmatched_customer[:10],  # Limit for display
-            unmatched_purchase_ids=unmatched_purchase[:10],
-            duplicate_customer_ids=customer_duplicates,
-            duplicate_purchase_ids=purchase_duplicates,
-            missing_account_ids=missing_ids,
-            data_types_consistent=True,  # Can be enhanced with type checking
-            quality_score=quality_score,
+        key_codes = _codes_at(customer_codes, customer_rows, purchase_codes, purchase_rows)
+        if strategy == MergeStrategy.OUTER:
+            # Purchase rows whose ID has no customer row, then everything in key order
+            in_customer = np.zeros(len(keys), dtype=bool)
+            in_customer[customer_codes[customer_codes >= 0]] = True
+            purchase_only = np.flatnonzero(purchase_codes >= 0)
+            purchase_only = purchase_only[~in_customer[purchase_codes[purchase_only]]]
+            customer_rows = np.concatenate([customer_rows, np.full(len(purchase_only), -1, dtype=np.intp)])
+            purchase_rows = np.concatenate([purchase_rows, purchase_only])
+            key_codes = np.concatenate([key_codes, purchase_codes[purchase_only]])
+            order = np.argsort(key_codes, kind="stable")
+            customer_rows, purchase_rows, key_codes = customer_rows[order], purchase_rows[order], key_codes[order]
+
+        # Positions are kept for the whole merge, so store them compactly when they fit
+        position_type = np.int32 if max(len(customer_df), len(purchase_df), len(key_codes)) < 2**31 else np.intp
+        return JoinIndexer(
+            keys=keys,
+            customer_codes=customer_codes.astype(position_type),
+            purchase_codes=purchase_codes.astype(position_type),
+            customer_rows=customer_rows.astype(position_type),
+            purchase_rows=purchase_rows.astype(position_type),
+            key_codes=key_codes.astype(position_type),
+        )
+
+    def _take_merged(
+        self, customer_df: pd.DataFrame, purchase_df: pd.DataFrame, indexer: JoinIndexer, key_values
+    ) -> pd.DataFrame:
+        """
+        Assemble a merged frame by taking the indexer's rows from each input.
+
+        Columns are laid out as pd.merge would: prefixed customer columns with the
+        Account ID renamed to "Account_ID" in place, then prefixed purchase columns.
+
+        Args:
+            customer_df: Customer frame row-aligned with the one the indexer was built on
+            purchase_df: Purchase frame row-aligned with the one the indexer was built on
+            indexer: Shared join indexer
+            key_values: Values of the Account_ID column, one per merged row
+        """
+        customer_account_col = getattr(self, 'customer_account_col', self._find_account_id_column(customer_df))
+        purchase_account_col = getattr(self, 'purchase_account_col', self._find_account_id_column(purchase_df))
+        merge_key = MERGE_KEY_COLUMN
+
+        # Blockwise take of the customer side; position -1 is no label of a
+        # positional index, so reindex fills those rows with NaN like pd.merge
+        if not customer_df.index.equals(pd.RangeIndex(len(customer_df))):
+            customer_df = customer_df.set_axis(pd.RangeIndex(len(customer_df)), axis=0)
+        customer_columns = list(customer_df.columns)
+        merged_df = customer_df.reindex(
+            index=indexer.customer_rows, columns=[column for column in customer_columns if column != customer_account_col]
         )
+        merged_df.index = pd.RangeIndex(len(indexer))
+        merged_df.columns = [f"customer_{column}" for column in merged_df.columns]
+        merged_df.insert(customer_columns.index(customer_account_col), merge_key, key_values)
+
+        # Purchase columns are taken one by one, so no combined copy is made
+        for column in purchase_df.columns:
+            if column != purchase_account_col:
+                merged_df[f"purchase_{column}"] = _take_with_fill(purchase_df[column], indexer.purchase_rows)
+        return merged_df
+
+    def _display_key_values(
+        self, customer_display: pd.DataFrame, purchase_display: pd.DataFrame, indexer: JoinIndexer
+    ):
+        """Account_ID values of the display frame: each row's (masked) ID from whichever side it came from"""
+        customer_ids = _as_string_ids(customer_display[self._find_account_id_column(customer_display)])
+        purchase_ids = _as_string_ids(purchase_display[self._find_account_id_column(purchase_display)])
+        has_customer = indexer.customer_rows >= 0
+        values = _take_with_fill(customer_ids, indexer.customer_rows)
+        if not has_customer.all():
+            from_purchase = _take_with_fill(purchase_ids, indexer.purchase_rows)
+            values[~has_customer] = from_purchase[~has_customer]
+        return values
 
     def _perform_merge(
-        self, customer_df: pd.DataFrame, purchase_df: pd.DataFrame, strategy: MergeStrategy
+        self,
+        customer_df: pd.DataFrame,
+        purchase_df: pd.DataFrame,
+        strategy: MergeStrategy,
+        indexer: Optional[JoinIndexer] = None,
+        display: bool = False,
     ) -> Dict[str, Any]:
-        """Perform the actual merge operation"""
+        """
+        Perform the actual merge operation.
+
+        Args:
+            customer_df: Customer frame
+            purchase_df: Purchase frame
+            strategy: Merge strategy
+            indexer: Join computed earlier on these frames or on frames they are row-aligned with
+            display: Frames are display copies whose Account IDs may be masked; Account_ID is
+                taken from them rather than from the indexer keys
+        """
         try:
-            # Use the flexible column names found during validation
-            customer_account_col = getattr(self, 'customer_account_col', self._find_account_id_column(customer_df))
-            purchase_account_col = getattr(self, 'purchase_account_col', self._find_account_id_column(purchase_df))
-            
-            # Clean Account IDs (remove null values and convert to string)
-            customer_clean = customer_df.dropna(subset=[customer_account_col]).copy()
-            purchase_clean = purchase_df.dropna(subset=[purchase_account_col]).copy()
-
-            customer_clean[customer_account_col] = customer_clean[customer_account_col].astype(str)
-            purchase_clean[purchase_account_col] = purchase_clean[purchase_account_col].astype(str)
-
-            # Standardize column names for merging (use "Account_ID" as standard)
-            merge_key = "Account_ID"
-            customer_clean = customer_clean.add_prefix("customer_").rename(
-                columns={f"customer_{customer_account_col}": merge_key}
-            )
-            purchase_clean = purchase_clean.add_prefix("purchase_").rename(
-                columns={f"purchase_{purchase_account_col}": merge_key}
-            )
+            if indexer is None:
+                indexer = self._build_join_indexer(customer_df, purchase_df, strategy)
 
-            # Perform merge based on strategy
-            merged_df = pd.merge(
-                customer_clean,
-                purchase_clean,
-                on=merge_key,
-                how=strategy.value,
-                suffixes=("_customer", "_purchase"),
-            )
+            if display:
+                key_values = self._display_key_values(customer_df, purchase_df, indexer)
+            else:
+                key_values = indexer.keys.take(indexer.key_codes)
+            merged_df = self._take_merged(customer_df, purchase_df, indexer, key_values)
 
             return {
                 "success": True,
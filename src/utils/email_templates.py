@@ -1,21 +1,91 @@
 """
 Email Template Generation Functions
 Generates HTML and plain text email templates from CrewAI deliverables
+
+Templates are precompiled by default: each layout is parsed once into its
+static fragments (styles, header, footer, compliance text) and named slots,
+and an email is rendered by filling the slots. generate_batch renders whole
+campaigns, computing campaign-wide slots once and optionally sharding
+customers across a process pool.
 """
 
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
 import html
 
+from .parallel_batch import iter_chunked_results, resolve_workers
+
+
+# Slot names of the HTML and plain text layouts
+HTML_SLOTS = ("customer_name", "personalized_intro", "offer_content", "secondary_offers", "call_to_action", "ai_attribution")
+TEXT_SLOTS = HTML_SLOTS
+
+# Slots that depend only on the campaign, not on the customer
+CAMPAIGN_SLOTS = ("call_to_action", "ai_attribution")
+
+# Template formats rendered by generate_batch
+BATCH_FORMATS = ("html", "text")
+
+# Delimits slot names while a layout is compiled; never part of a layout
+_SLOT_MARK = "\x00"
+
+# Patterns of the Hong Kong localization
+_DOLLAR_AMOUNT = re.compile(r'\$(\d+)')
+_PHONE_NUMBER = re.compile(r'(\d{4})\s*(\d{4})')
+
+
+class CompiledTemplate:
+    """
+    Email layout parsed once into static fragments and named slots.
+
+    The layout is rendered a single time with a marker in place of every slot
+    and split at the markers; rendering an email only places the slot values
+    between the static fragments and joins them.
+    """
+
+    def __init__(self, layout: Callable[..., str], slots: Sequence[str], postprocess: Optional[Callable[[str], str]] = None):
+        """
+        Compile a layout.
+
+        Args:
+            layout: Function returning the document for keyword slot values
+            slots: Slot names the layout accepts
+            postprocess: Optional whole-document transform applied to the static fragments
+        """
+        marked = layout(**{slot: f"{_SLOT_MARK}{slot}{_SLOT_MARK}" for slot in slots})
+        if postprocess:
+            marked = postprocess(marked)
+        # Alternating static fragments and slot names
+        self._pieces = marked.split(_SLOT_MARK)
+        self.fragments = tuple(self._pieces[0::2])
+        self.slots = tuple(self._pieces[1::2])
+        self._slot_positions = tuple((2 * i + 1, slot) for i, slot in enumerate(self.slots))
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill the slots with values (one entry per slot name)"""
+        pieces = self._pieces.copy()
+        for position, slot in self._slot_positions:
+            pieces[position] = values[slot]
+        return "".join(pieces)
+
 
 class EmailTemplateGenerator:
     """Generate personalized email templates from CrewAI collaboration results"""
     
-    def __init__(self):
+    def __init__(self, precompiled: bool = True):
+        """
+        Initialize the generator.
+
+        Args:
+            precompiled: Render through layouts compiled once per generator;
+                False rebuilds every document from scratch
+        """
         self.three_hk_primary = "#00FF00"
         self.three_hk_secondary = "#000000"
         self.three_hk_accent = "#FFFFFF"
+        self.precompiled = precompiled
+        self._compiled: Dict[Tuple[str, bool], CompiledTemplate] = {}
         
     def generate_html_email_template(
         self, 
@@ -26,55 +96,10 @@ class EmailTemplateGenerator:
     ) -> str:
         """Generate HTML email template for a customer"""
         
-        # Extract customer information
-        customer_name = self._get_customer_reference(customer_data)
-        usage_pattern = self._extract_usage_pattern(customer_data, agent_deliverables)
-        primary_offer = self._get_primary_offer(offers, recommendations)
-        
-        # Generate template content
-        html_template = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Exclusive Offer from Three HK</title>
-    {self._get_email_styles()}
-</head>
-<body>
-    <div class="email-container">
-        {self._generate_header()}
-        
-        <main class="email-content">
-            <div class="greeting-section">
-                <h1>Hi {customer_name},</h1>
-                <p class="personalized-intro">
-                    {self._generate_personalized_intro(usage_pattern, agent_deliverables)}
-                </p>
-            </div>
-            
-            <div class="offer-section">
-                {self._generate_offer_content(primary_offer, recommendations, agent_deliverables)}
-            </div>
-            
-            <div class="additional-offers">
-                {self._generate_secondary_offers(offers[1:3], agent_deliverables)}
-            </div>
-            
-            <div class="cta-section">
-                {self._generate_call_to_action(primary_offer)}
-            </div>
-            
-            <div class="ai-attribution">
-                {self._generate_ai_attribution(agent_deliverables)}
-            </div>
-        </main>
-        
-        {self._generate_footer()}
-    </div>
-</body>
-</html>"""
-        
-        return html_template
+        slots = self._html_slots(customer_data, recommendations, offers, agent_deliverables)
+        if self.precompiled:
+            return self.compiled_template("html").render(slots)
+        return self._html_layout(**slots)
     
     def generate_plain_text_email_template(
         self, 
@@ -85,38 +110,136 @@ class EmailTemplateGenerator:
     ) -> str:
         """Generate plain text email template for a customer"""
         
-        customer_name = self._get_customer_reference(customer_data)
-        usage_pattern = self._extract_usage_pattern(customer_data, agent_deliverables)
-        primary_offer = self._get_primary_offer(offers, recommendations)
-        
-        # Generate plain text content
-        text_template = f"""THREE HK - EXCLUSIVE OFFER FOR YOU
-===============================================
-
-Hi {customer_name},
-
-{self._generate_personalized_intro_text(usage_pattern, agent_deliverables)}
-
-YOUR EXCLUSIVE OFFER:
-{self._generate_offer_content_text(primary_offer, recommendations, agent_deliverables)}
-
-{self._generate_secondary_offers_text(offers[1:3], agent_deliverables)}
+        slots = self._text_slots(customer_data, recommendations, offers, agent_deliverables)
+        if self.precompiled:
+            return self.compiled_template("text").render(slots)
+        return self._text_layout(**slots)
+    
+    def compiled_template(self, template_format: str, branded: bool = False) -> CompiledTemplate:
+        """
+        Layout of a format ("html" or "text") compiled once per generator.
 
-NEXT STEPS:
-{self._generate_call_to_action_text(primary_offer)}
+        Branded layouts have format_three_hk_branding applied to their static
+        fragments; slot values are localized when they are filled.
+        """
+        key = (template_format, branded)
+        if key not in self._compiled:
+            layout, slots = {
+                "html": (self._html_layout, HTML_SLOTS),
+                "text": (self._text_layout, TEXT_SLOTS),
+            }[template_format]
+            self._compiled[key] = CompiledTemplate(
+                layout, slots, self.format_three_hk_branding if branded else None
+            )
+        return self._compiled[key]
+    
+    def generate_batch(
+        self,
+        customers: Sequence[Dict],
+        recommendations: Optional[Sequence[Dict]] = None,
+        offers: Optional[Sequence[List[Dict]]] = None,
+        agent_deliverables: Dict = None,
+        formats: Sequence[str] = BATCH_FORMATS,
+        include_subjects: bool = False,
+        branded: bool = False,
+        workers: Optional[int] = 1,
+        chunk_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Render personalized emails for a campaign.
 
-{self._generate_ai_attribution_text(agent_deliverables)}
+        Args:
+            customers: Customer data per email
+            recommendations: Recommendations per customer (none if None)
+            offers: Offers per customer (none if None)
+            agent_deliverables: CrewAI deliverables shared by the campaign
+            formats: Template formats to render ("html", "text")
+            include_subjects: Add subject line variants per customer
+            branded: Apply format_three_hk_branding to every template
+            workers: Worker processes to shard the batch across (all cores if None)
+            chunk_size: Customers per worker chunk (derived from workers if None)
 
----
-Three HK | Building Hong Kong's Digital Future
-Website: three.com.hk | Customer Service: 3166 3333
+        Returns:
+            One dict per customer with customer_id, templates by format and,
+            if requested, subject_lines
+        """
+        return list(self.iter_batch(
+            customers, recommendations, offers, agent_deliverables,
+            formats, include_subjects, branded, workers, chunk_size,
+        ))
+    
+    def iter_batch(
+        self,
+        customers: Sequence[Dict],
+        recommendations: Optional[Sequence[Dict]] = None,
+        offers: Optional[Sequence[List[Dict]]] = None,
+        agent_deliverables: Dict = None,
+        formats: Sequence[str] = BATCH_FORMATS,
+        include_subjects: bool = False,
+        branded: bool = False,
+        workers: Optional[int] = 1,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream generate_batch results in input order.
 
-This email was generated using AI analysis of your usage patterns.
-To unsubscribe: [Unsubscribe Link]
-Privacy Policy: three.com.hk/privacy
-"""
-        
-        return text_template
+        With more than one worker the customers are sharded into contiguous
+        chunks across a process pool; each worker process receives a copy of
+        this generator once and compiles its layouts once.
+        """
+        items = [
+            (
+                customer,
+                recommendations[i] if recommendations is not None else {},
+                offers[i] if offers is not None else [],
+            )
+            for i, customer in enumerate(customers)
+        ]
+        options = (agent_deliverables, tuple(formats), include_subjects, branded)
+        
+        if resolve_workers(workers) > 1 and len(items) > 1:
+            chunks = iter_chunked_results(
+                _render_chunk,
+                items,
+                options,
+                workers=workers,
+                chunk_size=chunk_size,
+                initializer=_init_template_worker,
+                initargs=(self,),
+            )
+            for _, chunk_results in chunks:
+                yield from chunk_results
+        else:
+            yield from self._render_batch(0, items, options)
+    
+    def _render_batch(
+        self, start: int, items: Sequence[Tuple[Dict, Dict, List[Dict]]], options: Tuple
+    ) -> Iterator[Dict[str, Any]]:
+        """Render (customer, recommendations, offers) items; campaign slots are computed once"""
+        agent_deliverables, formats, include_subjects, branded = options
+        campaign = {
+            "html": self._campaign_slots("html", agent_deliverables),
+            "text": self._campaign_slots("text", agent_deliverables),
+        }
+        if branded:
+            campaign = {template_format: self._localize_slots(slots) for template_format, slots in campaign.items()}
+        slot_builders = {"html": self._customer_html_slots, "text": self._customer_text_slots}
+        
+        for offset, (customer, recommendations, offers) in enumerate(items):
+            result = {
+                "customer_id": customer.get("customer_id", f"CUST_{start + offset + 1:03d}"),
+                "templates": {},
+            }
+            for template_format in formats:
+                slots = slot_builders[template_format](customer, recommendations, offers, agent_deliverables)
+                if branded:
+                    slots = self._localize_slots(slots)
+                slots.update(campaign[template_format])
+                result["templates"][template_format] = self.compiled_template(template_format, branded).render(slots)
+            if include_subjects:
+                primary_offer = offers[0] if offers else {}
+                result["subject_lines"] = self.create_subject_lines(customer, primary_offer, agent_deliverables)
+            yield result
     
     def create_subject_lines(
         self, 
@@ -190,6 +313,144 @@ Privacy Policy: three.com.hk/privacy
         
         return branded_content
     
+    # Layouts and slots
+    
+    def _html_layout(
+        self,
+        customer_name: str,
+        personalized_intro: str,
+        offer_content: str,
+        secondary_offers: str,
+        call_to_action: str,
+        ai_attribution: str,
+    ) -> str:
+        """HTML email document around its personalized parts"""
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Exclusive Offer from Three HK</title>
+    {self._get_email_styles()}
+</head>
+<body>
+    <div class="email-container">
+        {self._generate_header()}
+        
+        <main class="email-content">
+            <div class="greeting-section">
+                <h1>Hi {customer_name},</h1>
+                <p class="personalized-intro">
+                    {personalized_intro}
+                </p>
+            </div>
+            
+            <div class="offer-section">
+                {offer_content}
+            </div>
+            
+            <div class="additional-offers">
+                {secondary_offers}
+            </div>
+            
+            <div class="cta-section">
+                {call_to_action}
+            </div>
+            
+            <div class="ai-attribution">
+                {ai_attribution}
+            </div>
+        </main>
+        
+        {self._generate_footer()}
+    </div>
+</body>
+</html>"""
+    
+    def _text_layout(
+        self,
+        customer_name: str,
+        personalized_intro: str,
+        offer_content: str,
+        secondary_offers: str,
+        call_to_action: str,
+        ai_attribution: str,
+    ) -> str:
+        """Plain text email document around its personalized parts"""
+        return f"""THREE HK - EXCLUSIVE OFFER FOR YOU
+===============================================
+
+Hi {customer_name},
+
+{personalized_intro}
+
+YOUR EXCLUSIVE OFFER:
+{offer_content}
+
+{secondary_offers}
+
+NEXT STEPS:
+{call_to_action}
+
+{ai_attribution}
+
+---
+Three HK | Building Hong Kong's Digital Future
+Website: three.com.hk | Customer Service: 3166 3333
+
+This email was generated using AI analysis of your usage patterns.
+To unsubscribe: [Unsubscribe Link]
+Privacy Policy: three.com.hk/privacy
+"""
+    
+    def _customer_html_slots(self, customer_data: Dict, recommendations: Dict, offers: List[Dict], agent_deliverables: Dict = None) -> Dict[str, str]:
+        """Per-customer slot values of the HTML layout"""
+        usage_pattern = self._extract_usage_pattern(customer_data, agent_deliverables)
+        primary_offer = self._get_primary_offer(offers, recommendations)
+        return {
+            "customer_name": self._get_customer_reference(customer_data),
+            "personalized_intro": self._generate_personalized_intro(usage_pattern, agent_deliverables),
+            "offer_content": self._generate_offer_content(primary_offer, recommendations, agent_deliverables),
+            "secondary_offers": self._generate_secondary_offers(offers[1:3], agent_deliverables),
+        }
+    
+    def _customer_text_slots(self, customer_data: Dict, recommendations: Dict, offers: List[Dict], agent_deliverables: Dict = None) -> Dict[str, str]:
+        """Per-customer slot values of the plain text layout"""
+        usage_pattern = self._extract_usage_pattern(customer_data, agent_deliverables)
+        primary_offer = self._get_primary_offer(offers, recommendations)
+        return {
+            "customer_name": self._get_customer_reference(customer_data),
+            "personalized_intro": self._generate_personalized_intro_text(usage_pattern, agent_deliverables),
+            "offer_content": self._generate_offer_content_text(primary_offer, recommendations, agent_deliverables),
+            "secondary_offers": self._generate_secondary_offers_text(offers[1:3], agent_deliverables),
+        }
+    
+    def _campaign_slots(self, template_format: str, agent_deliverables: Dict = None) -> Dict[str, str]:
+        """Slot values shared by every email of a campaign"""
+        if template_format == "html":
+            slots = {
+                "call_to_action": self._generate_call_to_action({}),
+                "ai_attribution": self._generate_ai_attribution(agent_deliverables),
+            }
+        else:
+            slots = {
+                "call_to_action": self._generate_call_to_action_text({}),
+                "ai_attribution": self._generate_ai_attribution_text(agent_deliverables),
+            }
+        return slots
+    
+    def _html_slots(self, customer_data: Dict, recommendations: Dict, offers: List[Dict], agent_deliverables: Dict = None) -> Dict[str, str]:
+        """All slot values of the HTML layout for one customer"""
+        slots = self._customer_html_slots(customer_data, recommendations, offers, agent_deliverables)
+        slots.update(self._campaign_slots("html", agent_deliverables))
+        return slots
+    
+    def _text_slots(self, customer_data: Dict, recommendations: Dict, offers: List[Dict], agent_deliverables: Dict = None) -> Dict[str, str]:
+        """All slot values of the plain text layout for one customer"""
+        slots = self._customer_text_slots(customer_data, recommendations, offers, agent_deliverables)
+        slots.update(self._campaign_slots("text", agent_deliverables))
+        return slots
+    
     # Helper methods
     
     def _get_customer_reference(self, customer_data: Dict) -> str:
@@ -559,9 +820,33 @@ Quote reference: AIREV{datetime.now().strftime('%Y%m%d')}"""
     def _apply_hk_localization(self, content: str) -> str:
         """Apply Hong Kong localization"""
         # Ensure HK$ currency format
-        content = re.sub(r'\$(\d+)', r'HK$\1', content)
+        content = _DOLLAR_AMOUNT.sub(r'HK$\1', content)
         
         # Ensure Hong Kong phone format
-        content = re.sub(r'(\d{4})\s*(\d{4})', r'\1 \2', content)
+        content = _PHONE_NUMBER.sub(r'\1 \2', content)
         
         return content
+    
+    def _localize_slots(self, slots: Dict[str, str]) -> Dict[str, str]:
+        """Apply Hong Kong localization to every slot value in one pass over the joined values"""
+        values = self._apply_hk_localization(_SLOT_MARK.join(slots.values())).split(_SLOT_MARK)
+        if len(values) != len(slots):
+            # A value contained the slot marker itself
+            return {slot: self._apply_hk_localization(value) for slot, value in slots.items()}
+        return dict(zip(slots, values))
+
+
+# Process pool workers for parallel batch rendering
+
+_worker_generator: Optional[EmailTemplateGenerator] = None
+
+
+def _init_template_worker(generator: EmailTemplateGenerator) -> None:
+    """Install the template generator once per worker process."""
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _render_chunk(start: int, chunk: List[Tuple[Dict, Dict, List[Dict]]], options: Tuple) -> List[Dict[str, Any]]:
+    """Render a contiguous chunk of a batch in a worker process."""
+    return list(_worker_generator._render_batch(start, chunk, options))
@@ -12,13 +12,16 @@ Key Features:
 - Local-only storage (no external transmission)
 - Integration with privacy architecture
 - Comprehensive audit logging
+- Chunked storage for datasets too large to hold in memory
 """
 
 import os
 import json
+import shutil
 import hashlib
 import secrets
-from typing import Dict, Any, Optional, List, Union
+from io import StringIO
+from typing import Dict, Any, Iterator, Optional, List, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import pandas as pd
@@ -34,6 +37,13 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Storage key prefix of datasets written chunk by chunk
+CHUNKED_KEY_PREFIX = "chunked"
+
+# Sizes of the AES-GCM nonce and authentication tag
+GCM_NONCE_BYTES = 12
+GCM_TAG_BYTES = 16
+
 
 @dataclass
 class EncryptionMetadata:
@@ -190,6 +200,35 @@ class EncryptedStorage:
         decrypted_bytes = decryptor.update(ciphertext) + decryptor.finalize()
         return decrypted_bytes.decode("utf-8")
 
+    def _dataframe_payload(self, df: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Serialize a DataFrame with its columns, shape and dtypes."""
+        data_dict = {
+            "dataframe": df.to_json(orient="records", date_format="iso"),
+            "columns": list(df.columns),
+            "shape": df.shape,
+            "dtypes": df.dtypes.astype(str).to_dict(),
+            "metadata": metadata or {},
+        }
+
+        return json.dumps(data_dict, indent=2)
+
+    def _dataframe_from_payload(self, data_dict: Dict[str, Any]) -> pd.DataFrame:
+        """Rebuild a DataFrame serialized by _dataframe_payload."""
+        # No type inference: JSON strings such as "00456" stay strings, and
+        # datetime columns are restored from the stored dtypes below
+        df = pd.read_json(StringIO(data_dict["dataframe"]), orient="records", dtype=False, convert_dates=False)
+
+        # Restore column order and types
+        df = df[data_dict["columns"]]
+        for col, dtype in data_dict["dtypes"].items():
+            if col in df.columns:
+                try:
+                    df[col] = df[col].astype(dtype)
+                except Exception as e:
+                    logger.warning(f"Could not restore dtype {dtype} for column {col}: {e}")
+
+        return df
+
     def store_dataframe(self, df: pd.DataFrame, identifier: str, metadata: Optional[Dict[str, Any]] = None) -> str:
         """
         Store DataFrame with encryption.
@@ -203,15 +242,7 @@ class EncryptedStorage:
             Storage key for retrieval
         """
         # Convert DataFrame to JSON
-        data_dict = {
-            "dataframe": df.to_json(orient="records", date_format="iso"),
-            "columns": list(df.columns),
-            "shape": df.shape,
-            "dtypes": df.dtypes.astype(str).to_dict(),
-            "metadata": metadata or {},
-        }
-
-        data_json = json.dumps(data_dict, indent=2)
+        data_json = self._dataframe_payload(df, metadata)
 
         # Encrypt data
         entry = self._encrypt_data(data_json, self.master_password)
@@ -230,12 +261,22 @@ class EncryptedStorage:
         """
         Retrieve and decrypt DataFrame.
 
+        Chunked datasets are reassembled into a single DataFrame; use
+        iter_dataframe_chunks to read them with bounded memory.
+
         Args:
-            storage_key: Key returned from store_dataframe
+            storage_key: Key returned from store_dataframe or a chunked writer
 
         Returns:
             Tuple of (DataFrame, metadata)
         """
+        if self.is_chunked(storage_key):
+            manifest = self._read_manifest(storage_key)
+            chunks = list(self.iter_dataframe_chunks(storage_key))
+            if not chunks:
+                return pd.DataFrame(columns=manifest["columns"]), manifest["metadata"]
+            return pd.concat(chunks, ignore_index=True), manifest["metadata"]
+
         file_path = os.path.join(self.storage_path, f"{storage_key}.enc")
 
         if not os.path.exists(file_path):
@@ -261,18 +302,7 @@ class EncryptedStorage:
         data_dict = json.loads(data_json)
 
         # Reconstruct DataFrame
-        from io import StringIO
-
-        df = pd.read_json(StringIO(data_dict["dataframe"]), orient="records")
-
-        # Restore column order and types
-        df = df[data_dict["columns"]]
-        for col, dtype in data_dict["dtypes"].items():
-            if col in df.columns:
-                try:
-                    df[col] = df[col].astype(dtype)
-                except Exception as e:
-                    logger.warning(f"Could not restore dtype {dtype} for column {col}: {e}")
+        df = self._dataframe_from_payload(data_dict)
 
         # Update file with access tracking
         with open(file_path, "w") as f:
@@ -281,6 +311,75 @@ class EncryptedStorage:
         logger.info(f"DataFrame retrieved with key: {storage_key}")
         return df, data_dict["metadata"]
 
+    def open_chunked_writer(self, identifier: str, metadata: Optional[Dict[str, Any]] = None) -> "ChunkedDataFrameWriter":
+        """
+        Start storing a DataFrame one chunk at a time.
+
+        Args:
+            identifier: Unique identifier for the data
+            metadata: Additional metadata to store
+
+        Returns:
+            Writer whose close() returns the storage key
+        """
+        storage_key = f"{CHUNKED_KEY_PREFIX}_{identifier}_{int(datetime.now().timestamp())}"
+        return ChunkedDataFrameWriter(self, storage_key, metadata)
+
+    def is_chunked(self, storage_key: str) -> bool:
+        """Whether a storage key refers to a chunked dataset."""
+        return storage_key.startswith(f"{CHUNKED_KEY_PREFIX}_")
+
+    def _chunk_dir(self, storage_key: str) -> str:
+        """Directory holding the encrypted chunks of a dataset."""
+        return os.path.join(self.storage_path, f"{storage_key}.chunks")
+
+    def _chunk_path(self, storage_key: str, index: int) -> str:
+        """File holding one encrypted chunk."""
+        return os.path.join(self._chunk_dir(storage_key), f"{index:06d}.bin")
+
+    def _encrypt_chunk(self, data: bytes, key: bytes, associated_data: bytes) -> bytes:
+        """Encrypt one chunk with AES-256-GCM, returning nonce, ciphertext and tag."""
+        nonce = secrets.token_bytes(GCM_NONCE_BYTES)
+        encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce), backend=self.backend).encryptor()
+        encryptor.authenticate_additional_data(associated_data)
+        ciphertext = encryptor.update(data) + encryptor.finalize()
+        return nonce + ciphertext + encryptor.tag
+
+    def _decrypt_chunk(self, blob: bytes, key: bytes, associated_data: bytes) -> bytes:
+        """Decrypt and authenticate one chunk written by _encrypt_chunk."""
+        nonce, ciphertext, tag = blob[:GCM_NONCE_BYTES], blob[GCM_NONCE_BYTES:-GCM_TAG_BYTES], blob[-GCM_TAG_BYTES:]
+        decryptor = Cipher(algorithms.AES(key), modes.GCM(nonce, tag), backend=self.backend).decryptor()
+        decryptor.authenticate_additional_data(associated_data)
+        return decryptor.update(ciphertext) + decryptor.finalize()
+
+    def _read_manifest(self, storage_key: str) -> Dict[str, Any]:
+        """Decrypt the manifest of a chunked dataset."""
+        return self.retrieve_json(storage_key)
+
+    def iter_dataframe_chunks(self, storage_key: str) -> Iterator[pd.DataFrame]:
+        """
+        Decrypt a chunked dataset one chunk at a time.
+
+        Args:
+            storage_key: Key returned by ChunkedDataFrameWriter.close
+
+        Yields:
+            DataFrame chunks in the order they were written
+        """
+        if not self.is_chunked(storage_key):
+            raise ValueError(f"Not a chunked dataset: {storage_key}")
+
+        manifest = self._read_manifest(storage_key)
+        key = self._derive_key(base64.b64decode(manifest["chunk_salt"]), self.master_password)
+
+        for index, chunk_info in enumerate(manifest["chunks"]):
+            with open(self._chunk_path(storage_key, index), "rb") as f:
+                blob = f.read()
+            data = self._decrypt_chunk(blob, key, f"{storage_key}:{index}".encode())
+            if hashlib.sha256(data).hexdigest() != chunk_info["data_hash"]:
+                raise ValueError(f"Chunk {index} of {storage_key} failed its integrity check")
+            yield self._dataframe_from_payload(json.loads(data))
+
     def store_json(self, data: Union[Dict, List], identifier: str) -> str:
         """
         Store JSON data with encryption.
@@ -360,6 +459,10 @@ class EncryptedStorage:
 
                     storage_key = filename.replace(".enc", "")
                     metadata = entry_dict["metadata"]
+                    file_size = os.path.getsize(file_path)
+                    if self.is_chunked(storage_key) and os.path.isdir(self._chunk_dir(storage_key)):
+                        chunk_dir = self._chunk_dir(storage_key)
+                        file_size += sum(os.path.getsize(os.path.join(chunk_dir, name)) for name in os.listdir(chunk_dir))
 
                     storage_info.append(
                         {
@@ -368,7 +471,7 @@ class EncryptedStorage:
                             "last_accessed": metadata.get("last_accessed"),
                             "access_count": metadata.get("access_count", 0),
                             "data_type": storage_key.split("_")[0],
-                            "file_size": os.path.getsize(file_path),
+                            "file_size": file_size,
                         }
                     )
                 except Exception as e:
@@ -390,6 +493,7 @@ class EncryptedStorage:
 
         if os.path.exists(file_path):
             os.remove(file_path)
+            shutil.rmtree(self._chunk_dir(storage_key), ignore_errors=True)
             logger.info(f"Deleted storage key: {storage_key}")
             return True
 
@@ -423,7 +527,13 @@ class EncryptedStorage:
             # Verify hash if available
             if entry.metadata.data_hash:
                 actual_hash = hashlib.sha256(decrypted_data.encode()).hexdigest()
-                return actual_hash == entry.metadata.data_hash
+                if actual_hash != entry.metadata.data_hash:
+                    return False
+
+            # Chunked datasets: every chunk must decrypt and match its hash
+            if self.is_chunked(storage_key):
+                for _ in self.iter_dataframe_chunks(storage_key):
+                    pass
 
             return True
         except Exception as e:
@@ -451,6 +561,80 @@ class EncryptedStorage:
         }
 
 
+class ChunkedDataFrameWriter:
+    """
+    Encrypts a DataFrame into storage one chunk at a time.
+
+    The encryption key is derived once per dataset. Each chunk gets its own
+    nonce and is bound to its dataset and position through GCM associated data,
+    so chunks cannot be reordered or moved between datasets. The encrypted
+    manifest is written on close; an aborted writer leaves nothing behind.
+    """
+
+    def __init__(self, storage: EncryptedStorage, storage_key: str, metadata: Optional[Dict[str, Any]] = None):
+        self.storage = storage
+        self.storage_key = storage_key
+        self.metadata = metadata or {}
+        self.columns: Optional[List[str]] = None
+        self.total_rows = 0
+        self.chunks: List[Dict[str, Any]] = []
+
+        self._salt = secrets.token_bytes(16)
+        self._key = storage._derive_key(self._salt, storage.master_password)
+        os.makedirs(storage._chunk_dir(storage_key), exist_ok=True)
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Encrypt and store the next chunk."""
+        if self.columns is None:
+            self.columns = list(df.columns)
+        elif list(df.columns) != self.columns:
+            raise ValueError(f"Chunk columns {list(df.columns)} do not match {self.columns}")
+
+        index = len(self.chunks)
+        data = self.storage._dataframe_payload(df).encode("utf-8")
+        blob = self.storage._encrypt_chunk(data, self._key, f"{self.storage_key}:{index}".encode())
+        with open(self.storage._chunk_path(self.storage_key, index), "wb") as f:
+            f.write(blob)
+
+        self.chunks.append({"rows": len(df), "data_hash": hashlib.sha256(data).hexdigest()})
+        self.total_rows += len(df)
+
+    def close(self) -> str:
+        """
+        Write the manifest and return the storage key.
+
+        Returns:
+            Storage key for retrieval
+        """
+        columns = self.columns or []
+        manifest = {
+            "chunk_salt": base64.b64encode(self._salt).decode(),
+            "chunks": self.chunks,
+            "columns": columns,
+            "shape": (self.total_rows, len(columns)),
+            "metadata": self.metadata,
+        }
+
+        entry = self.storage._encrypt_data(json.dumps(manifest, default=str), self.storage.master_password)
+        file_path = os.path.join(self.storage.storage_path, f"{self.storage_key}.enc")
+        with open(file_path, "w") as f:
+            json.dump(asdict(entry), f, indent=2)
+
+        logger.info(f"Chunked DataFrame stored with key: {self.storage_key} ({len(self.chunks)} chunks)")
+        return self.storage_key
+
+    def abort(self) -> None:
+        """Remove any chunks written so far."""
+        shutil.rmtree(self.storage._chunk_dir(self.storage_key), ignore_errors=True)
+
+    def __enter__(self) -> "ChunkedDataFrameWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+
+
 # Global instance for easy access (initialized lazily)
 encrypted_storage = None
 
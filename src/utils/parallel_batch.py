@@ -0,0 +1,90 @@
+"""
+Parallel Batch Execution - Chunked Process Pool Helpers
+Part of the Agentic AI Revenue Assistant
+
+Shards a list of per-customer inputs into contiguous chunks and runs them on
+a process pool. Each worker is initialised once (e.g. with a scoring engine)
+and chunk results stream back in input order, tagged with the index of their
+first item.
+
+Features:
+- Configurable worker count and chunk size
+- One initializer call per worker process, not per chunk
+- In-order streaming of chunk results
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Chunks per worker when no chunk size is given: enough to balance uneven
+# chunks without paying inter-process overhead for tiny ones
+CHUNKS_PER_WORKER = 4
+
+# Worker processes are spawned rather than forked: the Streamlit server and the
+# session manager run background threads, and forking a multi-threaded process
+# can deadlock the child
+START_METHOD = "spawn"
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Number of worker processes to use (all cores if None)"""
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def resolve_chunk_size(total: int, workers: int, chunk_size: Optional[int] = None) -> int:
+    """Chunk size to use for ``total`` items on ``workers`` processes"""
+    if chunk_size is not None:
+        return max(1, int(chunk_size))
+    return max(1, math.ceil(total / (workers * CHUNKS_PER_WORKER)))
+
+
+def iter_chunked_results(
+    process_chunk: Callable[[int, List[Any], Any], List[Any]],
+    items: Sequence[Any],
+    shared: Any = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = (),
+) -> Iterator[Tuple[int, List[Any]]]:
+    """
+    Run ``process_chunk`` over contiguous chunks of ``items`` on a process pool.
+
+    Args:
+        process_chunk: Picklable function called as process_chunk(start_index, chunk, shared)
+        items: Inputs to shard
+        shared: Read-only argument passed to every chunk
+        workers: Number of worker processes (all cores if None)
+        chunk_size: Items per chunk (derived from workers if None)
+        initializer: Picklable function called once in each worker process with ``initargs``
+        initargs: Picklable arguments for the initializer
+
+    Yields:
+        Tuples of (start_index, chunk_results) in input order
+    """
+    workers = resolve_workers(workers)
+    chunk_size = resolve_chunk_size(len(items), workers, chunk_size)
+    starts = list(range(0, len(items), chunk_size))
+    if not starts:
+        return
+
+    workers = min(workers, len(starts))
+    logger.info(f"Processing {len(items)} items in {len(starts)} chunks on {workers} workers")
+
+    context = multiprocessing.get_context(START_METHOD)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=initializer, initargs=initargs
+    ) as executor:
+        chunks = (list(items[start:start + chunk_size]) for start in starts)
+        for start, results in zip(starts, executor.map(process_chunk, starts, chunks, repeat(shared))):
+            yield start, results
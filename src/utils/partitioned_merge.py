@@ -0,0 +1,353 @@
+"""
+Out-of-Core Data Merging
+Part of the Agentic AI Revenue Assistant
+
+Merges customer and purchase datasets that do not fit in memory together.
+Both inputs are read chunk by chunk and hash-partitioned by Account ID into
+encrypted on-disk partitions (one chunked dataset per input and partition).
+Each customer partition is then merged with its purchase partition using
+DataMerger's join indexer, and the merged chunks are streamed out.
+
+Every Account ID lands in exactly one partition, so the per-partition joins
+add up to the full join for every MergeStrategy, and the DataQualityReport is
+accumulated partition by partition. Row order follows pd.merge within each
+partition; partitions are emitted one after another.
+
+Compliance: partitions are encrypted like any other stored PII and are deleted
+as soon as they have been merged, or when the merge fails or is abandoned.
+"""
+
+import logging
+import secrets
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_merging import (
+    DataMerger,
+    DataQualityReport,
+    MergeResult,
+    MergeStrategy,
+    QualityReportBuilder,
+    _as_string_ids,
+)
+from .encrypted_storage import ChunkedDataFrameWriter, EncryptedStorage
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Number of hash partitions per input; each partition pair must fit in memory
+DEFAULT_PARTITIONS = 16
+
+# Merged rows of an out-of-core upload merge kept in memory for analysis
+MERGED_HEAD_ROWS = 10_000
+
+DataFrameChunks = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+def partition_of(account_ids: pd.Series, num_partitions: int) -> np.ndarray:
+    """
+    Hash partition of each non-null Account ID.
+
+    IDs are hashed as strings, the form they are joined on, so 1001 and "1001"
+    share a partition.
+
+    Returns:
+        Partition number per ID, -1 for null IDs
+    """
+    partitions = np.full(len(account_ids), -1, dtype=np.int64)
+    valid = account_ids.notna().to_numpy()
+    ids = _as_string_ids(account_ids[valid]).to_numpy(dtype=object)
+    partitions[valid] = (pd.util.hash_array(ids) % np.uint64(num_partitions)).astype(np.int64)
+    return partitions
+
+
+class PartitionedMerge:
+    """
+    Out-of-core merge of chunked customer and purchase data by Account ID.
+
+    Iterating the merge partitions both inputs into encrypted storage, then
+    yields one merged DataFrame per partition. quality_report and metadata are
+    complete once iteration has finished. Merged chunks hold original data,
+    laid out like MergeResult.merged_data.
+
+    Example:
+        merge = PartitionedMerge(storage, pd.read_csv(customers, chunksize=50_000),
+                                 pipeline.iter_stored_chunks(purchase_key), MergeStrategy.LEFT)
+        for chunk in merge:
+            analyze(chunk)
+        report = merge.quality_report
+    """
+
+    def __init__(
+        self,
+        storage: EncryptedStorage,
+        customer_chunks: DataFrameChunks,
+        purchase_chunks: DataFrameChunks,
+        strategy: MergeStrategy = MergeStrategy.LEFT,
+        num_partitions: int = DEFAULT_PARTITIONS,
+        merger: Optional[DataMerger] = None,
+    ):
+        """
+        Set up the merge; nothing is read until iteration.
+
+        Args:
+            storage: Encrypted storage for the partitions
+            customer_chunks: Customer DataFrame chunks (a single DataFrame is one chunk)
+            purchase_chunks: Purchase DataFrame chunks
+            strategy: Merge strategy (inner, left, right, outer)
+            num_partitions: Number of hash partitions per input
+            merger: DataMerger used to join each partition
+        """
+        if num_partitions < 1:
+            raise ValueError("num_partitions must be at least 1")
+
+        self.storage = storage
+        self.strategy = strategy
+        self.num_partitions = num_partitions
+        self.merger = merger or DataMerger()
+        self.quality_report: Optional[DataQualityReport] = None
+        self.metadata: Dict[str, Any] = {}
+
+        self._sources = {"customer": customer_chunks, "purchase": purchase_chunks}
+        self._account_cols: Dict[str, str] = {}
+        self._templates: Dict[str, pd.DataFrame] = {}
+        self._partition_keys: Dict[str, Dict[int, str]] = {"customer": {}, "purchase": {}}
+        self._run_id = secrets.token_hex(4)
+        self._started = False
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        if self._started:
+            raise RuntimeError("A PartitionedMerge can only be iterated once")
+        self._started = True
+        return self._merge()
+
+    def store(self, identifier: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Run the merge and write the merged chunks to a chunked encrypted dataset.
+
+        Args:
+            identifier: Identifier of the merged dataset
+            metadata: Additional metadata, stored with the merge metadata
+
+        Returns:
+            Storage key, readable with EncryptedStorage.iter_dataframe_chunks
+        """
+        chunks = iter(self)
+        with self.storage.open_chunked_writer(identifier) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+            writer.metadata = {**self.metadata, **(metadata or {})}
+            return writer.close()
+
+    def _merge(self) -> Iterator[pd.DataFrame]:
+        """Partition both inputs, then merge and yield partition by partition"""
+        builder = QualityReportBuilder()
+        try:
+            shapes = {dataset: self._partition_input(dataset, builder) for dataset in ("customer", "purchase")}
+
+            self.merger.customer_account_col = self._account_cols["customer"]
+            self.merger.purchase_account_col = self._account_cols["purchase"]
+            merged_rows = 0
+            largest_partition = 0
+
+            for partition in range(self.num_partitions):
+                customer_part = self._load_partition("customer", partition)
+                purchase_part = self._load_partition("purchase", partition)
+                largest_partition = max(largest_partition, len(customer_part) + len(purchase_part))
+
+                indexer = self.merger._build_join_indexer(customer_part, purchase_part, self.strategy)
+                builder.add_keys(
+                    customer_part[self._account_cols["customer"]],
+                    purchase_part[self._account_cols["purchase"]],
+                    indexer.keys,
+                    indexer.customer_codes,
+                    indexer.purchase_codes,
+                )
+                merged = self.merger._take_merged(
+                    customer_part, purchase_part, indexer, indexer.keys.take(indexer.key_codes)
+                )
+                del customer_part, purchase_part, indexer
+                self._delete_partition(partition)
+
+                merged_rows += len(merged)
+                if len(merged):
+                    yield merged
+
+            self.quality_report = builder.build()
+            self.metadata = {
+                "merge_strategy": self.strategy.value,
+                "num_partitions": self.num_partitions,
+                "source_customer_shape": shapes["customer"],
+                "source_purchase_shape": shapes["purchase"],
+                "merged_rows": merged_rows,
+                "largest_partition_rows": largest_partition,
+                "quality_score": self.quality_report.quality_score,
+            }
+            logger.info(
+                f"Partitioned merge of {self.quality_report.matched_records} matched IDs completed: "
+                f"{merged_rows} rows from {self.num_partitions} partitions"
+            )
+        finally:
+            # Also reached when the consumer stops early (generator close) or on errors
+            for partition in range(self.num_partitions):
+                self._delete_partition(partition)
+
+    def _partition_input(self, dataset: str, builder: QualityReportBuilder) -> tuple:
+        """
+        Hash-partition one input into encrypted chunked datasets.
+
+        Rows with null Account IDs never join, so they are only counted.
+
+        Returns:
+            Shape of the input
+        """
+        source = self._sources[dataset]
+        chunks = [source] if isinstance(source, pd.DataFrame) else source
+        writers: Dict[int, ChunkedDataFrameWriter] = {}
+        rows = 0
+
+        try:
+            for chunk in chunks:
+                if dataset not in self._account_cols:
+                    account_col = self.merger._find_account_id_column(chunk)
+                    if account_col is None:
+                        raise ValueError(
+                            f"{dataset.capitalize()} data missing Account ID column "
+                            f"(tried: {', '.join(self.merger.account_id_variants)})"
+                        )
+                    self._account_cols[dataset] = account_col
+                    self._templates[dataset] = chunk.iloc[:0]
+
+                account_ids = chunk[self._account_cols[dataset]]
+                builder.add_records(dataset, account_ids)
+                rows += len(chunk)
+
+                partitions = partition_of(account_ids, self.num_partitions)
+                order = np.argsort(partitions, kind="stable")
+                bounds = np.searchsorted(partitions[order], np.arange(-1, self.num_partitions + 1))
+                for partition in range(self.num_partitions):
+                    start, end = bounds[partition + 1], bounds[partition + 2]
+                    if start == end:
+                        continue
+                    if partition not in writers:
+                        writers[partition] = self.storage.open_chunked_writer(
+                            f"merge_{self._run_id}_{dataset}_p{partition:03d}", {"partition": partition}
+                        )
+                    writers[partition].write(chunk.take(order[start:end]))
+
+            for partition, writer in writers.items():
+                self._partition_keys[dataset][partition] = writer.close()
+        except Exception:
+            for partition, writer in writers.items():
+                if partition not in self._partition_keys[dataset]:
+                    writer.abort()
+            raise
+
+        if dataset not in self._account_cols:
+            raise ValueError(f"No {dataset} data to merge")
+
+        logger.info(f"Partitioned {rows} {dataset} rows into {len(writers)} encrypted partitions")
+        return (rows, len(self._templates[dataset].columns))
+
+    def _load_partition(self, dataset: str, partition: int) -> pd.DataFrame:
+        """Decrypt one partition of an input (an empty frame if no rows hashed to it)"""
+        storage_key = self._partition_keys[dataset].get(partition)
+        if storage_key is None:
+            return self._templates[dataset]
+        df, _ = self.storage.retrieve_dataframe(storage_key)
+        return df
+
+    def _delete_partition(self, partition: int) -> None:
+        """Remove both inputs' datasets of a partition"""
+        for keys in self._partition_keys.values():
+            storage_key = keys.pop(partition, None)
+            if storage_key is not None:
+                self.storage.delete_stored_data(storage_key)
+
+
+def merge_out_of_core(
+    storage: EncryptedStorage,
+    customer_chunks: DataFrameChunks,
+    purchase_chunks: DataFrameChunks,
+    strategy: MergeStrategy = MergeStrategy.LEFT,
+    num_partitions: int = DEFAULT_PARTITIONS,
+) -> PartitionedMerge:
+    """
+    Convenience function for an out-of-core merge.
+
+    Args:
+        storage: Encrypted storage for the partitions
+        customer_chunks: Customer DataFrame chunks
+        purchase_chunks: Purchase DataFrame chunks
+        strategy: Merge strategy
+        num_partitions: Number of hash partitions per input
+
+    Returns:
+        PartitionedMerge to iterate for merged chunks
+    """
+    return PartitionedMerge(storage, customer_chunks, purchase_chunks, strategy, num_partitions)
+
+
+def merge_uploaded_datasets(
+    storage: EncryptedStorage,
+    customer_data_dict: Dict[str, Any],
+    purchase_data_dict: Dict[str, Any],
+    strategy: MergeStrategy = MergeStrategy.LEFT,
+    head_rows: int = MERGED_HEAD_ROWS,
+) -> MergeResult:
+    """
+    Merge uploaded datasets out of core when either was streamed into chunked storage.
+
+    Streamed datasets (``"streamed"`` in their session dict) are read back chunk
+    by chunk from their storage key; in-memory datasets are used as one chunk.
+    The full merge is written to encrypted storage and only its first
+    head_rows rows are kept in the result.
+
+    Args:
+        storage: Encrypted storage holding the streamed uploads
+        customer_data_dict: Customer data from session state (processed format)
+        purchase_data_dict: Purchase data from session state (processed format)
+        strategy: Merge strategy (inner, left, right, outer)
+        head_rows: Merged rows kept in memory as MergeResult.merged_data
+
+    Returns:
+        MergeResult with the merged head; metadata["merged_storage_key"] holds the full merge
+    """
+
+    def chunks(data: Dict[str, Any]) -> DataFrameChunks:
+        if data.get("streamed"):
+            return storage.iter_dataframe_chunks(data["storage_key"])
+        return data["original_data"]
+
+    merge = PartitionedMerge(storage, chunks(customer_data_dict), chunks(purchase_data_dict), strategy)
+    merged_key = merge.store(f"merged_{strategy.value}_{secrets.token_hex(4)}")
+
+    head_parts, kept = [], 0
+    for chunk in storage.iter_dataframe_chunks(merged_key):
+        if kept >= head_rows:
+            break
+        head_parts.append(chunk.head(head_rows - kept))
+        kept += len(head_parts[-1])
+    merged_head = pd.concat(head_parts, ignore_index=True) if head_parts else pd.DataFrame()
+
+    merged_rows = merge.metadata["merged_rows"]
+    return MergeResult(
+        success=True,
+        message=(
+            f"Successfully merged {merge.quality_report.matched_records} records using {strategy.value} join "
+            f"out of core ({merged_rows} rows stored, first {len(merged_head)} loaded for analysis)"
+        ),
+        merged_data=merged_head,
+        display_data=None,
+        metadata={
+            **merge.metadata,
+            "merged_shape": (merged_rows, len(merged_head.columns)),
+            "merged_storage_key": merged_key,
+            "streamed": True,
+        },
+        quality_report=merge.quality_report.__dict__,
+        errors=[],
+    )
+
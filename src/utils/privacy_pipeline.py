@@ -15,17 +15,20 @@ Data Flow:
 2. Processing: EncryptedStorage → SecurityPseudonymizer → External LLM
 3. Display: EncryptedStorage → IntegratedDisplayMasking → UI
 4. Analysis: Only pseudonymized data used (never original PII)
+
+Large CSVs can be streamed through the same steps chunk by chunk
+(process_upload_stream), keeping only a display head and column statistics in memory.
 """
 
 import pandas as pd
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
 # Import all privacy components
 from src.utils.security_pseudonymization import SecurityPseudonymizer
-from src.utils.enhanced_field_identification import EnhancedFieldIdentifier
+from src.utils.enhanced_field_identification import EnhancedFieldIdentifier, FieldType
 from src.utils.integrated_display_masking import IntegratedDisplayMasking
 from src.utils.encrypted_storage import EncryptedStorage
 
@@ -33,6 +36,10 @@ from src.utils.encrypted_storage import EncryptedStorage
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Streaming ingestion: rows per chunk and masked rows kept for display
+STREAM_CHUNK_ROWS = 50_000
+STREAM_DISPLAY_ROWS = 1_000
+
 
 @dataclass
 class PipelineResult:
@@ -144,16 +151,7 @@ class PrivacyPipeline:
             logger.info("Step 2: Identifying PII fields...")
             identification_start = datetime.now()
 
-            identification_results = {}
-            pii_fields = []
-
-            for column in df.columns:
-                # Convert pandas Series to list of strings for field identification
-                sample_values = df[column].dropna().head(10).astype(str).tolist()
-                result = self.field_identifier.identify_field(column, sample_values)
-                identification_results[column] = result
-                if result.is_sensitive:
-                    pii_fields.append(column)
+            identification_results, pii_fields = self._identify_pii_fields(df)
 
             identification_time = (datetime.now() - identification_start).total_seconds()
 
@@ -235,6 +233,238 @@ class PrivacyPipeline:
 
             return PipelineResult(success=False, message=error_msg, errors=errors)
 
+    def _identify_pii_fields(self, df: pd.DataFrame) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Identify PII fields from sample values of each column.
+
+        Args:
+            df: DataFrame (or first chunk) to identify
+
+        Returns:
+            Tuple of (identification results by column, sensitive column names)
+        """
+        identification_results = {}
+        pii_fields = []
+
+        for column in df.columns:
+            # Convert pandas Series to list of strings for field identification
+            sample_values = df[column].dropna().head(10).astype(str).tolist()
+            result = self.field_identifier.identify_field(column, sample_values)
+            identification_results[column] = result
+            if result.is_sensitive:
+                pii_fields.append(column)
+
+        return identification_results, pii_fields
+
+    def process_upload_stream(
+        self,
+        source: Any,
+        identifier: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_rows: int = STREAM_CHUNK_ROWS,
+        display_rows: int = STREAM_DISPLAY_ROWS,
+        encoding: Optional[str] = None,
+    ) -> PipelineResult:
+        """
+        Process a CSV through the privacy pipeline in chunks, for files too large for memory.
+
+        PII fields are identified once from the first chunk. Every chunk is then
+        encrypted into a chunked store of the original data, pseudonymized and
+        encrypted into a second chunked store for external processing. Only the
+        masked display head and aggregate column statistics are kept, so memory
+        use depends on chunk_rows rather than on the size of the file.
+
+        Args:
+            source: CSV path, buffer or file-like object accepted by pd.read_csv
+            identifier: Unique identifier for this dataset
+            metadata: Additional metadata to store
+            chunk_rows: Rows read, pseudonymized and encrypted at a time
+            display_rows: Rows of masked data returned for display
+            encoding: Encoding of the CSV (pandas default if None)
+
+        Returns:
+            PipelineResult with the storage key, masked display head and
+            aggregate statistics in metadata; pseudonymized data stays in
+            storage (see iter_stored_chunks)
+        """
+        start_time = datetime.now()
+        encryption_time = identification_time = pseudonymization_time = masking_time = 0.0
+        identification_results: Dict[str, Any] = {}
+        pii_fields: List[str] = []
+        sensitive_columns: List[str] = []
+        column_stats: Dict[str, Dict[str, Any]] = {}
+        display_parts: List[pd.DataFrame] = []
+        display_count = 0
+        pseudonymized_count = 0
+
+        storage_metadata = {
+            "identifier": identifier,
+            "uploaded_at": start_time.isoformat(),
+            "user_metadata": metadata or {},
+        }
+        original_writer = self.encrypted_storage.open_chunked_writer(identifier, storage_metadata)
+        pseudonymized_writer = self.encrypted_storage.open_chunked_writer(
+            f"{identifier}_pseudonymized", {**storage_metadata, "pseudonymized": True}
+        )
+
+        try:
+            logger.info(f"Streaming upload: {identifier} ({chunk_rows} rows per chunk)")
+
+            with original_writer, pseudonymized_writer, pd.read_csv(
+                source, chunksize=chunk_rows, encoding=encoding
+            ) as reader:
+                for chunk in reader:
+                    if not original_writer.chunks:
+                        # Identify PII once, from the first chunk
+                        identification_start = datetime.now()
+                        identification_results, pii_fields = self._identify_pii_fields(chunk)
+                        sensitive_columns = self.security_pseudonymizer._detect_sensitive_columns(chunk)
+                        identification_time = (datetime.now() - identification_start).total_seconds()
+                        logger.info(f"Identified {len(pii_fields)} PII fields: {pii_fields}")
+
+                    encryption_start = datetime.now()
+                    original_writer.write(chunk)
+                    encryption_time += (datetime.now() - encryption_start).total_seconds()
+
+                    pseudonymization_start = datetime.now()
+                    pseudonymized_chunk = self.security_pseudonymizer.anonymize_dataframe(chunk, sensitive_columns)
+                    pseudonymization_time += (datetime.now() - pseudonymization_start).total_seconds()
+
+                    encryption_start = datetime.now()
+                    pseudonymized_writer.write(pseudonymized_chunk)
+                    encryption_time += (datetime.now() - encryption_start).total_seconds()
+                    pseudonymized_count += chunk[[c for c in sensitive_columns if c in chunk]].notna().sum().sum()
+
+                    self._update_column_stats(column_stats, chunk)
+
+                    if display_count < display_rows:
+                        masking_start = datetime.now()
+                        head = chunk.head(display_rows - display_count)
+                        masking_result = self.display_masker.process_dataframe(head)
+                        display_parts.append(masking_result.get("dataframe", head))
+                        display_count += len(head)
+                        masking_time += (datetime.now() - masking_start).total_seconds()
+
+                storage_key = original_writer.close()
+                pseudonymized_key = pseudonymized_writer.close()
+
+            total_rows = original_writer.total_rows
+            columns = original_writer.columns or []
+            display_df = pd.concat(display_parts, ignore_index=True) if display_parts else pd.DataFrame()
+            total_time = (datetime.now() - start_time).total_seconds()
+
+            # Values display masking hides, counted from the statistics rather than by masking every chunk
+            masked_values = 0
+            if not self.display_masker.show_sensitive:
+                masked_values = sum(
+                    column_stats[column]["non_null"]
+                    for column in pii_fields
+                    if identification_results[column].field_type != FieldType.GENERAL
+                    and identification_results[column].confidence >= self.display_masker.confidence_threshold
+                )
+
+            stats = PipelineStats(
+                total_rows=total_rows,
+                total_columns=len(columns),
+                pii_fields_identified=len(pii_fields),
+                pii_fields_pseudonymized=len([col for col in pii_fields if col in sensitive_columns]),
+                pii_fields_masked=masked_values,
+                processing_time_seconds=total_time,
+                encryption_time_seconds=encryption_time,
+                identification_time_seconds=identification_time,
+                pseudonymization_time_seconds=pseudonymization_time,
+                masking_time_seconds=masking_time,
+            )
+
+            self.current_session[identifier] = {
+                "storage_key": storage_key,
+                "pseudonymized_storage_key": pseudonymized_key,
+                "identifier": identifier,
+                "pii_fields": pii_fields,
+                "identification_results": identification_results,
+                "stats": stats,
+                "processed_at": datetime.now().isoformat(),
+            }
+            self.processing_stats.append(stats)
+
+            result_metadata = {
+                "storage_key": storage_key,
+                "pseudonymized_storage_key": pseudonymized_key,
+                "chunks": len(original_writer.chunks),
+                "shape": (total_rows, len(columns)),
+                "columns": columns,
+                "display_rows": len(display_df),
+                "values_pseudonymized": int(pseudonymized_count),
+                "column_stats": self._finalize_column_stats(column_stats),
+                "pii_fields_identified": pii_fields,
+                "identification_results": {k: asdict(v) for k, v in identification_results.items()},
+                "processing_stats": asdict(stats),
+                "compliance": {
+                    "gdpr_compliant": True,
+                    "hong_kong_pdpo_compliant": True,
+                    "original_data_encrypted": True,
+                    "no_external_pii_transmission": True,
+                },
+            }
+
+            logger.info(f"Streaming pipeline completed: {total_rows} rows in {total_time:.3f} seconds")
+
+            return PipelineResult(
+                success=True,
+                message=f"Successfully processed {total_rows} rows with {len(pii_fields)} PII fields identified",
+                storage_key=storage_key,
+                display_data=display_df,
+                metadata=result_metadata,
+            )
+
+        except Exception as e:
+            error_msg = f"Pipeline processing failed: {str(e)}"
+            logger.error(error_msg)
+
+            return PipelineResult(success=False, message=error_msg, errors=[error_msg])
+
+    def _update_column_stats(self, column_stats: Dict[str, Dict[str, Any]], chunk: pd.DataFrame) -> None:
+        """Accumulate per-column counts and numeric ranges from one chunk."""
+        non_null = chunk.notna().sum()
+        numeric = chunk.select_dtypes("number")
+        for column in chunk.columns:
+            stats = column_stats.setdefault(column, {"non_null": 0, "rows": 0})
+            stats["non_null"] += int(non_null[column])
+            stats["rows"] += len(chunk)
+
+        for column in numeric.columns:
+            stats = column_stats[column]
+            values = numeric[column]
+            if values.notna().any():
+                stats["sum"] = stats.get("sum", 0.0) + float(values.sum())
+                stats["numeric_count"] = stats.get("numeric_count", 0) + int(values.notna().sum())
+                stats["min"] = min(stats.get("min", float("inf")), float(values.min()))
+                stats["max"] = max(stats.get("max", float("-inf")), float(values.max()))
+
+    def _finalize_column_stats(self, column_stats: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Turn accumulated column statistics into null counts, ranges and means."""
+        finalized = {}
+        for column, stats in column_stats.items():
+            summary = {"non_null": stats["non_null"], "null": stats["rows"] - stats["non_null"]}
+            if "numeric_count" in stats:
+                summary.update(
+                    min=stats["min"], max=stats["max"], mean=stats["sum"] / stats["numeric_count"]
+                )
+            finalized[column] = summary
+        return finalized
+
+    def iter_stored_chunks(self, storage_key: str) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over a dataset stored by process_upload_stream, one chunk at a time.
+
+        Args:
+            storage_key: Original or pseudonymized storage key
+
+        Yields:
+            Decrypted DataFrame chunks
+        """
+        return self.encrypted_storage.iter_dataframe_chunks(storage_key)
+
     def retrieve_for_display(
         self, storage_key: str, privacy_enabled: bool = True, confidence_threshold: float = 0.5
     ) -> PipelineResult:
@@ -511,6 +741,24 @@ def process_customer_data(
     return privacy_pipeline.process_upload(df, identifier, metadata)
 
 
+def process_customer_csv_stream(
+    source: Any, identifier: str, metadata: Optional[Dict[str, Any]] = None, chunk_rows: int = STREAM_CHUNK_ROWS
+) -> PipelineResult:
+    """
+    Convenience function to stream a large customer CSV through the privacy pipeline.
+
+    Args:
+        source: CSV path, buffer or file-like object
+        identifier: Unique identifier for dataset
+        metadata: Additional metadata
+        chunk_rows: Rows processed at a time
+
+    Returns:
+        PipelineResult with storage keys, display head and aggregate statistics
+    """
+    return privacy_pipeline.process_upload_stream(source, identifier, metadata, chunk_rows=chunk_rows)
+
+
 def get_display_data(storage_key: str, privacy_enabled: bool = True) -> PipelineResult:
     """
     Convenience function to get display data with privacy controls.
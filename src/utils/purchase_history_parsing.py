@@ -0,0 +1,243 @@
+"""
+Purchase History and Engagement Parsing
+Part of the Agentic AI Revenue Assistant
+
+Purchase CSVs encode history as wide text columns ("Purchase History 1" to
+"Purchase History 5", holding values like "Family Plan (2023-06-01)") and a
+free-text "Engagement Data" column ("App Usage:17 sessions; Campaign Response:2").
+This module parses them once, with vectorized string operations, into:
+- a long-format purchase events table (account ID, history slot, product, date)
+- numeric engagement columns, one per metric
+
+The history entries carry a product and a date but no price, so the events
+table gives purchase counts and recency, not spend. It is not a substitute for
+the ``amount`` records CustomerDataAnalyzer uses for spend variance and payment
+reliability.
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Wide history columns, optionally prefixed as in merged frames ("purchase_Purchase History 1")
+PURCHASE_HISTORY_COLUMN_PATTERN = re.compile(r"(?:^|_)Purchase History (\d+)$")
+ENGAGEMENT_COLUMN_PATTERN = re.compile(r"(?:^|_)Engagement Data$")
+
+# "Product name (YYYY-MM-DD)"
+PURCHASE_ENTRY_PATTERN = r"^\s*(?P<product>.*?\S)\s*\((?P<date>\d{4}-\d{2}-\d{2})\)\s*$"
+
+# "Metric name:17 sessions" items separated by semicolons
+ENGAGEMENT_ITEM_PATTERN = r"(?P<metric>[^:;]+?)\s*:\s*(?P<value>-?\d+(?:\.\d+)?)"
+
+# Prefix of the numeric engagement columns
+ENGAGEMENT_COLUMN_PREFIX = "engagement_"
+
+# Engagement metrics that correspond to CustomerDataAnalyzer engagement fields
+ENGAGEMENT_FEATURE_FIELDS = {
+    "campaign_response": "promotion_responses",
+    "customer_support_interaction": "service_interactions",
+}
+
+
+@dataclass
+class ParsedPurchaseData:
+    """Typed purchase events and engagement metrics parsed from a purchase frame"""
+
+    account_column: str
+    purchase_events: pd.DataFrame  # account_id, history_slot, product, purchase_date; one row per purchase
+    engagement: pd.DataFrame  # account_id plus one float column per metric; one row per source row
+    unparsed_purchase_entries: int
+    unparsed_engagement_entries: int
+
+    def purchase_counts(self, account_ids) -> np.ndarray:
+        """Number of parsed purchases of each given account"""
+        counts = self.purchase_events["account_id"].value_counts()
+        return counts.reindex(pd.Index(account_ids).astype(str), fill_value=0).to_numpy()
+
+    def last_purchase_dates(self, account_ids) -> np.ndarray:
+        """Most recent purchase date of each given account (NaT if none)"""
+        latest = self.purchase_events.groupby("account_id")["purchase_date"].max()
+        return latest.reindex(pd.Index(account_ids).astype(str)).to_numpy()
+
+    def engagement_features(self) -> pd.DataFrame:
+        """
+        Engagement metrics per account, named as CustomerDataAnalyzer engagement fields.
+
+        Metrics without a matching field are kept under their engagement_ names.
+        Accounts with several source rows have their metrics summed.
+
+        Returns:
+            DataFrame with one row per account and an account_id column
+        """
+        return engagement_features(self.engagement)
+
+
+def find_purchase_history_columns(df: pd.DataFrame) -> List[str]:
+    """Wide purchase history columns of a frame, in slot order"""
+    slots = {}
+    for column in df.columns:
+        match = PURCHASE_HISTORY_COLUMN_PATTERN.search(str(column))
+        if match:
+            slots[column] = int(match.group(1))
+    return sorted(slots, key=slots.get)
+
+
+def find_engagement_column(df: pd.DataFrame) -> Optional[str]:
+    """Engagement Data column of a frame, if any"""
+    return next((column for column in df.columns if ENGAGEMENT_COLUMN_PATTERN.search(str(column))), None)
+
+
+def has_encoded_purchase_columns(df: pd.DataFrame) -> bool:
+    """Whether a frame carries wide purchase history or engagement text columns"""
+    return bool(find_purchase_history_columns(df)) or find_engagement_column(df) is not None
+
+
+def metric_column_name(metric: str) -> str:
+    """Snake-case engagement column name of a metric label ("App Usage" -> "engagement_app_usage")"""
+    return ENGAGEMENT_COLUMN_PREFIX + re.sub(r"[^0-9a-z]+", "_", metric.strip().lower()).strip("_")
+
+
+def parse_purchase_events(df: pd.DataFrame, account_column: str) -> pd.DataFrame:
+    """
+    Melt the wide purchase history columns into one typed row per purchase.
+
+    Entries repeat heavily (a few products times a few hundred dates), so they
+    are factorized first and the pattern is only matched against distinct values.
+
+    Args:
+        df: Purchase frame with wide "Purchase History N" columns
+        account_column: Column holding the account ID
+
+    Returns:
+        DataFrame with account_id, history_slot, product and purchase_date columns,
+        ordered by source row then slot; entries that do not parse are dropped
+    """
+    history_columns = find_purchase_history_columns(df)
+    if not history_columns:
+        return pd.DataFrame({
+            "account_id": pd.Series(dtype=object),
+            "history_slot": pd.Series(dtype=np.int16),
+            "product": pd.Series(dtype="category"),
+            "purchase_date": pd.Series(dtype="datetime64[ns]"),
+        })
+
+    slots = np.array([int(PURCHASE_HISTORY_COLUMN_PATTERN.search(str(column)).group(1)) for column in history_columns])
+
+    # Row-major flattening keeps the source row then slot order without sorting
+    entries = df[history_columns].to_numpy(dtype=object).ravel()
+    rows = np.repeat(np.arange(len(df)), len(history_columns))
+    codes, uniques = pd.factorize(entries)
+
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(PURCHASE_ENTRY_PATTERN)
+    dates = pd.to_datetime(parts["date"], format="%Y-%m-%d", errors="coerce").to_numpy()
+    products = pd.Categorical(parts["product"])
+    valid_unique = ~np.isnat(dates) & parts["product"].notna().to_numpy()
+
+    accounts = df[account_column]
+    keep = (codes >= 0) & accounts.notna().to_numpy()[rows]
+    keep[keep] = valid_unique[codes[keep]]
+    codes, rows = codes[keep], rows[keep]
+
+    return pd.DataFrame({
+        "account_id": accounts.astype(str).to_numpy()[rows],
+        "history_slot": slots[np.flatnonzero(keep) % len(history_columns)].astype(np.int16),
+        "product": pd.Categorical.from_codes(products.codes[codes], products.categories),
+        "purchase_date": dates[codes],
+    })
+
+
+def parse_engagement(df: pd.DataFrame, account_column: str) -> pd.DataFrame:
+    """
+    Split the Engagement Data text into one numeric column per metric.
+
+    Only distinct engagement strings are parsed; rows then take their values by code.
+
+    Args:
+        df: Purchase frame with an "Engagement Data" column
+        account_column: Column holding the account ID
+
+    Returns:
+        DataFrame aligned with df's rows: account_id plus a float column per metric
+        (NaN where a row does not mention the metric); items repeated in a row are summed
+    """
+    accounts = df[account_column]
+    engagement = pd.DataFrame({"account_id": accounts.where(accounts.isna(), accounts.astype(str)).to_numpy()})
+    engagement_column = find_engagement_column(df)
+    if engagement_column is None:
+        return engagement
+
+    codes, uniques = pd.factorize(df[engagement_column])
+    items = pd.Series(uniques, dtype=object).astype(str).str.extractall(ENGAGEMENT_ITEM_PATTERN)
+    if items.empty:
+        return engagement
+
+    unique_index = items.index.get_level_values(0).to_numpy()
+    label_codes, labels = pd.factorize(items["metric"])
+    label_metric_codes, metric_labels = pd.factorize(pd.Index(labels).map(metric_column_name))
+    metric_codes = label_metric_codes[label_codes]
+    values = np.full((len(uniques), len(metric_labels)), np.nan)
+    values[unique_index, metric_codes] = 0.0
+    np.add.at(values, (unique_index, metric_codes), items["value"].astype(float).to_numpy())
+
+    # Rows without engagement text (code -1) get an all-NaN row
+    values = np.vstack([values, np.full((1, len(metric_labels)), np.nan)])
+    metrics = pd.DataFrame(values[codes], columns=list(metric_labels))
+    return pd.concat([engagement, metrics], axis=1)
+
+
+def engagement_features(engagement: pd.DataFrame) -> pd.DataFrame:
+    """
+    Engagement metrics per account, named as CustomerDataAnalyzer engagement fields.
+
+    Args:
+        engagement: Row-aligned engagement table (see parse_engagement)
+
+    Returns:
+        DataFrame with one row per account and an account_id column; metrics of
+        accounts with several source rows are summed
+    """
+    metrics = engagement.groupby("account_id", sort=False).sum(min_count=1)
+    renamed = {f"{ENGAGEMENT_COLUMN_PREFIX}{metric}": field for metric, field in ENGAGEMENT_FEATURE_FIELDS.items()}
+    return metrics.rename(columns=renamed).reset_index()
+
+
+def parse_purchase_data(df: pd.DataFrame, account_column: str) -> ParsedPurchaseData:
+    """
+    Parse the wide purchase history and engagement text columns of a purchase frame.
+
+    Args:
+        df: Purchase frame (original or merged)
+        account_column: Column holding the account ID
+
+    Returns:
+        ParsedPurchaseData with the purchase events and engagement tables
+    """
+    events = parse_purchase_events(df, account_column)
+    engagement = parse_engagement(df, account_column)
+
+    history_columns = find_purchase_history_columns(df)
+    has_account = df[account_column].notna()
+    purchase_entries = int(df.loc[has_account, history_columns].notna().sum().sum()) if history_columns else 0
+    engagement_column = find_engagement_column(df)
+    engagement_entries = int(df[engagement_column].notna().sum()) if engagement_column else 0
+    metric_columns = [column for column in engagement.columns if column != "account_id"]
+    parsed_engagement = int(engagement[metric_columns].notna().any(axis=1).sum()) if metric_columns else 0
+
+    result = ParsedPurchaseData(
+        account_column=account_column,
+        purchase_events=events,
+        engagement=engagement,
+        unparsed_purchase_entries=purchase_entries - len(events),
+        unparsed_engagement_entries=engagement_entries - parsed_engagement,
+    )
+    logger.info(
+        f"Parsed {len(events)} purchase events and {len(metric_columns)} engagement metrics from {len(df)} rows"
+    )
+    return result
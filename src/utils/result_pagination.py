@@ -0,0 +1,168 @@
+"""
+Paginated Results Views
+Part of the Agentic AI Revenue Assistant
+
+The results page rendered one Streamlit block per recommendation and one
+st.write line per processed customer, so a 1,000-customer analysis sent tens
+of thousands of websocket deltas to the browser. This module keeps the data
+side of the paginated views:
+- a flat recommendations table, built once per analysis, that filters and
+  sorts on the server
+- page arithmetic, so only the cards of the current page are rendered
+- a bounded processing log that replaces per-customer debug output and is
+  rendered a page at a time, on request
+
+The functions are pure pandas and hold no Streamlit state; results.py caches
+the table in the session and renders the pages.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Sort options of the recommendations view -> table column (all sorted descending)
+RECOMMENDATION_SORT_COLUMNS = {
+    "Business Impact": "business_impact_score",
+    "Expected Revenue": "expected_revenue",
+    "Conversion Probability": "conversion_probability",
+    "Urgency Score": "urgency_score",
+}
+
+# Cards per page offered by the recommendations view
+PAGE_SIZE_OPTIONS = (10, 25, 50, 100)
+DEFAULT_PAGE_SIZE = 25
+
+# Lines per page of the processing log view, and lines kept per analysis
+LOG_PAGE_LINES = 200
+MAX_LOG_LINES = 50_000
+
+ALL_OPTION = "All"
+
+
+def recommendations_frame(recommendations: Sequence[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Flat table of the fields the recommendations view filters, searches and sorts on.
+
+    Args:
+        recommendations: Recommendation dicts as formatted for display
+
+    Returns:
+        DataFrame with one row per recommendation, in list order; "position"
+        is the recommendation's index in the list
+    """
+    frame = pd.DataFrame({
+        "position": np.arange(len(recommendations)),
+        "priority": [rec.get("priority", "unknown") for rec in recommendations],
+        "action_type": [rec.get("action_type", "unknown") for rec in recommendations],
+        "customer_name": [str(rec.get("customer_name", "")) for rec in recommendations],
+        "customer_id": [str(rec.get("customer_id", "")) for rec in recommendations],
+        "title": [str(rec.get("title", "")) for rec in recommendations],
+    })
+    for column in RECOMMENDATION_SORT_COLUMNS.values():
+        frame[column] = pd.to_numeric(
+            pd.Series([rec.get(column, 0) for rec in recommendations], dtype=object), errors="coerce"
+        ).fillna(0.0)
+
+    frame["priority"] = frame["priority"].astype("category")
+    frame["action_type"] = frame["action_type"].astype("category")
+    frame["search_text"] = (frame["customer_name"].astype(str) + " " + frame["customer_id"].astype(str)).str.lower()
+    return frame
+
+
+def filter_options(frame: pd.DataFrame, column: str) -> List[str]:
+    """Choices of a filter select box: "All" and the column's values, sorted"""
+    return [ALL_OPTION] + sorted(str(value) for value in frame[column].dropna().unique())
+
+
+def select_recommendations(
+    frame: pd.DataFrame,
+    priority: str = ALL_OPTION,
+    action_type: str = ALL_OPTION,
+    sort_by: str = "Business Impact",
+    search: str = "",
+) -> np.ndarray:
+    """
+    Filter and sort the recommendations table.
+
+    Sorting is descending and stable, so ties keep their list order as with
+    list.sort(reverse=True).
+
+    Args:
+        frame: Table from recommendations_frame
+        priority: Priority to keep, or "All"
+        action_type: Action type to keep, or "All"
+        sort_by: Key of RECOMMENDATION_SORT_COLUMNS
+        search: Case-insensitive substring of the customer name or ID
+
+    Returns:
+        List positions of the selected recommendations, in display order
+    """
+    mask = np.ones(len(frame), dtype=bool)
+    if priority != ALL_OPTION:
+        mask &= (frame["priority"] == priority).to_numpy()
+    if action_type != ALL_OPTION:
+        mask &= (frame["action_type"] == action_type).to_numpy()
+    if search.strip():
+        mask &= frame["search_text"].str.contains(search.strip().lower(), regex=False).to_numpy()
+
+    selected = frame.loc[mask]
+    sort_column = RECOMMENDATION_SORT_COLUMNS.get(sort_by, "business_impact_score")
+    selected = selected.sort_values(sort_column, ascending=False, kind="stable")
+    return selected["position"].to_numpy()
+
+
+def page_bounds(total: int, page: int, page_size: int) -> Tuple[int, int, int]:
+    """
+    Slice of one page.
+
+    Args:
+        total: Number of items
+        page: 1-based page number; clamped to the available pages
+        page_size: Items per page
+
+    Returns:
+        Tuple of (start, end, page_count); page_count is at least 1
+    """
+    page_count = max(1, -(-total // page_size))
+    page = min(max(page, 1), page_count)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total), page_count
+
+
+@dataclass
+class ProcessingLog:
+    """
+    Per-analysis processing log, shown on request instead of streamed to the page.
+
+    Only the first MAX_LOG_LINES lines are kept; later lines are counted.
+    """
+
+    lines: List[Tuple[str, str]] = field(default_factory=list)  # (level, message)
+    dropped: int = 0
+    started_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def add(self, message: str, level: str = "info") -> None:
+        """Append a line ("info", "success", "warning" or "error")"""
+        if len(self.lines) < MAX_LOG_LINES:
+            self.lines.append((level, message))
+        else:
+            self.dropped += 1
+
+    def count(self, level: Optional[str] = None) -> int:
+        """Number of kept lines, optionally of one level"""
+        if level is None:
+            return len(self.lines)
+        return sum(1 for line_level, _ in self.lines if line_level == level)
+
+    def page_text(self, page: int, lines_per_page: int = LOG_PAGE_LINES, level: Optional[str] = None) -> str:
+        """One page of the log as a single text block"""
+        lines = self.lines if level is None else [line for line in self.lines if line[0] == level]
+        start, end, _ = page_bounds(len(lines), page, lines_per_page)
+        return "\n".join(message for _, message in lines[start:end])
@@ -0,0 +1,200 @@
+"""
+Streaming Export Engine
+Part of the Agentic AI Revenue Assistant
+
+Builds CSV and ZIP exports from generators instead of whole-document strings.
+CSV rows are formatted in batches, and ZIP members are compressed as their
+chunks arrive. The archive is written to a spooled temporary file that stays
+in memory for small exports and moves to disk once it grows past
+SPOOL_MAX_BYTES, so a 100k-customer package never holds its uncompressed
+contents in the Streamlit process.
+
+An export is handed out as an ExportFile: a read-only file handle that
+st.download_button accepts as data and that can be streamed elsewhere.
+
+CSV output follows DataFrame.to_csv(index=False): header from the first row's
+keys, minimal quoting, "\\n" line endings, and None/NaN written as empty fields.
+JSON output is the same text json.dumps produces.
+"""
+
+import csv
+import io
+import itertools
+import json
+import logging
+import math
+import tempfile
+import zipfile
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Archive bytes kept in memory before the spooled file moves to disk
+SPOOL_MAX_BYTES = 16 * 2**20
+
+# CSV rows formatted per chunk
+CSV_BATCH_ROWS = 1000
+
+# JSONEncoder.iterencode tokens joined per JSON chunk
+JSON_BATCH_TOKENS = 4096
+
+ZipEntry = Tuple[str, Iterable[str]]
+
+
+def _csv_value(value: Any) -> Any:
+    """Field value as DataFrame.to_csv writes it (missing floats become empty fields)"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]], columns: Optional[Sequence[str]] = None) -> Iterator[str]:
+    """
+    CSV text of dict rows, in chunks of CSV_BATCH_ROWS rows.
+
+    Args:
+        rows: Rows as dicts; consumed lazily
+        columns: Column order; defaults to the keys of the first row
+
+    Yields:
+        Header line, then batches of formatted rows (nothing for no rows and no columns)
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    rows = iter(rows)
+
+    if columns is None:
+        first = next(rows, None)
+        if first is None:
+            return
+        columns = list(first)
+        rows = _prepend(first, rows)
+
+    writer.writerow(columns)
+    batch = 0
+    for row in rows:
+        writer.writerow([_csv_value(row.get(column)) for column in columns])
+        batch += 1
+        if batch == CSV_BATCH_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            batch = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_json(obj: Any, **encoder_options) -> Iterator[str]:
+    """
+    JSON text of obj in chunks, identical to json.dumps(obj, **encoder_options).
+
+    JSONEncoder.iterencode yields single tokens; they are joined
+    JSON_BATCH_TOKENS at a time.
+    """
+    tokens = json.JSONEncoder(**encoder_options).iterencode(obj)
+    while batch := list(itertools.islice(tokens, JSON_BATCH_TOKENS)):
+        yield "".join(batch)
+
+
+def _prepend(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    """Iterator over first followed by rest"""
+    yield first
+    yield from rest
+
+
+class ExportFile(io.RawIOBase):
+    """
+    Read-only handle on a finished export held in a spooled temporary file.
+
+    Accepted by st.download_button as file-like data; close it (or use it as a
+    context manager) to release the temporary file.
+    """
+
+    def __init__(self, spool: tempfile.SpooledTemporaryFile):
+        super().__init__()
+        self._spool = spool
+        self.size = spool.seek(0, io.SEEK_END)
+        spool.seek(0)
+
+    @property
+    def on_disk(self) -> bool:
+        """Whether the export outgrew memory and was moved to a temporary file"""
+        return not isinstance(self._spool._file, io.BytesIO)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._spool.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._spool.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._spool.tell()
+
+    def close(self) -> None:
+        if not self.closed:
+            self._spool.close()
+        super().close()
+
+
+def write_zip(entries: Iterable[ZipEntry], fileobj, compression: int = zipfile.ZIP_DEFLATED) -> int:
+    """
+    Write ZIP members from streamed text.
+
+    Members given as a list or tuple of chunks are already in memory and are
+    written in one go. Other members are compressed while their chunks are
+    produced, one write per chunk, so generators should yield blocks of text
+    (as iter_csv and iter_json do) rather than single tokens.
+
+    Args:
+        entries: (member name, text chunks) pairs; text is UTF-8 encoded
+        fileobj: Seekable binary file to write the archive to
+        compression: zipfile compression method
+
+    Returns:
+        Number of members written
+    """
+    members = 0
+    with zipfile.ZipFile(fileobj, "w", compression) as archive:
+        for name, chunks in entries:
+            if isinstance(chunks, (list, tuple)):
+                archive.writestr(name, "".join(chunks))
+            else:
+                with archive.open(name, "w") as member:
+                    for chunk in chunks:
+                        member.write(chunk.encode("utf-8"))
+            members += 1
+    return members
+
+
+def spool_zip(entries: Iterable[ZipEntry], max_memory: int = SPOOL_MAX_BYTES) -> ExportFile:
+    """
+    Build a ZIP archive from streamed entries into a spooled temporary file.
+
+    Args:
+        entries: (member name, chunks) pairs, consumed lazily
+        max_memory: Archive size kept in memory before spilling to disk
+
+    Returns:
+        ExportFile positioned at the start of the archive
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    try:
+        members = write_zip(entries, spool)
+    except Exception:
+        spool.close()
+        raise
+    export = ExportFile(spool)
+    logger.info(
+        f"Spooled ZIP export with {members} files: {export.size / 2**20:.1f} MiB "
+        f"({'on disk' if export.on_disk else 'in memory'})"
+    )
+    return export
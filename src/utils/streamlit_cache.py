@@ -0,0 +1,183 @@
+"""
+Streamlit Rerun Cache - Fingerprinted Upload Processing and Analysis
+Part of the Agentic AI Revenue Assistant
+
+Every widget interaction reruns the whole Streamlit script. Without caching,
+each toggle or slider change re-validates uploaded files, re-runs the privacy
+pipeline and reloads the product catalog from disk. This module keeps those
+results across reruns, keyed on content fingerprints rather than object identity.
+
+Features:
+- Content fingerprints of uploaded files and DataFrames
+- Cached resources: OpenRouter clients
+- Cached data: product catalog (keyed on the catalog file), analysis summaries
+  (keyed on frame content, so a new upload never sees stale results)
+- Per-session memo of upload validation and privacy pipeline results
+
+Security considerations:
+- Results containing original PII are memoized in the session only, never in the
+  process-wide cache shared by all sessions
+- Fingerprints are one-way hashes; the resource cache stores only a hash of each
+  API key argument
+"""
+
+import functools
+import hashlib
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from .collaboration_cache import fingerprint
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Session state key holding the per-session memo
+SESSION_MEMO_KEY = "_rerun_memo"
+
+# Analysis results kept per cached function
+ANALYSIS_CACHE_ENTRIES = 16
+
+# Cached analysis functions, so each gets its own entries in the shared cache
+_analysis_function_count = 0
+
+
+def bytes_fingerprint(content: bytes) -> str:
+    """SHA-256 fingerprint of raw file content"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content fingerprint of a DataFrame.
+
+    Computed from the frame's values on every call (a vectorized row hash), so
+    frames modified in place get a new fingerprint.
+    """
+    return fingerprint(df)
+
+
+def upload_fingerprint(uploaded_file, *settings: Any) -> str:
+    """Fingerprint of an uploaded file's content and the settings it is processed with"""
+    content = uploaded_file.getvalue()
+    return fingerprint({"content": bytes_fingerprint(content), "name": uploaded_file.name, "settings": list(settings)})
+
+
+def session_memo(
+    namespace: str, key: str, compute: Callable[[], Any],
+    cacheable: Callable[[Any], bool] = lambda result: True,
+) -> Tuple[Any, bool]:
+    """
+    Return the session's memoized result for a key, computing it on a miss.
+
+    Only the latest key of each namespace is kept, so a new upload replaces the
+    previous result. Results stay in this session and may therefore hold PII.
+
+    Returns:
+        Tuple of (result, cache_hit)
+    """
+    memo = st.session_state.setdefault(SESSION_MEMO_KEY, {})
+    entry = memo.get(namespace)
+    if entry is not None and entry[0] == key:
+        return entry[1], True
+
+    result = compute()
+    if cacheable(result):
+        memo[namespace] = (key, result)
+    else:
+        memo.pop(namespace, None)
+    return result, False
+
+
+def clear_session_memo(namespace: Optional[str] = None) -> None:
+    """Drop the session memo of a namespace (all namespaces if None)"""
+    memo = st.session_state.get(SESSION_MEMO_KEY, {})
+    if namespace is None:
+        memo.clear()
+    else:
+        memo.pop(namespace, None)
+
+
+def cache_by_fingerprint(func: Callable[[pd.DataFrame], Any]) -> Callable[[pd.DataFrame], Any]:
+    """
+    Cache a DataFrame analysis with st.cache_data, keyed on the frame's content fingerprint.
+
+    The frame itself is not hashed by Streamlit. Entries are shared by all
+    sessions but keyed on content, so they never need invalidating; old ones
+    are evicted after ANALYSIS_CACHE_ENTRIES.
+    """
+    global _analysis_function_count
+    # Every wrapper shares one st.cache_data function, so entries are told apart by name
+    name = f"{func.__module__}.{func.__qualname__}#{_analysis_function_count}"
+    _analysis_function_count += 1
+
+    @st.cache_data(max_entries=ANALYSIS_CACHE_ENTRIES, show_spinner=False)
+    def cached(function_name: str, df_fingerprint: str, _df: pd.DataFrame) -> Any:
+        return func(_df)
+
+    @functools.wraps(func)
+    def wrapper(df: pd.DataFrame) -> Any:
+        return cached(name, frame_fingerprint(df), df)
+
+    wrapper.clear = cached.clear
+    return wrapper
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_openrouter_client(api_key: str, default_model: str, max_tokens: int, temperature: float):
+    """OpenRouter client for a configuration, reused across customers and reruns"""
+    from .openrouter_client import OpenRouterClient, OpenRouterConfig
+
+    config = OpenRouterConfig(
+        api_key=api_key, default_model=default_model, max_tokens=max_tokens, temperature=temperature
+    )
+    return OpenRouterClient(config)
+
+
+def _catalog_stamp() -> Tuple[str, int, int]:
+    """Path, modification time and size of the catalog file"""
+    from .product_catalog_db import catalog_db
+
+    try:
+        stat = catalog_db.db_path.stat()
+        return str(catalog_db.db_path), stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return str(catalog_db.db_path), 0, 0
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _load_product_catalog(stamp: Tuple[str, int, int]) -> pd.DataFrame:
+    """Load the catalog for a given file state"""
+    from .product_catalog_db import catalog_db
+
+    return catalog_db.load_catalog()
+
+
+def get_product_catalog() -> pd.DataFrame:
+    """
+    Current product catalog, reloaded from disk only when the catalog file changes.
+
+    Returns:
+        DataFrame containing all plans (a copy per call)
+    """
+    return _load_product_catalog(_catalog_stamp())
+
+
+def is_catalog_available() -> bool:
+    """Whether the cached product catalog has any plans"""
+    return not get_product_catalog().empty
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _catalog_stats(stamp: Tuple[str, int, int]) -> Dict[str, Any]:
+    """Catalog statistics for a given file state"""
+    from .product_catalog_db import catalog_db
+
+    return catalog_db.get_catalog_stats()
+
+
+def get_catalog_stats() -> Dict[str, Any]:
+    """Catalog statistics, recomputed only when the catalog file changes"""
+    return _catalog_stats(_catalog_stamp())
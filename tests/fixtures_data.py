@@ -0,0 +1,142 @@
+"""
+Synthetic test data shared by several test modules and the benchmarks
+
+Plain functions (no pytest dependency), so benchmarks can import them too.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerSegment, FeatureSet
+from src.agents.lead_scoring import LeadPriority, LeadScore
+
+
+def make_customer_datasets(count: int, seed: int = 11):
+    """Build per-customer dataset dicts in the batch_analyze_customers layout"""
+    rng = np.random.default_rng(seed)
+    locations = ["Central, Hong Kong Island", "Mong Kok, Kowloon", "Sha Tin, New Territories", "Macau"]
+    account_types = ["Premium", "VIP", "Business", "Family", "Standard"]
+    datasets = []
+    for i in range(count):
+        customer_data = {
+            "customer_id": f"CUST{i:05d}",
+            "age": int(rng.integers(18, 70)) if i % 7 else "Senior",
+            "location": str(rng.choice(locations)),
+            "account_type": str(rng.choice(account_types)),
+            "tenure_months": int(rng.integers(0, 48)),
+            "monthly_spend": float(rng.choice([150.0, 299.0, 300.0, 520.0, 650.0, 999.0, 1000.0, 1800.0])),
+            "data_usage_gb": float(rng.uniform(0, 80)),
+            "voice_minutes": float(rng.uniform(0, 900)),
+            "sms_count": int(rng.integers(0, 300)),
+            "roaming_usage": float(rng.choice([0.0, 2.5])),
+        }
+        purchase_history = [
+            {"amount": float(amount)}
+            for amount in rng.choice([-20.0, 0.0, 80.0, 120.5, 499.0], int(rng.integers(0, 14)))
+        ]
+        engagement_data = {
+            "app_usage_hours": float(rng.uniform(0, 30)),
+            "service_interactions": int(rng.integers(0, 15)),
+            "complaint_count": int(rng.integers(0, 5)),
+            "satisfaction_score": float(rng.choice([3.0, 5.0, 6.5, 7.0, 8.0, 9.5])),
+            "promotion_responses": int(rng.integers(0, 4)),
+            "promotion_offers": int(rng.integers(1, 6)),
+        } if i % 3 else {}
+        datasets.append({
+            "customer_data": customer_data,
+            "purchase_history": purchase_history,
+            "engagement_data": engagement_data,
+        })
+    return datasets
+
+
+def make_customer_records(rows: int, seed: int = 7) -> pd.DataFrame:
+    """Build a synthetic customer dataset with the lead intelligence field layout"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'customer_id': [f'CUST{i:06d}' for i in range(rows)],
+        'monthly_spend': rng.choice([30, 49.5, 80, 120, 150, 151, 210, 320], rows),
+        'data_usage_gb': rng.integers(0, 120, rows),
+        'tenure_months': rng.integers(0, 60, rows),
+        'active_services': rng.integers(1, 5, rows),
+        'account_type': rng.choice(['individual', 'business'], rows),
+        'roaming_usage': rng.choice([0, 0, 5], rows),
+        'service_growth_rate': rng.choice([0.0, 0.2, 0.5, 0.9], rows),
+        'competitor_usage': rng.choice([0.0, 0.3, 0.6], rows),
+        'support_tickets': rng.integers(0, 6, rows),
+        'payment_delays': rng.integers(0, 3, rows),
+        'plan_type': rng.choice(['4G', '5G'], rows),
+        'plan_data_limit': rng.choice([20, 100], rows),
+        'family_lines': rng.integers(0, 4, rows),
+        'family_plan': rng.choice([True, False], rows),
+        'business_features': rng.choice([True, False], rows),
+    })
+
+
+def make_customers(count: int, seed: int = 21):
+    """Random (features, lead score, segment, current products) combinations"""
+    rng = np.random.default_rng(seed)
+    spends = [0.0, 150.0, 199.99, 200.0, 299.5, 300.0, 400.0, 480.0, 500.0, 599.99, 600.0, 800.0, 999.0,
+              1000.0, 1500.0, 2500.0]
+    segments = list(CustomerSegment)
+    customers = []
+    for _ in range(count):
+        features = FeatureSet(
+            monthly_spend=float(rng.choice(spends)),
+            tenure_category=str(rng.choice(["new", "recent", "established", "loyal", "unknown"])),
+            data_usage_gb=float(rng.choice([0.0, 12.5, 20.0, 30.0, 40.0, 45.0, 60.0, 180.0])),
+            satisfaction_score=float(rng.choice([4.0, 6.0, 7.5, 8.0, 9.0])),
+            churn_risk_score=float(rng.choice([0.1, 0.5, 0.7, 0.8])),
+            upsell_propensity=float(rng.choice([0.2, 0.6, 0.8])),
+        )
+        lead_score = LeadScore(
+            overall_score=float(rng.choice([20.0, 40.0, 60.0, 80.0, 95.0])),
+            revenue_potential=float(rng.choice([30.0, 85.0])),
+            lead_priority=rng.choice(list(LeadPriority)),
+        )
+        current_products = ["THREE_SMART_VALUE"] if rng.random() < 0.2 else []
+        customers.append((features, lead_score, segments[int(rng.integers(len(segments)))], current_products))
+    return customers
+
+
+def make_merge_frames(n: int, seed: int = 11, duplicate_rate: float = 0.05, null_rate: float = 0.01):
+    """Customer and purchase frames with partial overlap, duplicate and null Account IDs"""
+    rng = np.random.default_rng(seed)
+    customer_ids = np.array([f"ACC{i:07d}" for i in rng.permutation(n)], dtype=object)
+    purchase_ids = np.array([f"ACC{i:07d}" for i in rng.integers(n // 4, n + n // 4, n)], dtype=object)
+    customer_ids[rng.random(n) < duplicate_rate] = customer_ids[0]
+    customer_ids[rng.random(n) < null_rate] = None
+    purchase_ids[rng.random(n) < null_rate] = None
+
+    customer_df = pd.DataFrame({
+        "Given Name": [f"Name {i}" for i in range(n)],
+        "Account ID": customer_ids,
+        "Email": [f"user{i}@example.com" for i in range(n)],
+        "Monthly Spend": rng.uniform(88, 688, n).round(2),
+        "Tenure": rng.integers(1, 120, n),
+        "Active": rng.random(n) < 0.8,
+    })
+    purchase_df = pd.DataFrame({
+        "Account ID": purchase_ids,
+        "Purchase Date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+        "Amount": rng.integers(50, 900, n),
+        "Plan Type": pd.Categorical(rng.choice(["5G Basic", "5G Premium", "Data Add-on"], n)),
+    })
+    return customer_df, purchase_df
+
+
+class FakeUpload(io.BytesIO):
+    """Minimal stand-in for a Streamlit UploadedFile"""
+
+    def __init__(self, content: bytes, name: str):
+        super().__init__(content)
+        self.name = name
+        self.size = len(content)
@@ -0,0 +1,135 @@
+"""
+Unit tests for background analysis jobs
+Tests that jobs run off the calling thread with their own session store,
+report progress and incremental results, record real timing, and can be
+cancelled or fail without affecting other jobs
+"""
+
+import threading
+import time
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import analysis_jobs
+from src.utils.analysis_jobs import AnalysisJobManager, JobStatus, current_job
+
+
+def wait_for(job, timeout: float = 5.0):
+    """Wait until a job has finished"""
+    deadline = time.time() + timeout
+    while not job.done:
+        assert time.time() < deadline, f"job still {job.status.value}"
+        time.sleep(0.01)
+    return job
+
+
+class TestAnalysisJobManager:
+    """Test cases for AnalysisJobManager"""
+
+    def setup_method(self):
+        """Set up a manager with two workers"""
+        self.manager = AnalysisJobManager(max_workers=2)
+
+    def teardown_method(self):
+        """Stop the workers"""
+        self.manager.shutdown()
+
+    def test_job_runs_in_background_with_progress(self):
+        """Progress and incremental results are visible while the job waits; the result arrives at the end"""
+        release = threading.Event()
+
+        def analysis(job, items):
+            job.set_stage("Scoring", total=len(items))
+            for item in items:
+                job.advance(item * 10)
+                if item == 2:
+                    release.wait(5)
+            return {"scores": job.partial_results_since(0), "thread": threading.current_thread().name}
+
+        job_id = self.manager.submit(analysis, [1, 2, 3])
+        job = self.manager.get(job_id)
+        while job.snapshot()["completed"] < 2:
+            time.sleep(0.01)
+
+        snapshot = job.snapshot()
+        assert snapshot["status"] == JobStatus.RUNNING
+        assert snapshot["stage"] == "Scoring" and snapshot["total"] == 3
+        assert job.partial_results_since(0) == [10, 20]
+
+        release.set()
+        wait_for(job)
+        assert job.status == JobStatus.COMPLETED
+        assert job.result["scores"] == [10, 20, 30]
+        assert job.result["thread"].startswith("analysis-job")
+
+    def test_real_timing_is_recorded(self):
+        """elapsed covers the run of the job, not a fixed figure"""
+        job = self.manager.get(self.manager.submit(lambda job: time.sleep(0.2) or job.elapsed))
+        wait_for(job)
+
+        assert 0.2 <= job.result <= job.elapsed
+        assert job.finished_at - job.started_at == pytest.approx(job.elapsed)
+
+    def test_session_data_and_current_job(self):
+        """The job reads its settings snapshot and writes to its own store, found via current_job()"""
+        def analysis(job):
+            store = current_job().session_data
+            store["ai_debug_logs"] = [f"analyzing {store['customers_to_analyze']}"]
+            return current_job() is job
+
+        job = self.manager.get(self.manager.submit(analysis, session_data={"customers_to_analyze": 7}))
+        wait_for(job)
+
+        assert job.result is True
+        assert job.session_data["ai_debug_logs"] == ["analyzing 7"]
+        assert current_job() is None
+
+    def test_cancel(self):
+        """A cancelled job stops at its next checkpoint and is reported as cancelled"""
+        started = threading.Event()
+
+        def analysis(job):
+            started.set()
+            while not job.cancel_requested:
+                time.sleep(0.01)
+            return "partial"
+
+        job_id = self.manager.submit(analysis)
+        started.wait(5)
+        assert self.manager.cancel(job_id)
+        job = wait_for(self.manager.get(job_id))
+
+        assert job.status == JobStatus.CANCELLED
+        assert not self.manager.cancel(job_id)
+
+    def test_failure_is_recorded(self):
+        """An exception fails the job with its message; the worker stays usable"""
+        def analysis(job):
+            raise ValueError("no customer data")
+
+        failed = wait_for(self.manager.get(self.manager.submit(analysis)))
+        succeeded = wait_for(self.manager.get(self.manager.submit(lambda job: "ok")))
+
+        assert failed.status == JobStatus.FAILED and failed.error == "no customer data"
+        assert succeeded.status == JobStatus.COMPLETED and succeeded.result == "ok"
+
+    def test_finished_jobs_are_discarded_and_pruned(self, monkeypatch):
+        """Collected jobs are forgotten and only the newest finished jobs are kept"""
+        monkeypatch.setattr(analysis_jobs, "MAX_FINISHED_JOBS", 2)
+        job_ids = [self.manager.submit(lambda job: None) for _ in range(3)]
+        for job_id in job_ids:
+            wait_for(self.manager.get(job_id))
+        self.manager.discard(job_ids[2])
+        latest = self.manager.submit(lambda job: None)
+
+        assert self.manager.get(job_ids[2]) is None
+        assert self.manager.get(job_ids[0]) is not None and self.manager.get(job_ids[1]) is not None
+        wait_for(self.manager.get(latest))
+        self.manager.submit(lambda job: None)
+        assert self.manager.get(job_ids[0]) is None
@@ -0,0 +1,115 @@
+"""
+Unit tests for batched delegation between the Lead Intelligence and Revenue Optimization agents
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.lead_intelligence_agent import LeadIntelligenceAgent
+from src.agents.revenue_optimization_agent import RevenueOptimizationAgent
+from tests.fixtures_data import make_customer_records
+
+
+@pytest.fixture(scope="module")
+def lead_analysis():
+    """Lead Intelligence analysis of a synthetic customer base"""
+    df = make_customer_records(3000)
+    return LeadIntelligenceAgent().analyze_customer_patterns({'records': df.to_dict('records')})
+
+
+class TestBatchDelegation:
+    """Test cases for the batched delegation protocol"""
+
+    def setup_method(self):
+        """Set up the revenue agent for each test"""
+        self.agent = RevenueOptimizationAgent()
+
+    def test_batch_groups_by_type_segment_and_tier(self, lead_analysis):
+        """Every delegated customer appears in exactly one group per request type"""
+        batch = lead_analysis['batch_delegation']
+        assert batch['type'] == 'batch_delegation'
+
+        keys = [(g['request_type'], g['segment'], g['risk_tier']) for g in batch['groups']]
+        assert len(keys) == len(set(keys))
+
+        retention_ids = [customer_id for g in batch['groups'] if g['request_type'] == 'retention_strategy'
+                         for customer_id in g['customer_ids']]
+        high_churn = lead_analysis['churn_analysis']
+        assert len(retention_ids) == len(set(retention_ids))
+        assert all(g['risk_tier'] in ('high_risk', 'critical_risk')
+                   for g in batch['groups'] if g['request_type'] == 'retention_strategy')
+        assert high_churn['urgent_interventions'] <= len(retention_ids)
+
+    def test_batch_response_fans_out_offers(self, lead_analysis):
+        """One round-trip returns a strategy per group and an offer per at-risk customer"""
+        batch = lead_analysis['batch_delegation']
+        response = self.agent.respond_to_delegation(batch)
+
+        assert response['status'] == 'completed'
+        assert response['response_type'] == 'batch_delegation'
+        assert len(response['groups']) == len(batch['groups'])
+        assert response['strategies_computed'] == len(batch['groups'])
+        assert [r['response_type'] for r in response['responses']] == [r['type'] for r in batch['requests']]
+
+        retention_groups = [g for g in batch['groups'] if g['request_type'] == 'retention_strategy']
+        assert len(response['retention_offers']) == sum(g['customer_count'] for g in retention_groups)
+        pricing = [g for g in response['groups'] if g['request_type'] == 'pricing_strategy']
+        assert all('discount_percentage' in g['strategy'] for g in pricing)
+
+    def test_batch_groups_carry_ids_and_aggregates(self, lead_analysis):
+        """Groups carry id lists and aggregates instead of per-customer records"""
+        batch = lead_analysis['batch_delegation']
+
+        for group in batch['groups']:
+            assert 'customers' not in group
+            assert group['customer_count'] == len(group['customer_ids'])
+            assert set(group['aggregates']) == {'total_monthly_spend', 'avg_churn_probability',
+                                                'avg_lead_score', 'avg_lifetime_value'}
+            if group['request_type'] == 'retention_strategy':
+                assert len(group['monthly_spend']) == len(group['churn_probability']) == group['customer_count']
+                assert min(group['churn_probability']) > 0.7
+            else:
+                assert 'monthly_spend' not in group
+
+    def test_retention_offer_design_computed_once_per_group(self, monkeypatch):
+        """Customers sharing segment and risk tier reuse one offer design"""
+        calls = []
+        original = self.agent._retention_offer_strategy
+        monkeypatch.setattr(self.agent, '_retention_offer_strategy',
+                            lambda segment, template: calls.append(segment) or original(segment, template))
+
+        customers = [
+            {"customer_id": f"C{i}", "churn_probability": 0.65 if i % 2 else 0.9,
+             "monthly_spend": 100 + i, "segment": "family_plan"}
+            for i in range(1000)
+        ]
+        offers = self.agent.create_retention_offers(customers)
+
+        assert len(offers) == 1000
+        assert len(calls) == 2
+
+    def test_retention_offers_match_per_customer_customization(self):
+        """Grouped offer creation produces the same offers as per-customer customization"""
+        customers = [
+            {"customer_id": f"C{i}", "churn_probability": p, "monthly_spend": spend, "segment": segment}
+            for i, (p, spend, segment) in enumerate([
+                (0.85, 250, "premium_individual"), (0.65, 120, "family_plan"),
+                (0.7, 90, "family_plan"), (0.5, 300, "business_sme"), (0.95, 40, "budget_conscious"),
+            ])
+        ]
+        offers = {offer.customer_id: offer for offer in self.agent.create_retention_offers(customers)}
+
+        for customer in customers:
+            risk_level = self.agent._categorize_retention_risk(customer["churn_probability"])
+            template = self.agent.retention_templates[risk_level]
+            expected = self.agent._customize_retention_offer(customer, template, risk_level)
+            offer = offers[customer["customer_id"]]
+            assert offer.offer_type == expected["offer_type"]
+            assert offer.discount_amount == expected["discount_amount"]
+            assert offer.additional_benefits == expected["benefits"]
+            assert offer.offer_duration == expected["duration"]
@@ -0,0 +1,95 @@
+"""
+Unit tests for bulk Three HK offer matching
+Tests that the customers x products computation selects the same offers as per-customer matching
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerSegment, FeatureMatrix, FeatureSet
+from src.agents.lead_scoring import LeadScore
+from src.agents.three_hk_business_rules import ThreeHKBusinessRulesEngine
+from tests.fixtures_data import make_customers
+
+
+def offer_summary(offers):
+    """Comparable view of a ranked offer list"""
+    return [
+        (o.product.product_id, o.eligibility_status, o.confidence_level, o.conditions, o.match_score,
+         o.presentation_priority, o.offer_type, o.recommended_price)
+        for o in offers
+    ]
+
+
+def to_bulk_inputs(customers):
+    """Split make_customers tuples into the bulk API's parallel inputs"""
+    features, lead_scores, segments, current_products = (list(column) for column in zip(*customers))
+    feature_matrix = FeatureMatrix.from_feature_sets([f"CUST{i:05d}" for i in range(len(features))], features)
+    return feature_matrix, lead_scores, segments, current_products
+
+
+class TestBulkOfferMatching:
+    """Test cases for ThreeHKBusinessRulesEngine.match_offers_bulk"""
+
+    def setup_method(self):
+        """Set up the business rules engine for each test"""
+        self.engine = ThreeHKBusinessRulesEngine()
+
+    def test_matches_per_customer_matching(self):
+        """Bulk matching returns the same ranked offers as match_offers_for_customer"""
+        customers = make_customers(1500)
+        bulk = self.engine.match_offers_bulk(*to_bulk_inputs(customers))
+
+        assert len(bulk) == len(customers)
+        for (features, lead_score, segment, current_products), offers in zip(customers, bulk):
+            expected = self.engine.match_offers_for_customer(features, lead_score, segment, current_products)
+            assert offer_summary(offers) == offer_summary(expected)
+
+    def test_small_blocks_and_top_n(self):
+        """Block size does not change the ranking; top_n widens the selection"""
+        feature_matrix, lead_scores, segments, current_products = to_bulk_inputs(make_customers(300, seed=3))
+        positions, scores = self.engine.rank_offers_bulk(feature_matrix, lead_scores, segments, current_products)
+        small_positions, small_scores = self.engine.rank_offers_bulk(
+            feature_matrix, lead_scores, segments, current_products, block_pairs=50
+        )
+        np.testing.assert_array_equal(positions, small_positions)
+        np.testing.assert_array_equal(scores, small_scores)
+
+        wide_positions, _ = self.engine.rank_offers_bulk(feature_matrix, lead_scores, segments, current_products, top_n=20)
+        assert wide_positions.shape == (300, 20)
+        np.testing.assert_array_equal(wide_positions[:, :3], positions)
+        assert (wide_positions[:, len(self.engine.product_catalog):] == -1).all()
+
+    def test_eligibility_mask_excludes_current_products(self):
+        """Subscribed products are masked out of the customers x products grid"""
+        features = FeatureSet(monthly_spend=500.0, tenure_category="loyal", data_usage_gb=40.0, satisfaction_score=8.0)
+        feature_matrix = FeatureMatrix.from_feature_sets(["A", "B"], [features, features])
+        lead_scores = [LeadScore(overall_score=85.0)] * 2
+        segments = [CustomerSegment.YOUNG_DIGITAL] * 2
+        position = next(
+            i for i, product in enumerate(self.engine.product_catalog) if product.product_id == "THREE_SMART_VALUE"
+        )
+
+        eligible, scores = self.engine.score_offers_bulk(
+            feature_matrix, lead_scores, segments, [[], ["THREE_SMART_VALUE"]]
+        )
+
+        assert eligible.shape == scores.shape == (2, len(self.engine.product_catalog))
+        assert eligible[0, position] and not eligible[1, position]
+        assert ((scores >= 0) & (scores <= 100)).all()
+
+    def test_unusable_spend_and_empty_input(self):
+        """Customers with missing spend get no offers; no customers gives no results"""
+        features = FeatureSet(monthly_spend=float("nan"), tenure_category="loyal", satisfaction_score=9.0)
+        feature_matrix = FeatureMatrix.from_feature_sets(["A"], [features])
+        assert self.engine.match_offers_bulk(feature_matrix, [LeadScore(overall_score=90.0)],
+                                             [CustomerSegment.PREMIUM_BUSINESS]) == [[]]
+
+        empty = FeatureMatrix.from_feature_sets([], [])
+        assert self.engine.match_offers_bulk(empty, [], []) == []
@@ -0,0 +1,197 @@
+"""
+Tests for the collaboration result cache
+
+Tests fingerprinting, per-agent-stage keys, per-session scopes, copy semantics
+and encrypted persistence of memoized multi-agent collaboration results.
+"""
+
+import pytest
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+from src.agents.agent_integration_orchestrator import AgentIntegrationService
+from src.utils.collaboration_cache import CollaborationResultCache, fingerprint, get_collaboration_cache
+from src.utils.session_manager import SecureSessionManager
+
+
+@pytest.fixture
+def lead_results():
+    """Sample lead intelligence results"""
+    return {
+        "customer_segments": {"premium": {"count": 45, "avg_arpu": 1250}},
+        "revenue_insights": {"total_customers": 45, "monthly_revenue": 56250},
+        "timestamp": "2025-07-24T10:00:00",
+    }
+
+
+class TestFingerprint:
+    """Test cases for input fingerprinting"""
+
+    def test_fingerprint_ignores_key_order_and_volatile_keys(self, lead_results):
+        """Reordered dicts and new timestamps produce the same fingerprint"""
+        reordered = dict(reversed(list(lead_results.items())))
+        reordered["timestamp"] = "2025-07-25T09:00:00"
+        assert fingerprint(lead_results) == fingerprint(reordered)
+
+    def test_fingerprint_detects_content_changes(self, lead_results):
+        """Changing a value changes the fingerprint"""
+        changed = {**lead_results, "revenue_insights": {"total_customers": 46, "monthly_revenue": 56250}}
+        assert fingerprint(lead_results) != fingerprint(changed)
+
+    def test_fingerprint_dataframes(self):
+        """DataFrames are fingerprinted by content"""
+        df = pd.DataFrame({"Account_ID": ["A1", "A2"], "Monthly_Fee": [100, 200]})
+        assert fingerprint({"frame": df}) == fingerprint({"frame": df.copy()})
+        changed = df.copy()
+        changed.loc[1, "Monthly_Fee"] = 250
+        assert fingerprint({"frame": df}) != fingerprint({"frame": changed})
+
+
+class TestCollaborationResultCache:
+    """Test cases for CollaborationResultCache"""
+
+    def test_get_or_compute_memoizes(self, lead_results):
+        """The second call is served from cache without recomputing"""
+        cache = CollaborationResultCache(persist=False)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"success": True, "mode": "standard"}
+
+        first, first_hit = cache.get_or_compute("sales_optimization", {"lead_results": lead_results}, compute)
+        second, second_hit = cache.get_or_compute("sales_optimization", {"lead_results": lead_results}, compute)
+
+        assert (first_hit, second_hit) == (False, True)
+        assert first == second
+        assert len(calls) == 1
+        assert cache.stats["hits"] == 1
+
+    def test_only_dependent_stages_rerun(self, lead_results):
+        """Each agent stage misses only when one of its own inputs changes"""
+        cache = CollaborationResultCache(persist=False)
+        inputs = {"lead_results": lead_results, "customer_data": {"customers": []}, "model_config": {"models": {"general": "a"}}}
+        for stage in ("sales_optimization", "crewai_analysis"):
+            cache.put(stage, inputs, {"stage": stage})
+
+        new_model = {**inputs, "model_config": {"models": {"general": "b"}}}
+        assert cache.get("sales_optimization", new_model) is not None
+        assert cache.get("crewai_analysis", new_model) is None
+
+        new_leads = {**inputs, "lead_results": {**lead_results, "revenue_insights": {}}}
+        assert cache.get("sales_optimization", new_leads) is None
+        assert cache.get("crewai_analysis", new_leads) is not None
+
+    def test_downstream_stage_keyed_on_upstream_output(self, lead_results):
+        """A stage reruns when the output of the stage before it changes"""
+        cache = CollaborationResultCache(persist=False)
+        inputs = {"lead_results": lead_results, "sales_optimization": {"priority_actions": [1]}}
+        cache.put("agent_protocol_tasks", inputs, [{"task_id": "t1"}])
+
+        assert cache.get("agent_protocol_tasks", inputs) == [{"task_id": "t1"}]
+        assert cache.get("agent_protocol_tasks", {**inputs, "sales_optimization": {"priority_actions": [2]}}) is None
+
+    def test_callers_get_copies(self, lead_results):
+        """Modifying a stored or returned result does not change the cached entry"""
+        cache = CollaborationResultCache(persist=False)
+        inputs = {"lead_results": lead_results}
+        result = {"success": True, "next_actions": [{"priority": 1}]}
+        cache.put("sales_optimization", inputs, result)
+
+        result["next_actions"].append({"priority": 2})
+        served = cache.get("sales_optimization", inputs)
+        served["next_actions"][0]["priority"] = 9
+        served["success"] = False
+
+        assert cache.get("sales_optimization", inputs) == {"success": True, "next_actions": [{"priority": 1}]}
+
+    def test_uncacheable_results_not_stored(self, lead_results):
+        """Failed results are recomputed on the next call"""
+        cache = CollaborationResultCache(persist=False)
+        failing = lambda: {"error": "agent unavailable"}
+        cache.get_or_compute("sales_optimization", {"lead_results": lead_results}, failing,
+                             cacheable=lambda result: not result.get("error"))
+        assert cache.get("sales_optimization", {"lead_results": lead_results}) is None
+
+    def test_lru_eviction(self, lead_results):
+        """The in-memory layer is bounded"""
+        cache = CollaborationResultCache(max_entries=2, persist=False)
+        for count in range(3):
+            cache.put("sales_optimization", {"lead_results": {"count": count}}, {"success": True, "count": count})
+        assert cache.get("sales_optimization", {"lead_results": {"count": 0}}) is None
+        assert cache.get("sales_optimization", {"lead_results": {"count": 2}})["count"] == 2
+
+    def test_invalidate_single_stage(self, lead_results):
+        """Invalidating one stage keeps the others"""
+        cache = CollaborationResultCache(persist=False)
+        inputs = {"lead_results": lead_results, "customer_data": None, "model_config": {}}
+        cache.put("sales_optimization", inputs, {"success": True})
+        cache.put("crewai_analysis", inputs, "analysis")
+
+        assert cache.invalidate(["sales_optimization"]) == 1
+        assert cache.get("sales_optimization", inputs) is None
+        assert cache.get("crewai_analysis", inputs) == "analysis"
+
+    def test_invalidation_stays_in_scope(self, lead_results):
+        """Each session has its own cache; clearing one leaves the others"""
+        first = get_collaboration_cache("test_scope_a", persist=False)
+        second = get_collaboration_cache("test_scope_b", persist=False)
+        inputs = {"lead_results": lead_results}
+        first.put("sales_optimization", inputs, {"session": "a"})
+        second.put("sales_optimization", inputs, {"session": "b"})
+
+        assert get_collaboration_cache("test_scope_a") is first
+        first.invalidate()
+        assert first.get("sales_optimization", inputs) is None
+        assert second.get("sales_optimization", inputs) == {"session": "b"}
+
+    def test_encrypted_persistence(self, lead_results):
+        """Evicted entries are reloaded from the encrypted session store"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = SecureSessionManager(base_storage_dir=Path(temp_dir))
+            try:
+                cache = CollaborationResultCache(max_entries=1, session_manager=manager)
+                inputs = {"lead_results": lead_results}
+                cache.put("sales_optimization", inputs, {"success": True, "mode": "standard"})
+                cache.put("sales_optimization", {"lead_results": {"other": 1}}, {"success": True, "mode": "other"})
+
+                restored = cache.get("sales_optimization", inputs)
+                assert restored == {"success": True, "mode": "standard"}
+                assert cache.stats["persisted_hits"] == 1
+
+                stored_files = list(Path(temp_dir).rglob("*.encrypted.json"))
+                assert len(stored_files) == 2
+                assert all(b'"mode"' not in path.read_bytes() for path in stored_files)
+            finally:
+                manager.shutdown()
+
+
+class TestIntegrationServiceStages:
+    """Test cases for the memoized agent stages of the standard workflow"""
+
+    def test_agent_stages_run_once_per_input(self, lead_results, monkeypatch):
+        """Repeat runs reuse the Sales Optimization output and the Agent Protocol handoffs"""
+        lead_results = {**lead_results, "lead_scores": {"high": 10}}
+        service = AgentIntegrationService(CollaborationResultCache(persist=False))
+        calls = {"sales": 0, "tasks": 0}
+
+        def optimize(results):
+            calls["sales"] += 1
+            return {"priority_actions": [{"action": "upsell"}], "sales_optimizations": []}
+
+        def create_tasks(results, sales_results):
+            calls["tasks"] += 1
+            return [{"task_id": f"task_{calls['tasks']}"}]
+
+        monkeypatch.setattr(service.sales_agent, "process_lead_intelligence_results", optimize)
+        monkeypatch.setattr(service, "_create_agent_protocol_tasks", create_tasks)
+
+        first = service.process_lead_intelligence_completion(lead_results)
+        second = service.process_lead_intelligence_completion(lead_results)
+        assert calls == {"sales": 1, "tasks": 1}
+        assert second["collaboration_results"] == first["collaboration_results"]
+        assert second["workflow_steps"][2]["task_ids"] == ["task_1"]
+
+        service.process_lead_intelligence_completion({**lead_results, "lead_scores": {"high": 11}})
+        assert calls == {"sales": 2, "tasks": 2}
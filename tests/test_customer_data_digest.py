@@ -0,0 +1,128 @@
+"""
+Unit tests for context-budget-aware customer data digests
+Tests that CrewAI prompt digests stay under the token ceiling at any dataset size
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.customer_data_digest import (
+    AGENT_DIGEST_BUDGETS,
+    CustomerDataDigester,
+    count_tokens,
+    customer_data_to_frame,
+    truncate_to_tokens,
+)
+
+
+def make_customer_frame(rows: int) -> pd.DataFrame:
+    """Build a synthetic customer dataset with the upload column layout"""
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        'Account_ID': [f'ACC{i:06d}' for i in range(rows)],
+        'Given_Name': rng.choice(['Michelle', 'David', 'Susan', 'Kelvin'], rows),
+        'Email': [f'customer{i}@example.com' for i in range(rows)],
+        'Customer_Type': rng.choice(['Individual', 'Business', 'Corporate'], rows),
+        'Customer_Class': rng.choice(['Premium', 'Standard', 'SME', 'Enterprise'], rows),
+        'Plan_ID': rng.choice(['5G_UNLIMITED_PRO', 'MOBILE_5G_BASIC', 'FIBER_1000_BIZ'], rows),
+        'Monthly_Fee': rng.integers(100, 3000, rows),
+        'Contract_Duration': rng.choice([12, 24], rows),
+        'Churn_Risk': rng.choice(['Low', 'Medium', 'High'], rows),
+    })
+
+
+class TestCustomerDataDigester:
+    """Test the CustomerDataDigester class functionality"""
+
+    def setup_method(self):
+        """Set up the digester for each test"""
+        self.digester = CustomerDataDigester(token_ceiling=3000)
+
+    def test_digests_built_for_every_agent(self):
+        """Every configured agent role gets its own digest"""
+        digests = self.digester.build_agent_digests(make_customer_frame(200))
+        assert set(digests) == set(AGENT_DIGEST_BUDGETS)
+        for role, digest in digests.items():
+            assert digest.total_customers == 200
+            assert digest.token_count <= digest.token_budget
+
+    def test_large_dataset_stays_under_budget(self):
+        """A 50k-customer upload produces digests bounded by each agent's budget"""
+        df = make_customer_frame(50000)
+        small = self.digester.build_agent_digests(df.head(500))
+        large = self.digester.build_agent_digests(df)
+
+        for role, digest in large.items():
+            assert digest.token_count <= digest.token_budget
+            # Prompt size does not grow with the dataset
+            assert abs(digest.token_count - small[role].token_count) < 50
+        assert "50,000" in large["customer_intelligence"].text
+
+    def test_ceiling_clamps_agent_budgets(self):
+        """The configured ceiling overrides larger per-agent budgets"""
+        digester = CustomerDataDigester(token_ceiling=120)
+        digests = digester.build_agent_digests(make_customer_frame(1000))
+
+        for digest in digests.values():
+            assert digest.token_budget <= 120
+            assert digest.token_count <= 120
+        assert digests["customer_intelligence"].truncated
+
+    def test_sensitive_columns_excluded(self):
+        """Names and emails never appear in a digest"""
+        df = make_customer_frame(100)
+        digests = self.digester.build_agent_digests(df)
+
+        for digest in digests.values():
+            assert "@example.com" not in digest.text
+            assert "Given_Name" not in digest.text
+
+    def test_top_leads_ranked_by_value(self):
+        """Top leads list the highest-value customers first"""
+        df = make_customer_frame(1000)
+        digest = self.digester.digest_for_agent(df, "revenue_optimization")
+        best_account = df.loc[df['Monthly_Fee'].idxmax(), 'Account_ID']
+
+        assert "top_leads" in digest.sections
+        assert f"#1 | {best_account}" in digest.text
+
+    def test_retention_digest_focuses_on_churn(self):
+        """The retention digest lists high-risk customers"""
+        digest = self.digester.digest_for_agent(make_customer_frame(1000), "retention_strategy")
+        assert digest.sections[:2] == ["overview", "churn_risk"]
+        assert "high-risk customers" in digest.text
+
+    def test_empty_data(self):
+        """Empty inputs produce a minimal digest instead of failing"""
+        digest = self.digester.digest_for_agent({}, "customer_intelligence")
+        assert digest.total_customers == 0
+        assert digest.text == "No customer-level records available"
+
+
+class TestDigestHelpers:
+    """Test token helpers and input normalization"""
+
+    def test_customer_data_to_frame_formats(self):
+        """Dashboard dicts, record lists and DataFrames are all accepted"""
+        df = make_customer_frame(20)
+        records = df.head(5).to_dict('records')
+
+        assert len(customer_data_to_frame(df)) == 20
+        assert len(customer_data_to_frame(records)) == 5
+        assert len(customer_data_to_frame({'customers': records})) == 5
+        # The full frame wins over the limited record list
+        assert len(customer_data_to_frame({'customers': records, 'customer_frame': df})) == 20
+
+    def test_truncate_to_tokens(self):
+        """Truncated text fits the requested token budget"""
+        text = "Revenue optimization insight. " * 500
+        truncated = truncate_to_tokens(text, 100)
+        assert count_tokens(truncated) <= 101
+        assert truncate_to_tokens("short", 100) == "short"
@@ -0,0 +1,100 @@
+"""
+Unit tests for columnar customer feature extraction
+Tests that CustomerDataAnalyzer.extract_feature_matrix matches the per-customer FeatureSet path
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from dataclasses import fields
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerDataAnalyzer, FeatureMatrix, FeatureSet, NUMERICAL_FEATURE_FIELDS
+from tests.fixtures_data import make_customer_datasets
+
+
+def assert_feature_sets_match(actual: FeatureSet, expected: FeatureSet):
+    """Compare FeatureSets field by field with float tolerance"""
+    for field in fields(FeatureSet):
+        actual_value = getattr(actual, field.name)
+        expected_value = getattr(expected, field.name)
+        if field.type is float:
+            assert actual_value == pytest.approx(expected_value, rel=1e-9, abs=1e-9), field.name
+        else:
+            assert actual_value == expected_value, field.name
+
+
+class TestFeatureMatrix:
+    """Columnar feature extraction must match extract_customer_features"""
+
+    def setup_method(self):
+        """Set up the analyzer for each test"""
+        self.analyzer = CustomerDataAnalyzer(enable_ml_clustering=False)
+
+    def test_parity_with_scalar_extraction(self):
+        """Every FeatureSet view equals the per-customer extraction"""
+        datasets = make_customer_datasets(400)
+        customers, purchases = self.analyzer._datasets_to_frames(datasets)
+        matrix = self.analyzer.extract_feature_matrix(customers, purchases, customer_key="_dataset_index")
+
+        assert isinstance(matrix, FeatureMatrix)
+        assert len(matrix) == len(datasets)
+        for index, data in enumerate(datasets):
+            expected = self.analyzer.extract_customer_features(
+                data["customer_data"], data["purchase_history"], data["engagement_data"]
+            )
+            assert_feature_sets_match(matrix.feature_set(index), expected)
+
+    def test_absent_columns_use_scalar_defaults(self):
+        """Columns missing from the frame behave like missing dict keys"""
+        customers = pd.DataFrame({"customer_id": ["A", "B"], "monthly_spend": [120.0, 1500.0]})
+        matrix = self.analyzer.extract_feature_matrix(customers)
+
+        for index, row in enumerate(customers.to_dict("records")):
+            expected = self.analyzer.extract_customer_features(row, [], {})
+            assert_feature_sets_match(matrix.feature_set(index), expected)
+
+    def test_merged_customer_purchase_frame(self):
+        """A merged frame with one row per purchase gives the same features as separate frames"""
+        datasets = make_customer_datasets(50)
+        customers = pd.DataFrame([d["customer_data"] for d in datasets])
+        purchases = pd.DataFrame(
+            [{"customer_id": d["customer_data"]["customer_id"], "amount": p["amount"]}
+             for d in datasets for p in d["purchase_history"]]
+        )
+        merged = customers.merge(purchases, on="customer_id", how="left")
+
+        separate = self.analyzer.extract_feature_matrix(customers, purchases)
+        combined = self.analyzer.extract_feature_matrix(merged)
+
+        assert list(combined.customer_ids) == list(separate.customer_ids)
+        pd.testing.assert_frame_equal(combined.to_frame(), separate.to_frame())
+
+    def test_numerical_matrix_matches_numerical_features(self):
+        """The ML matrix has the columns and order of get_numerical_features"""
+        datasets = make_customer_datasets(20)
+        customers, purchases = self.analyzer._datasets_to_frames(datasets)
+        matrix = self.analyzer.extract_feature_matrix(customers, purchases, customer_key="_dataset_index")
+        numerical = matrix.numerical_matrix()
+
+        expected = self.analyzer.extract_customer_features(
+            datasets[4]["customer_data"], datasets[4]["purchase_history"], datasets[4]["engagement_data"]
+        ).get_numerical_features()
+        assert tuple(expected) == NUMERICAL_FEATURE_FIELDS
+        assert numerical.shape == (20, len(NUMERICAL_FEATURE_FIELDS))
+        np.testing.assert_allclose(numerical[4], list(expected.values()))
+
+    def test_cluster_customers_uses_feature_matrix(self):
+        """Clustering runs on the columnar features"""
+        analyzer = CustomerDataAnalyzer(enable_ml_clustering=True)
+        if not analyzer.enable_ml:
+            pytest.skip("scikit-learn not available")
+        result = analyzer.cluster_customers(make_customer_datasets(30))
+
+        assert "error" not in result
+        assert sum(cluster["size"] for cluster in result["clusters"].values()) == 30
@@ -0,0 +1,128 @@
+"""
+Unit tests for precompiled email templates and batch rendering
+Tests that precompiled templates render the same documents as the original
+layouts, that branded batches equal format_three_hk_branding of each email,
+and that generate_batch keeps customer order across a process pool
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.email_templates import CompiledTemplate, EmailTemplateGenerator, HTML_SLOTS
+
+
+def make_campaign(customers: int):
+    """Customers with recommendations, offers and CrewAI deliverables for a campaign"""
+    customer_rows, recommendations, offers = [], [], []
+    for i in range(customers):
+        customer_rows.append({
+            "customer_id": f"CUST{i:05d}",
+            "customer_name": f"Customer {i} <Kowloon>",
+            "usage_pattern": ["Heavy data user", "Roaming traveller", "Standard"][i % 3],
+            "monthly_spend": 188 + i,
+        })
+        recommendations.append({"recommended_plan": "5G Unlimited", "priority": "High"})
+        offers.append([
+            {"title": f"5G Upgrade {i}", "description": "Save $50 every month, call 1234 5678", "savings": f"${i % 90 + 10}"},
+            {"title": "Roaming Pack", "description": "Asia roaming for $38"},
+        ][:i % 3])
+    deliverables = {
+        "campaign_manager": {"subject_lines": ["Your 5G upgrade is ready"]},
+        "customer_profile": {"usage_analysis": "Streams video daily and travels often"},
+    }
+    return customer_rows, recommendations, offers, deliverables
+
+
+class TestCompiledTemplate:
+    """Test cases for CompiledTemplate"""
+
+    def test_fragments_and_slots(self):
+        """The layout is split once into static fragments around its slots"""
+        template = CompiledTemplate(lambda a, b: f"<p>{a}</p><b>{b}</b>", ("a", "b"))
+
+        assert template.fragments == ("<p>", "</p><b>", "</b>")
+        assert template.slots == ("a", "b")
+        assert template.render({"a": "x", "b": "{y}"}) == "<p>x</p><b>{y}</b>"
+
+
+class TestPrecompiledTemplates:
+    """Test cases for precompiled single-email rendering"""
+
+    def setup_method(self):
+        """Set up a small campaign and both generator modes"""
+        self.customers, self.recommendations, self.offers, self.deliverables = make_campaign(6)
+        self.precompiled = EmailTemplateGenerator()
+        self.legacy = EmailTemplateGenerator(precompiled=False)
+
+    def test_same_documents_as_layouts(self):
+        """Precompiled HTML and text emails equal the layouts rendered per call"""
+        for customer, recommendation, offers in zip(self.customers, self.recommendations, self.offers):
+            for deliverables in (self.deliverables, None):
+                args = (customer, recommendation, offers, deliverables)
+                assert self.precompiled.generate_html_email_template(*args) == self.legacy.generate_html_email_template(*args)
+                assert self.precompiled.generate_plain_text_email_template(*args) == self.legacy.generate_plain_text_email_template(*args)
+
+    def test_layout_compiled_once(self):
+        """Compiled layouts are cached per format and branding"""
+        html = self.precompiled.compiled_template("html")
+
+        assert self.precompiled.compiled_template("html") is html
+        assert self.precompiled.compiled_template("html", branded=True) is not html
+        assert html.slots == HTML_SLOTS
+        assert "Three HK" in "".join(html.fragments)
+
+
+class TestGenerateBatch:
+    """Test cases for generate_batch"""
+
+    def setup_method(self):
+        """Set up a campaign and a generator"""
+        self.customers, self.recommendations, self.offers, self.deliverables = make_campaign(12)
+        self.generator = EmailTemplateGenerator()
+
+    def test_results_match_single_emails(self):
+        """Each result holds the customer's templates and subject lines in input order"""
+        results = self.generator.generate_batch(
+            self.customers, self.recommendations, self.offers, self.deliverables, include_subjects=True
+        )
+
+        assert [r["customer_id"] for r in results] == [c["customer_id"] for c in self.customers]
+        for result, customer, recommendation, offers in zip(results, self.customers, self.recommendations, self.offers):
+            args = (customer, recommendation, offers, self.deliverables)
+            assert result["templates"]["html"] == self.generator.generate_html_email_template(*args)
+            assert result["templates"]["text"] == self.generator.generate_plain_text_email_template(*args)
+            primary_offer = offers[0] if offers else {}
+            assert result["subject_lines"] == self.generator.create_subject_lines(customer, primary_offer, self.deliverables)
+
+    def test_branded_batch(self):
+        """Branded templates equal format_three_hk_branding of the unbranded email"""
+        results = self.generator.generate_batch(
+            self.customers, self.recommendations, self.offers, self.deliverables, branded=True
+        )
+
+        for result, customer, recommendation, offers in zip(results, self.customers, self.recommendations, self.offers):
+            args = (customer, recommendation, offers, self.deliverables)
+            html = self.generator.generate_html_email_template(*args)
+            assert result["templates"]["html"] == self.generator.format_three_hk_branding(html)
+            text = self.generator.generate_plain_text_email_template(*args)
+            assert result["templates"]["text"] == self.generator.format_three_hk_branding(text)
+
+    def test_defaults(self):
+        """Missing ids get CUST_ numbers; only requested formats are rendered; no subjects by default"""
+        results = self.generator.generate_batch([{"monthly_spend": 100}, {}], formats=["text"])
+
+        assert [r["customer_id"] for r in results] == ["CUST_001", "CUST_002"]
+        assert all(list(r["templates"]) == ["text"] and "subject_lines" not in r for r in results)
+        assert self.generator.generate_batch([]) == []
+
+    def test_process_pool_matches_serial(self):
+        """Sharding the batch across worker processes gives the same results"""
+        args = (self.customers, self.recommendations, self.offers, self.deliverables)
+        serial = self.generator.generate_batch(*args, include_subjects=True, branded=True)
+        pooled = self.generator.generate_batch(*args, include_subjects=True, branded=True, workers=2, chunk_size=5)
+
+        assert pooled == serial
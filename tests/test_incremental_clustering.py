@@ -0,0 +1,164 @@
+"""
+Unit tests for incremental cluster assignment
+Tests the persisted clustering artefact, assign_clusters and drift-triggered refits
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents import customer_analysis
+from src.agents.customer_analysis import CustomerDataAnalyzer
+from tests.fixtures_data import make_customer_datasets
+
+
+def to_frames(analyzer, datasets, id_prefix="CUST"):
+    """Customer and purchase frames keyed by customer_id"""
+    customers, purchases = analyzer._datasets_to_frames(datasets)
+    customers["customer_id"] = [f"{id_prefix}{i:05d}" for i in range(len(customers))]
+    purchases["customer_id"] = customers["customer_id"].to_numpy()[purchases["_dataset_index"].to_numpy()]
+    return customers.drop(columns="_dataset_index"), purchases.drop(columns="_dataset_index")
+
+
+class TestIncrementalClustering:
+    """Test cases for CustomerDataAnalyzer.assign_clusters"""
+
+    def setup_method(self):
+        """Fit an artefact on a base population for each test"""
+        self.analyzer = CustomerDataAnalyzer(enable_ml_clustering=True)
+        if not self.analyzer.enable_ml:
+            pytest.skip("scikit-learn not available")
+        self.result = self.analyzer.cluster_customers(make_customer_datasets(400))
+
+    def test_artefact_contents(self):
+        """The artefact carries centroids, descriptions, fingerprint and a bounded reservoir"""
+        clustering = self.analyzer.fitted_clustering
+
+        assert set(clustering.centroids) == set(clustering.cluster_descriptions) == set(range(clustering.n_clusters))
+        assert len(clustering.training_fingerprint) == 64
+        assert clustering.training_size == clustering.rows_seen == 400
+        assert clustering.reservoir.shape == (400, len(customer_analysis.NUMERICAL_FEATURE_FIELDS))
+        assert np.isclose(clustering.cluster_proportions.sum(), 1.0)
+
+    def test_delta_assigned_without_refit(self, monkeypatch):
+        """Customers from the same population are assigned by predict only"""
+        monkeypatch.setattr(self.analyzer, "_find_optimal_clusters", lambda *args: pytest.fail("refitted"))
+        customers, purchases = to_frames(self.analyzer, make_customer_datasets(600, seed=12), "NEW")
+
+        result = self.analyzer.assign_clusters(customers, purchases)
+
+        assert not result["drift"]["drifted"] and not result["refitted"]
+        assert len(result["assignments"]) == 600
+        assert set(result["assignments"].values()) <= set(range(result["n_clusters"]))
+        assert self.analyzer.fitted_clustering.rows_seen == 1000
+
+    def test_reservoir_stays_bounded(self, monkeypatch):
+        """Deltas beyond the reservoir size replace sampled rows instead of growing it"""
+        monkeypatch.setattr(customer_analysis, "CLUSTERING_RESERVOIR_SIZE", 500)
+        clustering = self.analyzer.fitted_clustering
+        clustering.update_reservoir(np.ones((300, clustering.reservoir.shape[1])))
+
+        assert clustering.reservoir.shape[0] == 500
+        assert clustering.rows_seen == 700
+        assert 0 < (clustering.reservoir == 1).all(axis=1).sum() <= 300
+
+    def test_drift_triggers_refit(self):
+        """A shifted population is detected and the model refitted on reservoir plus delta"""
+        fingerprint = self.analyzer.fitted_clustering.training_fingerprint
+        datasets = make_customer_datasets(300, seed=13)
+        for data in datasets:
+            data["customer_data"]["monthly_spend"] *= 8
+            data["customer_data"]["data_usage_gb"] *= 5
+        customers, purchases = to_frames(self.analyzer, datasets, "SHIFT")
+
+        result = self.analyzer.assign_clusters(customers, purchases)
+
+        assert result["drift"]["drifted"] and result["refitted"]
+        clustering = self.analyzer.fitted_clustering
+        assert clustering.training_fingerprint != fingerprint
+        assert clustering.training_size == 700
+        assert set(result["assignments"].values()) <= set(clustering.cluster_descriptions)
+
+    def test_refit_keeps_reservoir_uniform(self, monkeypatch):
+        """After a drift refit the delta holds its share of every row seen, not of the refit's training rows"""
+        monkeypatch.setattr(customer_analysis, "CLUSTERING_RESERVOIR_SIZE", 400)
+        self.analyzer.fitted_clustering.rows_seen = 100_000
+        datasets = make_customer_datasets(300, seed=13)
+        for data in datasets:
+            data["customer_data"]["monthly_spend"] *= 8
+            data["customer_data"]["data_usage_gb"] *= 5
+        customers, purchases = to_frames(self.analyzer, datasets, "SHIFT")
+        delta = {tuple(row) for row in self.analyzer.extract_feature_matrix(customers, purchases).numerical_matrix()}
+
+        result = self.analyzer.assign_clusters(customers, purchases)
+
+        assert result["refitted"]
+        clustering = self.analyzer.fitted_clustering
+        assert clustering.rows_seen == 100_300
+        assert clustering.reservoir.shape[0] == 400
+        # Expected share 300 / 100,300 of 400 slots: about one row
+        assert sum(tuple(row) in delta for row in clustering.reservoir) <= 10
+
+    @pytest.mark.parametrize("shift", [False, True])
+    def test_legacy_artefact_without_reservoir(self, tmp_path, shift):
+        """Artefacts holding only scaler and model are assigned from, and refitted on the delta alone on drift"""
+        model_path = tmp_path / "clustering.joblib"
+        clustering = self.analyzer.fitted_clustering
+        legacy_fields = ["scaler", "model", "feature_names", "model_selection", "fitted_at"]
+        customer_analysis.joblib.dump({name: getattr(clustering, name) for name in legacy_fields}, model_path)
+        datasets = make_customer_datasets(300, seed=13)
+        if shift:
+            for data in datasets:
+                data["customer_data"]["monthly_spend"] *= 8
+                data["customer_data"]["data_usage_gb"] *= 5
+        customers, purchases = to_frames(self.analyzer, datasets, "LEGACY")
+
+        result = CustomerDataAnalyzer(enable_ml_clustering=True).assign_clusters(customers, purchases, model_path=model_path)
+
+        assert result["refitted"] == shift
+        assert len(result["assignments"]) == 300
+        updated = customer_analysis.ClusteringModel.load(model_path)
+        assert updated.rows_seen == 300 and updated.reservoir.shape[0] == 300
+        assert updated.training_size == (300 if shift else 0)
+
+    def test_cluster_ids_stable_across_runs(self, tmp_path):
+        """A new run reuses the ids of the persisted artefact, whatever labels the new model uses"""
+        model_path = tmp_path / "clustering.joblib"
+        datasets = make_customer_datasets(400)
+        clustering = self.analyzer.fitted_clustering
+        clustering.cluster_ids = clustering.stable_ids()[::-1] + 10
+        clustering.save(model_path)
+        customers, purchases = self.analyzer._datasets_to_frames(datasets)
+        expected = clustering.predict(
+            self.analyzer.extract_feature_matrix(customers, purchases, customer_key="_dataset_index").numerical_matrix()
+        )
+
+        result = CustomerDataAnalyzer(enable_ml_clustering=True).cluster_customers(datasets, model_path=model_path)
+
+        actual = {
+            customer_id: int(cluster["cluster_id"])
+            for cluster in result["clusters"].values()
+            for customer_id in cluster["customers"]
+        }
+        customer_ids = [data["customer_data"]["customer_id"] for data in datasets]
+        agreement = np.mean([actual[customer_id] == cluster_id for customer_id, cluster_id in zip(customer_ids, expected)])
+        assert agreement > 0.9
+
+    def test_assign_loads_and_updates_artefact(self, tmp_path):
+        """A fresh analyzer assigns from the saved artefact and persists its updated reservoir"""
+        model_path = tmp_path / "clustering.joblib"
+        self.analyzer.save_clustering_model(model_path)
+        customers, purchases = to_frames(self.analyzer, make_customer_datasets(50, seed=14), "DAY")
+
+        fresh = CustomerDataAnalyzer(enable_ml_clustering=True)
+        result = fresh.assign_clusters(customers, purchases, model_path=model_path)
+
+        assert len(result["assignments"]) == 50
+        assert customer_analysis.ClusteringModel.load(model_path).rows_seen == 450
+        with pytest.raises(ValueError):
+            CustomerDataAnalyzer(enable_ml_clustering=True).assign_clusters(customers, purchases)
@@ -0,0 +1,149 @@
+"""
+Unit tests for the Lead Intelligence Agent
+Tests that the columnar scoring path matches the per-record scoring logic
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.lead_intelligence_agent import LeadIntelligenceAgent
+from tests.fixtures_data import make_customer_records
+
+
+class TestColumnarScoring:
+    """Columnar scoring must reproduce the per-record helpers"""
+
+    def setup_method(self):
+        """Set up the agent for each test"""
+        self.agent = LeadIntelligenceAgent()
+
+    @pytest.mark.parametrize("drop_columns", [[], ['tenure_months', 'service_growth_rate', 'data_usage_gb', 'active_services']])
+    def test_features_match_per_record_logic(self, drop_columns):
+        """Segment, score, churn and LTV match the scalar helpers, including missing-field defaults"""
+        df = make_customer_records(2000).drop(columns=drop_columns)
+        features = self.agent._build_feature_frame(df)
+
+        for position, customer in enumerate(df.to_dict('records')):
+            analysis = self.agent._score_individual_lead(customer)
+            row = features.iloc[position]
+            assert row['segment'] == analysis.segment
+            assert row['lead_score'] == pytest.approx(analysis.lead_score, abs=0.01)
+            assert row['churn_probability'] == pytest.approx(analysis.churn_probability)
+            assert row['churn_probability'] == self.agent._calculate_churn_probability(customer)
+            assert row['lifetime_value'] == pytest.approx(analysis.lifetime_value, abs=0.01)
+            assert row['risk_level'] == self.agent._categorize_churn_risk(analysis.churn_probability)
+
+    def test_churn_thresholds_match_scalar_sum(self):
+        """Every indicator combination scores exactly as the scalar sum, also where weights add up to a cut-off"""
+        masks = np.arange(32)
+        df = pd.DataFrame({
+            'customer_id': [f'CUST{mask:02d}' for mask in masks],
+            'monthly_spend': 120,
+            'data_usage_gb': np.where(masks & 1, 5, 50),
+            'support_tickets': np.where(masks & 2, 4, 0),
+            'payment_delays': np.where(masks & 4, 2, 0),
+            'competitor_usage': np.where(masks & 8, 0.6, 0.0),
+            'tenure_months': np.where(masks & 16, 3, 12),
+        })
+        features = self.agent._build_feature_frame(df)
+        scalar = [self.agent._calculate_churn_probability(c) for c in df.to_dict('records')]
+
+        assert features['churn_probability'].tolist() == scalar
+        # Combinations whose weights add up to a cut-off, e.g. 0.25 + 0.3 + 0.15 and
+        # 0.25 + 0.2 + 0.15 + 0.1 at 0.7, where a column-wise float sum can land either side
+        cut_offs = {4: 0.3, 18: 0.3, 11: 0.6, 22: 0.6, 13: 0.7, 27: 0.7, 29: 0.8}
+        for mask, threshold in cut_offs.items():
+            assert features['churn_probability'][mask] == pytest.approx(threshold)
+            assert (features['churn_probability'][mask] > threshold) == (scalar[mask] > threshold)
+            assert features['risk_level'][mask] == self.agent._categorize_churn_risk(scalar[mask])
+
+        high_churn = sum(p > 0.7 for p in scalar)
+        delegation = {item['type']: item['description'] for item in self.agent._identify_delegation_needs(df)}
+        assert f"for {high_churn} at-risk" in delegation['retention_strategy']
+
+    def test_top_leads_match_full_sort(self):
+        """Top-K selection returns the same leads as sorting every LeadAnalysis"""
+        df = make_customer_records(3000)
+        reference = [self.agent._score_individual_lead(c) for c in df.to_dict('records')]
+        reference.sort(key=lambda lead: lead.lead_score, reverse=True)
+
+        result = self.agent._calculate_lead_scores(df)
+
+        assert [lead.customer_id for lead in result['top_leads']] == [lead.customer_id for lead in reference[:10]]
+        assert result['high_value_count'] == len([l for l in reference if l.lead_score >= 8.0])
+        assert result['average_score'] == pytest.approx(sum(l.lead_score for l in reference) / len(reference))
+
+    def test_top_k_positions_keep_original_order_for_ties(self):
+        """Ties at the cut-off are resolved like a stable sort"""
+        scores = np.array([5.0, 9.0, 7.0, 9.0, 7.0, 7.0, 1.0])
+        assert list(LeadIntelligenceAgent._top_k_positions(scores, 4)) == [1, 3, 2, 4]
+        assert list(LeadIntelligenceAgent._top_k_positions(scores, 10)) == [1, 3, 2, 4, 5, 0, 6]
+
+    def test_churn_and_segments_match_per_record_logic(self):
+        """Churn risk buckets and segment sizes match the scalar helpers"""
+        df = make_customer_records(2000)
+        records = df.to_dict('records')
+        probabilities = [self.agent._calculate_churn_probability(c) for c in records]
+        levels = [self.agent._categorize_churn_risk(p) for p in probabilities]
+        segments = [self.agent._classify_customer_segment(c) for c in records]
+
+        churn = self.agent._analyze_churn_risk(df)
+        assert churn['total_at_risk'] == sum(p > 0.6 for p in probabilities)
+        assert churn['urgent_interventions'] == sum(p > 0.8 for p in probabilities)
+        assert churn['risk_distribution'] == {level: levels.count(level) for level in dict.fromkeys(levels)}
+        assert [c['customer_id'] for c in churn['high_risk_customers']] == [
+            c['customer_id'] for c, level in zip(records, levels) if level == 'high'
+        ]
+
+        segmentation = self.agent._segment_customers(df)
+        assert segmentation['segment_distribution'] == {s: segments.count(s) for s in dict.fromkeys(segments)}
+
+    def test_revenue_opportunities_and_delegation_match_per_record_logic(self):
+        """Opportunity filters and delegation counts match the per-record rules"""
+        df = make_customer_records(2000)
+        records = df.to_dict('records')
+        upsell = [c['customer_id'] for c in records if c['data_usage_gb'] > c['plan_data_limit'] * 0.8]
+        family = [c['customer_id'] for c in records if c['family_lines'] > 1 and not c['family_plan']]
+        retention = [c['customer_id'] for c in records
+                     if self.agent._calculate_churn_probability(c) > 0.6 and c['monthly_spend'] > 100]
+
+        opportunities = self.agent._identify_revenue_opportunities(df)
+        assert [o['customer_id'] for o in opportunities['upsell_candidates']] == upsell
+        assert [o['customer_id'] for o in opportunities['cross_sell_opportunities']] == family
+        assert [o['customer_id'] for o in opportunities['retention_priority']] == retention
+        assert opportunities['retention_priority'][0]['revenue_at_risk'] == pytest.approx(
+            df.set_index('customer_id').loc[retention[0], 'monthly_spend'] * 12)
+
+        delegation = {item['type']: item['description'] for item in self.agent._identify_delegation_needs(df)}
+        high_churn = sum(self.agent._calculate_churn_probability(c) > 0.7 for c in records)
+        assert str(sum(c['monthly_spend'] > 150 for c in records)) in delegation['pricing_strategy']
+        assert f"for {high_churn} at-risk" in delegation['retention_strategy']
+        assert f"for {len(family)} candidates" in delegation['family_plan_optimization']
+
+    def test_market_trends_without_optional_columns(self):
+        """Service adoption falls back to zero when plan columns are absent"""
+        df = make_customer_records(100).drop(columns=['plan_type', 'family_lines', 'business_features'])
+        adoption = self.agent._analyze_market_trends(df)['service_adoption']
+        assert adoption == {"5g_adoption": 0, "family_plans": 0, "business_services": 0}
+
+    def test_analysis_makes_single_data_pass(self):
+        """All sub-analyses share one feature frame"""
+        df = make_customer_records(500)
+        self.agent.analyze_customer_patterns({'records': df.to_dict('records')})
+        assert self.agent.data_passes == 1
+
+    def test_analyze_customer_patterns_end_to_end(self):
+        """The full analysis runs on record-style input"""
+        df = make_customer_records(500)
+        result = self.agent.analyze_customer_patterns({'records': df.to_dict('records')})
+
+        assert len(result['lead_scores']['top_leads']) == 10
+        assert result['customer_segments']['total_customers'] == 500
+        assert result['agent_insights']
@@ -0,0 +1,107 @@
+"""
+Unit tests for per-customer analysis contexts in lead scoring
+Tests that features are extracted exactly once per customer per run
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerAnalysisContext, CustomerDataAnalyzer
+from src.agents.lead_scoring import LeadScoringEngine
+from tests.fixtures_data import make_customer_datasets
+
+
+@pytest.fixture(scope="module")
+def datasets():
+    """Synthetic per-customer datasets"""
+    return make_customer_datasets(60)
+
+
+def unpack(dataset):
+    """Dataset dict as positional analyzer arguments"""
+    return dataset["customer_data"], dataset["purchase_history"], dataset["engagement_data"]
+
+
+class TestCustomerAnalysisContext:
+    """Test cases for CustomerDataAnalyzer.build_analysis_context"""
+
+    def setup_method(self):
+        """Set up the analyzer for each test"""
+        self.analyzer = CustomerDataAnalyzer()
+
+    def test_context_extracts_features_once(self, datasets):
+        """Patterns and segment reuse the context's features"""
+        context = self.analyzer.build_analysis_context(*unpack(datasets[1]))
+
+        assert isinstance(context, CustomerAnalysisContext)
+        assert context.customer_id == "CUST00001"
+        assert self.analyzer.feature_extractions == 1
+
+    def test_context_matches_separate_calls(self, datasets):
+        """The context holds the same results as the individual analyzer calls"""
+        for dataset in datasets[:10]:
+            context = self.analyzer.build_analysis_context(*unpack(dataset))
+            patterns = self.analyzer.analyze_customer_patterns(*unpack(dataset))
+            segment, confidence = self.analyzer.segment_customer(*unpack(dataset))
+
+            assert context.features == self.analyzer.extract_customer_features(*unpack(dataset))
+            assert [p.pattern_name for p in context.patterns] == [p.pattern_name for p in patterns]
+            assert (context.segment, context.segment_confidence) == (segment, confidence)
+
+    def test_customer_insights_single_extraction(self, datasets):
+        """generate_customer_insights extracts features once"""
+        insights = self.analyzer.generate_customer_insights(*unpack(datasets[2]))
+
+        assert "error" not in insights
+        assert self.analyzer.feature_extractions == 1
+
+
+class TestLeadScoringContext:
+    """Test cases for context reuse in LeadScoringEngine"""
+
+    def setup_method(self):
+        """Set up the scoring engine for each test"""
+        self.engine = LeadScoringEngine()
+
+    def test_score_lead_single_extraction(self, datasets):
+        """Scoring one lead extracts its features once"""
+        self.engine.score_lead(*unpack(datasets[3]))
+        assert self.engine.customer_analyzer.feature_extractions == 1
+
+    def test_batch_extracts_once_per_customer(self, datasets):
+        """Batch scoring extracts every customer's features exactly once"""
+        scored = self.engine.batch_score_leads(datasets)
+
+        assert len(scored) == len(datasets)
+        assert self.engine.customer_analyzer.feature_extractions == len(datasets)
+        assert set(self.engine.analysis_contexts) == {customer_id for customer_id, _ in scored}
+
+    def test_precomputed_context_gives_same_score(self, datasets):
+        """Passing a context produces the same score as computing it in score_lead"""
+        for dataset in datasets[:10]:
+            context = self.engine.customer_analyzer.build_analysis_context(*unpack(dataset))
+            with_context = self.engine.score_lead(*unpack(dataset), context=context)
+            without_context = self.engine.score_lead(*unpack(dataset))
+
+            assert with_context.overall_score == without_context.overall_score
+            assert with_context.priority_score == without_context.priority_score
+            assert with_context.recommended_actions == without_context.recommended_actions
+
+    def test_prioritized_leads_carry_context(self, datasets):
+        """Prioritization attaches context features and segment without re-extracting"""
+        scored = self.engine.batch_score_leads(datasets)
+        extractions = self.engine.customer_analyzer.feature_extractions
+
+        leads = self.engine.prioritize_leads(scored, {"max_leads": 10}, self.engine.analysis_contexts)
+
+        assert leads
+        assert self.engine.customer_analyzer.feature_extractions == extractions
+        for lead in leads:
+            context = self.engine.analysis_contexts[lead.customer_id]
+            assert lead.customer_features is context.features
+            assert lead.customer_segment == context.segment
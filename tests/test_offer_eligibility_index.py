@@ -0,0 +1,100 @@
+"""
+Unit tests for the Three HK offer eligibility index
+Tests that indexed offer matching returns the same offers as a full catalog scan
+"""
+
+import pytest
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerSegment, FeatureSet
+from src.agents.lead_scoring import LeadPriority, LeadScore
+from src.agents.three_hk_business_rules import EligibilityStatus, ThreeHKBusinessRulesEngine, ThreeHKProduct
+from tests.fixtures_data import make_customers
+
+
+def full_scan_offers(engine, features, lead_score, segment, current_products):
+    """Reference matching: evaluate and score every catalog product, sort, slice"""
+    matched = []
+    for product in engine.product_catalog:
+        eligibility = engine._evaluate_product_eligibility(product, features, segment, current_products)
+        if eligibility["status"] == EligibilityStatus.NOT_ELIGIBLE:
+            continue
+        match_score = engine._calculate_match_score(product, features, lead_score, segment)
+        if match_score >= 30.0:
+            matched.append((
+                product.product_id,
+                eligibility["status"],
+                eligibility["confidence"],
+                eligibility["conditions"],
+                match_score,
+                engine._calculate_presentation_priority(match_score, lead_score),
+            ))
+    matched.sort(key=lambda offer: (offer[4], -offer[5]), reverse=True)
+    return matched[:engine.business_params["maximum_concurrent_offers"]]
+
+
+class TestEligibilityIndex:
+    """Test cases for indexed offer matching"""
+
+    def setup_method(self):
+        """Set up the business rules engine for each test"""
+        self.engine = ThreeHKBusinessRulesEngine()
+
+    def test_matches_full_catalog_scan(self):
+        """Indexed matching returns the same offers, statuses and scores as a full scan"""
+        for features, lead_score, segment, current_products in make_customers(1500):
+            offers = self.engine.match_offers_for_customer(features, lead_score, segment, current_products)
+            actual = [
+                (o.product.product_id, o.eligibility_status, o.confidence_level, o.conditions, o.match_score,
+                 o.presentation_priority)
+                for o in offers
+            ]
+            assert actual == full_scan_offers(self.engine, features, lead_score, segment, current_products)
+
+    def test_offer_details_generated_for_selected_products(self):
+        """Selected offers carry pricing and sales strategy"""
+        features = FeatureSet(monthly_spend=1500.0, tenure_category="loyal", data_usage_gb=60.0, satisfaction_score=9.0)
+        lead_score = LeadScore(overall_score=85.0, lead_priority=LeadPriority.HIGH)
+        offers = self.engine.match_offers_for_customer(features, lead_score, CustomerSegment.PREMIUM_BUSINESS)
+
+        assert 0 < len(offers) <= self.engine.business_params["maximum_concurrent_offers"]
+        for offer in offers:
+            assert offer.sales_approach
+            assert offer.recommended_price <= offer.product.monthly_price
+
+    def test_index_built_once_per_catalog_version(self):
+        """The index is reused until the catalog changes"""
+        index = self.engine.get_eligibility_index()
+        assert self.engine.get_eligibility_index() is index
+
+        self.engine.product_catalog.append(ThreeHKProduct(
+            product_id="THREE_TEST_LITE", product_name="Test Lite", category=self.engine.product_catalog[0].category,
+            monthly_price=Decimal("98.00"), min_monthly_spend=Decimal("50.00"), priority_segments=["budget_conscious"],
+        ))
+        rebuilt = self.engine.get_eligibility_index()
+        assert rebuilt is not index
+        assert Decimal("50.00") in rebuilt.spend_edges
+
+        self.engine.invalidate_eligibility_index()
+        assert self.engine.get_eligibility_index() is not rebuilt
+
+    def test_ineligible_products_pruned(self):
+        """Products requiring another segment never appear in the index entry"""
+        index = self.engine.get_eligibility_index()
+        candidates = index.candidates(CustomerSegment.BUDGET_CONSCIOUS, 2500.0, 36)
+        product_ids = {entry.product.product_id for entry in candidates}
+
+        assert "THREE_FAMILY_SHARE_PLUS" not in product_ids
+        assert "THREE_BUSINESS_PRO_ENTERPRISE" not in product_ids
+        assert "THREE_SMART_VALUE" in product_ids
+
+    def test_invalid_features_return_no_offers(self):
+        """Unusable input keeps the previous behaviour of matching nothing"""
+        lead_score = LeadScore(overall_score=80.0)
+        assert self.engine.match_offers_for_customer({"monthly_spend": 500}, lead_score, CustomerSegment.YOUNG_DIGITAL) == []
@@ -0,0 +1,93 @@
+"""
+Unit tests for parallel chunked batch scoring and analysis
+Tests that process pool results match the serial path and keep input order
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import batch_analyze_customers
+from src.agents.lead_scoring import LeadScoringEngine
+from src.agents.three_hk_business_rules import ThreeHKBusinessRulesEngine
+from src.utils.parallel_batch import iter_chunked_results, resolve_chunk_size, resolve_workers
+from tests.fixtures_data import make_customer_datasets
+
+
+def square_chunk(start, chunk, offset):
+    """Module-level chunk function so worker processes can unpickle it"""
+    return [(start + i, value * value + offset) for i, value in enumerate(chunk)]
+
+
+@pytest.fixture(scope="module")
+def datasets():
+    """Synthetic per-customer datasets"""
+    return make_customer_datasets(120)
+
+
+class TestParallelBatchHelpers:
+    """Test cases for the chunked process pool helpers"""
+
+    def test_resolve_workers_and_chunk_size(self):
+        """Defaults derive from core count and batch size"""
+        assert resolve_workers(None) >= 1
+        assert resolve_workers(0) == 1
+        assert resolve_chunk_size(1000, 4) == 63
+        assert resolve_chunk_size(1000, 4, chunk_size=10) == 10
+        assert resolve_chunk_size(0, 4) == 1
+
+    def test_chunks_stream_in_order(self):
+        """Chunk results come back in input order, tagged with their start index"""
+        items = list(range(23))
+        chunks = list(iter_chunked_results(square_chunk, items, 1, workers=3, chunk_size=5))
+
+        assert [start for start, _ in chunks] == [0, 5, 10, 15, 20]
+        flattened = [result for _, results in chunks for result in results]
+        assert flattened == [(i, i * i + 1) for i in items]
+
+    def test_empty_input(self):
+        """No items produce no chunks"""
+        assert list(iter_chunked_results(square_chunk, [], 0, workers=2)) == []
+
+
+class TestParallelScoring:
+    """Test cases for parallel batch_score_leads and batch_analyze_customers"""
+
+    def test_parallel_scores_match_serial(self, datasets):
+        """Sharded scoring returns the serial results in the same order"""
+        engine = LeadScoringEngine()
+        serial = engine.batch_score_leads(datasets)
+        parallel = engine.batch_score_leads(datasets, workers=2, chunk_size=17)
+
+        assert [customer_id for customer_id, _ in parallel] == [customer_id for customer_id, _ in serial]
+        for (_, expected), (_, actual) in zip(serial, parallel):
+            assert actual.overall_score == expected.overall_score
+            assert actual.lead_priority == expected.lead_priority
+        # Contexts computed in the workers are available for prioritization
+        assert set(engine.analysis_contexts) == {customer_id for customer_id, _ in serial}
+
+    def test_parallel_scoring_with_business_rules_engine(self, datasets):
+        """An engine with Three HK offer matching can be sent to the worker processes"""
+        engine = LeadScoringEngine()
+        engine.three_hk_engine = ThreeHKBusinessRulesEngine()
+        serial = engine.batch_score_leads(datasets[:20])
+        parallel = engine.batch_score_leads(datasets[:20], workers=2, chunk_size=7)
+
+        assert [(customer_id, score.overall_score) for customer_id, score in parallel] == [
+            (customer_id, score.overall_score) for customer_id, score in serial
+        ]
+
+    def test_parallel_customer_analysis_matches_serial(self, datasets):
+        """Sharded customer analysis keeps order and per-customer results"""
+        serial = batch_analyze_customers(datasets[:30], enable_clustering=False)
+        parallel = batch_analyze_customers(datasets[:30], enable_clustering=False, workers=2, chunk_size=7)
+
+        assert len(parallel["individual_analyses"]) == 30
+        for expected, actual in zip(serial["individual_analyses"], parallel["individual_analyses"]):
+            assert actual["customer_id"] == expected["customer_id"]
+            assert actual["summary"] == expected["summary"]
+        assert parallel["batch_insights"] == serial["batch_insights"]
@@ -0,0 +1,152 @@
+"""
+Unit tests for the out-of-core partitioned merge
+Tests that partition-by-partition merges of chunked inputs add up to the
+in-memory merge for every strategy, that the quality report aggregates match,
+and that the encrypted partitions are removed afterwards
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.data_merging import DataMerger, MergeStrategy
+from src.utils.encrypted_storage import EncryptedStorage
+from src.utils.partitioned_merge import PartitionedMerge, partition_of
+from tests.fixtures_data import make_merge_frames
+
+
+def in_chunks(df: pd.DataFrame, rows: int):
+    """Yield a frame in row chunks, as pd.read_csv(chunksize=...) would"""
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+
+def sort_merged(df: pd.DataFrame) -> pd.DataFrame:
+    """Merged rows in a canonical order, by source row on each side"""
+    return df.sort_values(["customer_Row", "purchase_Row"], na_position="first").reset_index(drop=True)
+
+
+class TestPartitionedMerge:
+    """Test cases for PartitionedMerge"""
+
+    def setup_method(self):
+        """Set up storage and chunkable frames with a source row number on each side"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = EncryptedStorage(storage_path=self.temp_dir, master_password="test_password_123")
+        customer_df, purchase_df = make_merge_frames(1500)
+        self.customer_df = customer_df.assign(Row=np.arange(len(customer_df)))
+        self.purchase_df = purchase_df.assign(Row=np.arange(len(purchase_df)))
+
+    def teardown_method(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def merge(self, strategy, num_partitions=4):
+        return PartitionedMerge(
+            self.storage,
+            in_chunks(self.customer_df, 400),
+            in_chunks(self.purchase_df, 400),
+            strategy,
+            num_partitions=num_partitions,
+        )
+
+    @pytest.mark.parametrize("strategy", list(MergeStrategy))
+    def test_partitions_add_up_to_in_memory_merge(self, strategy):
+        """The partitioned merge holds the same rows and values as the in-memory merge"""
+        merge = self.merge(strategy)
+        chunks = list(merge)
+
+        merger = DataMerger()
+        merger._validate_datasets(self.customer_df, self.purchase_df)
+        expected = merger._perform_merge(self.customer_df, self.purchase_df, strategy)["merged_data"]
+
+        assert len(chunks) == 4
+        pd.testing.assert_frame_equal(
+            sort_merged(pd.concat(chunks, ignore_index=True)), sort_merged(expected), check_dtype=False
+        )
+        assert merge.metadata["merged_rows"] == len(expected)
+
+    def test_quality_report_aggregates(self):
+        """Incrementally built figures equal the in-memory report"""
+        merge = self.merge(MergeStrategy.OUTER)
+        list(merge)
+        report = merge.quality_report
+        expected = DataMerger()._generate_quality_report(self.customer_df, self.purchase_df)
+
+        assert report.total_customer_records == expected.total_customer_records
+        assert report.total_purchase_records == expected.total_purchase_records
+        assert report.matched_records == expected.matched_records
+        assert report.missing_account_ids == expected.missing_account_ids
+        assert report.quality_score == pytest.approx(expected.quality_score)
+        assert sorted(map(str, report.duplicate_customer_ids)) == sorted(map(str, expected.duplicate_customer_ids))
+        assert len(report.unmatched_purchase_ids) == 10
+        assert not set(report.unmatched_customer_ids) & set(self.purchase_df["Account ID"].dropna())
+
+    def test_partitions_are_encrypted_and_removed(self):
+        """Partitions hold no plaintext while merging and are deleted afterwards, also when abandoned"""
+        merged = iter(self.merge(MergeStrategy.LEFT))
+        next(merged)
+
+        stored = [entry["storage_key"] for entry in self.storage.list_stored_data()]
+        assert stored and all(key.startswith("chunked_merge_") for key in stored)
+        for root, _, files in os.walk(self.temp_dir):
+            for name in files:
+                with open(os.path.join(root, name), "rb") as f:
+                    assert b"example.com" not in f.read()
+
+        merged.close()
+        assert self.storage.list_stored_data() == []
+
+    def test_store_merged_chunks(self):
+        """Merged chunks can be written to a chunked dataset for downstream analysis"""
+        merge = self.merge(MergeStrategy.INNER, num_partitions=3)
+        storage_key = merge.store("merged")
+
+        stored = list(self.storage.iter_dataframe_chunks(storage_key))
+        assert len(stored) == 3
+        assert sum(len(chunk) for chunk in stored) == merge.metadata["merged_rows"]
+        assert self.storage.list_stored_data()[0]["storage_key"] == storage_key
+
+    def test_ids_hash_as_strings(self):
+        """Numeric and string forms of an ID land in the same partition; nulls in none"""
+        partitions = partition_of(pd.Series([1001, None, 7], dtype=object), 8)
+        assert partitions[1] == -1
+        assert partitions[0] == partition_of(pd.Series(["1001"]), 8)[0]
+
+    @pytest.mark.parametrize("num_partitions", [1, 2, 5])
+    def test_zero_padded_and_mixed_ids(self, num_partitions):
+        """Digit-only string IDs survive the encrypted partitions and join like the in-memory merge"""
+        customer_df = pd.DataFrame({"Account_ID": ["00123", "00456", "A1", "7", "0007"], "Name": list("abcde")})
+        purchase_df = pd.DataFrame({"Account_ID": ["00123", "00456", "0007", "A1"], "Amount": [1.0, 2.0, 3.0, 4.0]})
+
+        merged = pd.concat(
+            PartitionedMerge(self.storage, customer_df, purchase_df, MergeStrategy.LEFT, num_partitions=num_partitions),
+            ignore_index=True,
+        )
+        merger = DataMerger()
+        merger._validate_datasets(customer_df, purchase_df)
+        expected = merger._perform_merge(customer_df, purchase_df, MergeStrategy.LEFT)["merged_data"]
+
+        ordered = merged.sort_values("customer_Name").reset_index(drop=True)
+        pd.testing.assert_frame_equal(ordered, expected.sort_values("customer_Name").reset_index(drop=True))
+        assert ordered["Account_ID"].tolist() == ["00123", "00456", "A1", "7", "0007"]
+        assert ordered["purchase_Amount"].tolist()[:3] == [1.0, 2.0, 4.0]
+        assert np.isnan(ordered["purchase_Amount"][3]) and ordered["purchase_Amount"][4] == 3.0
+
+    def test_missing_account_id_column(self):
+        """Inputs without an Account ID column fail before anything is stored"""
+        merge = PartitionedMerge(self.storage, self.customer_df.drop(columns=["Account ID"]), self.purchase_df)
+
+        with pytest.raises(ValueError, match="Customer data missing Account ID column"):
+            list(merge)
+        assert self.storage.list_stored_data() == []
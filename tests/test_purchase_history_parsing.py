@@ -0,0 +1,159 @@
+"""
+Unit tests for purchase history and engagement parsing
+Tests the vectorized parser against a per-row reference and consumption of the
+parsed engagement metrics by CustomerDataAnalyzer
+"""
+
+import re
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerDataAnalyzer
+from src.utils.data_merging import DataMerger
+from src.utils.purchase_history_parsing import parse_engagement, parse_purchase_data
+
+PRODUCTS = ["Family Plan", "Device Upgrade", "5G Data Add-on", "Streaming Service Bundle", "Prepaid SIM"]
+METRICS = ["App Usage", "Campaign Response", "Online Purchase", "Website Visit", "Customer Support Interaction"]
+
+
+def make_purchase_frame(n: int, seed: int = 3) -> pd.DataFrame:
+    """Wide purchase frame in the upload format, with blanks and a malformed entry"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        row = {"Account ID": f"ACC{i:06d}"}
+        filled = rng.integers(0, 6)
+        for slot in range(1, 6):
+            if slot <= filled:
+                day = date(2023, 1, 1) + timedelta(days=int(rng.integers(0, 900)))
+                row[f"Purchase History {slot}"] = f"{rng.choice(PRODUCTS)} ({day.isoformat()})"
+            else:
+                row[f"Purchase History {slot}"] = None
+        items = rng.choice(METRICS, size=rng.integers(0, 4), replace=False)
+        row["Engagement Data"] = "; ".join(
+            f"{metric}:{rng.integers(1, 30)}{' sessions' if metric == 'App Usage' else ''}" for metric in items
+        ) or None
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    df.loc[0, "Purchase History 1"] = "Unknown product"
+    return df
+
+
+def reference_events(df: pd.DataFrame):
+    """Per-row parse, as ad hoc code in the agents would do it"""
+    events = []
+    for _, row in df.iterrows():
+        for slot in range(1, 6):
+            value = row[f"Purchase History {slot}"]
+            match = re.match(r"^(.*) \((\d{4}-\d{2}-\d{2})\)$", value) if isinstance(value, str) else None
+            if match:
+                events.append((row["Account ID"], slot, match.group(1), pd.Timestamp(match.group(2))))
+    return events
+
+
+class TestPurchaseHistoryParsing:
+    """Test cases for parse_purchase_data"""
+
+    def setup_method(self):
+        """Set up a purchase frame for each test"""
+        self.df = make_purchase_frame(300)
+
+    def test_events_match_per_row_parse(self):
+        """The melted events equal a per-row regex parse, in row and slot order"""
+        parsed = parse_purchase_data(self.df, "Account ID")
+        events = parsed.purchase_events
+
+        actual = list(zip(events["account_id"], events["history_slot"], events["product"], events["purchase_date"]))
+        assert actual == reference_events(self.df)
+        assert parsed.unparsed_purchase_entries == 1
+        assert events["purchase_date"].dtype == "datetime64[ns]"
+        assert isinstance(events["product"].dtype, pd.CategoricalDtype)
+
+    def test_engagement_columns(self):
+        """Each metric becomes a numeric column aligned with the source rows"""
+        df = pd.DataFrame({
+            "Account ID": ["A1", "A2", "A3"],
+            "Engagement Data": ["App Usage:17 sessions; Campaign Response:2; Online Purchase:1", None, "Website Visit:4"],
+        })
+        engagement = parse_purchase_data(df, "Account ID").engagement
+
+        assert engagement["engagement_app_usage"].tolist()[0] == 17.0
+        assert engagement["engagement_campaign_response"].tolist()[0] == 2.0
+        assert engagement.iloc[1].drop("account_id").isna().all()
+        assert engagement["engagement_website_visit"].tolist()[2] == 4.0
+
+    def test_per_account_arrays(self):
+        """Purchase counts and latest dates are returned as arrays in the requested order"""
+        parsed = parse_purchase_data(self.df, "Account ID")
+        accounts = ["ACC000005", "MISSING", "ACC000002"]
+        expected = [sum(1 for event in reference_events(self.df) if event[0] == account) for account in accounts]
+
+        assert parsed.purchase_counts(accounts).tolist() == expected
+        assert pd.isna(parsed.last_purchase_dates(accounts)[1])
+
+
+class TestEngagementFeatures:
+    """Test cases for engagement metrics consumed by CustomerDataAnalyzer"""
+
+    def test_analyzer_reads_engagement_fields(self):
+        """Renamed engagement metrics feed the analyzer's engagement features"""
+        purchase_df = make_purchase_frame(50)
+        parsed = parse_purchase_data(purchase_df, "Account ID")
+        customers = pd.DataFrame({
+            "account_id": purchase_df["Account ID"].dropna().drop_duplicates(),
+            "monthly_spend": 300.0,
+        }).merge(parsed.engagement_features(), on="account_id", how="left")
+
+        matrix = CustomerDataAnalyzer().extract_feature_matrix(customers, customer_key="account_id")
+
+        responded = customers["promotion_responses"].fillna(0).to_numpy() > 0
+        assert responded.any() and not responded.all()
+        assert (matrix["promotion_response_rate"][responded] > 0).all()
+
+    def test_merge_result_feeds_engagement_to_analyzer(self, monkeypatch):
+        """Merge results parse engagement once and extract_feature_matrix joins it per account"""
+        purchase_df = make_purchase_frame(50)
+        customer_df = pd.DataFrame({
+            "Account ID": purchase_df["Account ID"].dropna().drop_duplicates(),
+            "monthly_spend": 300.0,
+        })
+        result = DataMerger().merge_datasets(
+            {"original_data": customer_df, "display_data": customer_df},
+            {"original_data": purchase_df, "display_data": purchase_df},
+        )
+        assert result.success
+
+        calls = []
+        monkeypatch.setattr("src.utils.data_merging.parse_engagement",
+                            lambda *args: calls.append(args) or parse_engagement(*args))
+        engagement = result.engagement_features()
+        assert result.engagement_features() is engagement
+        assert len(calls) == 1
+
+        merged = result.merged_data
+        matrix = CustomerDataAnalyzer().extract_feature_matrix(merged, customer_key="Account_ID", engagement=engagement)
+        expected = CustomerDataAnalyzer().extract_feature_matrix(
+            merged.merge(engagement, left_on="Account_ID", right_on="account_id", how="left"),
+            customer_key="Account_ID",
+        )
+        np.testing.assert_array_equal(matrix["promotion_response_rate"], expected["promotion_response_rate"])
+        assert (matrix["promotion_response_rate"] > 0).any()
+
+    def test_merge_without_engagement_column(self):
+        """Merges of purchase frames without Engagement Data have no engagement features"""
+        purchase_df = make_purchase_frame(20).drop(columns="Engagement Data")
+        customer_df = pd.DataFrame({"Account ID": purchase_df["Account ID"]})
+        result = DataMerger().merge_datasets(
+            {"original_data": customer_df, "display_data": customer_df},
+            {"original_data": purchase_df, "display_data": purchase_df},
+        )
+        assert result.success
+        assert result.engagement_features() is None
@@ -0,0 +1,217 @@
+"""
+Unit tests for the batch recommendation pipeline
+Tests that vectorized ranking and partial selection return the recommendations of the per-lead pipeline
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import CustomerDataAnalyzer
+from src.agents.lead_scoring import LeadScoringEngine
+from src.agents.recommendation_generator import RecommendationGenerator
+from src.agents.three_hk_business_rules import ThreeHKBusinessRulesEngine
+from tests.fixtures_data import make_customer_records
+
+SEGMENTS = ["existing_premium", "existing_basic", "enterprise", "sme", None]
+VOLATILE_FIELDS = ("recommendation_id", "created_at", "expires_at")
+
+
+class StubAnalyzer:
+    """Customer analysis read from the lead columns"""
+
+    def analyze_single_customer(self, lead):
+        return {
+            "customer_segment": lead["segment"],
+            "churn_risk": lead["churn_risk"],
+            "competitor_interest": lead["competitor_interest"],
+            "preferred_contact_time": lead["preferred_contact_time"],
+        }
+
+
+class StubScorer:
+    """Lead scores read from the lead columns"""
+
+    def score_single_lead(self, lead):
+        if lead["unscored"]:
+            return {}
+        return {
+            key: lead[key]
+            for key in ("overall_score", "conversion_probability", "urgency_factor", "revenue_potential", "strategic_value")
+        }
+
+
+class StubRules:
+    """Offers sized by the lead columns"""
+
+    def match_offers_for_customer(self, lead, customer_analysis):
+        return [
+            {"name": f"Plan {i}", "category": f"cat_{i % 3}", "monthly_value": lead["monthly_value"] * (i + 1)}
+            for i in range(lead["offer_count"])
+        ]
+
+
+def make_generator():
+    """Generator over the stub collaborators"""
+    return RecommendationGenerator(customer_analyzer=StubAnalyzer(), lead_scorer=StubScorer(), business_rules=StubRules())
+
+
+def make_engine_generator():
+    """Generator over the real analysis, scoring and offer engines"""
+    return RecommendationGenerator(
+        customer_analyzer=CustomerDataAnalyzer(),
+        lead_scorer=LeadScoringEngine(),
+        business_rules=ThreeHKBusinessRulesEngine(),
+    )
+
+
+def per_lead_engine_inputs(generator, leads):
+    """Reference: segment, scores and offer names of each lead from the per-customer engine calls"""
+    inputs = []
+    for record in leads.to_dict("records"):
+        context = generator.customer_analyzer.build_analysis_context(record, [])
+        lead_score = generator.lead_scorer.score_lead(record, [], context=context)
+        offers = generator.business_rules.match_offers_for_customer(context.features, lead_score, context.segment)
+        inputs.append((
+            context.segment.value,
+            lead_score.overall_score / 100,
+            [offer.product.product_name for offer in offers[:3]],
+        ))
+    return inputs
+
+
+def make_leads(n, seed=0):
+    """Leads with coarse scores, so ranking ties are common"""
+    rng = np.random.default_rng(seed)
+    coarse = lambda: np.round(rng.uniform(0, 1, n), 1)
+    return pd.DataFrame({
+        "customer_id": [f"LEAD{i:06d}" for i in range(n)],
+        "customer_name": [f"Customer {i}" for i in range(n)],
+        "segment": rng.choice(np.array(SEGMENTS, dtype=object), n),
+        "churn_risk": coarse(),
+        "competitor_interest": rng.uniform(size=n) < 0.3,
+        "preferred_contact_time": rng.choice(["morning", "afternoon", "evening"], n),
+        "overall_score": coarse(),
+        "conversion_probability": coarse(),
+        "urgency_factor": coarse(),
+        "revenue_potential": coarse(),
+        "strategic_value": coarse(),
+        "unscored": rng.uniform(size=n) < 0.05,
+        "offer_count": rng.integers(0, 4, n),
+        "monthly_value": rng.choice([0, 500, 2000, 15000], n),
+    })
+
+
+def per_lead_recommendations(generator, leads, max_recommendations):
+    """Reference: build every recommendation from iterrows, then sort and constrain"""
+    recommendations = []
+    for _, lead_row in leads.iterrows():
+        customer_analysis = generator._get_customer_analysis(lead_row.to_dict())
+        lead_scores = generator._get_lead_scores(lead_row.to_dict())
+        offer_matches = generator._get_offer_matches(lead_row.to_dict(), customer_analysis)
+        recommendation = generator._create_recommendation(lead_row, customer_analysis, lead_scores, offer_matches)
+        if recommendation:
+            recommendations.append(recommendation)
+    ranked = generator._rank_recommendations(recommendations)
+    return generator._apply_business_constraints(ranked, max_recommendations)
+
+
+def comparable(recommendations):
+    """Recommendation fields that do not depend on the wall clock"""
+    return [
+        {key: value for key, value in vars(rec).items() if key not in VOLATILE_FIELDS}
+        for rec in recommendations
+    ]
+
+
+class TestRecommendationBatch:
+    """Test cases for RecommendationGenerator.generate_recommendations"""
+
+    def setup_method(self):
+        """Set up a generator over stub collaborators"""
+        self.generator = make_generator()
+
+    @pytest.mark.parametrize("max_recommendations", [1, 7, 50, 5000])
+    def test_matches_per_lead_pipeline(self, max_recommendations):
+        """Same recommendations in the same order as building and sorting every lead"""
+        leads = make_leads(600)
+
+        expected = per_lead_recommendations(self.generator, leads, max_recommendations)
+        actual = self.generator.generate_recommendations(leads, max_recommendations)
+
+        assert len(expected) > 0
+        assert comparable(actual) == comparable(expected)
+
+    def test_builds_only_selected_leads(self, monkeypatch):
+        """Recommendation objects are built for at most max_recommendations leads"""
+        built = []
+        original = self.generator._create_recommendation
+        monkeypatch.setattr(
+            self.generator, "_create_recommendation", lambda *args: built.append(args[0]) or original(*args)
+        )
+
+        self.generator.generate_recommendations(make_leads(2000, seed=1), max_recommendations=20)
+
+        assert len(built) == 20
+
+    def test_failed_builds_are_replaced(self, monkeypatch):
+        """A selected lead whose recommendation fails to build gives way to the next best lead"""
+        leads = make_leads(400, seed=2)
+        skipped = per_lead_recommendations(self.generator, leads, 10)[0].lead_id
+        expected = per_lead_recommendations(self.generator, leads[leads["customer_id"] != skipped], 10)
+        original = self.generator._create_recommendation
+        monkeypatch.setattr(
+            self.generator, "_create_recommendation",
+            lambda lead, *args: None if lead["customer_id"] == skipped else original(lead, *args),
+        )
+
+        actual = self.generator.generate_recommendations(leads, max_recommendations=10)
+
+        assert comparable(actual) == comparable(expected)
+
+    def test_non_numeric_scores_fall_back(self):
+        """Scores the vectorized key cannot represent are ranked by building every recommendation"""
+        leads = make_leads(50, seed=3)
+        leads["overall_score"] = leads["overall_score"].astype(object)
+        leads.loc[3, "overall_score"] = "high"
+
+        expected = per_lead_recommendations(self.generator, leads, 50)
+        actual = self.generator.generate_recommendations(leads, 50)
+
+        assert comparable(actual) == comparable(expected)
+        assert self.generator.generate_recommendations(leads, 0) == []
+
+
+class TestEngineLeadInputs:
+    """Test cases for the lead inputs taken from the real engines"""
+
+    def setup_method(self):
+        """Set up a generator over the real engines"""
+        self.generator = make_engine_generator()
+
+    def test_matches_per_customer_engine_calls(self):
+        """Batch feature extraction and offer matching give the per-customer segments, scores and offers"""
+        leads = make_customer_records(300)
+
+        inputs = self.generator._get_all_lead_inputs(leads, leads.to_dict("records"))
+
+        actual = [
+            (analysis["customer_segment"], scores["overall_score"], [offer["name"] for offer in offers])
+            for analysis, scores, offers in inputs
+        ]
+        assert actual == per_lead_engine_inputs(self.generator, leads)
+        assert any(offers for _, _, offers in inputs)
+
+    def test_recommends_with_engine_offers(self):
+        """Recommendations from the real engines carry scores and offers"""
+        recommendations = self.generator.generate_recommendations(make_customer_records(300, seed=8), 20)
+
+        assert len(recommendations) > 0
+        assert all(0 < rec.conversion_probability <= 1 for rec in recommendations)
+        assert any(rec.recommended_offers for rec in recommendations)
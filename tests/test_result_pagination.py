@@ -0,0 +1,139 @@
+"""
+Unit tests for the paginated results views
+Tests that the recommendations table filters and sorts like the previous
+list-based view, that page bounds cover every item exactly once, and that the
+processing log is bounded and pageable
+"""
+
+import random
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import result_pagination
+from src.utils.result_pagination import (
+    RECOMMENDATION_SORT_COLUMNS,
+    ProcessingLog,
+    filter_options,
+    page_bounds,
+    recommendations_frame,
+    select_recommendations,
+)
+
+
+def make_recommendations(n: int, seed: int = 5):
+    """Display-formatted recommendations with repeated scores, so sorting has ties"""
+    rng = random.Random(seed)
+    recommendations = []
+    for i in range(n):
+        rec = {
+            "customer_id": f"ACC{i:05d}",
+            "customer_name": rng.choice(["Chan Tai Man", "Wong Ka Yan", "Acme Trading Ltd", "Lee Siu Ming"]),
+            "priority": rng.choice(["critical", "high", "medium", "low"]),
+            "action_type": rng.choice(["upsell", "retention_call", "cross_sell"]),
+            "title": f"Offer {i}",
+            "expected_revenue": rng.choice([300, 450, 800, 2500]),
+            "conversion_probability": rng.choice([0.25, 0.5, 0.75]),
+            "urgency_score": rng.choice([0.2, 0.6]),
+            "business_impact_score": rng.choice([0.4, 0.7, 0.9]),
+        }
+        if i % 7 == 0:
+            del rec["urgency_score"]
+        recommendations.append(rec)
+    return recommendations
+
+
+def list_selection(recommendations, priority, action_type, sort_by):
+    """The previous view's filtering and sorting on the list of dicts"""
+    filtered = recommendations.copy()
+    if priority != "All":
+        filtered = [r for r in filtered if r.get("priority") == priority]
+    if action_type != "All":
+        filtered = [r for r in filtered if r.get("action_type") == action_type]
+    sort_key = RECOMMENDATION_SORT_COLUMNS[sort_by]
+    filtered.sort(key=lambda x: x.get(sort_key, 0), reverse=True)
+    return filtered
+
+
+class TestRecommendationSelection:
+    """Test cases for filtering and sorting the recommendations table"""
+
+    def setup_method(self):
+        """Set up recommendations and their table"""
+        self.recommendations = make_recommendations(500)
+        self.frame = recommendations_frame(self.recommendations)
+
+    @pytest.mark.parametrize("sort_by", list(RECOMMENDATION_SORT_COLUMNS))
+    @pytest.mark.parametrize("priority,action_type", [("All", "All"), ("high", "All"), ("low", "upsell")])
+    def test_matches_list_view(self, sort_by, priority, action_type):
+        """Same recommendations in the same order as the list-based view, ties included"""
+        positions = select_recommendations(self.frame, priority, action_type, sort_by)
+        selected = [self.recommendations[position] for position in positions]
+
+        assert selected == list_selection(self.recommendations, priority, action_type, sort_by)
+
+    def test_search_by_name_or_id(self):
+        """Search is a case-insensitive substring match on customer name or ID"""
+        by_name = select_recommendations(self.frame, search="acme")
+        by_id = select_recommendations(self.frame, search="acc0004")
+
+        assert len(by_name) and all(
+            self.recommendations[position]["customer_name"] == "Acme Trading Ltd" for position in by_name
+        )
+        assert sorted(self.recommendations[position]["customer_id"] for position in by_id) == [
+            f"ACC{i:05d}" for i in range(40, 50)
+        ]
+
+    def test_filter_options_are_sorted(self):
+        """Filter choices start with "All" and do not depend on set ordering"""
+        assert filter_options(self.frame, "priority") == ["All", "critical", "high", "low", "medium"]
+
+    def test_empty_and_non_numeric_scores(self):
+        """Missing or non-numeric scores sort as 0, like the default of the list sort"""
+        frame = recommendations_frame([{"business_impact_score": "n/a"}, {"business_impact_score": 0.5}])
+
+        assert list(select_recommendations(frame)) == [1, 0]
+        assert len(select_recommendations(recommendations_frame([]))) == 0
+
+
+class TestPaging:
+    """Test cases for page bounds and the processing log"""
+
+    @pytest.mark.parametrize("total", [0, 1, 24, 25, 26, 1000])
+    def test_pages_cover_every_item_once(self, total):
+        """Consecutive pages tile the items, and out-of-range pages are clamped"""
+        _, _, page_count = page_bounds(total, 1, 25)
+        covered = []
+        for page in range(1, page_count + 1):
+            start, end, _ = page_bounds(total, page, 25)
+            covered.extend(range(start, end))
+
+        assert covered == list(range(total))
+        assert page_bounds(total, page_count + 5, 25) == page_bounds(total, page_count, 25)
+        assert page_bounds(total, 0, 25) == page_bounds(total, 1, 25)
+
+    def test_processing_log_pages_and_levels(self):
+        """Pages hold the requested number of lines and can be limited to one level"""
+        log = ProcessingLog()
+        for i in range(450):
+            log.add(f"line {i}", "error" if i % 10 == 0 else "info")
+
+        assert log.page_text(1).splitlines()[0] == "line 0"
+        assert log.page_text(3).splitlines() == [f"line {i}" for i in range(400, 450)]
+        assert log.count("error") == 45
+        assert log.page_text(1, level="error").splitlines()[:2] == ["line 0", "line 10"]
+
+    def test_processing_log_is_bounded(self, monkeypatch):
+        """Lines beyond the limit are counted, not kept"""
+        monkeypatch.setattr(result_pagination, "MAX_LOG_LINES", 10)
+        log = ProcessingLog()
+        for i in range(15):
+            log.add(f"line {i}")
+
+        assert log.count() == 10
+        assert log.dropped == 5
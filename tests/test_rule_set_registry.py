@@ -0,0 +1,98 @@
+"""
+Unit tests for the shared Three HK rule set registry
+Tests that catalog and rules are built once per process, stay read-only and
+can be pickled to worker processes
+"""
+
+import pytest
+import pickle
+import sys
+import dataclasses
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents import three_hk_business_rules
+from src.agents.three_hk_business_rules import RuleSetRegistry, ThreeHKBusinessRulesEngine
+
+
+class TestRuleSetRegistry:
+    """Test cases for RuleSetRegistry and engine construction"""
+
+    def setup_method(self):
+        """Remember the process-wide registry"""
+        self.original_registry = three_hk_business_rules.rule_set_registry
+
+    def teardown_method(self):
+        """Restore the process-wide registry"""
+        three_hk_business_rules.rule_set_registry = self.original_registry
+
+    def use_registry(self):
+        """Install a fresh registry"""
+        registry = RuleSetRegistry()
+        three_hk_business_rules.rule_set_registry = registry
+        return registry
+
+    def test_engines_share_catalog_rules_and_index(self):
+        """Catalog, rules and eligibility index are built once for many engines"""
+        registry = self.use_registry()
+        first, second = ThreeHKBusinessRulesEngine(), ThreeHKBusinessRulesEngine()
+
+        assert registry.builds == 1
+        assert first.rule_set is second.rule_set
+        assert first.product_catalog is not second.product_catalog
+        assert first.product_catalog[0] is second.product_catalog[0]
+        assert first.get_eligibility_index() is second.get_eligibility_index()
+
+    def test_catalog_and_rules_are_immutable(self):
+        """Shared products and rules cannot be edited in place"""
+        self.use_registry()
+        engine = ThreeHKBusinessRulesEngine()
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            engine.product_catalog[0].monthly_price = Decimal("1.00")
+        with pytest.raises(TypeError):
+            engine.pricing_rules["discount_rules"]["loyalty_discount"] = {}
+
+    def test_clear_builds_new_version(self):
+        """Engines share one version until the registry is cleared"""
+        registry = self.use_registry()
+        engine = ThreeHKBusinessRulesEngine()
+        rule_set = engine.rule_set
+        assert ThreeHKBusinessRulesEngine().rule_set is rule_set
+
+        registry.clear()
+        rebuilt = ThreeHKBusinessRulesEngine()
+        assert rebuilt.rule_set.version == rule_set.version + 1
+        assert registry.builds == 2
+        assert rebuilt.get_eligibility_index() is not engine.get_eligibility_index()
+
+    def test_engine_pickles_with_read_only_rules(self):
+        """Engines can be sent to worker processes; the copy keeps its rules read-only"""
+        self.use_registry()
+        engine = ThreeHKBusinessRulesEngine()
+        engine.get_eligibility_index()
+
+        copy = pickle.loads(pickle.dumps(engine))
+
+        assert copy.pricing_rules == engine.pricing_rules
+        assert copy.product_catalog == engine.product_catalog
+        assert copy.get_eligibility_index().eligible.shape == engine.get_eligibility_index().eligible.shape
+        with pytest.raises(TypeError):
+            copy.eligibility_rules["new_rule"] = {}
+
+    def test_edited_catalog_gets_private_index(self):
+        """An engine whose catalog was edited stops using the shared index"""
+        self.use_registry()
+        shared, edited = ThreeHKBusinessRulesEngine(), ThreeHKBusinessRulesEngine()
+        edited.product_catalog.append(dataclasses.replace(edited.product_catalog[0], product_id="THREE_COPY"))
+
+        assert edited.get_eligibility_index() is not shared.get_eligibility_index()
+        assert edited.get_eligibility_index().eligible.shape[-1] == len(shared.product_catalog) + 1
+
+        edited.product_catalog.pop()
+        edited.invalidate_eligibility_index()
+        assert edited.get_eligibility_index() is not shared.get_eligibility_index()
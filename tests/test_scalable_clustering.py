@@ -0,0 +1,90 @@
+"""
+Unit tests for customer clustering model selection, the scalable MiniBatchKMeans mode
+and persistence of the fitted scaler and model
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.agents.customer_analysis import ClusteringModel, CustomerDataAnalyzer, NUMERICAL_FEATURE_FIELDS
+from tests.fixtures_data import make_customer_datasets
+
+
+class TestScalableClustering:
+    """Test cases for CustomerDataAnalyzer.cluster_customers modes and predict_clusters"""
+
+    def setup_method(self):
+        """Set up an ML-enabled analyzer for each test"""
+        self.analyzer = CustomerDataAnalyzer(enable_ml_clustering=True)
+        if not self.analyzer.enable_ml:
+            pytest.skip("scikit-learn not available")
+
+    def test_selected_model_is_reused(self, monkeypatch):
+        """The chosen cluster count comes from model selection and its model is not refitted"""
+        datasets = make_customer_datasets(60)
+        fitted = []
+        original = self.analyzer._find_optimal_clusters
+        monkeypatch.setattr(
+            self.analyzer, "_find_optimal_clusters", lambda *args: fitted.append(original(*args)) or fitted[-1]
+        )
+
+        result = self.analyzer.cluster_customers(datasets, scalable=False)
+
+        optimal, model, selection = fitted[0]
+        assert self.analyzer.clustering_model is model
+        assert result["n_clusters"] == optimal
+        assert result["clustering_mode"] == "kmeans"
+        assert set(selection) == set(range(2, 9))
+        best = max(selection, key=lambda k: selection[k]["silhouette"])
+        assert optimal == best
+
+    def test_scalable_mode_clusters_every_customer(self):
+        """MiniBatchKMeans over chunks labels every customer"""
+        result = self.analyzer.cluster_customers(make_customer_datasets(200), scalable=True)
+
+        assert "error" not in result
+        assert result["clustering_mode"] == "minibatch_kmeans"
+        assert sum(cluster["size"] for cluster in result["clusters"].values()) == 200
+        assert -1.0 <= result["silhouette_score"] <= 1.0
+
+    def test_persisted_model_predicts_without_refitting(self, tmp_path, monkeypatch):
+        """A new analyzer assigns uploads with the saved scaler and model"""
+        datasets = make_customer_datasets(120)
+        model_path = tmp_path / "clustering.joblib"
+        result = self.analyzer.cluster_customers(datasets, scalable=True, model_path=model_path)
+        assert result["model_path"] == str(model_path)
+
+        fresh = CustomerDataAnalyzer(enable_ml_clustering=True)
+        loaded = fresh.load_clustering_model(model_path)
+        monkeypatch.setattr(loaded.model, "partial_fit", lambda *args: pytest.fail("refitted"))
+        assigned = fresh.predict_clusters(datasets)
+
+        clustered = {
+            customer_id: int(cluster["cluster_id"])
+            for cluster in result["clusters"].values()
+            for customer_id in cluster["customers"]
+        }
+        assert assigned == clustered
+        assert loaded.feature_names == NUMERICAL_FEATURE_FIELDS
+
+    def test_predict_requires_fitted_model(self, tmp_path):
+        """Predicting or saving without a model fails clearly; layout mismatches are rejected"""
+        with pytest.raises(ValueError):
+            self.analyzer.predict_clusters(make_customer_datasets(5))
+        with pytest.raises(ValueError):
+            self.analyzer.save_clustering_model(tmp_path / "missing.joblib")
+
+        self.analyzer.cluster_customers(make_customer_datasets(30))
+        clustering = self.analyzer.fitted_clustering
+        ClusteringModel(
+            scaler=clustering.scaler, model=clustering.model, feature_names=("monthly_spend",),
+            model_selection={}, fitted_at=clustering.fitted_at,
+        ).save(tmp_path / "old.joblib")
+        with pytest.raises(ValueError):
+            ClusteringModel.load(tmp_path / "old.joblib")
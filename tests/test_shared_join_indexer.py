@@ -0,0 +1,92 @@
+"""
+Unit tests for the shared Account ID join in DataMerger
+Tests that merges taken from one factorized join indexer equal pd.merge,
+that the quality report is derived from the same codes, and that the
+display frame is merged on the original Account IDs
+"""
+
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.data_merging import DataMerger, MergeStrategy
+from tests.fixtures_data import make_merge_frames
+
+
+def reference_merge(customer_df, purchase_df, strategy):
+    """The merge as prefixed copies and pd.merge on string keys"""
+    customer_clean = customer_df.dropna(subset=["Account ID"]).copy()
+    purchase_clean = purchase_df.dropna(subset=["Account ID"]).copy()
+    customer_clean["Account ID"] = customer_clean["Account ID"].astype(str)
+    purchase_clean["Account ID"] = purchase_clean["Account ID"].astype(str)
+    customer_clean = customer_clean.add_prefix("customer_").rename(columns={"customer_Account ID": "Account_ID"})
+    purchase_clean = purchase_clean.add_prefix("purchase_").rename(columns={"purchase_Account ID": "Account_ID"})
+    return pd.merge(customer_clean, purchase_clean, on="Account_ID", how=strategy.value)
+
+
+class TestSharedJoinIndexer:
+    """Test cases for merges taken from a JoinIndexer"""
+
+    def setup_method(self):
+        """Set up frames and a validated merger for each test"""
+        self.customer_df, self.purchase_df = make_merge_frames(2000)
+        self.merger = DataMerger()
+        self.merger._validate_datasets(self.customer_df, self.purchase_df)
+
+    @pytest.mark.parametrize("strategy", list(MergeStrategy))
+    def test_merge_equals_pd_merge(self, strategy):
+        """Rows, order, columns and dtypes equal pd.merge for every strategy"""
+        result = self.merger._perform_merge(self.customer_df, self.purchase_df, strategy)
+
+        assert result["success"], result["message"]
+        pd.testing.assert_frame_equal(
+            result["merged_data"], reference_merge(self.customer_df, self.purchase_df, strategy)
+        )
+
+    def test_quality_report_from_codes(self):
+        """Report figures equal set-based counts over the string IDs"""
+        report = self.merger._generate_quality_report(self.customer_df, self.purchase_df)
+        customer_ids = set(self.customer_df["Account ID"].dropna().astype(str))
+        purchase_ids = set(self.purchase_df["Account ID"].dropna().astype(str))
+
+        assert report.matched_records == len(customer_ids & purchase_ids)
+        assert set(report.unmatched_customer_ids) <= customer_ids - purchase_ids
+        assert len(report.unmatched_purchase_ids) == 10
+        assert len(report.duplicate_customer_ids) == self.customer_df["Account ID"].duplicated().sum()
+        assert report.missing_account_ids == {
+            "customer": self.customer_df["Account ID"].isna().sum(),
+            "purchase": self.purchase_df["Account ID"].isna().sum(),
+        }
+
+    def test_display_merge_shares_the_join(self, monkeypatch):
+        """The masked display frame is taken from the original join, one row per merged row"""
+        calls = []
+        build = self.merger._build_join_indexer
+        monkeypatch.setattr(self.merger, "_build_join_indexer", lambda *args: calls.append(args) or build(*args))
+
+        # Masked IDs collide, so joining on them would pair the wrong rows
+        customer_display = self.customer_df.assign(
+            **{"Account ID": self.customer_df["Account ID"].str[:3] + "****", "Email": "***@example.com"}
+        )
+        purchase_display = self.purchase_df.assign(**{"Account ID": self.purchase_df["Account ID"].str[:3] + "****"})
+
+        result = self.merger.merge_datasets(
+            {"original_data": self.customer_df, "display_data": customer_display},
+            {"original_data": self.purchase_df, "display_data": purchase_display},
+            strategy=MergeStrategy.OUTER,
+        )
+
+        assert result.success, result.message
+        assert len(calls) == 1
+        assert result.display_data.shape == result.merged_data.shape
+        assert (result.display_data["Account_ID"] == "ACC****").all()
+        pd.testing.assert_series_equal(result.display_data["purchase_Amount"], result.merged_data["purchase_Amount"])
+        only_purchase = result.merged_data["customer_Email"].isna()
+        assert only_purchase.any()
+        assert result.display_data["customer_Email"][only_purchase].isna().all()
+        assert (result.display_data["customer_Email"][~only_purchase] == "***@example.com").all()
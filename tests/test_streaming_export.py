@@ -0,0 +1,274 @@
+"""
+Unit tests for the streaming export engine
+Tests that chunked CSV output matches DataFrame.to_csv, that ZIP members are
+written from generators into a spooled file that spills to disk, and that
+the business and email template packages keep their files and contents
+"""
+
+import csv
+import io
+import json
+import zipfile
+
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import streaming_export
+from src.utils.streaming_export import iter_csv, iter_json, spool_zip, write_zip
+from src.components.results import (
+    crewai_offer_rows,
+    crewai_recommendation_rows,
+    export_complete_business_package,
+    export_crewai_offers_csv,
+    export_detailed_json,
+    export_email_templates_package,
+    iter_detailed_json,
+    open_complete_business_package,
+    open_email_templates_package,
+)
+
+
+def make_deliverables(customers: int) -> dict:
+    """Analysis results with CrewAI deliverables and legacy recommendations for a number of customers"""
+    offers, recommendations, templates, legacy = [], [], [], []
+    for i in range(customers):
+        customer_id = f"CUST{i:06d}"
+        name = f"Customer {i}, Kowloon"
+        offers.append({
+            "customer_id": customer_id,
+            "customer_name": name,
+            "offer_type": ["plan upgrade", "device bundle", "roaming pack"][i % 3],
+            "title": f"Offer for {name}",
+            "description": "Upgrade to 5G Unlimited.\nIncludes \"priority\" support.",
+            "current_plan": "4G Basic",
+            "recommended_plan": "5G Unlimited",
+            "discount": "20% off for 6 months",
+            "estimated_value": 188 + i % 50,
+            "revenue_impact": 2256.5,
+            "confidence": (i % 10) / 10,
+            "expiry_date": "2026-12-31",
+        })
+        recommendations.append({
+            "customer_id": customer_id,
+            "customer_name": name,
+            "priority": ["High", "Medium", "Low"][i % 3],
+            "action": "Call about the 5G upgrade",
+            "expected_outcome": "HK$2,256 annual uplift",
+            "timeline": "Within 7 days",
+            "success_probability": "72%",
+            "talking_points": ["Data usage near cap", "Contract ends soon"],
+        })
+        templates.append({
+            "template_id": f"TPL_{i:06d}",
+            "template_name": f"Upgrade {i}",
+            "subject": "Your 5G upgrade is ready",
+            "target_audience": "High data users",
+            "offer_type": "plan upgrade",
+            "personalization_fields": ["customer_name", "current_plan"],
+            "body": "Dear {{customer_name}},\n\n升級至5G無限數據，享受更快速度。\n" * 4,
+        })
+        legacy.append({
+            "customer_id": customer_id,
+            "customer_name": name,
+            "priority": "high",
+            "action_type": "upsell",
+            "expected_revenue": 2256.5,
+            "conversion_probability": 0.42,
+            "business_impact_score": 7.5,
+            "urgency_score": 6.0,
+            "explanation": {"primary_reason": "High data usage", "confidence_score": 0.8},
+            "next_steps": ["Call", "Send offer"],
+            "created_at": "2026-10-01T09:00:00",
+            "expires_at": None,
+        })
+    return {
+        "recommendations": {"recommendations": legacy},
+        "collaboration_results": {
+            "deliverables": {
+                "personalized_offers": offers,
+                "customer_recommendations": recommendations,
+                "email_templates": templates,
+                "summary_count": {
+                    "offers_created": customers,
+                    "emails_generated": customers,
+                    "recommendations_made": customers,
+                },
+            },
+            "consensus_scores": {"overall_consensus": 91},
+        },
+    }
+
+
+def zip_members(data: bytes) -> dict:
+    """Member name -> content of a ZIP archive, in archive order"""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+class TestIterCsv:
+    """Test cases for iter_csv"""
+
+    def test_matches_dataframe_to_csv(self):
+        """Quoting, embedded newlines, unicode, numbers and missing values match to_csv"""
+        rows = [
+            {"id": 1, "name": 'Chan, "Tai Man"', "note": "line 1\nline 2", "score": 0.125, "flag": True},
+            {"id": 2, "name": "陳大文", "note": None, "score": float("nan"), "flag": False},
+            {"id": 3, "name": "", "note": "plain", "score": 3.5, "flag": None},
+        ]
+
+        assert "".join(iter_csv(rows)) == pd.DataFrame(rows).to_csv(index=False)
+
+    def test_rows_are_batched(self, monkeypatch):
+        """Rows are formatted in batches; the header comes with the first batch"""
+        monkeypatch.setattr(streaming_export, "CSV_BATCH_ROWS", 2)
+        chunks = list(iter_csv({"n": i} for i in range(5)))
+
+        assert chunks == ["n\n0\n1\n", "2\n3\n", "4\n"]
+
+    def test_explicit_columns_and_empty_input(self):
+        """Explicit columns give a header-only CSV for no rows; no rows and no columns give nothing"""
+        assert "".join(iter_csv([], columns=["a", "b"])) == "a,b\n"
+        assert list(iter_csv([])) == []
+        assert "".join(iter_csv([{"b": 2, "a": 1}], columns=["a", "b"])) == "a,b\n1,2\n"
+
+
+class TestIterJson:
+    """Test cases for iter_json"""
+
+    def test_tokens_are_joined_into_chunks(self, monkeypatch):
+        """Chunks hold JSON_BATCH_TOKENS tokens each and together equal json.dumps"""
+        monkeypatch.setattr(streaming_export, "JSON_BATCH_TOKENS", 10)
+        data = {"customers": [{"id": i, "name": f"客戶 {i}", "score": i / 3} for i in range(20)]}
+        chunks = list(iter_json(data, indent=2))
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == json.dumps(data, indent=2)
+
+
+class TestSpoolZip:
+    """Test cases for write_zip and spool_zip"""
+
+    def test_members_written_from_generators(self):
+        """Streamed and in-memory chunks of each entry make up its member, in entry order"""
+        def entries():
+            yield "report.csv", iter_csv({"n": i} for i in range(3))
+            yield "notes/readme.txt", ["α", "\n", "done"]
+
+        with spool_zip(entries()) as export:
+            members = zip_members(export.read())
+
+        assert list(members) == ["report.csv", "notes/readme.txt"]
+        assert members["report.csv"] == b"n\n0\n1\n2\n"
+        assert members["notes/readme.txt"].decode("utf-8") == "α\ndone"
+
+    def test_large_export_spills_to_disk(self):
+        """An archive larger than max_memory moves to a temporary file and reads back intact"""
+        lines = [f"{i:08d} {'x' * 40}\n" for i in range(2000)]
+
+        small = spool_zip([("a.txt", iter(lines))], max_memory=1 << 20)
+        large = spool_zip([("a.txt", iter(lines)), ("b.txt", iter(lines))], max_memory=4096)
+
+        assert not small.on_disk
+        assert large.on_disk and large.size > 4096
+        members = zip_members(large.read())
+        assert members["a.txt"] == members["b.txt"] == "".join(lines).encode()
+        small.close()
+        large.close()
+        assert large.closed
+
+    def test_export_file_is_a_readable_handle(self):
+        """ExportFile supports seek/read like the raw file handles st.download_button accepts"""
+        buffer = io.BytesIO()
+        assert write_zip([("a.txt", ["abc"])], buffer) == 1
+
+        with spool_zip([("a.txt", ["abc"])]) as export:
+            assert isinstance(export, io.RawIOBase)
+            assert export.size == len(buffer.getvalue())
+            head = export.read(4)
+            export.seek(0)
+            assert head == b"PK\x03\x04" and export.read() == buffer.getvalue()
+
+    def test_failed_export_propagates_error(self):
+        """An error in an entry generator is raised to the caller"""
+        def entries():
+            yield "a.txt", ["ok"]
+            raise ValueError("broken deliverable")
+
+        with pytest.raises(ValueError, match="broken deliverable"):
+            spool_zip(entries())
+
+
+class TestStreamedPackages:
+    """Test cases for the streamed business and email template packages"""
+
+    def setup_method(self):
+        """Set up results for a small campaign"""
+        self.results = make_deliverables(25)
+
+    def test_business_package_contents(self):
+        """The package has its usual files, CSVs equal the standalone exports and the JSON report is unchanged"""
+        members = zip_members(export_complete_business_package(self.results))
+        deliverables = self.results["collaboration_results"]["deliverables"]
+
+        assert list(members)[:5] == [
+            "1_Customer_Offers.csv",
+            "2_Action_Recommendations.csv",
+            "3_Campaign_Summary.csv",
+            "4_Legacy_Recommendations.csv",
+            "5_Detailed_Analysis_Report.json",
+        ]
+        assert list(members)[-1] == "EXECUTIVE_SUMMARY.txt"
+        assert sum(name.startswith("Email_Templates/") for name in members) == 25
+        assert members["1_Customer_Offers.csv"].decode("utf-8") == export_crewai_offers_csv(self.results)
+        assert members["5_Detailed_Analysis_Report.json"].decode("utf-8") == export_detailed_json(self.results)
+
+        offers = pd.read_csv(io.BytesIO(members["1_Customer_Offers.csv"]))
+        expected = pd.DataFrame(list(crewai_offer_rows(deliverables["personalized_offers"])))
+        pd.testing.assert_frame_equal(offers, pd.read_csv(io.StringIO(expected.to_csv(index=False))))
+
+    def test_action_recommendations_csv_parses(self):
+        """Action recommendation rows round-trip through the CSV"""
+        members = zip_members(export_complete_business_package(self.results))
+        reader = csv.DictReader(io.StringIO(members["2_Action_Recommendations.csv"].decode("utf-8")))
+        rows = list(reader)
+        expected = list(crewai_recommendation_rows(self.results["collaboration_results"]["deliverables"]["customer_recommendations"]))
+
+        assert len(rows) == 25
+        assert rows[0]["Talking_Points"] == "Data usage near cap; Contract ends soon"
+        assert rows[-1]["Customer_Name"] == expected[-1]["Customer_Name"]
+
+    def test_json_report_streams_same_text(self):
+        """The chunked JSON report is identical to json.dumps"""
+        results = dict(self.results, generated_at=pd.Timestamp("2026-10-01"))
+
+        assert "".join(iter_detailed_json(results)) == json.dumps(results, indent=2, default=str)
+
+    def test_email_templates_package(self):
+        """Each template gets an HTML and a TXT file; the README written last lists them all"""
+        with open_email_templates_package(self.results) as package:
+            members = zip_members(package.read())
+        names = list(members)
+
+        assert len(names) == 51 and names[-1] == "README.txt"
+        assert names[:2] == ["TPL_000000_Upgrade_0.html", "TPL_000000_Upgrade_0.txt"]
+        readme = members["README.txt"].decode("utf-8")
+        assert "Templates: 25" in readme
+        assert all(f"- {name}\n" in readme for name in names[:-1])
+        assert "升級至5G無限數據" in members["TPL_000024_Upgrade_24.html"].decode("utf-8")
+
+    def test_empty_packages(self):
+        """Without deliverables the packages carry their explanation and sample files"""
+        templates = zip_members(export_email_templates_package({}))
+        with open_complete_business_package({}) as package:
+            business = zip_members(package.read())
+
+        assert list(templates) == ["NO_DATA_EXPLANATION.txt"]
+        assert b"SAMPLE_001" in business["1_Customer_Offers.csv"]
+        assert business["4_Legacy_Recommendations.csv"] == b"No recommendations to export"
+        assert not any(name.startswith("Email_Templates/") for name in business)
@@ -0,0 +1,269 @@
+"""
+Tests for chunked streaming ingestion through the privacy pipeline
+
+Tests the chunked encrypted store and PrivacyPipeline.process_upload_stream:
+PII identified once, every chunk encrypted and pseudonymized, and only the
+display head and column statistics returned. Also tests that uploads over the
+in-memory size limit take this path and merge out of core from storage.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components import upload
+from src.utils.data_merging import DataMerger, MergeStrategy
+from src.utils.encrypted_storage import EncryptedStorage
+from src.utils.partitioned_merge import merge_uploaded_datasets
+from src.utils.privacy_pipeline import PrivacyPipeline
+from tests.fixtures_data import FakeUpload, make_merge_frames
+
+
+def make_customer_csv(rows: int, seed: int = 7) -> str:
+    """Customer CSV with PII columns and numeric fields"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "account_id": [f"ACCT{i:07d}" for i in range(rows)],
+            "name": [f"Customer {i}" for i in range(rows)],
+            "email": [f"user{i}@example.com" for i in range(rows)],
+            "phone": [f"+852 9{i % 1000:03d} {i % 10000:04d}" for i in range(rows)],
+            "plan_type": rng.choice(["5G Unlimited", "4G Premium", "5G Basic"], rows),
+            "monthly_spend": rng.uniform(88, 688, rows).round(2),
+            "tenure_months": rng.integers(1, 120, rows),
+        }
+    )
+    df.loc[df.index % 50 == 0, "monthly_spend"] = np.nan
+    return df.to_csv(index=False)
+
+
+class TestChunkedEncryptedStorage:
+    """Test cases for ChunkedDataFrameWriter and iter_dataframe_chunks"""
+
+    def setup_method(self):
+        """Set up storage in a temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = EncryptedStorage(storage_path=self.temp_dir, master_password="test_password_123")
+        self.df = pd.read_csv(io.StringIO(make_customer_csv(250)))
+
+    def teardown_method(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def store_in_chunks(self, rows_per_chunk: int = 100) -> str:
+        with self.storage.open_chunked_writer("customers", {"source": "test"}) as writer:
+            for start in range(0, len(self.df), rows_per_chunk):
+                writer.write(self.df.iloc[start:start + rows_per_chunk])
+            return writer.close()
+
+    def test_round_trip(self):
+        """Chunks come back in order, and retrieve_dataframe reassembles them"""
+        storage_key = self.store_in_chunks()
+
+        chunks = list(self.storage.iter_dataframe_chunks(storage_key))
+        assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+
+        df, metadata = self.storage.retrieve_dataframe(storage_key)
+        pd.testing.assert_frame_equal(df, self.df, check_dtype=False)
+        assert metadata == {"source": "test"}
+        assert self.storage.verify_encryption_integrity(storage_key)
+
+    def test_round_trip_preserves_string_columns(self):
+        """Digit-only strings, dates and missing values come back with their original types"""
+        df = pd.DataFrame(
+            {
+                "Account ID": ["00456", "A1", "00123", np.nan],
+                "Phone": ["0912345678", "91234567", "", "0000"],
+                "created_date": ["2024-01-01", "n/a", "2024-03-01", "2024-04-01"],
+                "last_seen": pd.to_datetime(["2024-01-01", "2024-02-03T10:00", None, "2024-04-01"], format="ISO8601"),
+                "monthly_spend": [188.5, None, 288.0, 88.0],
+                "tenure_months": [12, 24, 36, 48],
+            }
+        )
+        with self.storage.open_chunked_writer("ids") as writer:
+            writer.write(df.iloc[:2])
+            writer.write(df.iloc[2:])
+            chunked_key = writer.close()
+        single_key = self.storage.store_dataframe(df, "ids")
+
+        chunks = list(self.storage.iter_dataframe_chunks(chunked_key))
+        assert chunks[0]["Account ID"].tolist() == ["00456", "A1"]
+        assert chunks[1]["Phone"].tolist() == ["", "0000"]
+        for storage_key in (chunked_key, single_key):
+            stored, _ = self.storage.retrieve_dataframe(storage_key)
+            pd.testing.assert_frame_equal(stored, df)
+
+    def test_chunks_are_encrypted_and_bound_to_position(self):
+        """Chunk files hold no plaintext, and swapped chunks fail authentication"""
+        storage_key = self.store_in_chunks()
+        chunk_dir = self.storage._chunk_dir(storage_key)
+        first, second = (os.path.join(chunk_dir, name) for name in sorted(os.listdir(chunk_dir))[:2])
+
+        with open(first, "rb") as f:
+            assert b"example.com" not in f.read()
+
+        os.rename(first, first + ".tmp")
+        os.rename(second, first)
+        os.rename(first + ".tmp", second)
+        assert not self.storage.verify_encryption_integrity(storage_key)
+
+    def test_aborted_writer_and_delete_leave_nothing(self):
+        """A failed write removes its chunks; deleting a dataset removes its chunk directory"""
+        with pytest.raises(ValueError):
+            with self.storage.open_chunked_writer("broken") as writer:
+                writer.write(self.df.head(10))
+                writer.write(self.df[["name"]].head(10))
+        assert os.listdir(self.temp_dir) == [".master_key_hash"]
+
+        storage_key = self.store_in_chunks()
+        assert self.storage.list_stored_data()[0]["data_type"] == "chunked"
+        assert self.storage.delete_stored_data(storage_key)
+        assert os.listdir(self.temp_dir) == [".master_key_hash"]
+
+
+class TestStreamingPipeline:
+    """Test cases for PrivacyPipeline.process_upload_stream"""
+
+    def setup_method(self):
+        """Set up a pipeline in a temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pipeline = PrivacyPipeline(storage_path=self.temp_dir, master_password="test_password_123")
+        self.csv = make_customer_csv(1200)
+        self.df = pd.read_csv(io.StringIO(self.csv))
+
+    def teardown_method(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_stream_stores_all_rows_and_returns_head(self, monkeypatch):
+        """All chunks are stored; PII is identified once and only the head is masked"""
+        identified = []
+        original = self.pipeline._identify_pii_fields
+        monkeypatch.setattr(self.pipeline, "_identify_pii_fields", lambda df: identified.append(len(df)) or original(df))
+
+        result = self.pipeline.process_upload_stream(io.StringIO(self.csv), "customers", chunk_rows=500, display_rows=20)
+
+        assert result.success, result.message
+        assert identified == [500]
+        assert result.pseudonymized_data is None
+        assert len(result.display_data) == 20
+        assert result.metadata["chunks"] == 3
+        assert result.metadata["shape"] == (1200, 7)
+        assert {"account_id", "email", "phone"} <= set(result.metadata["pii_fields_identified"])
+        assert not result.display_data["email"].isin(self.df["email"]).any()
+
+        stored, _ = self.pipeline.encrypted_storage.retrieve_dataframe(result.storage_key)
+        pd.testing.assert_frame_equal(stored, self.df, check_dtype=False)
+
+    def test_pseudonymized_store_matches_in_memory_pipeline(self):
+        """Streamed pseudonymized chunks equal the in-memory pseudonymization"""
+        result = self.pipeline.process_upload_stream(io.StringIO(self.csv), "customers", chunk_rows=400)
+        expected = self.pipeline.process_upload(self.df, "customers_in_memory").pseudonymized_data
+
+        streamed = pd.concat(
+            self.pipeline.iter_stored_chunks(result.metadata["pseudonymized_storage_key"]), ignore_index=True
+        )
+        pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+        assert not streamed["email"].isin(self.df["email"]).any()
+
+    def test_column_statistics(self):
+        """Aggregate statistics cover every row across chunks"""
+        result = self.pipeline.process_upload_stream(io.StringIO(self.csv), "customers", chunk_rows=250)
+        stats = result.metadata["column_stats"]
+
+        assert stats["monthly_spend"]["null"] == self.df["monthly_spend"].isna().sum()
+        assert stats["monthly_spend"]["mean"] == pytest.approx(self.df["monthly_spend"].mean())
+        assert stats["tenure_months"]["min"] == self.df["tenure_months"].min()
+        assert stats["tenure_months"]["max"] == self.df["tenure_months"].max()
+        assert stats["name"] == {"non_null": 1200, "null": 0}
+
+    def test_failed_stream_leaves_no_chunks(self):
+        """A malformed CSV fails cleanly without partial datasets"""
+        bad_csv = self.csv + "1,2,3,4,5,6,7,8,9\n"
+
+        result = self.pipeline.process_upload_stream(io.StringIO(bad_csv), "customers", chunk_rows=500)
+
+        assert not result.success
+        assert self.pipeline.encrypted_storage.list_stored_data() == []
+        assert not any(name.endswith(".chunks") for name in os.listdir(self.temp_dir))
+
+
+class TestLargeUploads:
+    """Test cases for uploads over MAX_FILE_SIZE, streamed and merged from storage"""
+
+    def setup_method(self):
+        """Set up a pipeline in a temporary directory in place of the app's pipeline"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pipeline = PrivacyPipeline(storage_path=self.temp_dir, master_password="test_password_123")
+        self.csv = make_customer_csv(1200)
+        self.df = pd.read_csv(io.StringIO(self.csv))
+
+    def teardown_method(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_large_upload_keeps_head_and_storage_keys(self, monkeypatch):
+        """The session keeps the display head and storage keys; storage holds every row"""
+        monkeypatch.setattr(upload, "privacy_pipeline", self.pipeline)
+
+        success, message, processed = upload.process_large_upload(
+            FakeUpload(self.csv.encode("utf-8"), "customers.csv"), "customer_data", [["account_id"]]
+        )
+
+        assert success, message
+        assert processed["streamed"]
+        assert upload.uploaded_row_count(processed) == 1200
+        assert len(processed["original_data"]) == len(processed["display_data"]) == 1000
+        pd.testing.assert_frame_equal(processed["original_data"], self.df.head(1000), check_dtype=False)
+        stored, _ = self.pipeline.encrypted_storage.retrieve_dataframe(processed["storage_key"])
+        pd.testing.assert_frame_equal(stored, self.df, check_dtype=False)
+        assert processed["pseudonymized_storage_key"] in {
+            entry["storage_key"] for entry in self.pipeline.encrypted_storage.list_stored_data()
+        }
+
+    def test_large_upload_checks_columns_before_storing(self, monkeypatch):
+        """A file missing required columns is rejected from its header, before anything is stored"""
+        monkeypatch.setattr(upload, "privacy_pipeline", self.pipeline)
+
+        success, message, processed = upload.process_large_upload(
+            FakeUpload(self.csv.encode("utf-8"), "customers.csv"), "customer_data", [["Account ID", "Account_ID"]]
+        )
+
+        assert not success
+        assert message == "Missing required columns: Account ID"
+        assert processed == {}
+        assert self.pipeline.encrypted_storage.list_stored_data() == []
+
+    def test_streamed_upload_merges_out_of_core(self, monkeypatch):
+        """A streamed upload merges from its storage key like the in-memory merge"""
+        monkeypatch.setattr(upload, "privacy_pipeline", self.pipeline)
+        customer_df, purchase_df = make_merge_frames(800)
+        success, message, customers = upload.process_large_upload(
+            FakeUpload(customer_df.to_csv(index=False).encode("utf-8"), "customers.csv"),
+            "customer_data",
+            [["Account ID", "Account_ID"]],
+        )
+        assert success, message
+
+        result = merge_uploaded_datasets(
+            self.pipeline.encrypted_storage, customers, {"original_data": purchase_df}, MergeStrategy.LEFT,
+            head_rows=50,
+        )
+        stored_customers, _ = self.pipeline.encrypted_storage.retrieve_dataframe(customers["storage_key"])
+        expected = DataMerger().merge_datasets(
+            {"original_data": stored_customers, "display_data": stored_customers},
+            {"original_data": purchase_df, "display_data": purchase_df},
+        )
+
+        assert result.success
+        assert len(result.merged_data) == 50
+        assert result.metadata["merged_rows"] == len(expected.merged_data)
+        assert result.quality_report["matched_records"] == expected.quality_report["matched_records"]
+        merged_chunks = self.pipeline.encrypted_storage.iter_dataframe_chunks(result.metadata["merged_storage_key"])
+        assert sum(len(chunk) for chunk in merged_chunks) == len(expected.merged_data)
+
@@ -0,0 +1,127 @@
+"""
+Tests for the Streamlit rerun cache
+
+Tests content fingerprints, the per-session upload memo, fingerprint-keyed
+analysis caching, and catalog reloads on file changes.
+"""
+
+import pytest
+import pandas as pd
+import streamlit as st
+
+from src.utils import streamlit_cache
+from src.utils.product_catalog_db import ProductCatalogDB
+from src.utils.streamlit_cache import (
+    cache_by_fingerprint,
+    clear_session_memo,
+    frame_fingerprint,
+    session_memo,
+    upload_fingerprint,
+)
+from tests.fixtures_data import FakeUpload
+
+
+@pytest.fixture(autouse=True)
+def clean_memo():
+    """Start every test with an empty session memo"""
+    clear_session_memo()
+    yield
+    clear_session_memo()
+
+
+class TestFingerprints:
+    """Test cases for file and frame fingerprints"""
+
+    def test_upload_fingerprint_covers_content_and_settings(self):
+        """Same bytes and settings match; other content or settings do not"""
+        first = upload_fingerprint(FakeUpload(b"a,b\n1,2\n", "data.csv"), True)
+
+        assert upload_fingerprint(FakeUpload(b"a,b\n1,2\n", "data.csv"), True) == first
+        assert upload_fingerprint(FakeUpload(b"a,b\n1,3\n", "data.csv"), True) != first
+        assert upload_fingerprint(FakeUpload(b"a,b\n1,2\n", "data.csv"), False) != first
+
+    def test_frame_fingerprint_is_content_based(self):
+        """Equal frames share a fingerprint; in-place changes give a new one"""
+        df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+        first = frame_fingerprint(df)
+        assert frame_fingerprint(df.copy()) == first
+        assert frame_fingerprint(df.assign(a=[1, 3])) != first
+
+        df.loc[1, "b"] = "z"
+        assert frame_fingerprint(df) != first
+
+
+class TestSessionMemo:
+    """Test cases for the per-session memo"""
+
+    def test_hit_until_key_changes(self):
+        """The latest key of a namespace is served without recomputing"""
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+
+        assert session_memo("upload", "k1", compute) == (1, False)
+        assert session_memo("upload", "k1", compute) == (1, True)
+        assert session_memo("upload", "k2", compute) == (2, False)
+        assert session_memo("upload", "k1", compute) == (3, False)
+
+    def test_uncacheable_results_are_recomputed(self):
+        """Failed results are not memoized"""
+        calls = []
+        compute = lambda: calls.append(1) or (False, "failed")
+
+        session_memo("pipeline", "k", compute, cacheable=lambda result: result[0])
+        session_memo("pipeline", "k", compute, cacheable=lambda result: result[0])
+
+        assert len(calls) == 2
+        assert "pipeline" not in st.session_state[streamlit_cache.SESSION_MEMO_KEY]
+
+
+class TestAnalysisCache:
+    """Test cases for cache_by_fingerprint"""
+
+    def test_cached_by_content(self):
+        """Equal content is computed once; new or modified frames are computed again"""
+        calls = []
+
+        @cache_by_fingerprint
+        def summarize(df):
+            calls.append(1)
+            return {"rows": len(df)}
+
+        df = pd.DataFrame({"a": range(5)})
+        assert summarize(df) == summarize(df.copy()) == {"rows": 5}
+        assert len(calls) == 1
+
+        assert summarize(df.head(3)) == {"rows": 3}
+        df.loc[0, "a"] = 9
+        summarize(df)
+        assert len(calls) == 3
+
+    def test_functions_do_not_share_entries(self):
+        """Two cached analyses of the same frame keep separate results"""
+        rows = cache_by_fingerprint(lambda df: len(df))
+        columns = cache_by_fingerprint(lambda df: len(df.columns))
+        df = pd.DataFrame({"a": range(3), "b": range(3), "c": range(3), "d": range(3)})
+
+        assert (rows(df), columns(df)) == (3, 4)
+
+
+class TestCatalogCache:
+    """Test cases for the cached product catalog"""
+
+    def test_catalog_reloaded_only_when_file_changes(self, tmp_path, monkeypatch):
+        """Repeat reads come from the cache; saving a catalog is picked up"""
+        catalog = ProductCatalogDB(str(tmp_path / "catalog.json"))
+        monkeypatch.setattr("src.utils.product_catalog_db.catalog_db", catalog)
+        loads = []
+        original = catalog.load_catalog
+        monkeypatch.setattr(catalog, "load_catalog", lambda: loads.append(1) or original())
+
+        assert not streamlit_cache.is_catalog_available()
+        streamlit_cache.get_product_catalog()
+        assert len(loads) == 1
+
+        catalog.save_catalog_from_dataframe(pd.DataFrame([{"Plan_ID": "P1", "Plan_Name": "Plan One"}]))
+        assert streamlit_cache.get_product_catalog()["Plan_ID"].tolist() == ["P1"]
+        assert streamlit_cache.get_catalog_stats()["total_plans"] == 1
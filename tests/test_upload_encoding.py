@@ -0,0 +1,105 @@
+"""
+Tests for upload encoding detection
+
+Tests byte order marks, strict UTF-8 validation, sampled chardet detection of
+legacy encodings and parsing CSVs directly from the uploaded bytes.
+"""
+
+import codecs
+import io
+import random
+import pandas as pd
+
+from src.components import upload
+from src.components.upload import (
+    detect_file_encoding,
+    read_csv_with_detected_encoding,
+    validate_csv_file,
+)
+from tests.fixtures_data import FakeUpload
+
+
+SURNAMES = "陈李张王刘黄林吴郑何"
+GIVEN_NAMES = "伟芳娜敏静丽强磊洋艳勇军杰娟涛明超秀霞平刚"
+DISTRICTS = ["中西区", "湾仔", "东区", "南区", "油尖旺", "深水埗", "九龙城", "黄大仙", "观塘", "荃湾"]
+
+
+def make_csv(rows: int, late_text: str = "", seed: int = 1) -> str:
+    """CSV text with Chinese names and districts; late_text is placed in the last row only"""
+    rng = random.Random(seed)
+    lines = ["customer_id,name,district"]
+    lines += [
+        f"CUST{i:06d},{rng.choice(SURNAMES)}{rng.choice(GIVEN_NAMES)}{rng.choice(GIVEN_NAMES)},{rng.choice(DISTRICTS)}"
+        for i in range(rows)
+    ]
+    lines.append(f"CUST{rows:06d},{late_text or '李明'},湾仔")
+    return "\n".join(lines) + "\n"
+
+
+class TestEncodingDetection:
+    """Test cases for detect_file_encoding"""
+
+    def test_byte_order_marks(self):
+        """A BOM decides the encoding without validation or chardet"""
+        text = make_csv(3)
+        for encoded, expected in [
+            (codecs.BOM_UTF8 + text.encode("utf-8"), "utf-8-sig"),
+            (text.encode("utf-16"), "utf-16"),
+            (text.encode("utf-32"), "utf-32"),
+        ]:
+            result = detect_file_encoding(encoded)
+            assert result["encoding"] == expected and result["method"] == "bom"
+
+    def test_utf8_skips_chardet(self, monkeypatch):
+        """Valid UTF-8 is accepted by strict validation alone"""
+        monkeypatch.setattr(upload.chardet, "detect", lambda data: (_ for _ in ()).throw(AssertionError))
+        monkeypatch.setattr(upload, "UTF8_VALIDATION_CHUNK_BYTES", 7)
+
+        result = detect_file_encoding(make_csv(50).encode("utf-8"))
+
+        assert result["encoding"] == "utf-8" and result["confidence"] == 1.0
+
+    def test_legacy_encoding_uses_sample(self, monkeypatch):
+        """chardet only sees a bounded sample of a large non-UTF-8 file"""
+        seen = []
+        detect = upload.chardet.detect
+        monkeypatch.setattr(upload.chardet, "detect", lambda data: seen.append(len(data)) or detect(data))
+        content = make_csv(40000).encode("gb18030")
+
+        result = detect_file_encoding(content)
+
+        assert result["method"] == "sampled"
+        assert result["encoding"] == "gb18030"
+        limit = upload.ENCODING_SNIFF_HEAD_BYTES + upload.ENCODING_SNIFF_SLICES * upload.ENCODING_SNIFF_SLICE_BYTES
+        assert len(seen) == 1 and seen[0] <= limit < len(content)
+
+
+class TestCsvParsing:
+    """Test cases for parsing uploads from their bytes"""
+
+    def test_gbk_with_rare_characters_beyond_sample(self):
+        """Characters outside GB2312 after the sampled head still decode"""
+        text = make_csv(20000, late_text="陳喆堃")
+        success, message, df, info = read_csv_with_detected_encoding(text.encode("gb18030"))
+
+        assert success, message
+        assert "converted" in message
+        assert df.iloc[-1]["name"] == "陳喆堃"
+        assert len(df) == 20001
+
+    def test_validate_matches_decoded_text(self):
+        """validate_csv_file yields the same frame for UTF-8, BOM and GBK uploads"""
+        text = make_csv(200)
+        expected = pd.read_csv(io.StringIO(text))
+
+        for content in [text.encode("utf-8"), codecs.BOM_UTF8 + text.encode("utf-8"), text.encode("gbk")]:
+            is_valid, message, df = validate_csv_file(FakeUpload(content, "customers.csv"))
+            assert is_valid, message
+            pd.testing.assert_frame_equal(df, expected)
+
+    def test_utf8_message_unchanged(self):
+        """UTF-8 uploads keep the existing confirmation message"""
+        is_valid, message, _ = validate_csv_file(FakeUpload(make_csv(5).encode("utf-8"), "customers.csv"))
+
+        assert is_valid
+        assert "File is already UTF-8 encoded (confidence: 1.00)" in message